@@ -2,19 +2,26 @@
 """
 Analyze transcripts for speaker identification possibilities
 """
-import json
 import re
+import sys
+from itertools import islice
 from pathlib import Path
 from collections import defaultdict, Counter
 
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from transcript_store import Transcript
+
+# Every heuristic below looks at the opening segments only
+SEGMENTS_TO_CHECK = 100
+
 def analyze_speaker_patterns(transcript_file):
     """Analyze a transcript for speaker patterns and dialogue markers"""
 
-    with open(transcript_file, 'r') as f:
-        data = json.load(f)
+    transcript = Transcript(transcript_file)
 
-    segments = data.get('transcript', {}).get('segments', [])
-    title = data.get('title', 'Unknown')
+    # Streamed: the rest of the file is never parsed
+    segments = list(islice(transcript.iter_segments(), SEGMENTS_TO_CHECK))
+    title = transcript.title or 'Unknown'
 
     print(f"\nAnalyzing: {title[:60]}...")
     print("-" * 60)
@@ -24,7 +31,7 @@ def analyze_speaker_patterns(transcript_file):
     print(f"Has speaker field: {has_speaker_field}")
 
     if has_speaker_field:
-        speakers = Counter([seg.get('speaker', 'Unknown') for seg in segments])
+        speakers = Counter(seg.get('speaker', 'Unknown') for seg in transcript.iter_segments())
         print(f"Speakers found: {dict(speakers)}")
 
     # Analyze text patterns for dialogue
@@ -42,7 +49,7 @@ def analyze_speaker_patterns(transcript_file):
     consecutive_questions = 0
     last_was_question = False
 
-    for i, seg in enumerate(segments[:100]):  # Check first 100 segments
+    for i, seg in enumerate(segments):  # Check first 100 segments
         text = seg['text'].lower()
 
         # Check for questions
@@ -82,7 +89,7 @@ def analyze_speaker_patterns(transcript_file):
     print(f"  'We' statements: {dialogue_patterns['we_statements']}")
 
     # Detect conversation type
-    total_segments_checked = min(100, len(segments))
+    total_segments_checked = len(segments)
     question_ratio = dialogue_patterns['question_marks'] / total_segments_checked
     you_ratio = dialogue_patterns['you_statements'] / total_segments_checked
 
@@ -3,10 +3,14 @@
 
 import json
 import os
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from transcript_store import TranscriptLibrary
+
 # Define paths
 BASE_PATH = Path('/Users/yourox/AI-Workspace')
 TRANSCRIPTS_PATH = BASE_PATH / 'data' / 'transcripts'
@@ -31,6 +35,8 @@ def analyze_transcripts():
     transcript_files = list(TRANSCRIPTS_PATH.glob('*.json'))
     stats['total_videos'] = len(transcript_files)
 
+    library = TranscriptLibrary(TRANSCRIPTS_PATH)
+
     # Analyze each transcript
     for file_path in transcript_files:
         try:
@@ -46,29 +52,37 @@ def analyze_transcripts():
 
             # Check if recent (last 7 days)
             if creation_time > datetime.now() - timedelta(days=7):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                if file_path.name.endswith('_full.json'):
+                    # Cached header: no segment parsing
+                    header = library.header(file_path.name[:-len('_full.json')])
+                    metadata = header['metadata']
+                    method = header['method'] or 'unknown'
+                else:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
                     metadata = data.get('metadata', {})
-                    stats['recent_additions'].append({
-                        'video_id': metadata.get('video_id', file_path.stem),
-                        'title': metadata.get('title', 'Unknown'),
-                        'channel': metadata.get('channel', 'Unknown'),
-                        'added': creation_time.strftime('%Y-%m-%d %H:%M'),
-                        'duration': metadata.get('duration_formatted', 'N/A')
-                    })
+                    method = data.get('method', 'unknown')
 
-                    # Track channel
-                    channel = metadata.get('channel', 'Unknown')
-                    stats['by_channel'][channel] += 1
+                stats['recent_additions'].append({
+                    'video_id': metadata.get('video_id', file_path.stem),
+                    'title': metadata.get('title', 'Unknown'),
+                    'channel': metadata.get('channel', 'Unknown'),
+                    'added': creation_time.strftime('%Y-%m-%d %H:%M'),
+                    'duration': metadata.get('duration_formatted', 'N/A')
+                })
 
-                    # Track processing method
-                    method = data.get('method', 'unknown')
-                    stats['processing_methods'][method] += 1
+                # Track channel
+                channel = metadata.get('channel', 'Unknown')
+                stats['by_channel'][channel] += 1
+
+                # Track processing method
+                stats['processing_methods'][method] += 1
 
         except Exception as e:
             print(f"Error processing {file_path.name}: {e}")
             continue
 
+    library.save_index()
     return stats
 
 def analyze_insights():
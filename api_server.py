@@ -11,21 +11,30 @@ import os
 from pathlib import Path
 from typing import List, Dict, Any
 import glob
+import sys
 from collections import defaultdict
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from transcript_store import TranscriptLibrary
+from server_metrics import METRICS, instrument_flask
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
+instrument_flask(app)  # Per-route latency histograms at /metrics
 
 # Configuration
 DATA_DIR = Path("data/business_insights")
 TRANSCRIPTS_DIR = Path("data/transcripts")
 CACHE = {}  # Simple in-memory cache
+TRANSCRIPTS = TranscriptLibrary(TRANSCRIPTS_DIR)  # Cached headers + recently opened transcripts
 
 def load_all_insights():
     """Load all business insights from JSON files"""
     if "all_data" in CACHE:
+        METRICS.cache("insights", hit=True)
         return CACHE["all_data"]
+    METRICS.cache("insights", hit=False)
 
     all_data = defaultdict(list)
     meta_info = []
@@ -547,8 +556,7 @@ def get_videos():
                 insights = json.load(f)
 
             # Check if transcript exists
-            transcript_path = TRANSCRIPTS_DIR / f"{video_id}_full.json"
-            has_transcript = transcript_path.exists()
+            has_transcript = TRANSCRIPTS.exists(video_id)
 
             # Get video metadata from insights
             meta = insights.get('meta', {})
@@ -590,56 +598,53 @@ def get_video_detail(video_id):
         insights = json.load(f)
 
     # Load transcript if available
-    transcript_path = TRANSCRIPTS_DIR / f"{video_id}_full.json"
+    transcript = TRANSCRIPTS.get(video_id)
     transcript_data = None
 
-    if transcript_path.exists():
-        with open(transcript_path, 'r') as f:
-            transcript_json = json.load(f)
-
-            # Combine transcript segments into readable text
-            segments = transcript_json.get('transcript', {}).get('segments', [])
-            full_text = ' '.join([seg['text'] for seg in segments])
-
-            # Create intelligently grouped paragraphs
-            paragraphs = group_segments_into_paragraphs(segments)
-
-            # Detect speaker turns
-            speaker_turns = detect_speaker_turns(segments)
+    if transcript is not None:
+        # Segments and joined text are parsed once per file version
+        segments = transcript.segments
+        full_text = transcript.text
+
+        # Create intelligently grouped paragraphs
+        paragraphs = group_segments_into_paragraphs(segments)
+
+        # Detect speaker turns
+        speaker_turns = detect_speaker_turns(segments)
+
+        # Calculate speaker statistics
+        speaker_stats = {}
+        for turn in speaker_turns:
+            speaker = turn['speaker']
+            if speaker not in speaker_stats:
+                speaker_stats[speaker] = {
+                    'total_time': 0,
+                    'turn_count': 0,
+                    'avg_turn_length': 0,
+                    'total_words': 0
+                }
 
-            # Calculate speaker statistics
-            speaker_stats = {}
-            for turn in speaker_turns:
-                speaker = turn['speaker']
-                if speaker not in speaker_stats:
-                    speaker_stats[speaker] = {
-                        'total_time': 0,
-                        'turn_count': 0,
-                        'avg_turn_length': 0,
-                        'total_words': 0
-                    }
-
-                duration = turn['end'] - turn['start']
-                words = len(turn['text'].split())
-
-                speaker_stats[speaker]['total_time'] += duration
-                speaker_stats[speaker]['turn_count'] += 1
-                speaker_stats[speaker]['total_words'] += words
-
-            # Calculate averages
-            for speaker, stats in speaker_stats.items():
-                if stats['turn_count'] > 0:
-                    stats['avg_turn_length'] = stats['total_time'] / stats['turn_count']
-
-            transcript_data = {
-                "full_text": full_text,
-                "segments": segments,  # All segments
-                "paragraphs": paragraphs,  # Grouped paragraphs
-                "speaker_turns": speaker_turns,  # Speaker-based grouping
-                "speaker_stats": speaker_stats,  # Speaker statistics
-                "language": transcript_json.get('transcript', {}).get('language', 'en'),
-                "duration": segments[-1]['start'] + segments[-1]['duration'] if segments else 0
-            }
+            duration = turn['end'] - turn['start']
+            words = len(turn['text'].split())
+
+            speaker_stats[speaker]['total_time'] += duration
+            speaker_stats[speaker]['turn_count'] += 1
+            speaker_stats[speaker]['total_words'] += words
+
+        # Calculate averages
+        for speaker, stats in speaker_stats.items():
+            if stats['turn_count'] > 0:
+                stats['avg_turn_length'] = stats['total_time'] / stats['turn_count']
+
+        transcript_data = {
+            "full_text": full_text,
+            "segments": segments,  # All segments
+            "paragraphs": paragraphs,  # Grouped paragraphs
+            "speaker_turns": speaker_turns,  # Speaker-based grouping
+            "speaker_stats": speaker_stats,  # Speaker statistics
+            "language": transcript.language,
+            "duration": transcript.duration
+        }
 
     # Prepare response
     response = {
@@ -656,23 +661,17 @@ def get_video_detail(video_id):
 def get_video_transcript(video_id):
     """Get just the transcript for a specific video"""
 
-    transcript_path = TRANSCRIPTS_DIR / f"{video_id}_full.json"
+    transcript = TRANSCRIPTS.get(video_id)
 
-    if not transcript_path.exists():
+    if transcript is None:
         return jsonify({"error": "Transcript not found"}), 404
 
-    with open(transcript_path, 'r') as f:
-        transcript_json = json.load(f)
-
-    segments = transcript_json.get('transcript', {}).get('segments', [])
-    full_text = ' '.join([seg['text'] for seg in segments])
-
     return jsonify({
         "video_id": video_id,
-        "title": transcript_json.get('title', ''),
-        "full_text": full_text,
-        "segments": segments,
-        "language": transcript_json.get('transcript', {}).get('language', 'en')
+        "title": transcript.title,
+        "full_text": transcript.text,
+        "segments": transcript.segments,
+        "language": transcript.language
     })
 
 @app.route('/api/search')
@@ -5,6 +5,7 @@ FastAPI server for intelligent BI analysis chat
 """
 
 import os
+import sys
 import logging
 from pathlib import Path
 from typing import List, Optional
@@ -16,9 +17,12 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-from mcp_client import MCPClientManager
+from mcp_client_simple import SimpleMCPClientManager
 from reasoning_orchestrator import ReasoningOrchestrator, ReasoningConfig
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from server_metrics import METRICS, instrument_fastapi
+
 # Load environment
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
@@ -30,7 +34,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Global instances
-mcp_manager = MCPClientManager()
+mcp_manager = SimpleMCPClientManager()
 orchestrator: Optional[ReasoningOrchestrator] = None
 
 
@@ -40,9 +44,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting BI Chat API...")
 
-    # Initialize MCP client (temporarily disabled - debugging)
-    # base_path = Path("/Users/yourox/AI-Workspace")
-    # await mcp_manager.initialize(base_path)
+    # Initialize MCP client - one shared process pool per server for all chat sessions
+    base_path = Path("/Users/yourox/AI-Workspace")
+    await mcp_manager.initialize(base_path, pool_size=int(os.getenv("BI_CHAT_MCP_POOL_SIZE", "2")))
 
     # Initialize reasoning orchestrator
     global orchestrator
@@ -53,16 +57,19 @@ async def lifespan(app: FastAPI):
 
     orchestrator = ReasoningOrchestrator(
         openrouter_api_key=openrouter_key,
-        mcp_client=None  # Temporarily None - debugging
+        mcp_client=mcp_manager.get_client(),
+        metrics=METRICS
     )
 
-    logger.info("BI Chat API ready! (MCP connections temporarily disabled)")
+    logger.info("BI Chat API ready!")
 
     yield
 
     # Shutdown
     logger.info("Shutting down BI Chat API...")
-    # await mcp_manager.shutdown()
+    if orchestrator:
+        await orchestrator.aclose()
+    await mcp_manager.shutdown()
 
 
 # Initialize FastAPI app
@@ -82,6 +89,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency histograms at /metrics
+instrument_fastapi(app)
+
 
 # Request/Response models
 class Message(BaseModel):
@@ -115,7 +125,7 @@ async def health_check():
     try:
         if mcp_manager._initialized:
             mcp_client = mcp_manager.get_client()
-            available_servers = list(mcp_client.sessions.keys())
+            available_servers = mcp_client.connected_servers()
     except:
         pass  # MCP not initialized - that's OK
 
@@ -1,140 +1,346 @@
 #!/usr/bin/env python3
 """
 Simplified MCP Client using direct subprocess communication
+
+Each server runs as a small pool of stdio processes. Every process has a
+background reader task that routes JSON-RPC responses to per-request futures,
+so many tool calls can be in flight on one process at once and concurrent
+chat sessions share the pool instead of queueing behind each other.
+Dead processes are replaced under a per-server lock, so concurrent callers
+never spawn more than pool_size processes between them.
 """
 
 import asyncio
+import itertools
 import json
 import logging
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
-import subprocess
 
 logger = logging.getLogger(__name__)
 
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "bi-chat-client", "version": "1.0.0"}
+
+DEFAULT_POOL_SIZE = 2
+CONNECT_TIMEOUT = 30.0     # Servers load their data snapshots on startup
+CALL_TIMEOUT = 10.0
+REFILL_BACKOFF = 5.0       # Minimum seconds between background refills of a partial pool
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024  # Tool results can be large JSON blobs
+
+
+class MCPStdioConnection:
+    """One MCP server process with multiplexed JSON-RPC requests"""
+
+    def __init__(self, server_name: str, server_path: Path, env: Optional[Dict[str, str]] = None):
+        self.server_name = server_name
+        self.server_path = server_path
+        self.env = env  # Process environment (None inherits ours)
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.in_flight = 0
+
+        self._closed = False
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None and not self._closed
+
+    async def start(self, timeout: float = CONNECT_TIMEOUT) -> List[Dict[str, Any]]:
+        """
+        Spawn the server, run the initialize handshake and list its tools
+
+        Returns:
+            Tool definitions reported by the server
+        """
+        self.process = await asyncio.create_subprocess_exec(
+            "python3", str(self.server_path),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self.env,
+            limit=MAX_MESSAGE_BYTES
+        )
+        self._tasks = [
+            asyncio.create_task(self._read_responses()),
+            asyncio.create_task(self._drain_stderr()),
+        ]
+
+        response = await self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": CLIENT_INFO
+        }, timeout=timeout)
+        logger.info(f"Connected to {self.server_name} (pid {self.process.pid}): {response.get('serverInfo')}")
+        await self.notify("notifications/initialized")
+
+        tools = await self.request("tools/list", {}, timeout=timeout)
+        return tools.get("tools", [])
+
+    async def _send(self, message: Dict[str, Any]):
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        async with self._write_lock:
+            self.process.stdin.write(data)
+            await self.process.stdin.drain()
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """Send a JSON-RPC notification (no response expected)"""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+
+    async def request(
+        self,
+        method: str,
+        params: Dict[str, Any],
+        timeout: float = CALL_TIMEOUT
+    ) -> Dict[str, Any]:
+        """
+        Send a JSON-RPC request and wait for its response
+
+        Args:
+            method: JSON-RPC method
+            params: Method parameters
+            timeout: Seconds to wait for this response
+
+        Returns:
+            The response's result object
+
+        Raises:
+            asyncio.TimeoutError: No response within timeout
+            ConnectionError: The server process exited
+            RuntimeError: The server returned a JSON-RPC error
+        """
+        if not self.alive:
+            raise ConnectionError(f"Server {self.server_name} is not running")
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.in_flight += 1
+        try:
+            await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            response = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            # Let the server stop working on a request nobody is waiting for
+            try:
+                await self.notify("notifications/cancelled", {"requestId": request_id, "reason": "timeout"})
+            except Exception:
+                pass
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+            self.in_flight -= 1
+
+        if "error" in response:
+            raise RuntimeError(f"{method} failed on {self.server_name}: {response['error']}")
+        return response.get("result", {})
+
+    async def _read_responses(self):
+        """Route each response line to the future waiting on its id"""
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.debug(f"{self.server_name} stdout: {line[:200]!r}")
+                    continue
+                if not isinstance(message, dict):
+                    continue
+
+                if "method" in message:
+                    # Server-initiated request or notification
+                    if message["method"] == "ping" and "id" in message:
+                        await self._send({"jsonrpc": "2.0", "id": message["id"], "result": {}})
+                    continue
+
+                future = self._pending.get(message.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except Exception as e:
+            logger.error(f"Reader for {self.server_name} failed: {e}")
+        finally:
+            self._closed = True
+            error = ConnectionError(f"Server {self.server_name} closed its output")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+
+    async def _drain_stderr(self):
+        """Keep the stderr pipe empty so the server never blocks on logging"""
+        while True:
+            chunk = await self.process.stderr.read(65536)
+            if not chunk:
+                break
+            logger.debug(f"{self.server_name} stderr: {chunk.decode('utf-8', 'replace').rstrip()}")
+
+    async def close(self):
+        """Terminate the process and stop the background tasks"""
+        if self.process is not None and self.process.returncode is None:
+            try:
+                self.process.terminate()
+                await asyncio.wait_for(self.process.wait(), timeout=3)
+            except Exception:
+                try:
+                    self.process.kill()
+                except ProcessLookupError:
+                    pass
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
 
 class SimpleMCPClient:
-    """Simplified MCP client using subprocess for stdio communication"""
+    """Simplified MCP client using a pool of stdio processes per server"""
 
-    def __init__(self):
-        self.processes: Dict[str, subprocess.Popen] = {}
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.pool_size = max(1, pool_size)
+        self.pools: Dict[str, List[MCPStdioConnection]] = {}
+        self.server_paths: Dict[str, Path] = {}
         self.tools_cache: Dict[str, List[Dict[str, Any]]] = {}
 
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refills: Dict[str, asyncio.Task] = {}
+        self._last_refill: Dict[str, float] = {}
+
     async def connect_server(self, server_name: str, server_path: Path):
-        """Connect to an MCP server using subprocess"""
-        try:
-            # Start the MCP server as a subprocess
-            process = subprocess.Popen(
-                ["python3", str(server_path)],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
-            )
+        """Start the server's process pool (succeeds if any process connects)"""
+        connections = [MCPStdioConnection(server_name, server_path) for _ in range(self.pool_size)]
+        results = await asyncio.gather(*(c.start() for c in connections), return_exceptions=True)
+
+        pool = []
+        for connection, result in zip(connections, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to connect to {server_name}: {result!r}")
+                await connection.close()
+                continue
+            pool.append(connection)
+            self.tools_cache.setdefault(server_name, result)
+
+        if not pool:
+            return False
+
+        self.pools[server_name] = pool
+        self.server_paths[server_name] = server_path
+        self._locks.setdefault(server_name, asyncio.Lock())
+        logger.info(f"Loaded {len(self.tools_cache[server_name])} tools from {server_name} "
+                    f"({len(pool)}/{self.pool_size} processes)")
+        return True
+
+    async def _acquire(self, server_name: str) -> MCPStdioConnection:
+        """
+        Least-busy live process for a server
+
+        If every process died, the pool is refilled before returning. If only
+        some died, the caller gets a live process right away and the missing
+        ones are respawned in the background.
+        """
+        pool = self.pools[server_name]
+        alive = [c for c in pool if c.alive]
+        if len(alive) < self.pool_size:
+            if alive:
+                self._schedule_refill(server_name)
+            else:
+                logger.warning(f"All {server_name} processes exited - restarting")
+                alive = await self._refill(server_name)
+        return min(alive, key=lambda c: c.in_flight)
+
+    def _schedule_refill(self, server_name: str):
+        """Start a background refill unless one is running or ran recently"""
+        task = self._refills.get(server_name)
+        if task is not None and not task.done():
+            return
+        if time.monotonic() - self._last_refill.get(server_name, 0.0) < REFILL_BACKOFF:
+            return
 
-            self.processes[server_name] = process
-
-            # Send initialize request
-            init_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {
-                        "name": "bi-chat-client",
-                        "version": "1.0.0"
-                    }
-                }
-            }
-
-            # Write to stdin
-            process.stdin.write(json.dumps(init_request) + "\n")
-            process.stdin.flush()
-
-            # Read response (with timeout)
+        async def refill():
             try:
-                response_line = await asyncio.wait_for(
-                    asyncio.to_thread(process.stdout.readline),
-                    timeout=5.0
-                )
-                response = json.loads(response_line)
-                logger.info(f"Connected to {server_name}: {response}")
-
-                # List tools
-                list_tools_request = {
-                    "jsonrpc": "2.0",
-                    "id": 2,
-                    "method": "tools/list",
-                    "params": {}
-                }
-
-                process.stdin.write(json.dumps(list_tools_request) + "\n")
-                process.stdin.flush()
-
-                tools_response_line = await asyncio.wait_for(
-                    asyncio.to_thread(process.stdout.readline),
-                    timeout=5.0
-                )
-                tools_response = json.loads(tools_response_line)
-
-                if "result" in tools_response:
-                    self.tools_cache[server_name] = tools_response["result"].get("tools", [])
-                    logger.info(f"Loaded {len(self.tools_cache[server_name])} tools from {server_name}")
-
-                return True
-
-            except asyncio.TimeoutError:
-                logger.error(f"Timeout connecting to {server_name}")
-                process.kill()
-                return False
+                await self._refill(server_name)
+            except Exception as e:
+                logger.error(f"Refilling {server_name} pool failed: {e!r}")
 
-        except Exception as e:
-            logger.error(f"Failed to connect to {server_name}: {e}")
-            return False
+        self._refills[server_name] = asyncio.create_task(refill())
+
+    async def _refill(self, server_name: str) -> List[MCPStdioConnection]:
+        """
+        Replace dead processes so the pool is back to pool_size
+
+        The pool list is updated in place under the server's lock, so
+        concurrent refills neither overspawn nor drop each other's processes.
+
+        Returns:
+            Live connections after the refill
+
+        Raises:
+            Exception: The first start error, if no process is alive afterwards
+        """
+        async with self._locks[server_name]:
+            self._last_refill[server_name] = time.monotonic()
+            pool = self.pools[server_name]
+            alive = [c for c in pool if c.alive]
+            dead = [c for c in pool if not c.alive]
+            missing = self.pool_size - len(alive)
+
+            connections = [MCPStdioConnection(server_name, self.server_paths[server_name]) for _ in range(missing)]
+            try:
+                results = await asyncio.gather(*(c.start() for c in connections), return_exceptions=True)
+            except BaseException:
+                # Cancelled (e.g. by disconnect_all) - don't leave half-started processes behind
+                await asyncio.gather(*(c.close() for c in connections), return_exceptions=True)
+                raise
+
+            errors = []
+            for connection, result in zip(connections, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to restart {server_name}: {result!r}")
+                    errors.append(result)
+                    await connection.close()
+                else:
+                    alive.append(connection)
+
+            for connection in dead:
+                await connection.close()
+            pool[:] = alive
+
+            if connections:
+                logger.info(f"Refilled {server_name}: {len(alive)}/{self.pool_size} processes")
+            if not alive:
+                raise errors[0] if errors else ConnectionError(f"Server {server_name} is not running")
+            return list(alive)
 
     async def call_tool(
         self,
         server_name: str,
         tool_name: str,
-        arguments: Dict[str, Any]
+        arguments: Dict[str, Any],
+        timeout: float = CALL_TIMEOUT
     ) -> Any:
         """Call a tool on an MCP server"""
-        if server_name not in self.processes:
+        if server_name not in self.pools:
             raise ValueError(f"Server {server_name} not connected")
 
-        process = self.processes[server_name]
-
         try:
-            request = {
-                "jsonrpc": "2.0",
-                "id": 3,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                }
-            }
-
-            process.stdin.write(json.dumps(request) + "\n")
-            process.stdin.flush()
-
-            response_line = await asyncio.wait_for(
-                asyncio.to_thread(process.stdout.readline),
-                timeout=10.0
+            connection = await self._acquire(server_name)
+            result = await connection.request(
+                "tools/call",
+                {"name": tool_name, "arguments": arguments},
+                timeout=timeout
             )
-            response = json.loads(response_line)
-
-            if "result" in response:
-                return response["result"].get("content", [{}])[0].get("text", "")
-            else:
-                logger.error(f"Error calling {tool_name}: {response.get('error')}")
-                return None
+            return result.get("content", [{}])[0].get("text", "")
 
+        except RuntimeError as e:
+            logger.error(f"Error calling {tool_name}: {e}")
+            return None
         except Exception as e:
-            logger.error(f"Error calling {tool_name} on {server_name}: {e}")
+            logger.error(f"Error calling {tool_name} on {server_name}: {e!r}")
             raise
 
     def get_available_tools(self, server_name: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
@@ -143,19 +349,23 @@ class SimpleMCPClient:
             return {server_name: self.tools_cache.get(server_name, [])}
         return self.tools_cache
 
+    def connected_servers(self) -> List[str]:
+        """Servers with at least one live process"""
+        return [name for name, pool in self.pools.items() if any(c.alive for c in pool)]
+
     async def disconnect_all(self):
         """Disconnect from all servers"""
-        for server_name, process in self.processes.items():
+        for task in self._refills.values():
+            task.cancel()
+        self._refills.clear()
+
+        for server_name, pool in self.pools.items():
             try:
-                process.terminate()
-                process.wait(timeout=3)
+                await asyncio.gather(*(c.close() for c in pool))
                 logger.info(f"Disconnected from {server_name}")
             except Exception as e:
                 logger.error(f"Error disconnecting from {server_name}: {e}")
-                try:
-                    process.kill()
-                except:
-                    pass
+        self.pools.clear()
 
 
 class SimpleMCPClientManager:
@@ -170,12 +380,12 @@ class SimpleMCPClientManager:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    async def initialize(self, base_path: Path):
+    async def initialize(self, base_path: Path, pool_size: int = DEFAULT_POOL_SIZE):
         """Initialize MCP client and connect to servers"""
         if self._initialized:
             return
 
-        self._client = SimpleMCPClient()
+        self._client = SimpleMCPClient(pool_size=pool_size)
 
         # Define server paths
         servers = {
@@ -2,16 +2,22 @@
 """
 Reasoning Orchestrator
 Coordinates AI model calls with MCP tool usage
+
+One pooled HTTP client (HTTP/2 when h2 is installed) is kept alive across
+requests, independent tool calls from a planning pass run concurrently, and
+tool results are cached briefly by server, tool and normalized arguments.
 """
 
 import json
+import time
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional, AsyncIterator
 from dataclasses import dataclass
 
 import httpx
 
-from mcp_client import MCPClient
+from mcp_client_simple import SimpleMCPClient
 from prompts.reasoning_prompts import (
     get_system_prompt,
     get_builder_context_prompt,
@@ -20,6 +26,18 @@ from prompts.reasoning_prompts import (
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_TIMEOUT = 120.0
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=120.0)
+
+TOOL_CACHE_TTL = 60.0      # Seconds a tool result stays fresh
+TOOL_CACHE_MAX_ENTRIES = 256
+
 
 @dataclass
 class ReasoningConfig:
@@ -32,10 +50,13 @@ class ReasoningConfig:
 class ReasoningOrchestrator:
     """Orchestrates AI reasoning with MCP tool access"""
 
-    def __init__(self, openrouter_api_key: str, mcp_client: MCPClient):
+    def __init__(self, openrouter_api_key: str, mcp_client: Optional[SimpleMCPClient], metrics: Any = None):
         self.api_key = openrouter_api_key
         self.mcp_client = mcp_client
+        self.metrics = metrics  # Optional server_metrics registry (tool cache hit rate)
         self.base_url = "https://openrouter.ai/api/v1"
+        self._http: Optional[httpx.AsyncClient] = None
+        self._tool_cache: Dict[tuple, tuple] = {}  # key -> (expires_at, result)
 
         # Model mappings
         self.model_map = {
@@ -51,6 +72,28 @@ class ReasoningOrchestrator:
             "deepseek": "deepseek/deepseek-chat"
         }
 
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared pooled client (created on first use, reused across requests)"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                timeout=HTTP_TIMEOUT,
+                limits=HTTP_LIMITS,
+                http2=HTTP2_AVAILABLE
+            )
+        return self._http
+
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     async def reason(
         self,
         query: str,
@@ -90,43 +133,38 @@ class ReasoningOrchestrator:
     ) -> AsyncIterator[str]:
         """Single-pass reasoning with streaming"""
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            try:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": model_id,
-                        "messages": messages,
-                        "temperature": config.temperature,
-                        "max_tokens": config.max_tokens,
-                        "stream": True
-                    }
-                ) as response:
-                    response.raise_for_status()
-
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data = line[6:]
-                            if data == "[DONE]":
-                                break
-
-                            try:
-                                chunk = json.loads(data)
-                                if "choices" in chunk and len(chunk["choices"]) > 0:
-                                    delta = chunk["choices"][0].get("delta", {})
-                                    if "content" in delta:
-                                        yield delta["content"]
-                            except json.JSONDecodeError:
-                                continue
-
-            except Exception as e:
-                logger.error(f"Error in single-pass reasoning: {e}")
-                yield f"\n\n[Error: {str(e)}]"
+        try:
+            async with self.http.stream(
+                "POST",
+                "/chat/completions",
+                json={
+                    "model": model_id,
+                    "messages": messages,
+                    "temperature": config.temperature,
+                    "max_tokens": config.max_tokens,
+                    "stream": True
+                }
+            ) as response:
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data = line[6:]
+                        if data == "[DONE]":
+                            break
+
+                        try:
+                            chunk = json.loads(data)
+                            if "choices" in chunk and len(chunk["choices"]) > 0:
+                                delta = chunk["choices"][0].get("delta", {})
+                                if "content" in delta:
+                                    yield delta["content"]
+                        except json.JSONDecodeError:
+                            continue
+
+        except Exception as e:
+            logger.error(f"Error in single-pass reasoning: {e}")
+            yield f"\n\n[Error: {str(e)}]"
 
     async def _multi_pass_reasoning(
         self,
@@ -168,18 +206,8 @@ Then proceed with the analysis."""
         tool_calls = self._parse_tool_calls_from_plan(plan_response)
 
         if tool_calls and self.mcp_client:
-            # Execute MCP tool calls silently
-            tool_results = {}
-            for i, tool_call in enumerate(tool_calls, 1):
-                try:
-                    result = await self.mcp_client.call_tool(
-                        tool_call["server"],
-                        tool_call["tool"],
-                        tool_call["args"]
-                    )
-                    tool_results[f"{tool_call['server']}.{tool_call['tool']}"] = result
-                except Exception as e:
-                    logger.error(f"Error calling {tool_call}: {e}")
+            # Execute MCP tool calls silently (concurrently - they are independent)
+            tool_results = await self._execute_tool_calls(tool_calls)
 
             # Pass 2: Reasoning with data
             reasoning_messages = messages.copy()
@@ -199,6 +227,41 @@ Now provide your comprehensive analysis using this data."""
             async for chunk in self._single_pass_reasoning(messages, model_id, config):
                 yield chunk
 
+    async def _execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run tool calls concurrently; results keyed server.tool in call order"""
+        results = await asyncio.gather(
+            *(self._call_tool_cached(call["server"], call["tool"], call["args"]) for call in tool_calls),
+            return_exceptions=True
+        )
+
+        tool_results = {}
+        for tool_call, result in zip(tool_calls, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error calling {tool_call}: {result}")
+                continue
+            tool_results[f"{tool_call['server']}.{tool_call['tool']}"] = result
+        return tool_results
+
+    async def _call_tool_cached(self, server: str, tool: str, args: Dict[str, Any]) -> Any:
+        """Call an MCP tool, reusing a result from the last TOOL_CACHE_TTL seconds"""
+        key = (server, tool, json.dumps(args, sort_keys=True, default=str))
+        now = time.monotonic()
+        cached = self._tool_cache.get(key)
+        hit = cached is not None and cached[0] > now
+        if self.metrics:
+            self.metrics.cache("tool_results", hit=hit)
+        if hit:
+            return cached[1]
+
+        result = await self.mcp_client.call_tool(server, tool, args)
+        if result is not None:
+            if len(self._tool_cache) >= TOOL_CACHE_MAX_ENTRIES:
+                self._tool_cache = {k: v for k, v in self._tool_cache.items() if v[0] > now}
+                if len(self._tool_cache) >= TOOL_CACHE_MAX_ENTRIES:
+                    self._tool_cache.pop(next(iter(self._tool_cache)))
+            self._tool_cache[key] = (now + TOOL_CACHE_TTL, result)
+        return result
+
     def _parse_tool_calls_from_plan(self, plan_text: str) -> List[Dict[str, Any]]:
         """Parse MCP tool calls from planning text"""
         # Simplified parsing - in production, use structured function calling
@@ -227,28 +290,23 @@ Now provide your comprehensive analysis using this data."""
         config: ReasoningConfig
     ) -> str:
         """Get non-streaming completion"""
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": model_id,
-                        "messages": messages,
-                        "temperature": config.temperature,
-                        "max_tokens": config.max_tokens,
-                        "stream": False
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            except Exception as e:
-                logger.error(f"Error getting completion: {e}")
-                return f"[Error: {str(e)}]"
+        try:
+            response = await self.http.post(
+                "/chat/completions",
+                json={
+                    "model": model_id,
+                    "messages": messages,
+                    "temperature": config.temperature,
+                    "max_tokens": config.max_tokens,
+                    "stream": False
+                }
+            )
+            response.raise_for_status()
+            result = response.json()
+            return result["choices"][0]["message"]["content"]
+        except Exception as e:
+            logger.error(f"Error getting completion: {e}")
+            return f"[Error: {str(e)}]"
 
     def _format_available_tools(self) -> str:
         """Format available MCP tools for context"""
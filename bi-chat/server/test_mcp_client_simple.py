@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Simple MCP Client Tests
+Runs MCPStdioConnection and SimpleMCPClient against a fake stdio MCP server:
+responses are routed by id when they arrive out of order, and dead processes
+are replaced up to pool_size without leaking any
+
+Usage:
+    python3 -m pytest bi-chat/server/test_mcp_client_simple.py -q
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import mcp_client_simple
+from mcp_client_simple import MCPStdioConnection, SimpleMCPClient
+
+FAKE_SERVER = '''
+import json, os, sys, threading, time
+
+write_lock = threading.Lock()
+
+def send(message):
+    with write_lock:
+        sys.stdout.write(json.dumps(message) + "\\n")
+        sys.stdout.flush()
+
+def handle(message):
+    method, params = message["method"], message.get("params", {})
+    if method == "initialize":
+        result = {"serverInfo": {"name": "fake"}}
+    elif method == "tools/list":
+        result = {"tools": [{"name": "sleep"}]}
+    else:
+        seconds = params["arguments"]["seconds"]
+        time.sleep(seconds)
+        result = {"content": [{"type": "text", "text": str(seconds)}]}
+    send({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+for line in sys.stdin:
+    message = json.loads(line)
+    if message.get("params", {}).get("name") == "exit":
+        os._exit(0)
+    if "id" in message:
+        threading.Thread(target=handle, args=(message,), daemon=True).start()
+'''
+
+
+def write_server(tmp_path) -> Path:
+    path = tmp_path / "fake_server.py"
+    path.write_text(FAKE_SERVER)
+    return path
+
+
+def test_responses_are_routed_by_id(tmp_path):
+    async def scenario():
+        connection = MCPStdioConnection("fake", write_server(tmp_path))
+        tools = await connection.start()
+        assert [tool["name"] for tool in tools] == ["sleep"]
+
+        finished = []
+
+        async def call(seconds):
+            result = await connection.request("tools/call", {"name": "sleep", "arguments": {"seconds": seconds}})
+            finished.append(seconds)
+            return result["content"][0]["text"]
+
+        start = time.monotonic()
+        results = await asyncio.gather(call(0.6), call(0.3), call(0.1))
+        elapsed = time.monotonic() - start
+        await connection.close()
+        return results, finished, elapsed
+
+    results, finished, elapsed = asyncio.run(scenario())
+    assert results == ["0.6", "0.3", "0.1"]
+    assert finished == [0.1, 0.3, 0.6]
+    assert elapsed < 1.0  # Concurrent on one process, not 1.0s in sequence
+
+
+def test_pending_requests_fail_when_server_exits(tmp_path):
+    async def scenario():
+        connection = MCPStdioConnection("fake", write_server(tmp_path))
+        await connection.start()
+        slow = asyncio.create_task(
+            connection.request("tools/call", {"name": "sleep", "arguments": {"seconds": 5}})
+        )
+        await asyncio.sleep(0.1)
+        await connection.notify("tools/call", {"name": "exit", "arguments": {}})
+        try:
+            await slow
+        except ConnectionError:
+            return "closed"
+        finally:
+            await connection.close()
+
+    assert asyncio.run(scenario()) == "closed"
+
+
+def count_starts(monkeypatch) -> list:
+    started = []
+    original = MCPStdioConnection.start
+
+    async def start(self, *args, **kwargs):
+        started.append(self)
+        return await original(self, *args, **kwargs)
+
+    monkeypatch.setattr(MCPStdioConnection, "start", start)
+    return started
+
+
+def test_concurrent_calls_respawn_dead_pool_once(tmp_path, monkeypatch):
+    started = count_starts(monkeypatch)
+
+    async def scenario():
+        client = SimpleMCPClient(pool_size=2)
+        assert await client.connect_server("fake", write_server(tmp_path))
+        for connection in client.pools["fake"]:
+            connection.process.kill()
+            await connection.process.wait()
+        await asyncio.sleep(0.1)
+
+        results = await asyncio.gather(*(
+            client.call_tool("fake", "sleep", {"seconds": 0.05}) for _ in range(5)
+        ))
+        pool = list(client.pools["fake"])
+        alive = [c.alive for c in pool]
+        leaked = [c for c in started if c not in pool and c.process.returncode is None]
+        await client.disconnect_all()
+        return results, alive, leaked
+
+    results, alive, leaked = asyncio.run(scenario())
+    assert results == ["0.05"] * 5
+    assert alive == [True, True]
+    assert len(started) == 4  # 2 at connect, 2 respawned - not one per caller
+    assert leaked == []
+
+
+def test_partially_dead_pool_is_refilled(tmp_path, monkeypatch):
+    monkeypatch.setattr(mcp_client_simple, "REFILL_BACKOFF", 0.0)
+
+    async def scenario():
+        client = SimpleMCPClient(pool_size=2)
+        assert await client.connect_server("fake", write_server(tmp_path))
+        dead = client.pools["fake"][0]
+        dead.process.kill()
+        await dead.process.wait()
+        await asyncio.sleep(0.1)
+
+        assert await client.call_tool("fake", "sleep", {"seconds": 0.01}) == "0.01"
+        await client._refills["fake"]
+        pool = list(client.pools["fake"])
+        alive = [c.alive for c in pool]
+        await client.disconnect_all()
+        return dead, pool, alive
+
+    dead, pool, alive = asyncio.run(scenario())
+    assert alive == [True, True]
+    assert dead not in pool
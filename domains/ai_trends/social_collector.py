@@ -18,12 +18,12 @@ sys.path.append(str(project_root))
 
 try:
     import praw
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 except ImportError:
     print("⚠️  Missing dependencies. Installing...")
-    os.system("pip install praw vaderSentiment")
+    os.system("pip install praw vaderSentiment")  # vaderSentiment is used by text_analytics
     import praw
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from scripts import text_analytics
 
 # Load environment
 load_dotenv(project_root / '.env')
@@ -36,7 +36,7 @@ class DomainSocialCollector:
         self.domain_path = Path(domain_path)
         self.config = self._load_config()
         self.reddit = self._init_reddit()
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self.sentiment_analyzer = text_analytics.get_sentiment_analyzer()
         
         # Directories
         self.social_dir = self.domain_path / 'social'
@@ -80,20 +80,11 @@ class DomainSocialCollector:
     
     def analyze_sentiment(self, text: str) -> Dict:
         """Analyze sentiment of text"""
-        scores = self.sentiment_analyzer.polarity_scores(text)
-        
-        # Classify sentiment
-        compound = scores['compound']
-        if compound >= 0.05:
-            sentiment = 'positive'
-        elif compound <= -0.05:
-            sentiment = 'negative'
-        else:
-            sentiment = 'neutral'
+        scores = text_analytics.score_sentiment(text)
         
         return {
-            'sentiment': sentiment,
-            'compound': compound,
+            'sentiment': scores['label'],
+            'compound': scores['compound'],
             'positive': scores['pos'],
             'negative': scores['neg'],
             'neutral': scores['neu']
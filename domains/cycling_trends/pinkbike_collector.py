@@ -2,39 +2,52 @@
 """
 Pinkbike Collector for Cycling Trends Domain
 Collects articles, reviews, field tests, and comments from Pinkbike.com
-Uses Browserbase to bypass bot protection
+Uses Browserbase to bypass bot protection; sessions are pooled and
+articles are extracted concurrently (see scripts/browser_pool.py)
 """
 
 import os
+import sys
 import json
-import time
 import re
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
-from browserbase import Browserbase
-from playwright.sync_api import sync_playwright
 
 # Load environment
 project_root = Path(__file__).parent.parent.parent
 load_dotenv(project_root / '.env')
 
+sys.path.append(str(project_root))
+from scripts.browser_pool import BrowserPool, run_with_pool, map_pages
+
 
 class PinkbikeCollector:
     """Collects content from Pinkbike.com using Browserbase"""
 
-    def __init__(self, domain_path: Path):
+    def __init__(self, domain_path: Path, backend: Optional[str] = None,
+                 sessions: int = 1, pages_per_session: int = 3):
         self.domain_path = Path(domain_path)
         self.config = self._load_config()
 
-        # Browserbase credentials
+        # Browserbase credentials (backend='local' uses a local Chromium instead)
         self.api_key = os.getenv('BROWSERBASE_API_KEY')
         self.project_id = os.getenv('BROWSERBASE_PROJECT_ID')
+        backend = backend or os.getenv('BROWSER_POOL_BACKEND') or 'browserbase'
 
-        if not self.api_key or not self.project_id:
+        if backend == 'browserbase' and (not self.api_key or not self.project_id):
             raise ValueError("Browserbase credentials not found in .env")
 
+        # Shared sessions, up to sessions x pages_per_session articles in flight;
+        # ~1 navigation every 2s per host replaces the fixed sleeps between articles
+        self.pool_kwargs = {
+            'backend': backend,
+            'sessions': sessions,
+            'pages_per_session': pages_per_session,
+            'per_host_rate': 0.5
+        }
+
         # Directories
         self.articles_dir = project_root / 'data' / 'pinkbike_articles'
         self.metadata_file = self.domain_path / 'pinkbike_articles.json'
@@ -52,21 +65,6 @@ class PinkbikeCollector:
                 return json.load(f)
         return {}
 
-    def create_browser_session(self):
-        """Create a Browserbase session"""
-        bb = Browserbase(api_key=self.api_key)
-        session = bb.sessions.create(project_id=self.project_id)
-        print(f"✅ Browserbase session created: {session.id}")
-        return bb, session.id
-
-    def close_browser_session(self, bb, session_id):
-        """Close Browserbase session"""
-        try:
-            bb.sessions.delete(session_id)
-            print(f"🧹 Session closed")
-        except:
-            pass
-
     def extract_article_urls(self, section_url: str, max_articles: int = 10) -> List[str]:
         """
         Extract article URLs from a Pinkbike section (news, reviews, field-test)
@@ -78,23 +76,20 @@ class PinkbikeCollector:
         Returns:
             List of article URLs
         """
+        return run_with_pool(self._extract_article_urls, section_url, max_articles,
+                             pool_kwargs=self.pool_kwargs)
+
+    async def _extract_article_urls(self, pool: BrowserPool, section_url: str, max_articles: int) -> List[str]:
+        """Article URLs from a section page (on a pooled page)"""
         print(f"\n🔍 Extracting article URLs from: {section_url}")
 
-        bb, session_id = self.create_browser_session()
         article_urls = []
 
         try:
-            with sync_playwright() as playwright:
-                browser = playwright.chromium.connect_over_cdp(
-                    f"wss://connect.browserbase.com?apiKey={self.api_key}&sessionId={session_id}"
-                )
-
-                context = browser.contexts[0]
-                page = context.pages[0]
-
+            async with pool.page() as page:
                 print(f"🔗 Navigating to: {section_url}")
-                page.goto(section_url, wait_until="domcontentloaded", timeout=60000)
-                time.sleep(3)
+                await pool.goto(page, section_url)
+                await page.wait_for_timeout(3000)
 
                 # Pinkbike article links are typically in article cards
                 # Look for article links in the main content area
@@ -108,10 +103,10 @@ class PinkbikeCollector:
 
                 for selector in article_selectors:
                     try:
-                        links = page.locator(selector).all()
+                        links = await page.locator(selector).all()
                         for link in links[:max_articles]:
                             try:
-                                href = link.get_attribute('href')
+                                href = await link.get_attribute('href')
                                 if href and '/news/' in href:
                                     # Make absolute URL
                                     if href.startswith('/'):
@@ -138,8 +133,6 @@ class PinkbikeCollector:
 
         except Exception as e:
             print(f"❌ Error extracting URLs: {e}")
-        finally:
-            self.close_browser_session(bb, session_id)
 
         return article_urls
 
@@ -153,6 +146,19 @@ class PinkbikeCollector:
         Returns:
             Dict with article data or None on failure
         """
+        return run_with_pool(self._extract_article_content, article_url, pool_kwargs=self.pool_kwargs)
+
+    def extract_articles(self, article_urls: List[str]) -> List[Optional[Dict]]:
+        """
+        Extract many articles concurrently over one set of pooled sessions
+
+        Returns:
+            Article dicts in input order (see extract_article_content)
+        """
+        return map_pages(self._extract_article_content, article_urls, **self.pool_kwargs)
+
+    async def _extract_article_content(self, pool: BrowserPool, article_url: str) -> Optional[Dict]:
+        """Scrape one article on a pooled page"""
         print(f"\n📰 Extracting article: {article_url}")
 
         # Generate article ID from URL
@@ -160,20 +166,11 @@ class PinkbikeCollector:
         if not article_id:
             article_id = re.sub(r'[^a-zA-Z0-9_-]', '_', article_url)[-50:]
 
-        bb, session_id = self.create_browser_session()
-
         try:
-            with sync_playwright() as playwright:
-                browser = playwright.chromium.connect_over_cdp(
-                    f"wss://connect.browserbase.com?apiKey={self.api_key}&sessionId={session_id}"
-                )
-
-                context = browser.contexts[0]
-                page = context.pages[0]
-
+            async with pool.page() as page:
                 print(f"  🔗 Loading article...")
-                page.goto(article_url, wait_until="domcontentloaded", timeout=60000)
-                time.sleep(3)
+                await pool.goto(page, article_url)
+                await page.wait_for_timeout(3000)
 
                 # Extract title
                 title = ""
@@ -182,7 +179,7 @@ class PinkbikeCollector:
                     try:
                         title_elem = page.locator(selector).first
                         if title_elem:
-                            title = title_elem.inner_text()
+                            title = await title_elem.inner_text()
                             if title:
                                 break
                     except:
@@ -200,7 +197,7 @@ class PinkbikeCollector:
                     try:
                         author_elem = page.locator(selector).first
                         if author_elem:
-                            author = author_elem.inner_text()
+                            author = await author_elem.inner_text()
                             if author:
                                 break
                     except:
@@ -213,7 +210,7 @@ class PinkbikeCollector:
                     try:
                         date_elem = page.locator(selector).first
                         if date_elem:
-                            publish_date = date_elem.get_attribute('datetime') or date_elem.inner_text()
+                            publish_date = await date_elem.get_attribute('datetime') or await date_elem.inner_text()
                             if publish_date:
                                 break
                     except:
@@ -224,9 +221,9 @@ class PinkbikeCollector:
                 tag_selectors = ['.tags a', '.categories a', 'a[href*="/tags/"]']
                 for selector in tag_selectors:
                     try:
-                        tag_elems = page.locator(selector).all()
+                        tag_elems = await page.locator(selector).all()
                         for tag_elem in tag_elems:
-                            tag_text = tag_elem.inner_text()
+                            tag_text = await tag_elem.inner_text()
                             if tag_text and tag_text not in tags:
                                 tags.append(tag_text.strip())
                     except:
@@ -245,7 +242,7 @@ class PinkbikeCollector:
                     try:
                         content_elem = page.locator(selector).first
                         if content_elem:
-                            content = content_elem.inner_text()
+                            content = await content_elem.inner_text()
                             if content and len(content) > 100:
                                 break
                     except:
@@ -254,8 +251,9 @@ class PinkbikeCollector:
                 if not content:
                     # Fallback: try to get all sections from blog-body
                     try:
-                        sections = page.locator('.blog-section .blog-section-inside').all()
-                        content = '\n\n'.join([s.inner_text() for s in sections if s.inner_text()])
+                        sections = await page.locator('.blog-section .blog-section-inside').all()
+                        section_texts = [await s.inner_text() for s in sections]
+                        content = '\n\n'.join([text for text in section_texts if text])
                     except:
                         content = ""
 
@@ -271,7 +269,7 @@ class PinkbikeCollector:
                     try:
                         bio_elem = page.locator(selector).first
                         if bio_elem:
-                            author_bio = bio_elem.inner_text()
+                            author_bio = await bio_elem.inner_text()
                             break
                     except:
                         continue
@@ -281,7 +279,7 @@ class PinkbikeCollector:
                     try:
                         role_elem = page.locator(selector).first
                         if role_elem:
-                            author_role = role_elem.inner_text()
+                            author_role = await role_elem.inner_text()
                             break
                     except:
                         continue
@@ -293,7 +291,7 @@ class PinkbikeCollector:
                     try:
                         view_elem = page.locator(selector).first
                         if view_elem:
-                            view_text = view_elem.inner_text() or view_elem.get_attribute('data-views') or "0"
+                            view_text = await view_elem.inner_text() or await view_elem.get_attribute('data-views') or "0"
                             # Parse views (handle K, M notation)
                             view_text = view_text.strip().replace(',', '').replace(' views', '')
                             if 'K' in view_text.upper():
@@ -316,7 +314,7 @@ class PinkbikeCollector:
                     try:
                         rating_elem = page.locator(selector).first
                         if rating_elem:
-                            rating_text = rating_elem.inner_text() or rating_elem.get_attribute('content') or ""
+                            rating_text = await rating_elem.inner_text() or await rating_elem.get_attribute('content') or ""
                             try:
                                 rating = float(rating_text.strip().split('/')[0])
                                 break
@@ -328,7 +326,7 @@ class PinkbikeCollector:
                 # Count images (Pinkbike uses .news-photo class)
                 image_count = 0
                 try:
-                    images = page.locator('.news-photo, .blog-body img').all()
+                    images = await page.locator('.news-photo, .blog-body img').all()
                     image_count = len(images)
                 except:
                     pass
@@ -336,7 +334,7 @@ class PinkbikeCollector:
                 # Count videos
                 video_count = 0
                 try:
-                    videos = page.locator('.blog-body video, .blog-body iframe[src*="youtube"], .blog-body iframe[src*="vimeo"]').all()
+                    videos = await page.locator('.blog-body video, .blog-body iframe[src*="youtube"], .blog-body iframe[src*="vimeo"]').all()
                     video_count = len(videos)
                 except:
                     pass
@@ -348,7 +346,7 @@ class PinkbikeCollector:
                     try:
                         update_elem = page.locator(selector).first
                         if update_elem:
-                            update_date = update_elem.get_attribute('datetime') or update_elem.inner_text()
+                            update_date = await update_elem.get_attribute('datetime') or await update_elem.inner_text()
                             if update_date and update_date != publish_date:
                                 break
                     except:
@@ -366,7 +364,7 @@ class PinkbikeCollector:
                         try:
                             share_elem = page.locator(selector).first
                             if share_elem:
-                                share_text = share_elem.inner_text() or share_elem.get_attribute(f'data-{platform}-shares') or "0"
+                                share_text = await share_elem.inner_text() or await share_elem.get_attribute(f'data-{platform}-shares') or "0"
                                 try:
                                     social_shares[platform] = int(share_text.strip().replace(',', ''))
                                 except:
@@ -388,9 +386,9 @@ class PinkbikeCollector:
                 ]
                 for selector in product_selectors:
                     try:
-                        product_elems = page.locator(selector).all()
+                        product_elems = await page.locator(selector).all()
                         for prod_elem in product_elems:
-                            prod_text = prod_elem.inner_text()
+                            prod_text = await prod_elem.inner_text()
                             if prod_text and prod_text not in products:
                                 products.append(prod_text.strip())
                     except:
@@ -399,8 +397,8 @@ class PinkbikeCollector:
                 # Scroll to load comments
                 print(f"  💬 Loading comments...")
                 try:
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    time.sleep(2)
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await page.wait_for_timeout(2000)
 
                     # Try to load more comments
                     for _ in range(3):
@@ -413,9 +411,9 @@ class PinkbikeCollector:
                             for selector in load_more_selectors:
                                 try:
                                     button = page.locator(selector).first
-                                    if button and button.is_visible(timeout=2000):
-                                        button.click()
-                                        time.sleep(2)
+                                    if button and await button.is_visible(timeout=2000):
+                                        await button.click()
+                                        await page.wait_for_timeout(2000)
                                         break
                                 except:
                                     continue
@@ -435,7 +433,7 @@ class PinkbikeCollector:
 
                 for selector in comment_selectors:
                     try:
-                        comment_elems = page.locator(selector).all()
+                        comment_elems = await page.locator(selector).all()
 
                         if len(comment_elems) > 0:
                             print(f"  💬 Found {len(comment_elems)} comment elements with selector: {selector}")
@@ -449,7 +447,7 @@ class PinkbikeCollector:
                                         try:
                                             auth_elem = comment_elem.locator(auth_sel).first
                                             if auth_elem:
-                                                comment_author = auth_elem.inner_text()
+                                                comment_author = await auth_elem.inner_text()
                                                 if comment_author:
                                                     break
                                         except:
@@ -460,7 +458,7 @@ class PinkbikeCollector:
                                     # Try to get all text from the comment, excluding nested replies
                                     try:
                                         # Get direct text content, excluding child comment containers
-                                        full_text = comment_elem.inner_text()
+                                        full_text = await comment_elem.inner_text()
                                         # Try to filter out author name if it's included
                                         if comment_author and comment_author in full_text:
                                             comment_text = full_text.replace(comment_author, '', 1).strip()
@@ -480,7 +478,7 @@ class PinkbikeCollector:
                                             try:
                                                 text_elem = comment_elem.locator(text_sel).first
                                                 if text_elem:
-                                                    comment_text = text_elem.inner_text()
+                                                    comment_text = await text_elem.inner_text()
                                                     if comment_text and len(comment_text) > 10:
                                                         break
                                             except:
@@ -499,7 +497,7 @@ class PinkbikeCollector:
                                         try:
                                             like_elem = comment_elem.locator(like_sel).first
                                             if like_elem:
-                                                like_text = like_elem.inner_text() or like_elem.get_attribute('data-votes') or "0"
+                                                like_text = await like_elem.inner_text() or await like_elem.get_attribute('data-votes') or "0"
                                                 # Parse likes (handle K, M notation)
                                                 like_text = like_text.strip().replace(',', '')
                                                 if 'K' in like_text.upper():
@@ -523,7 +521,7 @@ class PinkbikeCollector:
                                         try:
                                             time_elem = comment_elem.locator(time_sel).first
                                             if time_elem:
-                                                timestamp = time_elem.get_attribute('datetime') or time_elem.inner_text()
+                                                timestamp = await time_elem.get_attribute('datetime') or await time_elem.inner_text()
                                                 if timestamp:
                                                     break
                                         except:
@@ -601,8 +599,6 @@ class PinkbikeCollector:
                 'error': str(e),
                 'status': 'error'
             }
-        finally:
-            self.close_browser_session(bb, session_id)
 
     def save_article(self, article_data: Dict) -> Path:
         """Save article data to JSON file"""
@@ -626,30 +622,29 @@ class PinkbikeCollector:
         Returns:
             List of article data dictionaries
         """
+        return run_with_pool(self._collect_section, section_url, max_articles, pool_kwargs=self.pool_kwargs)
+
+    async def _collect_section(self, pool: BrowserPool, section_url: str, max_articles: int) -> List[Dict]:
+        """Section listing + concurrent article extraction on a shared pool"""
         print(f"\n{'='*70}")
         print(f"🚴 Collecting from: {section_url}")
         print(f"{'='*70}")
 
         # Step 1: Get article URLs
-        article_urls = self.extract_article_urls(section_url, max_articles)
+        article_urls = await self._extract_article_urls(pool, section_url, max_articles)
 
         if not article_urls:
             print("❌ No articles found")
             return []
 
-        # Step 2: Extract each article
-        articles = []
-        for i, url in enumerate(article_urls, 1):
-            print(f"\n[{i}/{len(article_urls)}]")
-            article_data = self.extract_article_content(url)
+        # Step 2: Extract articles concurrently (politeness via the pool's per-host rate)
+        results = await pool.map(self._extract_article_content, article_urls)
 
+        articles = []
+        for url, article_data in zip(article_urls, results):
             if article_data and article_data.get('status') == 'success':
                 self.save_article(article_data)
                 articles.append(article_data)
-
-                # Be respectful - add delay between requests
-                if i < len(article_urls):
-                    time.sleep(5)
             else:
                 print(f"  ⚠️  Skipped: {url}")
 
@@ -679,6 +674,11 @@ class PinkbikeCollector:
                 "https://www.pinkbike.com/news/"
             ]
 
+        return run_with_pool(self._collect_all, sections, max_articles_per_section,
+                             pool_kwargs=self.pool_kwargs)
+
+    async def _collect_all(self, pool: BrowserPool, sections: List[str], max_articles_per_section: int) -> Dict:
+        """All sections over one pool, so sessions are reused across sections"""
         all_articles = []
         stats = {
             'sections_processed': 0,
@@ -688,7 +688,7 @@ class PinkbikeCollector:
         }
 
         for section_url in sections:
-            articles = self.collect_section(section_url, max_articles_per_section)
+            articles = await self._collect_section(pool, section_url, max_articles_per_section)
 
             for article in articles:
                 if article.get('status') == 'success':
@@ -699,9 +699,6 @@ class PinkbikeCollector:
             all_articles.extend(articles)
             stats['sections_processed'] += 1
 
-            # Delay between sections
-            time.sleep(10)
-
         # Save metadata
         with open(self.metadata_file, 'w') as f:
             json.dump(all_articles, f, indent=2)
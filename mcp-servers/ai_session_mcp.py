@@ -15,6 +15,7 @@ from mcp.server.fastmcp import FastMCP
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from server_metrics import instrument_mcp
 
 from ai_session_logger_core import AISessionDB
 from ai_learning_extractor import LearningExtractor
@@ -29,6 +30,7 @@ mcp = FastMCP(
     "AI Session Logger",
     instructions="Access your coding history, learnings, patterns, and get personalized suggestions based on YOUR coding style."
 )
+instrument_mcp(mcp)
 
 # Initialize components
 db = AISessionDB()
@@ -192,27 +194,20 @@ def search_similar_problems(description: str, limit: int = 5) -> List[Dict[str,
         limit: Maximum results
 
     Returns:
-        Similar sessions with solutions
+        Similar sessions with solutions, most relevant first
     """
+    # Ranked sessions with their best-matching learnings, in one query
     similar_sessions = db.search_similar_sessions(description, limit=limit)
 
     results = []
     for session in similar_sessions:
-        session_dict = dict(session)
-
-        # Get learnings for this session
-        learnings = db.get_learnings(category=None, limit=50)
-        session_learnings = [
-            l for l in learnings
-            if l.get("session_id") == session_dict.get("session_id")
-        ]
-
         results.append({
-            "session_id": session_dict.get("session_id", ""),
-            "summary": session_dict.get("summary", ""),
-            "started_at": session_dict.get("started_at", ""),
-            "learnings": session_dict.get("learnings", ""),
-            "relevant_insights": [l.get("title") for l in session_learnings[:3]]
+            "session_id": session.get("session_id", ""),
+            "summary": session.get("summary", ""),
+            "started_at": session.get("started_at", ""),
+            "relevance": session.get("relevance"),
+            "learnings": session.get("learnings", ""),
+            "relevant_insights": session.get("relevant_insights", [])
         })
 
     return results
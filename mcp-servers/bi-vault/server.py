@@ -25,10 +25,9 @@ Provides semantic search and structured queries for:
 """
 
 import os
+import sys
 import json
 import logging
-import psycopg2
-import psycopg2.extras
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -36,6 +35,15 @@ from dotenv import load_dotenv
 
 from mcp.server.fastmcp import FastMCP
 
+sys.path.insert(0, '/Users/yourox/AI-Workspace/scripts')
+from artifact_store import open_existing_store, iter_artifacts
+from query_engine import Collection, Text, Match, Equals, AtLeast
+from server_metrics import instrument_mcp
+from lazy_loading import LazyResource, lazy_import, warm_up_in_background
+
+# Deferred so the handshake and list_tools do not wait on the driver
+psycopg2 = lazy_import("psycopg2", "psycopg2.extras")
+
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 logger = logging.getLogger(__name__)
@@ -81,12 +89,33 @@ mcp = FastMCP(
 📖 Full Documentation: Check bi://guide resource for detailed query patterns
 """
 )
-
-# Data directories
-DATA_DIR = Path("/Users/yourox/AI-Workspace/data/business_insights")
-ENRICHED_DIR = Path("/Users/yourox/AI-Workspace/data/enriched_insights")
-SUMMARIES_DIR = Path("/Users/yourox/AI-Workspace/data/video_summaries")
-META_DIR = Path("/Users/yourox/AI-Workspace/data/meta_intelligence")
+instrument_mcp(mcp)
+
+# Data directories (AI_WORKSPACE_DATA_DIR points the server at another
+# snapshot, e.g. config/mcp_load_fixtures for the load test)
+DATA_ROOT = Path(os.getenv('AI_WORKSPACE_DATA_DIR', "/Users/yourox/AI-Workspace/data"))
+DATA_DIR = DATA_ROOT / "business_insights"
+ENRICHED_DIR = DATA_ROOT / "enriched_insights"
+SUMMARIES_DIR = DATA_ROOT / "video_summaries"
+META_DIR = DATA_ROOT / "meta_intelligence"
+ARTIFACT_DB = DATA_ROOT / "artifacts.db"
+
+# Fields the tools filter or sort on, indexed at load time per category
+FILTER_FIELDS = {
+    'products': ['category', 'sentiment'],
+    'problems': ['category', 'difficulty'],
+    'startup_ideas': ['target_market', 'business_model'],
+    'growth_tactics': ['channel'],
+    'ai_workflows': ['automation_level'],
+    'trends': ['category', 'stage'],
+    'quotes': ['category'],
+    'comment_insights': ['type'],
+    'yc_companies': ['batch', 'industry', 'status', 'isHiring', 'top_company'],
+}
+RANGE_FIELDS = {
+    'comment_insights': ['engagement'],
+    'top_validated_comments': ['likes'],
+}
 
 # Database connection
 DATABASE_URL = os.getenv('RAILWAY_DATABASE_URL')
@@ -99,6 +128,16 @@ def get_db_connection():
     return psycopg2.connect(DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor)
 
 
+def _average_score(row: dict) -> float:
+    """Mean of an insight's actionability, specificity and evidence scores"""
+    insight = row['insight'] if isinstance(row['insight'], dict) else {}
+    return (
+        insight.get('actionability_score', 0) +
+        insight.get('specificity_score', 0) +
+        insight.get('evidence_strength', 0)
+    ) / 3
+
+
 class BusinessIntelligenceDB:
     """In-memory business intelligence database with rich query capabilities"""
 
@@ -125,47 +164,62 @@ class BusinessIntelligenceDB:
             'video_summaries': [],  # Video-level summaries
         }
         self.meta_intelligence = {}  # Cross-video meta-intelligence
+        self.collections: Dict[str, Collection] = {}
+        self.insight_metrics: Optional[Collection] = None
         self.load_all_insights()
         self.load_yc_companies()
         self.load_enriched_data()
         self.load_video_summaries()
         self.load_meta_intelligence()
+        self.build_indexes()
+
+    def _iter_artifacts(self, kind: str, directory: Path, suffix: str):
+        """
+        Yield (artifact_id, data, source) for one artifact kind
+
+        Merges the consolidated artifact store with the per-file JSON layout,
+        so files that were never imported into the store are still loaded.
+        """
+        store = open_existing_store(ARTIFACT_DB)
+        try:
+            yield from iter_artifacts(kind, directory, suffix, store)
+        finally:
+            if store is not None:
+                store.close()
 
     def load_all_insights(self):
-        """Load all business intelligence JSON files"""
-        for file_path in DATA_DIR.glob("*_insights.json"):
+        """Load all business intelligence artifacts"""
+        for artifact_id, data, source in self._iter_artifacts("insights", DATA_DIR, "_insights.json"):
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    video_id = data.get('meta', {}).get('video_id', file_path.stem.replace('_insights', ''))
-
-                    # Add video metadata to each item
-                    meta = {
-                        'video_id': video_id,
-                        'video_title': data.get('meta', {}).get('title', ''),
-                        'source_file': str(file_path)
-                    }
-
-                    # Extract and categorize all data
-                    self._extract_products(data, meta)
-                    self._extract_problems(data, meta)
-                    self._extract_startup_ideas(data, meta)
-                    self._extract_growth_tactics(data, meta)
-                    self._extract_ai_workflows(data, meta)
-                    self._extract_target_markets(data, meta)
-                    self._extract_trends(data, meta)
-                    self._extract_strategies(data, meta)
-                    self._extract_metrics(data, meta)
-                    self._extract_quotes(data, meta)
-                    self._extract_statistics(data, meta)
-                    self._extract_mistakes(data, meta)
-                    self._extract_comment_insights(data, meta)
-                    self._extract_top_validated_comments(data, meta)
-                    self._extract_comment_derived_trends(data, meta)
-
-                    self.insights_files.append(file_path.name)
+                video_id = data.get('meta', {}).get('video_id', artifact_id)
+
+                # Add video metadata to each item
+                meta = {
+                    'video_id': video_id,
+                    'video_title': data.get('meta', {}).get('title', ''),
+                    'source_file': source
+                }
+
+                # Extract and categorize all data
+                self._extract_products(data, meta)
+                self._extract_problems(data, meta)
+                self._extract_startup_ideas(data, meta)
+                self._extract_growth_tactics(data, meta)
+                self._extract_ai_workflows(data, meta)
+                self._extract_target_markets(data, meta)
+                self._extract_trends(data, meta)
+                self._extract_strategies(data, meta)
+                self._extract_metrics(data, meta)
+                self._extract_quotes(data, meta)
+                self._extract_statistics(data, meta)
+                self._extract_mistakes(data, meta)
+                self._extract_comment_insights(data, meta)
+                self._extract_top_validated_comments(data, meta)
+                self._extract_comment_derived_trends(data, meta)
+
+                self.insights_files.append(f"{artifact_id}_insights.json")
             except Exception as e:
-                logger.error(f"Error loading {file_path}: {e}")
+                logger.error(f"Error loading {source}: {e}")
 
     def _extract_products(self, data: dict, meta: dict):
         """Extract products and tools"""
@@ -295,7 +349,7 @@ class BusinessIntelligenceDB:
 
     def _load_yc_companies_from_json(self):
         """Fallback: Load YC companies from JSON cache"""
-        yc_cache = Path("/Users/yourox/AI-Workspace/data/yc_companies/all_companies.json")
+        yc_cache = DATA_ROOT / "yc_companies" / "all_companies.json"
 
         if not yc_cache.exists():
             logger.warning("YC companies cache not found. Run: python3 scripts/yc_companies_extractor.py")
@@ -321,15 +375,10 @@ class BusinessIntelligenceDB:
             return
 
         count = 0
-        for file_path in ENRICHED_DIR.glob("*_enriched.json"):
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    data['source_file'] = str(file_path)
-                    self.all_data['enriched_insights'].append(data)
-                    count += 1
-            except Exception as e:
-                logger.error(f"Error loading enriched {file_path}: {e}")
+        for _, data, source in self._iter_artifacts("enriched", ENRICHED_DIR, "_enriched.json"):
+            data['source_file'] = source
+            self.all_data['enriched_insights'].append(data)
+            count += 1
 
         logger.info(f"Loaded {count} enriched insight files")
 
@@ -340,15 +389,10 @@ class BusinessIntelligenceDB:
             return
 
         count = 0
-        for file_path in SUMMARIES_DIR.glob("*_summary.json"):
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    data['source_file'] = str(file_path)
-                    self.all_data['video_summaries'].append(data)
-                    count += 1
-            except Exception as e:
-                logger.error(f"Error loading summary {file_path}: {e}")
+        for _, data, source in self._iter_artifacts("summary", SUMMARIES_DIR, "_summary.json"):
+            data['source_file'] = source
+            self.all_data['video_summaries'].append(data)
+            count += 1
 
         logger.info(f"Loaded {count} video summaries")
 
@@ -367,7 +411,36 @@ class BusinessIntelligenceDB:
         except Exception as e:
             logger.error(f"Error loading meta-intelligence: {e}")
 
-    def search(self, query: str, category: str, filters: dict = None) -> List[dict]:
+    def build_indexes(self):
+        """Build text, filter and sort indexes for every category"""
+        for category, items in self.all_data.items():
+            self.collections[category] = Collection(
+                items,
+                fields=FILTER_FIELDS.get(category, ()),
+                ranges=RANGE_FIELDS.get(category, ()),
+            )
+
+        # Per-insight rows across all enriched files, for score-ranked lookups
+        rows = []
+        for enriched in self.all_data['enriched_insights']:
+            for category, insights in enriched.get('insight_metrics', {}).items():
+                if not isinstance(insights, list):
+                    continue
+                for insight in insights:
+                    rows.append({
+                        'video_id': enriched.get('video_id'),
+                        'video_title': enriched.get('video_title', ''),
+                        'category': category,
+                        'insight': insight
+                    })
+        self.insight_metrics = Collection(rows, text=False, keys={
+            'avg_score': _average_score,
+            'average_score': lambda row: round(_average_score(row), 1),
+        })
+
+        logger.info(f"Indexed {len(self.collections)} categories and {len(rows)} scored insights")
+
+    def search(self, query: str, category: str, filters: dict = None, limit: int = None) -> List[dict]:
         """
         Search across all data with optional filters
 
@@ -375,35 +448,13 @@ class BusinessIntelligenceDB:
             query: Search term (case-insensitive, partial match)
             category: Data category to search (products, problems, etc.)
             filters: Additional filters (e.g., {'sentiment': 'positive'})
+            limit: Maximum results (default: all)
         """
-        if category not in self.all_data:
+        collection = self.collections.get(category)
+        if collection is None:
             return []
 
-        items = self.all_data[category]
-        results = []
-
-        query_lower = query.lower() if query else ""
-
-        for item in items:
-            # Text search across all string fields
-            if query_lower:
-                item_text = json.dumps(item).lower()
-                if query_lower not in item_text:
-                    continue
-
-            # Apply filters
-            if filters:
-                match = True
-                for key, value in filters.items():
-                    if key in item and item[key] != value:
-                        match = False
-                        break
-                if not match:
-                    continue
-
-            results.append(item)
-
-        return results
+        return collection.find(Text(query), Match(filters), limit=limit)
 
     def get_stats(self) -> dict:
         """Get database statistics"""
@@ -432,10 +483,15 @@ class BusinessIntelligenceDB:
         }
 
 
-# Initialize database
-logger.info("Loading Business Intelligence Database...")
-db = BusinessIntelligenceDB()
-logger.info(f"Loaded {len(db.insights_files)} files with {sum(len(v) for v in db.all_data.values())} total insights")
+def load_database() -> BusinessIntelligenceDB:
+    """Load every snapshot and build the indexes"""
+    database = BusinessIntelligenceDB()
+    logger.info(f"Loaded {len(database.insights_files)} files with {sum(len(v) for v in database.all_data.values())} total insights")
+    return database
+
+
+# Database loads on first use (or in the background once the server is up)
+db = LazyResource(load_database, "Business Intelligence Database")
 
 
 # Resources
@@ -1174,7 +1230,7 @@ def search_products(query: str, category: str = "all", sentiment: str = "all", l
     if sentiment != "all":
         filters["sentiment"] = sentiment
 
-    results = db.search(query, "products", filters)[:limit]
+    results = db.search(query, "products", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1201,7 +1257,7 @@ def search_problems(query: str, category: str = "all", difficulty: str = "all",
     if difficulty != "all":
         filters["difficulty"] = difficulty
 
-    results = db.search(query, "problems", filters)[:limit]
+    results = db.search(query, "problems", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1228,7 +1284,7 @@ def search_startup_ideas(query: str, target_market: str = None, business_model:
     if business_model:
         filters["business_model"] = business_model
 
-    results = db.search(query, "startup_ideas", filters)[:limit]
+    results = db.search(query, "startup_ideas", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1252,7 +1308,7 @@ def search_growth_tactics(query: str, channel: str = "all", limit: int = 20) ->
     if channel != "all":
         filters["channel"] = channel
 
-    results = db.search(query, "growth_tactics", filters)[:limit]
+    results = db.search(query, "growth_tactics", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1276,7 +1332,7 @@ def search_ai_workflows(query: str, automation_level: str = "all", limit: int =
     if automation_level != "all":
         filters["automation_level"] = automation_level
 
-    results = db.search(query, "ai_workflows", filters)[:limit]
+    results = db.search(query, "ai_workflows", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1295,7 +1351,7 @@ def search_target_markets(query: str, limit: int = 20) -> str:
         query: Market search term
         limit: Maximum results (default: 20)
     """
-    results = db.search(query, "target_markets", {})[:limit]
+    results = db.search(query, "target_markets", {}, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1321,7 +1377,7 @@ def search_trends(query: str, category: str = "all", stage: str = "all", limit:
     if stage != "all":
         filters["stage"] = stage
 
-    results = db.search(query, "trends", filters)[:limit]
+    results = db.search(query, "trends", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1349,13 +1405,13 @@ def search_comment_insights(query: str, insight_type: str = "all", min_engagemen
     if insight_type != "all":
         filters["type"] = insight_type
 
-    results = db.search(query, "comment_insights", filters)
+    predicates = [Text(query), Match(filters)]
 
     # Filter by engagement
     if min_engagement > 0:
-        results = [r for r in results if r.get('engagement', 0) >= min_engagement]
+        predicates.append(AtLeast('engagement', min_engagement))
 
-    results = results[:limit]
+    results = db.collections['comment_insights'].find(*predicates, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1378,11 +1434,10 @@ def search_validated_comments(query: str = "", min_likes: int = 10000, limit: in
     Returns:
         JSON with high-engagement comments and their business insights
     """
-    results = db.search(query, "top_validated_comments", {})
-
-    # Filter by likes
-    results = [r for r in results if r.get('likes', 0) >= min_likes]
-    results = sorted(results, key=lambda x: x.get('likes', 0), reverse=True)[:limit]
+    # Filter by likes, highest first
+    results = db.collections['top_validated_comments'].find(
+        Text(query), AtLeast('likes', min_likes), order_by='likes', limit=limit
+    )
 
     return json.dumps({
         "query": query,
@@ -1404,7 +1459,7 @@ def search_comment_trends(query: str = "", limit: int = 20) -> str:
     Returns:
         JSON with comment-derived trends and business implications
     """
-    results = db.search(query, "comment_derived_trends", {})[:limit]
+    results = db.search(query, "comment_derived_trends", {}, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1426,11 +1481,11 @@ def get_user_problems_from_comments(min_engagement: int = 1000, limit: int = 20)
         JSON with problem-type comment insights sorted by engagement
     """
     filters = {"type": "problem"}
-    results = db.search("", "comment_insights", filters)
 
     # Filter and sort by engagement
-    results = [r for r in results if r.get('engagement', 0) >= min_engagement]
-    results = sorted(results, key=lambda x: x.get('engagement', 0), reverse=True)[:limit]
+    results = db.collections['comment_insights'].find(
+        Match(filters), AtLeast('engagement', min_engagement), order_by='engagement', limit=limit
+    )
 
     return json.dumps({
         "min_engagement": min_engagement,
@@ -1488,7 +1543,7 @@ def search_yc_companies(
     if top_company is not None:
         filters["top_company"] = top_company
 
-    results = db.search(query, "yc_companies", filters)[:limit]
+    results = db.search(query, "yc_companies", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -1519,25 +1574,18 @@ def search_enriched_insights(
     Returns:
         JSON with enriched insights matching filters
     """
-    results = []
-
-    for insight in db.all_data['enriched_insights']:
-        # Filter by video type
-        if video_type != "all" and insight.get('video_type') != video_type:
-            continue
-
-        # Filter by metrics
-        video_metrics = insight.get('video_level_metrics', {})
-        if video_metrics.get('avg_actionability_score', 0) < min_actionability:
-            continue
-        if video_metrics.get('avg_specificity_score', 0) < min_specificity:
-            continue
-        if video_metrics.get('avg_evidence_strength', 0) < min_evidence:
-            continue
+    # Filter by metrics
+    predicates = [
+        AtLeast(('video_level_metrics', 'avg_actionability_score'), min_actionability),
+        AtLeast(('video_level_metrics', 'avg_specificity_score'), min_specificity),
+        AtLeast(('video_level_metrics', 'avg_evidence_strength'), min_evidence),
+    ]
 
-        results.append(insight)
+    # Filter by video type
+    if video_type != "all":
+        predicates.append(Equals('video_type', video_type))
 
-    results = results[:limit]
+    results = db.collections['enriched_insights'].find(*predicates, limit=limit)
 
     return json.dumps({
         "filters": {
@@ -1568,47 +1616,19 @@ def get_high_value_insights(
     Returns:
         JSON with high-value insights sorted by score
     """
-    results = []
-
-    for enriched in db.all_data['enriched_insights']:
-        video_id = enriched.get('video_id')
-        video_title = enriched.get('video_title', '')
-
-        # Check all insight categories
-        for category, insights in enriched.get('insight_metrics', {}).items():
-            if not isinstance(insights, list):
-                continue
-
-            for insight in insights:
-                score_field = f"{metric_type}_score" if metric_type != "all" else None
-
-                if metric_type == "all":
-                    # Average of all metrics
-                    avg_score = (
-                        insight.get('actionability_score', 0) +
-                        insight.get('specificity_score', 0) +
-                        insight.get('evidence_strength', 0)
-                    ) / 3
-                    if avg_score >= min_score:
-                        results.append({
-                            'video_id': video_id,
-                            'video_title': video_title,
-                            'category': category,
-                            'insight': insight,
-                            'average_score': round(avg_score, 1)
-                        })
-                elif score_field and insight.get(score_field, 0) >= min_score:
-                    results.append({
-                        'video_id': video_id,
-                        'video_title': video_title,
-                        'category': category,
-                        'insight': insight,
-                        'score': insight.get(score_field, 0)
-                    })
-
-    # Sort by score
-    sort_key = 'average_score' if metric_type == "all" else 'score'
-    results = sorted(results, key=lambda x: x.get(sort_key, 0), reverse=True)[:limit]
+    # Insight rows across all enriched files are flattened and indexed at load
+    if metric_type == "all":
+        # Average of all metrics, sorted by the rounded average
+        rows = db.insight_metrics.find(
+            AtLeast('avg_score', min_score), order_by='average_score', limit=limit
+        )
+        results = [{**row, 'average_score': round(_average_score(row), 1)} for row in rows]
+    else:
+        score_field = ('insight', f"{metric_type}_score")
+        rows = db.insight_metrics.find(
+            AtLeast(score_field, min_score), order_by=score_field, limit=limit
+        )
+        results = [{**row, 'score': row['insight'].get(score_field[1], 0)} for row in rows]
 
     return json.dumps({
         "min_score": min_score,
@@ -1637,28 +1657,17 @@ def search_video_summaries(
     Returns:
         JSON with matching video summaries
     """
-    results = []
-    query_lower = query.lower()
+    predicates = [Text(query)]
 
-    for summary in db.all_data['video_summaries']:
-        # Filter by video type
-        content_profile = summary.get('content_profile', {})
-        if video_type != "all" and content_profile.get('video_type') != video_type:
-            continue
-
-        # Filter by experience level
-        if experience_level != "all" and content_profile.get('experience_level') != experience_level:
-            continue
+    # Filter by video type
+    if video_type != "all":
+        predicates.append(Equals(('content_profile', 'video_type'), video_type))
 
-        # Text search
-        if query:
-            summary_text = json.dumps(summary).lower()
-            if query_lower not in summary_text:
-                continue
-
-        results.append(summary)
+    # Filter by experience level
+    if experience_level != "all":
+        predicates.append(Equals(('content_profile', 'experience_level'), experience_level))
 
-    results = results[:limit]
+    results = db.collections['video_summaries'].find(*predicates, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -2034,4 +2043,5 @@ def get_video_transcript(video_id: str) -> str:
 if __name__ == "__main__":
     logger.info("Starting BI-Vault MCP Server - The Intelligence Vault")
     logger.info(f"Database: {DATA_DIR} (read-only mode)")
+    warm_up_in_background(db)
     mcp.run(transport="stdio")
@@ -13,6 +13,7 @@ Provides semantic search and structured queries for:
 - Trends & Signals (104+)
 """
 
+import sys
 import json
 import logging
 from pathlib import Path
@@ -21,6 +22,9 @@ from datetime import datetime
 
 from mcp.server.fastmcp import FastMCP
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from server_metrics import instrument_mcp
+
 logger = logging.getLogger(__name__)
 if not logger.handlers:
     logging.basicConfig(level="INFO")
@@ -30,6 +34,7 @@ mcp = FastMCP(
     "Business Intelligence",
     instructions="Query-only access to YouTube/BI knowledge insights. Read-only database."
 )
+instrument_mcp(mcp)
 
 # Data directories
 DATA_DIR = Path("/Users/yourox/AI-Workspace/data/business_insights")
@@ -19,7 +19,11 @@ from coding_history_core import (
 )
 from coding_history_capture import OutputCapture
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from coding_history_search import ChunkReader, HistorySearchIndex
+
 from mcp.server.fastmcp import FastMCP
+from server_metrics import instrument_mcp
 
 # Initialize MCP server
 mcp = FastMCP(
@@ -42,11 +46,14 @@ Use search_history() for your sessions, search_github_patterns() for elite code
 and get_best_practices() to learn from top repositories.
     """
 )
+instrument_mcp(mcp)
 
 # Initialize components
 db = CodingHistoryDB()
 compression = CompressionManager()
 config = CaptureConfig()
+reader = ChunkReader(fallback=compression.decompress_chunk)
+search_index = HistorySearchIndex(reader=reader)
 active_captures: Dict[str, OutputCapture] = {}
 
 
@@ -91,7 +98,7 @@ def get_recent_history() -> str:
             preview = ""
             if chunk['content_length'] < 100:
                 # Load small content directly
-                content = compression.decompress_chunk(chunk['compressed_path'])
+                content = reader.read(chunk['compressed_path'])
                 preview = content[:80].replace('\n', ' ')
             else:
                 preview = f"[{chunk['content_length']} bytes]"
@@ -126,6 +133,26 @@ def search_history(
     if hours_ago:
         start_time = datetime.now() - timedelta(hours=hours_ago)
 
+    # Indexed text comes back with each row - nothing to decompress.
+    # A large backlog is indexed in the background; scan the DB until then.
+    if search_index.sync_or_defer(db):
+        indexed = search_index.search(
+            query=query,
+            project_path=project_path,
+            output_type=output_type,
+            start_time=start_time,
+            limit=limit,
+            preview_chars=1000
+        )
+        return [
+            {
+                **chunk,
+                'content': chunk['content'][:1000],  # Limit content size
+                'content_truncated': chunk['text_length'] > 1000
+            }
+            for chunk in indexed
+        ]
+
     results = db.search_chunks(
         query=query,
         project_path=project_path,
@@ -138,7 +165,7 @@ def search_history(
     enriched_results = []
     for chunk in results:
         try:
-            content = compression.decompress_chunk(chunk['compressed_path'])
+            content = reader.read(chunk['compressed_path'])
             enriched_results.append({
                 **chunk,
                 'content': content[:1000],  # Limit content size
@@ -189,7 +216,7 @@ def get_session(session_id: str) -> Dict[str, Any]:
     # Load content for each chunk
     for chunk in chunks:
         try:
-            chunk['content'] = compression.decompress_chunk(chunk['compressed_path'])
+            chunk['content'] = reader.read(chunk['compressed_path'])
         except:
             chunk['content'] = "[Content unavailable]"
 
@@ -228,7 +255,7 @@ def get_errors(
 
     results = []
     for error in errors:
-        content = compression.decompress_chunk(error['compressed_path'])
+        content = reader.read(error['compressed_path'])
 
         error_info = {
             "timestamp": error['timestamp'],
@@ -251,7 +278,7 @@ def get_errors(
             cmd_row = cursor.fetchone()
             if cmd_row:
                 cmd_path = cmd_row[9]  # compressed_path column
-                error_info['command'] = compression.decompress_chunk(cmd_path)
+                error_info['command'] = reader.read(cmd_path)
 
         if with_solutions:
             # Look for similar errors that were resolved
@@ -413,6 +440,7 @@ def capture_command(
         active_captures[sid] = capture
 
     capture.capture_command(command)
+    search_index.sync_or_defer(db)
 
     return f"✅ Captured command in session {capture.session_id[:8]}..."
 
@@ -449,6 +477,7 @@ def capture_output(
         active_captures[sid] = capture
 
     capture.capture_output(content, output_type)
+    search_index.sync_or_defer(db)
 
     return f"✅ Captured {output_type} in session {capture.session_id[:8]}..."
 
@@ -582,5 +611,8 @@ def configure_capture(
 
 
 if __name__ == "__main__":
+    # Catch the search index up (chunks and session log) without delaying startup
+    search_index.sync_in_background(db)
+
     # Run with stdio transport for Claude Desktop/Cursor
     mcp.run(transport="stdio")
\ No newline at end of file
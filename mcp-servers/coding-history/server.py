@@ -18,8 +18,10 @@ from coding_history_core import (
     CodingHistoryDB, CompressionManager, CaptureConfig
 )
 from coding_history_capture import OutputCapture
+from coding_history_search import ChunkReader, HistorySearchIndex
 
 from mcp.server.fastmcp import FastMCP
+from server_metrics import instrument_mcp
 
 # Initialize MCP server
 mcp = FastMCP(
@@ -36,11 +38,14 @@ Use search_history() for general searches, get_session() for specific sessions,
 and toggle_capture() to control recording.
     """
 )
+instrument_mcp(mcp)
 
 # Initialize components
 db = CodingHistoryDB()
 compression = CompressionManager()
 config = CaptureConfig()
+reader = ChunkReader(fallback=compression.decompress_chunk)
+search_index = HistorySearchIndex(reader=reader)
 active_captures: Dict[str, OutputCapture] = {}
 
 
@@ -85,7 +90,7 @@ def get_recent_history() -> str:
             preview = ""
             if chunk['content_length'] < 100:
                 # Load small content directly
-                content = compression.decompress_chunk(chunk['compressed_path'])
+                content = reader.read(chunk['compressed_path'])
                 preview = content[:80].replace('\n', ' ')
             else:
                 preview = f"[{chunk['content_length']} bytes]"
@@ -120,6 +125,26 @@ def search_history(
     if hours_ago:
         start_time = datetime.now() - timedelta(hours=hours_ago)
 
+    # Indexed text comes back with each row - nothing to decompress.
+    # A large backlog is indexed in the background; scan the DB until then.
+    if search_index.sync_or_defer(db):
+        indexed = search_index.search(
+            query=query,
+            project_path=project_path,
+            output_type=output_type,
+            start_time=start_time,
+            limit=limit,
+            preview_chars=1000
+        )
+        return [
+            {
+                **chunk,
+                'content': chunk['content'][:1000],  # Limit content size
+                'content_truncated': chunk['text_length'] > 1000
+            }
+            for chunk in indexed
+        ]
+
     results = db.search_chunks(
         query=query,
         project_path=project_path,
@@ -132,7 +157,7 @@ def search_history(
     enriched_results = []
     for chunk in results:
         try:
-            content = compression.decompress_chunk(chunk['compressed_path'])
+            content = reader.read(chunk['compressed_path'])
             enriched_results.append({
                 **chunk,
                 'content': content[:1000],  # Limit content size
@@ -183,7 +208,7 @@ def get_session(session_id: str) -> Dict[str, Any]:
     # Load content for each chunk
     for chunk in chunks:
         try:
-            chunk['content'] = compression.decompress_chunk(chunk['compressed_path'])
+            chunk['content'] = reader.read(chunk['compressed_path'])
         except:
             chunk['content'] = "[Content unavailable]"
 
@@ -222,7 +247,7 @@ def get_errors(
 
     results = []
     for error in errors:
-        content = compression.decompress_chunk(error['compressed_path'])
+        content = reader.read(error['compressed_path'])
 
         error_info = {
             "timestamp": error['timestamp'],
@@ -245,7 +270,7 @@ def get_errors(
             cmd_row = cursor.fetchone()
             if cmd_row:
                 cmd_path = cmd_row[9]  # compressed_path column
-                error_info['command'] = compression.decompress_chunk(cmd_path)
+                error_info['command'] = reader.read(cmd_path)
 
         if with_solutions:
             # Look for similar errors that were resolved
@@ -407,6 +432,7 @@ def capture_command(
         active_captures[sid] = capture
 
     capture.capture_command(command)
+    search_index.sync_or_defer(db)
 
     return f"✅ Captured command in session {capture.session_id[:8]}..."
 
@@ -443,6 +469,7 @@ def capture_output(
         active_captures[sid] = capture
 
     capture.capture_output(content, output_type)
+    search_index.sync_or_defer(db)
 
     return f"✅ Captured {output_type} in session {capture.session_id[:8]}..."
 
@@ -576,5 +603,8 @@ def configure_capture(
 
 
 if __name__ == "__main__":
+    # Catch the search index up (chunks and session log) without delaying startup
+    search_index.sync_in_background(db)
+
     # Run with stdio transport for Claude Desktop/Cursor
     mcp.run(transport="stdio")
\ No newline at end of file
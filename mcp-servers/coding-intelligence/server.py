@@ -15,17 +15,24 @@ All powered by vector embeddings for semantic understanding.
 """
 
 import os
+import sys
 import json
 import logging
-import psycopg2
-import psycopg2.extras
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
 
 from mcp.server.fastmcp import FastMCP
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from server_metrics import instrument_mcp
+from lazy_loading import LazyResource, lazy_import, warm_up_in_background
+
+# Deferred so the handshake and list_tools do not wait on torch or the driver
+psycopg2 = lazy_import("psycopg2", "psycopg2.extras")
+sentence_transformers = lazy_import("sentence_transformers")
+
 # Load environment
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
@@ -47,20 +54,39 @@ Use this MCP to:
 
 All searches use semantic understanding, not just keywords."""
 )
+instrument_mcp(mcp)
 
 # Database connection
 DATABASE_URL = os.getenv('RAILWAY_DATABASE_URL')
 
-# Load embedding model (cached after first load)
-logger.info("Loading sentence-transformers model...")
-MODEL = SentenceTransformer('all-MiniLM-L6-v2')
-logger.info("Model loaded! (384 dimensions)")
+# Embedding model loads on first use (or in the background once the server is up)
+MODEL = LazyResource(
+    lambda: sentence_transformers.SentenceTransformer('all-MiniLM-L6-v2'),
+    "embedding model all-MiniLM-L6-v2"
+)
 
 def get_db_connection():
     """Get a database connection"""
     return psycopg2.connect(DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor)
 
 
+def check_database() -> str:
+    """Server version of the database (logs connectivity at warm-up)"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT version();")
+        version = cursor.fetchone()['version'].split(',')[0]
+        cursor.close()
+    finally:
+        conn.close()
+    logger.info(f"Connected to: {version}")
+    return version
+
+
+DATABASE_CHECK = LazyResource(check_database, "database connection check")
+
+
 def semantic_search(
     query: str,
     table: str,
@@ -694,23 +720,8 @@ if __name__ == "__main__":
     logger.info(f"Embedding Model: all-MiniLM-L6-v2 (384 dimensions)")
     logger.info(f"Search Type: Semantic Vector Search")
 
-    # Test connection
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT version();")
-        version = cursor.fetchone()['version']
-        logger.info(f"Connected to: {version.split(',')[0]}")
-
-        # Test embedding model
-        test_embedding = MODEL.encode("test query")
-        logger.info(f"Embedding model ready: {len(test_embedding)} dimensions")
-
-        cursor.close()
-        conn.close()
-    except Exception as e:
-        logger.error(f"Failed to initialize: {e}")
-        exit(1)
+    # Model and connection check run in the background so list_tools answers immediately
+    warm_up_in_background(MODEL, DATABASE_CHECK)
 
     logger.info("🚀 Coding Intelligence MCP Server ready!")
     mcp.run(transport="stdio")
@@ -11,6 +11,8 @@ Provides semantic search and structured queries for:
 - Field Test Results
 """
 
+import os
+import sys
 import json
 import logging
 from pathlib import Path
@@ -18,6 +20,11 @@ from typing import List, Dict, Any, Optional
 
 from mcp.server.fastmcp import FastMCP
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from query_engine import Collection, Text, Match
+from server_metrics import instrument_mcp
+from lazy_loading import LazyResource, warm_up_in_background
+
 logger = logging.getLogger(__name__)
 if not logger.handlers:
     logging.basicConfig(level="INFO")
@@ -27,9 +34,23 @@ mcp = FastMCP(
     "Cycling Intelligence",
     instructions="Query-only access to Pinkbike cycling insights. Read-only database."
 )
+instrument_mcp(mcp)
+
+# Data directory (AI_WORKSPACE_DATA_DIR points the server at another snapshot,
+# e.g. config/mcp_load_fixtures for the load test)
+DATA_ROOT = Path(os.getenv('AI_WORKSPACE_DATA_DIR', "/Users/yourox/AI-Workspace/data"))
+DATA_DIR = DATA_ROOT / "pinkbike_insights"
 
-# Data directory
-DATA_DIR = Path("/Users/yourox/AI-Workspace/data/pinkbike_insights")
+# Fields the tools filter on, indexed at load time per category
+FILTER_FIELDS = {
+    'bikes': ['category', 'sentiment'],
+    'components': ['category', 'sentiment'],
+    'tech_trends': ['adoption_stage'],
+    'market_trends': ['adoption_stage'],
+    'geometry_trends': ['adoption_stage'],
+    'field_tests': ['year'],
+    'reliability_issues': ['severity'],
+}
 
 
 class CyclingIntelligenceDB:
@@ -57,7 +78,9 @@ class CyclingIntelligenceDB:
             'product_launches': [],
             'brand_news': []
         }
+        self.collections: Dict[str, Collection] = {}
         self.load_all_insights()
+        self.build_indexes()
 
     def load_all_insights(self):
         """Load all cycling intelligence JSON files"""
@@ -178,36 +201,19 @@ class CyclingIntelligenceDB:
         for item in news:
             self.all_data['brand_news'].append({**item, **meta})
 
-    def search(self, query: str, category: str, filters: dict = None) -> List[dict]:
+    def build_indexes(self):
+        """Build the text and filter indexes for every category"""
+        for category, items in self.all_data.items():
+            self.collections[category] = Collection(items, fields=FILTER_FIELDS.get(category, ()))
+        logger.info(f"Indexed {len(self.collections)} categories")
+
+    def search(self, query: str, category: str, filters: dict = None, limit: int = None) -> List[dict]:
         """Search across all data with optional filters"""
-        if category not in self.all_data:
+        collection = self.collections.get(category)
+        if collection is None:
             return []
 
-        items = self.all_data[category]
-        results = []
-
-        query_lower = query.lower() if query else ""
-
-        for item in items:
-            # Text search
-            if query_lower:
-                item_text = json.dumps(item).lower()
-                if query_lower not in item_text:
-                    continue
-
-            # Apply filters
-            if filters:
-                match = True
-                for key, value in filters.items():
-                    if key in item and item[key] != value:
-                        match = False
-                        break
-                if not match:
-                    continue
-
-            results.append(item)
-
-        return results
+        return collection.find(Text(query), Match(filters), limit=limit)
 
     def get_stats(self) -> dict:
         """Get database statistics"""
@@ -235,10 +241,15 @@ class CyclingIntelligenceDB:
         }
 
 
-# Initialize database
-logger.info("Loading Cycling Intelligence Database...")
-db = CyclingIntelligenceDB()
-logger.info(f"Loaded {len(db.insights_files)} files with {sum(len(v) for v in db.all_data.values())} total insights")
+def load_database() -> CyclingIntelligenceDB:
+    """Load every snapshot and build the indexes"""
+    database = CyclingIntelligenceDB()
+    logger.info(f"Loaded {len(database.insights_files)} files with {sum(len(v) for v in database.all_data.values())} total insights")
+    return database
+
+
+# Database loads on first use (or in the background once the server is up)
+db = LazyResource(load_database, "Cycling Intelligence Database")
 
 
 # Resources
@@ -302,7 +313,7 @@ def search_mountain_bikes(query: str, category: str = "all", sentiment: str = "a
     if sentiment != "all":
         filters["sentiment"] = sentiment
 
-    results = db.search(query, "bikes", filters)[:limit]
+    results = db.search(query, "bikes", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -329,7 +340,7 @@ def search_components(query: str, category: str = "all", sentiment: str = "all",
     if sentiment != "all":
         filters["sentiment"] = sentiment
 
-    results = db.search(query, "components", filters)[:limit]
+    results = db.search(query, "components", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -356,16 +367,16 @@ def search_cycling_trends(query: str, trend_type: str = "all", stage: str = "all
 
     # Search across all trend types or specific
     if trend_type == "all":
-        tech = db.search(query, "tech_trends", filters)
-        market = db.search(query, "market_trends", filters)
-        geo = db.search(query, "geometry_trends", filters)
+        tech = db.search(query, "tech_trends", filters, limit=limit)
+        market = db.search(query, "market_trends", filters, limit=limit)
+        geo = db.search(query, "geometry_trends", filters, limit=limit)
         results = (tech + market + geo)[:limit]
     elif trend_type == "technology":
-        results = db.search(query, "tech_trends", filters)[:limit]
+        results = db.search(query, "tech_trends", filters, limit=limit)
     elif trend_type == "market":
-        results = db.search(query, "market_trends", filters)[:limit]
+        results = db.search(query, "market_trends", filters, limit=limit)
     elif trend_type == "geometry":
-        results = db.search(query, "geometry_trends", filters)[:limit]
+        results = db.search(query, "geometry_trends", filters, limit=limit)
     else:
         results = []
 
@@ -392,7 +403,7 @@ def search_field_tests(query: str = "", year: str = "all", limit: int = 20) -> s
     if year != "all":
         filters["year"] = year
 
-    results = db.search(query, "field_tests", filters)[:limit]
+    results = db.search(query, "field_tests", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -413,16 +424,16 @@ def search_gear_recommendations(query: str, rec_type: str = "all", limit: int =
         limit: Maximum results (default: 20)
     """
     if rec_type == "all":
-        editor = db.search(query, "editor_picks", {})
-        tests = db.search(query, "field_tests", {})
-        value = db.search(query, "value_picks", {})
+        editor = db.search(query, "editor_picks", {}, limit=limit)
+        tests = db.search(query, "field_tests", {}, limit=limit)
+        value = db.search(query, "value_picks", {}, limit=limit)
         results = (editor + tests + value)[:limit]
     elif rec_type == "editor-picks":
-        results = db.search(query, "editor_picks", {})[:limit]
+        results = db.search(query, "editor_picks", {}, limit=limit)
     elif rec_type == "field-tests":
-        results = db.search(query, "field_tests", {})[:limit]
+        results = db.search(query, "field_tests", {}, limit=limit)
     elif rec_type == "value-picks":
-        results = db.search(query, "value_picks", {})[:limit]
+        results = db.search(query, "value_picks", {}, limit=limit)
     else:
         results = []
 
@@ -443,7 +454,7 @@ def search_brand_perception(brand: str = "", limit: int = 10) -> str:
         brand: Brand name to search (optional)
         limit: Maximum results (default: 10)
     """
-    results = db.search(brand, "brand_perception", {})[:limit]
+    results = db.search(brand, "brand_perception", {}, limit=limit)
 
     return json.dumps({
         "brand": brand,
@@ -466,7 +477,7 @@ def search_reliability_issues(query: str = "", severity: str = "all", limit: int
     if severity != "all":
         filters["severity"] = severity
 
-    results = db.search(query, "reliability_issues", filters)[:limit]
+    results = db.search(query, "reliability_issues", filters, limit=limit)
 
     return json.dumps({
         "query": query,
@@ -488,4 +499,5 @@ def get_database_stats() -> str:
 if __name__ == "__main__":
     logger.info("Starting Cycling Intelligence MCP Server")
     logger.info(f"Database: {DATA_DIR} (read-only mode)")
+    warm_up_in_background(db)
     mcp.run(transport="stdio")
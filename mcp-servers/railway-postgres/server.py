@@ -21,16 +21,23 @@ For most use cases, prefer BI-Vault which provides safe, curated intelligence to
 """
 
 import os
+import sys
 import json
 import logging
-import psycopg2
-import psycopg2.extras
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 
 from mcp.server.fastmcp import FastMCP
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from server_metrics import instrument_mcp
+from lazy_loading import LazyResource, lazy_import, warm_up_in_background
+
+# Deferred so the handshake and list_tools do not wait on the driver
+psycopg2 = lazy_import("psycopg2", "psycopg2.extras")
+
 # Load environment
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
@@ -43,6 +50,7 @@ mcp = FastMCP(
     "Railway PostgreSQL",
     instructions="LOW-LEVEL DATABASE ACCESS: Direct SQL queries on Railway PostgreSQL. For curated intelligence, use BI-Vault. Read-only for safety."
 )
+instrument_mcp(mcp)
 
 # Database connection
 DATABASE_URL = os.getenv('RAILWAY_DATABASE_URL')
@@ -52,6 +60,23 @@ def get_db_connection():
     return psycopg2.connect(DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor)
 
 
+def check_database() -> str:
+    """Server version of the database (logs connectivity at warm-up)"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT version();")
+        version = cursor.fetchone()['version'].split(',')[0]
+        cursor.close()
+    finally:
+        conn.close()
+    logger.info(f"Connected to: {version}")
+    return version
+
+
+DATABASE_CHECK = LazyResource(check_database, "database connection check")
+
+
 # Resources
 @mcp.resource("railway://stats")
 def get_database_stats() -> str:
@@ -545,17 +570,7 @@ if __name__ == "__main__":
     logger.info("Starting Railway PostgreSQL MCP Server")
     logger.info(f"Database: Railway PostgreSQL (read-only mode)")
 
-    # Test connection
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT version();")
-        version = cursor.fetchone()['version']
-        logger.info(f"Connected to: {version.split(',')[0]}")
-        cursor.close()
-        conn.close()
-    except Exception as e:
-        logger.error(f"Failed to connect to database: {e}")
-        exit(1)
+    # Connection check runs in the background so list_tools answers immediately
+    warm_up_in_background(DATABASE_CHECK)
 
     mcp.run(transport="stdio")
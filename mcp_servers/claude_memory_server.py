@@ -16,6 +16,7 @@ from mcp.server.fastmcp import FastMCP
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from server_metrics import instrument_mcp
 
 from claude_memory_ultimate import UltimateMemorySystem
 from knowledge_pipeline import KnowledgePipeline
@@ -30,13 +31,21 @@ mcp = FastMCP(
     "Claude Knowledge",
     instructions="Provides unified access to persistent memory and curated knowledge base."
 )
+instrument_mcp(mcp)
 
 WORKSPACE = Path("/Users/yourox/AI-Workspace")
 PIPELINE = KnowledgePipeline(WORKSPACE)
 
 
+_memory_system = None
+
+
 def load_dual_memory() -> UltimateMemorySystem:
-    return UltimateMemorySystem()
+    # One instance per server: the log is replayed once, then kept current by appends
+    global _memory_system
+    if _memory_system is None:
+        _memory_system = UltimateMemorySystem()
+    return _memory_system
 
 
 def format_memory_context(limit: int = 15) -> str:
@@ -14,6 +14,7 @@ from mcp.server.fastmcp import FastMCP
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from server_metrics import instrument_mcp
 
 from coding_history_core import (
     CodingHistoryDB,
@@ -22,6 +23,7 @@ from coding_history_core import (
     SessionInfo,
     OutputChunk
 )
+from coding_history_search import ChunkReader
 
 logger = logging.getLogger(__name__)
 if not logger.handlers:
@@ -32,10 +34,12 @@ mcp = FastMCP(
     "Coding History",
     instructions="Access and search your terminal output history and coding sessions."
 )
+instrument_mcp(mcp)
 
 # Initialize components
 db = CodingHistoryDB()
 compression = CompressionManager()
+reader = ChunkReader(fallback=compression.decompress_chunk)  # Also decodes dictionary frames
 config = CaptureConfig()
 
 
@@ -152,7 +156,7 @@ def search_history(
     for i, chunk in enumerate(results):
         if i < 5:  # Decompress first 5 for detail
             try:
-                content = compression.decompress_chunk(chunk['compressed_path'])
+                content = reader.read(chunk['compressed_path'])
                 chunk['content_preview'] = content[:500] + ("..." if len(content) > 500 else "")
             except Exception as e:
                 chunk['content_preview'] = f"[Error decompressing: {e}]"
@@ -231,7 +235,7 @@ def get_error_patterns(project_path: Optional[str] = None, limit: int = 10) -> L
     for chunk in error_chunks:
         # Try to decompress and extract error type
         try:
-            content = compression.decompress_chunk(chunk['compressed_path'])
+            content = reader.read(chunk['compressed_path'])
             # Simple pattern extraction (can be enhanced)
             if "ModuleNotFoundError" in content:
                 error_type = "ModuleNotFoundError"
@@ -299,7 +303,7 @@ def export_session_history(
 
         for chunk in chunks[:100]:  # Limit decompression
             try:
-                content = compression.decompress_chunk(chunk['compressed_path'])
+                content = reader.read(chunk['compressed_path'])
                 chunk['content'] = content
                 export_data['chunks'].append(chunk)
             except Exception as e:
@@ -330,7 +334,7 @@ def export_session_history(
                 lines.append(f"Exit Code: {chunk['exit_code']}")
 
             try:
-                content = compression.decompress_chunk(chunk['compressed_path'])
+                content = reader.read(chunk['compressed_path'])
                 lines.append("-" * 40)
                 lines.append(content[:500] + ("..." if len(content) > 500 else ""))
                 lines.append("-" * 40)
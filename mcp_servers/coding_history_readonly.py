@@ -5,6 +5,7 @@ Secure: Only queries database, NEVER writes
 Claude Desktop can only READ your coding history
 """
 
+import sys
 import json
 import logging
 import sqlite3
@@ -14,6 +15,10 @@ from typing import Any, Dict, List
 
 from mcp.server.fastmcp import FastMCP
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from coding_history_search import search_session_log
+from server_metrics import instrument_mcp
+
 logger = logging.getLogger(__name__)
 if not logger.handlers:
     logging.basicConfig(level="INFO")
@@ -23,6 +28,7 @@ mcp = FastMCP(
     "Coding History (Read-Only)",
     instructions="Query-only access to coding history. No write permissions."
 )
+instrument_mcp(mcp)
 
 DB_PATH = Path.home() / "AI-Workspace" / ".coding_history.db"
 
@@ -124,27 +130,34 @@ def search_history(query: str = None, hours_ago: int = None, limit: int = 20) ->
         conn = get_connection()
         cursor = conn.cursor()
 
-        sql = 'SELECT id, timestamp, command, prompt, outcome FROM sessions'
-        params = []
-        conditions = []
-
-        if query:
-            conditions.append('command LIKE ?')
-            params.append(f'%{query}%')
-
+        cutoff = None
         if hours_ago:
             cutoff = (datetime.now() - timedelta(hours=hours_ago)).isoformat()
-            conditions.append('timestamp > ?')
-            params.append(cutoff)
 
-        if conditions:
-            sql += ' WHERE ' + ' AND '.join(conditions)
+        # Trigram index sidecar (attached read-only) when it has been built
+        rows = search_session_log(conn, query, cutoff, limit)
 
-        sql += ' ORDER BY timestamp DESC LIMIT ?'
-        params.append(limit)
+        if rows is None:
+            sql = 'SELECT id, timestamp, command, prompt, outcome FROM sessions'
+            params = []
+            conditions = []
 
-        cursor.execute(sql, params)
-        rows = cursor.fetchall()
+            if query:
+                conditions.append('command LIKE ?')
+                params.append(f'%{query}%')
+
+            if cutoff:
+                conditions.append('timestamp > ?')
+                params.append(cutoff)
+
+            if conditions:
+                sql += ' WHERE ' + ' AND '.join(conditions)
+
+            sql += ' ORDER BY timestamp DESC LIMIT ?'
+            params.append(limit)
+
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
         conn.close()
 
         results = []
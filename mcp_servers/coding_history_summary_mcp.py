@@ -15,6 +15,7 @@ from mcp.server.fastmcp import FastMCP
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from server_metrics import instrument_mcp
 
 from coding_history_summary import SummaryDB, SessionSummary, queue_event
 
@@ -27,6 +28,7 @@ mcp = FastMCP(
     "Coding History Summaries",
     instructions="Access intelligent summaries of coding sessions, not raw terminal output."
 )
+instrument_mcp(mcp)
 
 # Initialize database
 db = SummaryDB()
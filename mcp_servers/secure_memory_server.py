@@ -14,6 +14,7 @@ from secure_memory import SecureMemorySystem, SecurityLevel
 from security_auditor import SecurityAuditor
 from knowledge_pipeline import KnowledgePipeline
 from mcp.server.fastmcp import FastMCP
+from server_metrics import instrument_mcp
 
 # Initialize secure MCP server
 mcp = FastMCP(
@@ -21,6 +22,7 @@ mcp = FastMCP(
     instructions="Provides secure access to classified persistent memory. "
     "Public memories auto-load. Private/confidential/secret require explicit access."
 )
+instrument_mcp(mcp)
 
 # Initialize secure memory system and auditor
 memory = SecureMemorySystem()
@@ -143,12 +145,10 @@ def get_secret(secret_name: str) -> str:
     Security: This tool provides explicit access to secrets.
     Only use when you need to retrieve sensitive credentials.
     """
-    secrets = memory.load_memories(SecurityLevel.SECRET)
     auditor.log_access("read", f"secret:{secret_name}", SecurityLevel.SECRET.value)
     
-    # Search for secret by name
-    query_lower = secret_name.lower()
-    matches = [s for s in secrets if query_lower in s['text'].lower()]
+    # Search for secret by name (explicit secret level only)
+    matches = memory.search_memories(secret_name, SecurityLevel.SECRET)
     
     if not matches:
         return f"🔐 No secret found matching '{secret_name}'"
@@ -5,6 +5,7 @@ Provides MCP-compliant access to YC company database
 """
 
 import json
+import sys
 import logging
 import os
 from pathlib import Path
@@ -14,6 +15,9 @@ from datetime import datetime
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from server_metrics import instrument_mcp
+
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / ".env")
 
@@ -26,6 +30,7 @@ mcp = FastMCP(
     "YC Companies",
     instructions="Access and search Y Combinator company data with 5,490+ companies from all YC batches."
 )
+instrument_mcp(mcp)
 
 # Supabase configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
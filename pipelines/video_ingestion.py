@@ -10,6 +10,11 @@ Usage:
     python3 video_ingestion.py --video-id "dQw4w9WgXcQ"
     python3 video_ingestion.py --video-url "https://youtube.com/watch?v=dQw4w9WgXcQ"
     python3 video_ingestion.py --batch-file "new_videos.txt"
+    python3 video_ingestion.py --from-queue          # drain the 'vector_ingest' stage
+
+Batches go through the 'vector_ingest' stage of the pipeline job queue
+(scripts/job_queue.py): an interrupted batch resumes where it stopped and
+failed videos are retried with backoff, then dead-lettered.
 """
 import os
 import sys
@@ -22,6 +27,7 @@ from dotenv import load_dotenv
 
 sys.path.append('/Users/yourox/AI-Workspace')
 from config.mem0_collections import get_mem0_config
+from scripts.job_queue import JobQueue, run_workers
 
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
@@ -214,31 +220,51 @@ class VideoIngestionPipeline:
             print(f"\n❌ Video ingestion failed: {video_id}")
             return False
 
-    def ingest_batch(self, video_ids):
+    def ingest_job(self, job):
+        """Queue handler for the 'vector_ingest' stage"""
+        if self.ingest_video(job.item_id):
+            return {'status': 'success'}
+        return {'status': 'error', 'error': 'ingestion failed'}
+
+    def ingest_batch(self, video_ids, workers=1, force=False):
         """
-        Ingest multiple videos
+        Ingest multiple videos through the job queue
 
         Args:
-            video_ids: List of YouTube video IDs
+            video_ids: List of YouTube video IDs (None = only what is already queued)
+            workers: Parallel ingestion workers
+            force: Re-ingest videos that were already ingested
 
         Returns:
             tuple: (success_count, failed_count)
         """
+        queue = JobQueue()
+        if video_ids:
+            queue.enqueue('vector_ingest', video_ids, reset=force)
+        # Only this batch; other runs' backlog stays with them (--from-queue takes all)
+        scope = list(video_ids) if video_ids else None
+        pending = queue.outstanding(['vector_ingest'], scope)
+
         print(f"\n{'='*60}")
-        print(f"BATCH INGESTION: {len(video_ids)} videos")
+        print(f"BATCH INGESTION: {pending} videos pending"
+              + (f" ({len(video_ids)} requested)" if video_ids else ""))
         print(f"{'='*60}\n")
 
-        success = 0
-        failed = 0
+        totals = run_workers(
+            queue,
+            {'vector_ingest': self.ingest_job},
+            max_workers=workers,
+            owner='vector_ingest',
+            item_ids=scope
+        )
+        queue.close()
 
-        for video_id in video_ids:
-            if self.ingest_video(video_id):
-                success += 1
-            else:
-                failed += 1
+        success = totals['done']
+        failed = totals['dead']
 
         print(f"\n{'='*60}")
-        print(f"BATCH COMPLETE: {success} succeeded, {failed} failed")
+        print(f"BATCH COMPLETE: {success} succeeded, {failed} failed"
+              + (f", {totals['retried']} retried" if totals['retried'] else ""))
         print(f"{'='*60}\n")
 
         return success, failed
@@ -248,6 +274,9 @@ def main():
     parser.add_argument('--video-id', help='Single YouTube video ID')
     parser.add_argument('--video-url', help='Single YouTube video URL')
     parser.add_argument('--batch-file', help='File with video IDs (one per line)')
+    parser.add_argument('--from-queue', action='store_true', help="Ingest videos queued in the 'vector_ingest' stage")
+    parser.add_argument('--workers', type=int, default=1, help='Parallel ingestion workers (batch/queue)')
+    parser.add_argument('--force', action='store_true', help='Re-ingest videos already ingested (batch)')
 
     args = parser.parse_args()
 
@@ -267,9 +296,11 @@ def main():
     elif args.batch_file:
         with open(args.batch_file, 'r') as f:
             video_ids = [line.strip() for line in f if line.strip()]
-        pipeline.ingest_batch(video_ids)
+        pipeline.ingest_batch(video_ids, workers=args.workers, force=args.force)
+    elif args.from_queue:
+        pipeline.ingest_batch(None, workers=args.workers)
     else:
-        print("❌ Please provide --video-id, --video-url, or --batch-file")
+        print("❌ Please provide --video-id, --video-url, --batch-file or --from-queue")
         parser.print_help()
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ AI Session Logger - Core Components
 SAFE: Read-only, no terminal hooks, passive monitoring
 """
 
+import re
 import sqlite3
 import json
 import hashlib
@@ -17,6 +18,33 @@ import threading
 BASE_DIR = Path("/Users/yourox/AI-Workspace/data/ai_sessions")
 BASE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Words too common to say anything about which problem a session solved
+SEARCH_STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'how',
+    'i', 'in', 'is', 'it', 'my', 'of', 'on', 'or', 'the', 'this', 'to', 'with'
+}
+MAX_SEARCH_TERMS = 32
+
+
+def build_match_query(description: str) -> Optional[str]:
+    """
+    Turn a free-text problem description into an FTS5 OR query
+
+    Args:
+        description: Problem description
+
+    Returns:
+        MATCH expression, or None if the description has no usable terms
+    """
+    terms = []
+    for word in re.findall(r'\w+', description.lower()):
+        if word in SEARCH_STOPWORDS or word in terms:
+            continue
+        terms.append(word)
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in terms[:MAX_SEARCH_TERMS])
+
 
 @dataclass
 class AISession:
@@ -78,6 +106,7 @@ class AISessionDB:
         self.lock = threading.RLock()
         self.conn = sqlite3.connect(db_path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self.fts_enabled = False
         self._init_db()
 
     def _init_db(self):
@@ -155,11 +184,75 @@ class AISessionDB:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_started ON sessions(started_at)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_learnings_category ON learnings(category)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_learnings_timestamp ON learnings(timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_learnings_session ON learnings(session_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_patterns_type ON patterns(pattern_type)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_interactions_session ON interactions(session_id)")
 
+            self.fts_enabled = self._init_fts(cursor)
+
             self.conn.commit()
 
+    def _init_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Full-text indexes over session summaries and learnings
+
+        External-content FTS5 tables kept in sync by triggers, so every
+        writer of sessions/learnings updates them. Existing rows are indexed
+        the first time the tables are created.
+
+        Returns:
+            False if this SQLite build has no FTS5 (LIKE search is used instead)
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE name IN ('sessions_fts', 'learnings_fts')")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS sessions_fts USING fts5(
+                    summary, content='sessions', tokenize='porter unicode61'
+                )
+            """)
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS learnings_fts USING fts5(
+                    title, description, content='learnings', tokenize='porter unicode61'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+
+        cursor.executescript("""
+            CREATE TRIGGER IF NOT EXISTS sessions_fts_insert AFTER INSERT ON sessions BEGIN
+                INSERT INTO sessions_fts(rowid, summary) VALUES (new.rowid, new.summary);
+            END;
+            CREATE TRIGGER IF NOT EXISTS sessions_fts_delete AFTER DELETE ON sessions BEGIN
+                INSERT INTO sessions_fts(sessions_fts, rowid, summary) VALUES ('delete', old.rowid, old.summary);
+            END;
+            CREATE TRIGGER IF NOT EXISTS sessions_fts_update AFTER UPDATE OF summary ON sessions BEGIN
+                INSERT INTO sessions_fts(sessions_fts, rowid, summary) VALUES ('delete', old.rowid, old.summary);
+                INSERT INTO sessions_fts(rowid, summary) VALUES (new.rowid, new.summary);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS learnings_fts_insert AFTER INSERT ON learnings BEGIN
+                INSERT INTO learnings_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS learnings_fts_delete AFTER DELETE ON learnings BEGIN
+                INSERT INTO learnings_fts(learnings_fts, rowid, title, description)
+                VALUES ('delete', old.rowid, old.title, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS learnings_fts_update AFTER UPDATE OF title, description ON learnings BEGIN
+                INSERT INTO learnings_fts(learnings_fts, rowid, title, description)
+                VALUES ('delete', old.rowid, old.title, old.description);
+                INSERT INTO learnings_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+            END;
+        """)
+
+        if 'sessions_fts' not in existing:
+            cursor.execute("INSERT INTO sessions_fts(sessions_fts) VALUES ('rebuild')")
+        if 'learnings_fts' not in existing:
+            cursor.execute("INSERT INTO learnings_fts(learnings_fts) VALUES ('rebuild')")
+
+        return True
+
     def create_session(self, session: AISession) -> str:
         """Create a new session"""
         with self.lock:
@@ -303,7 +396,83 @@ class AISessionDB:
     def search_similar_sessions(self,
                                  description: str,
                                  limit: int = 10) -> List[Dict]:
-        """Search for sessions with similar problems/solutions"""
+        """
+        Search for sessions with similar problems/solutions
+
+        One ranked query over the FTS indexes: BM25 scores of the session
+        summary and of each matching learning are summed per session, and
+        each result carries its best-matching learning titles.
+
+        Returns:
+            Session rows plus 'learnings' (all titles), 'relevance' (higher is
+            better) and 'relevant_insights' (up to 3 titles, best match first)
+        """
+        if not self.fts_enabled:
+            return self._search_similar_sessions_like(description, limit)
+
+        match = build_match_query(description)
+        if match is None:
+            return []
+
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                WITH learning_hits AS (
+                    SELECT l.rowid AS learning_rowid, l.session_id, bm25(learnings_fts) AS rank
+                    FROM learnings_fts
+                    JOIN learnings l ON l.rowid = learnings_fts.rowid
+                    WHERE learnings_fts MATCH :match
+                ),
+                session_hits AS (
+                    SELECT s.session_id, bm25(sessions_fts) AS rank
+                    FROM sessions_fts
+                    JOIN sessions s ON s.rowid = sessions_fts.rowid
+                    WHERE sessions_fts MATCH :match
+                ),
+                ranked AS (
+                    SELECT session_id, SUM(rank) AS rank
+                    FROM (
+                        SELECT session_id, rank FROM session_hits
+                        UNION ALL
+                        SELECT session_id, rank FROM learning_hits
+                    )
+                    GROUP BY session_id
+                    ORDER BY rank
+                    LIMIT :limit
+                ),
+                insights AS (
+                    SELECT l.session_id, l.title,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY l.session_id
+                               ORDER BY h.rank IS NULL, h.rank, l.timestamp DESC
+                           ) AS position
+                    FROM learnings l
+                    LEFT JOIN learning_hits h ON h.learning_rowid = l.rowid
+                    WHERE l.session_id IN (SELECT session_id FROM ranked)
+                )
+                SELECT s.*,
+                       ROUND(-r.rank, 4) AS relevance,
+                       (SELECT GROUP_CONCAT(i.title, ', ') FROM insights i
+                        WHERE i.session_id = s.session_id) AS learnings,
+                       (SELECT json_group_array(title) FROM (
+                            SELECT i.title FROM insights i
+                            WHERE i.session_id = s.session_id AND i.position <= 3
+                            ORDER BY i.position
+                        )) AS relevant_insights
+                FROM ranked r
+                JOIN sessions s ON s.session_id = r.session_id
+                ORDER BY r.rank
+            """, {'match': match, 'limit': limit})
+
+            results = []
+            for row in cursor.fetchall():
+                session = dict(row)
+                session['relevant_insights'] = json.loads(session['relevant_insights'] or '[]')
+                results.append(session)
+            return results
+
+    def _search_similar_sessions_like(self, description: str, limit: int) -> List[Dict]:
+        """LIKE scan for SQLite builds without FTS5"""
         with self.lock:
             cursor = self.conn.cursor()
 
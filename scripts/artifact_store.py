@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Artifact Store - Consolidated storage for per-video and per-company artifacts
+
+Replaces thousands of small indent=2 JSON files (insights, enriched, summaries,
+transcripts, YC enrichments) with a single SQLite segment store:
+- Keyed by (kind, id, version)
+- zstd-compressed compact JSON blobs (zlib fallback if zstandard is missing)
+- Atomic writes (one transaction per put / batch)
+- Sequential bulk iteration for readers that scan a whole kind
+
+Usage:
+    python3 artifact_store.py import --kind insights --dir data/business_insights --suffix _insights.json
+    python3 artifact_store.py import-all
+    python3 artifact_store.py stats
+"""
+
+import os
+import json
+import sqlite3
+import tempfile
+import time
+import zlib
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple, Callable
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+logger = logging.getLogger(__name__)
+
+WORKSPACE_DIR = Path("/Users/yourox/AI-Workspace")
+DEFAULT_DB_PATH = WORKSPACE_DIR / "data" / "artifacts.db"
+
+# kind -> (directory, filename suffix) of the legacy per-file layout
+LEGACY_LAYOUT = {
+    "insights": (WORKSPACE_DIR / "data" / "business_insights", "_insights.json"),
+    "enriched": (WORKSPACE_DIR / "data" / "enriched_insights", "_enriched.json"),
+    "summary": (WORKSPACE_DIR / "data" / "video_summaries", "_summary.json"),
+    "transcript": (WORKSPACE_DIR / "data" / "transcripts", "_full.json"),
+    "yc_enriched": (WORKSPACE_DIR / "data" / "yc_enriched", "_enriched.json"),
+}
+
+ZSTD_LEVEL = 3
+
+
+class ArtifactStore:
+    """SQLite-backed store of compressed JSON artifacts keyed by (kind, id, version)"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS artifacts (
+            kind TEXT NOT NULL,
+            id TEXT NOT NULL,
+            version TEXT NOT NULL DEFAULT '',
+            codec TEXT NOT NULL,
+            data BLOB NOT NULL,
+            raw_size INTEGER NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (kind, id, version)
+        );
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+        if zstd is not None:
+            self._compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL)
+            self._decompressor = zstd.ZstdDecompressor()
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def _encode(self, data: Dict) -> Tuple[str, bytes, int]:
+        raw = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        if zstd is not None:
+            return 'zstd', self._compressor.compress(raw), len(raw)
+        return 'zlib', zlib.compress(raw, 6), len(raw)
+
+    def _decode(self, codec: str, blob: bytes) -> Dict:
+        if codec == 'zstd':
+            if zstd is None:
+                raise RuntimeError("Artifact is zstd-compressed but zstandard is not installed")
+            raw = self._decompressor.decompress(blob)
+        elif codec == 'zlib':
+            raw = zlib.decompress(blob)
+        else:
+            raw = blob
+        return json.loads(raw)
+
+    # ------------------------------------------------------------------
+    # Writes (each call is one atomic transaction)
+    # ------------------------------------------------------------------
+
+    def put(self, kind: str, artifact_id: str, data: Dict, version: str = ''):
+        """Atomically insert or replace one artifact"""
+        self.put_many(kind, [(artifact_id, data)], version=version)
+
+    def put_many(self, kind: str, items: Iterable[Tuple[str, Dict]], version: str = '') -> int:
+        """Atomically insert or replace a batch of artifacts in one transaction"""
+        now = time.time()
+        rows = [
+            (kind, artifact_id, version, *self._encode(data), now)
+            for artifact_id, data in items
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO artifacts "
+                "(kind, id, version, codec, data, raw_size, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def update(self, kind: str, artifact_id: str, fn: Callable[[Dict], Dict], version: str = '') -> Dict:
+        """
+        Read-modify-write one artifact inside a single write transaction
+
+        fn receives the current data (empty dict if missing) and returns the new data.
+        """
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute(
+                "SELECT codec, data FROM artifacts WHERE kind = ? AND id = ? AND version = ?",
+                (kind, artifact_id, version)
+            ).fetchone()
+            current = self._decode(*row) if row else {}
+            new_data = fn(current)
+            codec, blob, size = self._encode(new_data)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO artifacts "
+                "(kind, id, version, codec, data, raw_size, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, artifact_id, version, codec, blob, size, time.time())
+            )
+        return new_data
+
+    def delete(self, kind: str, artifact_id: str, version: Optional[str] = None):
+        """Delete one artifact (all versions if version is None)"""
+        with self.conn:
+            if version is None:
+                self.conn.execute("DELETE FROM artifacts WHERE kind = ? AND id = ?", (kind, artifact_id))
+            else:
+                self.conn.execute(
+                    "DELETE FROM artifacts WHERE kind = ? AND id = ? AND version = ?",
+                    (kind, artifact_id, version)
+                )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, kind: str, artifact_id: str, version: Optional[str] = None) -> Optional[Dict]:
+        """Get one artifact (latest version if version is None)"""
+        if version is None:
+            row = self.conn.execute(
+                "SELECT codec, data FROM artifacts WHERE kind = ? AND id = ? "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (kind, artifact_id)
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT codec, data FROM artifacts WHERE kind = ? AND id = ? AND version = ?",
+                (kind, artifact_id, version)
+            ).fetchone()
+        return self._decode(*row) if row else None
+
+    def get_entry(self, kind: str, artifact_id: str) -> Optional[Tuple[Dict, float]]:
+        """Latest version of one artifact with its updated_at timestamp"""
+        row = self.conn.execute(
+            "SELECT codec, data, updated_at FROM artifacts WHERE kind = ? AND id = ? "
+            "ORDER BY updated_at DESC LIMIT 1",
+            (kind, artifact_id)
+        ).fetchone()
+        return (self._decode(row[0], row[1]), row[2]) if row else None
+
+    def get_many(self, kind: str, artifact_ids: Iterable[str], version: str = '',
+                 max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Get a batch of artifacts of one version as {id: data}
+
+        Args:
+            kind: Artifact kind
+            artifact_ids: Ids to look up (missing ids are simply absent from the result)
+            version: Version to read
+            max_age: Only return artifacts written within this many seconds (TTL caches)
+        """
+        ids = list(artifact_ids)
+        min_updated = time.time() - max_age if max_age is not None else 0
+        found = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.conn.execute(
+                "SELECT id, codec, data FROM artifacts "
+                f"WHERE kind = ? AND version = ? AND updated_at >= ? AND id IN ({','.join('?' * len(chunk))})",
+                (kind, version, min_updated, *chunk)
+            )
+            for artifact_id, codec, blob in rows:
+                found[artifact_id] = self._decode(codec, blob)
+        return found
+
+    def exists(self, kind: str, artifact_id: str) -> bool:
+        """Check whether any version of an artifact exists"""
+        row = self.conn.execute(
+            "SELECT 1 FROM artifacts WHERE kind = ? AND id = ? LIMIT 1",
+            (kind, artifact_id)
+        ).fetchone()
+        return row is not None
+
+    def ids(self, kind: str) -> Set[str]:
+        """All artifact ids of a kind (index-only scan, no decompression)"""
+        rows = self.conn.execute("SELECT DISTINCT id FROM artifacts WHERE kind = ?", (kind,))
+        return {row[0] for row in rows}
+
+    def updated_times(self, kind: str) -> Dict[str, float]:
+        """Latest updated_at per artifact id of a kind (no decompression)"""
+        rows = self.conn.execute(
+            "SELECT id, MAX(updated_at) FROM artifacts WHERE kind = ? GROUP BY id", (kind,)
+        )
+        return {artifact_id: updated_at for artifact_id, updated_at in rows}
+
+    def count(self, kind: str) -> int:
+        """Number of distinct artifacts of a kind"""
+        return self.conn.execute(
+            "SELECT COUNT(DISTINCT id) FROM artifacts WHERE kind = ?", (kind,)
+        ).fetchone()[0]
+
+    def iter_kind(self, kind: str, version: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Sequentially iterate all artifacts of a kind as (id, data)
+
+        Yields the latest version of each id unless a version is given.
+        """
+        if version is not None:
+            cursor = self.conn.execute(
+                "SELECT id, codec, data FROM artifacts WHERE kind = ? AND version = ? ORDER BY id",
+                (kind, version)
+            )
+            for artifact_id, codec, blob in cursor:
+                yield artifact_id, self._decode(codec, blob)
+            return
+
+        cursor = self.conn.execute(
+            "SELECT id, codec, data FROM artifacts WHERE kind = ? ORDER BY id, updated_at DESC",
+            (kind,)
+        )
+        last_id = None
+        for artifact_id, codec, blob in cursor:
+            if artifact_id == last_id:
+                continue
+            last_id = artifact_id
+            yield artifact_id, self._decode(codec, blob)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-kind counts and sizes"""
+        rows = self.conn.execute(
+            "SELECT kind, COUNT(*), SUM(raw_size), SUM(LENGTH(data)) FROM artifacts GROUP BY kind"
+        ).fetchall()
+        return {
+            kind: {
+                'artifacts': count,
+                'raw_bytes': raw or 0,
+                'stored_bytes': stored or 0,
+            }
+            for kind, count, raw, stored in rows
+        }
+
+    # ------------------------------------------------------------------
+    # Migration from the per-file layout
+    # ------------------------------------------------------------------
+
+    def import_directory(self, kind: str, directory: Path, suffix: str, batch_size: int = 500) -> int:
+        """Import legacy *<suffix> JSON files from a directory"""
+        directory = Path(directory)
+        if not directory.exists():
+            logger.warning(f"Directory not found: {directory}")
+            return 0
+
+        imported = 0
+        batch = []
+        for file_path in directory.glob(f"*{suffix}"):
+            artifact_id = file_path.name[:-len(suffix)]
+            try:
+                with open(file_path, 'r') as f:
+                    batch.append((artifact_id, json.load(f)))
+            except Exception as e:
+                logger.error(f"Error reading {file_path}: {e}")
+                continue
+
+            if len(batch) >= batch_size:
+                imported += self.put_many(kind, batch)
+                batch = []
+
+        if batch:
+            imported += self.put_many(kind, batch)
+
+        return imported
+
+    def close(self):
+        self.conn.close()
+
+
+def write_json_atomic(path: Path, data: Dict, indent: Optional[int] = 2):
+    """Write a JSON file via temp file + rename so readers never see partial writes"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def open_existing_store(db_path: Path = DEFAULT_DB_PATH) -> Optional[ArtifactStore]:
+    """Open the store if it has been created (readers never create it)"""
+    if not Path(db_path).exists():
+        return None
+    try:
+        return ArtifactStore(db_path)
+    except sqlite3.Error as e:
+        logger.warning(f"Artifact store unavailable: {e}")
+        return None
+
+
+def legacy_ids(directory: Path, suffix: str) -> Set[str]:
+    """Artifact ids present in the per-file layout"""
+    return {path.name[:-len(suffix)] for path in Path(directory).glob(f"*{suffix}")}
+
+
+def artifact_ids(kind: str, directory: Path, suffix: str, store: Optional[ArtifactStore] = None) -> Set[str]:
+    """Ids of a kind from the store and the per-file layout combined"""
+    ids = legacy_ids(directory, suffix)
+    if store is not None:
+        ids |= store.ids(kind)
+    return ids
+
+
+def _file_mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def load_artifact(kind: str, artifact_id: str, directory: Path, suffix: str,
+                  store: Optional[ArtifactStore] = None) -> Optional[Dict]:
+    """
+    Load one artifact from the store or its JSON file, whichever is newer
+
+    Producers that still write only JSON can re-extract an artifact after it
+    was imported, so a file modified after the store row wins.
+    """
+    path = Path(directory) / f"{artifact_id}{suffix}"
+    mtime = _file_mtime(path)
+    if store is not None:
+        entry = store.get_entry(kind, artifact_id)
+        if entry is not None and (mtime is None or entry[1] >= mtime):
+            return entry[0]
+    if mtime is None:
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def iter_artifacts(kind: str, directory: Path, suffix: str,
+                   store: Optional[ArtifactStore] = None) -> Iterator[Tuple[str, Dict, str]]:
+    """
+    Yield (artifact_id, data, source) for every artifact of a kind
+
+    Each id comes from whichever copy is newer: the store row (updated_at) or
+    its JSON file (mtime). Store rows are scanned sequentially first; JSON
+    files are then read for ids the store lacks or holds an older copy of.
+    Files written before the store existed, or by producers that do not
+    mirror into it (including re-extractions after an import), are therefore
+    never dropped or shadowed.
+    """
+    files = {}
+    for file_path in Path(directory).glob(f"*{suffix}"):
+        mtime = _file_mtime(file_path)
+        if mtime is not None:
+            files[file_path.name[:-len(suffix)]] = (file_path, mtime)
+
+    if store is not None:
+        updated = store.updated_times(kind)
+        newer_files = {i for i, (_, mtime) in files.items() if i in updated and mtime > updated[i]}
+        for artifact_id, data in store.iter_kind(kind):
+            if artifact_id in newer_files:
+                continue
+            files.pop(artifact_id, None)
+            yield artifact_id, data, f"{store.db_path}#{kind}/{artifact_id}"
+
+    for artifact_id, (file_path, _) in files.items():
+        try:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading {file_path}: {e}")
+            continue
+        yield artifact_id, data, str(file_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Artifact Store")
+    parser.add_argument('command', choices=['import', 'import-all', 'stats'])
+    parser.add_argument('--kind', help='Artifact kind (insights, enriched, summary, ...)')
+    parser.add_argument('--dir', help='Directory of legacy JSON files')
+    parser.add_argument('--suffix', help='Filename suffix to strip for the id')
+    parser.add_argument('--db', default=str(DEFAULT_DB_PATH), help='Store path')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    store = ArtifactStore(Path(args.db))
+
+    if args.command == 'import':
+        if not (args.kind and args.dir and args.suffix):
+            parser.error("import requires --kind, --dir and --suffix")
+        start = time.time()
+        count = store.import_directory(args.kind, Path(args.dir), args.suffix)
+        print(f"✅ Imported {count} {args.kind} artifacts in {time.time() - start:.1f}s")
+
+    elif args.command == 'import-all':
+        for kind, (directory, suffix) in LEGACY_LAYOUT.items():
+            start = time.time()
+            count = store.import_directory(kind, directory, suffix)
+            print(f"✅ {kind:<12} {count:>6} artifacts ({time.time() - start:.1f}s)")
+
+    elif args.command == 'stats':
+        for kind, info in sorted(store.stats().items()):
+            ratio = info['stored_bytes'] / info['raw_bytes'] if info['raw_bytes'] else 0
+            print(
+                f"{kind:<12} {info['artifacts']:>6} artifacts  "
+                f"{info['raw_bytes'] / 1024 / 1024:8.1f} MB raw  "
+                f"{info['stored_bytes'] / 1024 / 1024:8.1f} MB stored  ({ratio:.0%})"
+            )
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
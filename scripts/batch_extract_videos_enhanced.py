@@ -5,11 +5,16 @@ Enhanced Batch Video Extraction Script (Production-Ready for 500+ videos)
 Features:
 1. Parallel processing with configurable workers
 2. Progress tracking with ETA
-3. Checkpoint/resume capability
+3. Resume via the durable pipeline job queue (scripts/job_queue.py)
 4. Real-time statistics
 5. Cost tracking
 6. Failure recovery
 7. Detailed logging
+
+Videos go through the queue's 'transcript' stage (transcript + comments) and
+'insights' stage. Re-running the same batch after a crash or Ctrl+C only
+processes what is not done yet; failed videos are retried with backoff and
+dead-lettered after repeated failures.
 """
 
 import sys
@@ -17,11 +22,13 @@ import json
 import time
 import argparse
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
 from datetime import datetime, timedelta
-from browserbase_transcript_extractor import extract_youtube_transcript, save_transcript
+from browserbase_transcript_extractor import (
+    extract_youtube_transcript, save_transcript, pool_for_workers, pool_capacity
+)
 from business_intelligence_extractor import BusinessIntelligenceExtractor
+from job_queue import JobQueue, Job, run_workers
 
 
 class EnhancedBatchExtractor:
@@ -31,7 +38,6 @@ class EnhancedBatchExtractor:
         self.workspace = Path(workspace_dir)
         self.transcripts_dir = self.workspace / "data" / "transcripts"
         self.insights_dir = self.workspace / "data" / "business_insights"
-        self.checkpoint_file = self.workspace / "data" / "batch_checkpoint.json"
         self.failed_videos_file = self.workspace / "data" / "failed_videos.txt"
 
         # Ensure directories exist
@@ -51,27 +57,12 @@ class EnhancedBatchExtractor:
         }
         self.results_lock = Lock()
         self.start_time = None
+        self.total_videos = 0
+        self.skip_existing = True
 
-    def load_checkpoint(self) -> dict:
-        """Load previous checkpoint if exists"""
-        if self.checkpoint_file.exists():
-            try:
-                with open(self.checkpoint_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-
-    def save_checkpoint(self, video_ids_remaining: list):
-        """Save progress checkpoint"""
-        checkpoint = {
-            'timestamp': datetime.now().isoformat(),
-            'results': self.results,
-            'remaining_videos': video_ids_remaining,
-            'elapsed_time': time.time() - self.start_time if self.start_time else 0
-        }
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(checkpoint, f, indent=2)
+        self.queue = JobQueue()
+        self.browser_pool = None  # Sized from max_workers in batch_extract
+        self.bi_extractor = None  # One per batch run, shared by the insights workers
 
     def save_failed_videos(self):
         """Save list of failed videos for retry"""
@@ -114,173 +105,170 @@ class EnhancedBatchExtractor:
         print(f"💰 Cost so far: ${browserbase_cost:.2f} (Browserbase)")
         print(f"{'='*80}\n")
 
-    def process_single_video(self, video_id: str, index: int, total: int, skip_existing: bool):
+    def _finish_video(self, video_id: str, processing_time: float = None, failed: bool = False):
+        """Count a video whose last stage in this run has finished"""
+        with self.results_lock:
+            self.results['videos_processed'] += 1
+            if failed:
+                self.results['failed_videos'].append(video_id)
+            if processing_time is not None:
+                self.results['processing_times'].append(processing_time)
+                # Keep only last 20 times for rolling average
+                if len(self.results['processing_times']) > 20:
+                    self.results['processing_times'] = self.results['processing_times'][-20:]
+
+    def transcript_stage(self, job: Job) -> dict:
         """
-        Process a single video with enhanced error handling
+        Queue handler: extract transcript + comments for one video
 
         Returns:
-            tuple: (success: bool, processing_time: float)
+            Status dict; success hands the video to the 'insights' stage
         """
-        video_start_time = time.time()
-
-        self.print_progress(index, total, video_id)
+        video_id = job.item_id
+        self.print_progress(self.results['videos_processed'] + 1, self.total_videos, video_id)
 
-        transcript_file = self.transcripts_dir / f"{video_id}_full.json"
         insights_file = self.insights_dir / f"{video_id}_insights.json"
 
         # Check if already processed
-        if skip_existing and insights_file.exists():
+        if self.skip_existing and insights_file.exists():
             print(f"⚡ Skipping {video_id} - insights already exist")
             with self.results_lock:
                 self.results['transcripts']['skipped'] += 1
                 self.results['insights']['skipped'] += 1
-                self.results['videos_processed'] += 1
-            return True, 0
+            self._finish_video(video_id)
+            return {'status': 'skipped', 'next_stage': 'enrich'}
 
-        # STEP 1: Extract transcript + comments
-        print(f"📹 [{video_id}] Step 1/2: Extracting transcript + comments...")
+        # STEP 1: Extract transcript + comments (the Browserbase extractor covers both)
+        print(f"📹 [{video_id}] Step 1/2: Extracting transcript + comments (attempt {job.attempts})...")
 
-        try:
-            transcript_data = extract_youtube_transcript(video_id)
+        transcript_data = extract_youtube_transcript(video_id, pool=self.browser_pool)
 
-            if transcript_data.get('status') == 'success':
-                save_transcript(video_id, transcript_data)
+        if transcript_data.get('status') != 'success':
+            error = transcript_data.get('error', 'Unknown error')
+            print(f"❌ [{video_id}] Transcript failed: {error}")
+            return {'status': 'error', 'error': error}
 
-                comment_count = transcript_data.get('comments', {}).get('count', 0)
-                print(f"✅ [{video_id}] Transcript + {comment_count} comments extracted")
+        save_transcript(video_id, transcript_data)
 
-                with self.results_lock:
-                    self.results['comments_extracted'] += comment_count
-                    self.results['transcripts']['success'] += 1
-            else:
-                error = transcript_data.get('error', 'Unknown error')
-                print(f"❌ [{video_id}] Transcript failed: {error}")
-                with self.results_lock:
-                    self.results['transcripts']['failed'] += 1
-                    self.results['failed_videos'].append(video_id)
-                    self.results['videos_processed'] += 1
-                return False, time.time() - video_start_time
+        comment_count = transcript_data.get('comments', {}).get('count', 0)
+        print(f"✅ [{video_id}] Transcript + {comment_count} comments extracted")
 
-        except Exception as e:
-            print(f"❌ [{video_id}] Exception during transcript: {e}")
-            with self.results_lock:
-                self.results['transcripts']['failed'] += 1
-                self.results['failed_videos'].append(video_id)
-                self.results['videos_processed'] += 1
-            return False, time.time() - video_start_time
+        with self.results_lock:
+            self.results['comments_extracted'] += comment_count
+            self.results['transcripts']['success'] += 1
 
-        # STEP 2: Extract business intelligence
-        print(f"🧠 [{video_id}] Step 2/2: Extracting business intelligence...")
+        return {'status': 'success', 'next_stage': 'insights', 'payload': {'started': time.time()}}
 
-        try:
-            bi_extractor = BusinessIntelligenceExtractor()
-            insights = bi_extractor.process_transcript(video_id)
+    def insights_stage(self, job: Job) -> dict:
+        """
+        Queue handler: extract business intelligence for one transcribed video
 
-            if insights and 'error' not in insights:
-                print(f"✅ [{video_id}] Business intelligence extracted")
-                with self.results_lock:
-                    self.results['insights']['success'] += 1
-            else:
-                error = insights.get('error', 'No insights') if insights else 'No insights'
-                print(f"❌ [{video_id}] BI failed: {error}")
-                with self.results_lock:
-                    self.results['insights']['failed'] += 1
+        Returns:
+            Status dict; success hands the video to the 'enrich' stage
+        """
+        video_id = job.item_id
+        print(f"🧠 [{video_id}] Step 2/2: Extracting business intelligence (attempt {job.attempts})...")
 
-        except Exception as e:
-            print(f"❌ [{video_id}] Exception during BI: {e}")
+        insights = self.bi_extractor.process_transcript(video_id)
+
+        if insights and 'error' not in insights:
+            print(f"✅ [{video_id}] Business intelligence extracted")
             with self.results_lock:
-                self.results['insights']['failed'] += 1
+                self.results['insights']['success'] += 1
+            return {'status': 'success'}
 
-        processing_time = time.time() - video_start_time
-        with self.results_lock:
-            self.results['videos_processed'] += 1
-            self.results['processing_times'].append(processing_time)
-            # Keep only last 20 times for rolling average
-            if len(self.results['processing_times']) > 20:
-                self.results['processing_times'] = self.results['processing_times'][-20:]
+        error = insights.get('error', 'No insights') if insights else 'No insights'
+        print(f"❌ [{video_id}] BI failed: {error}")
+        return {'status': 'error', 'error': error}
+
+    def _on_job_result(self, job: Job, result: dict):
+        """Per-job bookkeeping for the final report"""
+        outcome = result['outcome']
 
-        return True, processing_time
+        if job.stage == 'transcript':
+            if outcome == 'dead':
+                with self.results_lock:
+                    self.results['transcripts']['failed'] += 1
+                self._finish_video(job.item_id, failed=True)
+            elif outcome == 'retried':
+                print(f"🔁 [{job.item_id}] Transcript will be retried with backoff")
+
+        elif job.stage == 'insights':
+            if outcome == 'done':
+                started = job.payload.get('started')
+                self._finish_video(job.item_id, time.time() - started if started else None)
+            elif outcome == 'dead':
+                with self.results_lock:
+                    self.results['insights']['failed'] += 1
+                self._finish_video(job.item_id, failed=True)
 
-    def batch_extract(self, video_ids: list, skip_existing: bool = True, max_workers: int = 10,
-                     checkpoint_interval: int = 10):
+    def batch_extract(self, video_ids: list, skip_existing: bool = True, max_workers: int = 10):
         """
         Extract transcripts and business intelligence for multiple videos
 
+        Videos are enqueued into the pipeline job queue; items finished in an
+        earlier (possibly interrupted) run are not processed again.
+
         Args:
             video_ids: List of YouTube video IDs
-            skip_existing: Skip videos with existing insights
+            skip_existing: Skip videos with existing insights (False re-queues finished videos)
             max_workers: Number of parallel workers (1-15)
-            checkpoint_interval: Save checkpoint every N videos
         """
         self.start_time = time.time()
         self.results['start_time'] = datetime.now().isoformat()
         self.results['current_batch_start'] = datetime.now().isoformat()
+        self.skip_existing = skip_existing
+
+        added = self.queue.enqueue('transcript', video_ids, reset=not skip_existing)
+        statuses = self.queue.status_of('transcript', video_ids)
+        already_done = sum(1 for status in statuses.values() if status == 'done')
+        if added < len(set(video_ids)):
+            print(f"\n🔄 Resuming: {len(set(video_ids)) - added} videos were already queued "
+                  f"({already_done} finished transcripts)")
 
-        # Check for resume
-        checkpoint = self.load_checkpoint()
-        if checkpoint and checkpoint.get('remaining_videos'):
-            print(f"\n🔄 Found checkpoint from {checkpoint.get('timestamp')}")
-            print(f"   Resuming from {len(checkpoint['remaining_videos'])} remaining videos")
-            response = input("Resume from checkpoint? (y/n): ")
-            if response.lower() == 'y':
-                video_ids = checkpoint['remaining_videos']
-                self.results = checkpoint['results']
+        total_videos = len(set(video_ids)) - already_done
+        self.total_videos = total_videos
 
-        total_videos = len(video_ids)
+        # One browser page per worker (the shared default pool caps at 3)
+        self.browser_pool = pool_for_workers(max_workers)
+        self.bi_extractor = BusinessIntelligenceExtractor()
+        concurrency = min(max_workers, pool_capacity(self.browser_pool))
 
         print(f"\n{'='*80}")
         print(f"🚀 ENHANCED BATCH VIDEO EXTRACTION")
         print(f"{'='*80}\n")
         print(f"Total videos: {total_videos}")
-        print(f"Parallel workers: {max_workers}")
+        print(f"Parallel workers: {max_workers} ({self.browser_pool.pool.max_sessions} browser sessions, "
+              f"{concurrency} pages in flight)")
         print(f"Skip existing: {skip_existing}")
-        print(f"Checkpoint interval: every {checkpoint_interval} videos")
+        print(f"Queue: {self.queue.db_path}")
         print(f"Expected cost: ${total_videos * 0.0242:.2f} (Browserbase)")
-        print(f"Expected time: ~{total_videos * 235 / max_workers / 60:.1f} minutes")
+        print(f"Expected time: ~{total_videos * 235 / concurrency / 60:.1f} minutes")
         print(f"\n{'='*80}\n")
 
-        processed_count = 0
-
-        # Process in batches for checkpointing
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {}
-
-            for i, video_id in enumerate(video_ids, 1):
-                future = executor.submit(
-                    self.process_single_video,
-                    video_id, i, total_videos, skip_existing
-                )
-                futures[future] = (video_id, i)
-
-            # Process completions
-            for future in as_completed(futures):
-                video_id, index = futures[future]
-                processed_count += 1
-
-                try:
-                    success, proc_time = future.result()
-                except Exception as e:
-                    print(f"❌ Unexpected error processing {video_id}: {e}")
-                    with self.results_lock:
-                        self.results['failed_videos'].append(video_id)
-
-                # Checkpoint every N videos
-                if processed_count % checkpoint_interval == 0:
-                    remaining = [vid for vid in video_ids[processed_count:]]
-                    self.save_checkpoint(remaining)
-                    print(f"\n💾 Checkpoint saved ({processed_count}/{total_videos})\n")
+        try:
+            run_workers(
+                self.queue,
+                {'transcript': self.transcript_stage, 'insights': self.insights_stage},
+                max_workers=max_workers,
+                owner='batch_extract',
+                lease_seconds=900,
+                on_result=self._on_job_result,
+                item_ids=video_ids
+            )
+        finally:
+            self.browser_pool.close()
+            self.browser_pool = None
+            # Persist transcript headers scanned by the insights stage
+            self.bi_extractor.transcripts.save_index()
 
         # Final results
         total_time = time.time() - self.start_time
-        self.print_final_report(total_videos, total_time)
+        self.print_final_report(max(total_videos, 1), total_time)
 
         # Save failed videos for retry
         self.save_failed_videos()
 
-        # Clean up checkpoint
-        if self.checkpoint_file.exists():
-            self.checkpoint_file.unlink()
-
         return self.results
 
     def print_final_report(self, total_videos: int, total_time: float):
@@ -325,6 +313,7 @@ class EnhancedBatchExtractor:
             if len(self.results['failed_videos']) > 10:
                 print(f"  ... and {len(self.results['failed_videos']) - 10} more")
             print(f"\n  Failed videos saved to: {self.failed_videos_file}")
+            print(f"  Retry with: python3 job_queue.py retry-dead --stage transcript (or --stage insights)")
 
         print(f"\n{'='*80}\n")
 
@@ -339,8 +328,6 @@ def main():
                        help='Skip videos with existing insights (default: True)')
     parser.add_argument('--no-skip', action='store_true',
                        help='Process all videos even if insights exist')
-    parser.add_argument('--checkpoint-interval', '-c', type=int, default=10,
-                       help='Save checkpoint every N videos (default: 10)')
 
     args = parser.parse_args()
 
@@ -375,8 +362,7 @@ def main():
     results = extractor.batch_extract(
         video_ids,
         skip_existing=skip_existing,
-        max_workers=args.workers,
-        checkpoint_interval=args.checkpoint_interval
+        max_workers=args.workers
     )
 
     # Save results
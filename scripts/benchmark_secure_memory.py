@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Secure Memory Search Benchmark
+Compares the linear scan SecureMemorySystem.search_memories used to do with
+the per-level token index, on synthetic memories (never the real files)
+
+For each size the benchmark builds one level's worth of memories, checks the
+index returns exactly what the scan returns, and reports per-query latency.
+The scan is timed on an already-loaded list, so it is a lower bound for the
+old path (which also re-read the JSON file on every search).
+
+Usage:
+    python benchmark_secure_memory.py                  # 10k, 100k, 1M
+    python benchmark_secure_memory.py --sizes 10000 50000
+    python benchmark_secure_memory.py --repeat 10
+"""
+
+import sys
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from secure_memory import MemoryIndex, SecurityLevel
+
+WORDS = [
+    "project", "meeting", "deadline", "python", "server", "deploy", "client",
+    "invoice", "budget", "roadmap", "feature", "release", "database", "backup",
+    "monitoring", "latency", "customer", "feedback", "design", "review",
+    "contract", "pricing", "launch", "migration", "schema", "pipeline",
+    "dashboard", "analytics", "retention", "onboarding", "security", "audit",
+]
+
+QUERIES = [
+    "deploy",                 # common word
+    "migration schema",       # two-word phrase
+    "ticket-4821",            # rare identifier
+    "pipe",                   # partial word
+    "nonexistent phrase",     # no hits
+]
+
+
+def generate_memories(count: int, seed: int = 42) -> list[dict]:
+    """Synthetic memories shaped like SecureMemorySystem.save_memory output"""
+    rng = random.Random(seed)
+    memories = []
+    for i in range(count):
+        words = rng.choices(WORDS, k=rng.randint(6, 18))
+        words.append(f"ticket-{rng.randint(0, count)}")
+        memories.append({
+            "id": i + 1,
+            "text": " ".join(words).capitalize(),
+            "type": "conversation",
+            "level": SecurityLevel.PUBLIC.value,
+            "timestamp": "2025-01-01T00:00:00",
+            "user_id": "yourox_default"
+        })
+    return memories
+
+
+def scan(memories: list[dict], query: str) -> list[dict]:
+    """The original search loop for one level"""
+    query_lower = query.lower()
+    return [m for m in memories if query_lower in m['text'].lower()]
+
+
+def time_ms(func, repeat: int) -> float:
+    """Median wall time of func() in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(size: int, repeat: int):
+    print(f"\n📊 {size:,} memories")
+    memories = generate_memories(size)
+
+    start = time.perf_counter()
+    index = MemoryIndex(memories)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"   Index build: {build_ms:,.0f} ms ({len(index.postings):,} tokens)")
+
+    print(f"   {'query':<22} {'hits':>8} {'scan ms':>10} {'index ms':>10} {'speedup':>9}")
+    for query in QUERIES:
+        expected = scan(memories, query)
+        found = index.search(query.lower())
+        if found != expected:
+            raise AssertionError(f"index results differ from scan for {query!r}")
+
+        scan_ms = time_ms(lambda: scan(memories, query), repeat)
+        index_ms = time_ms(lambda: index.search(query.lower()), repeat)
+        speedup = scan_ms / index_ms if index_ms else float('inf')
+        print(f"   {query:<22} {len(found):>8,} {scan_ms:>10.2f} {index_ms:>10.2f} {speedup:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark secure memory search: scan vs index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Memory counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query (median reported)")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Browser Pool - Shared Playwright sessions for Browserbase/browser-based collectors
+
+Replaces the per-call "create session -> connect_over_cdp -> scrape one page ->
+delete session" pattern with long-lived sessions shared across many pages:
+- Sessions are created lazily, reused across pages and released when idle
+  (Browserbase bills per session minute)
+- Several pages run concurrently per session, in one shared context
+- Navigations are rate limited per host (token bucket from polite_fetcher)
+- Images, fonts and media are aborted at the route level
+- BackgroundBrowserPool runs the pool on its own event-loop thread so
+  synchronous callers (job queue workers, CLI loops) share sessions
+
+Backends:
+    browserbase - remote sessions (BROWSERBASE_API_KEY / BROWSERBASE_PROJECT_ID)
+    local       - headless Chromium (`playwright install chromium`), for offline testing
+
+Usage:
+    async def scrape(pool, url):
+        async with pool.page() as page:
+            await pool.goto(page, url)
+            return await page.title()
+
+    async with BrowserPool(sessions=2, pages_per_session=4) as pool:
+        titles = await pool.map(scrape, urls)
+
+    # From synchronous code
+    titles = map_pages(scrape, urls, backend='local')
+    title = shared_pool().run(scrape, url)
+"""
+
+import os
+import sys
+import time
+import atexit
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from polite_fetcher import TokenBucket, DEFAULT_USER_AGENT
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+try:
+    from browserbase import Browserbase
+except ImportError:
+    Browserbase = None
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_RESOURCE_TYPES = ('image', 'font', 'media')
+BROWSERBASE_CONNECT_URL = "wss://connect.browserbase.com?apiKey={api_key}&sessionId={session_id}"
+
+
+class _Session:
+    """One browser (Browserbase session or local Chromium) and its shared context"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser = None
+        self.context = None
+        self.remote_id: Optional[str] = None
+        self.active = 0
+        self.pages_served = 0
+        self.opened_at = 0.0
+        self.last_used = 0.0
+        self.lock = asyncio.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+
+class BrowserPool:
+    """Reusable browser sessions with page-level concurrency and per-host politeness"""
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        sessions: int = 1,
+        pages_per_session: int = 3,
+        per_host_rate: float = 0.5,
+        per_host_burst: float = 2.0,
+        block_resources: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+        session_timeout: int = 600,
+        idle_release: float = 60.0,
+        max_pages_per_session: int = 200,
+        headless: bool = True,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ):
+        """
+        Args:
+            backend: 'browserbase' or 'local' (default: BROWSER_POOL_BACKEND env,
+                     else browserbase when credentials are set)
+            sessions: Maximum concurrent browser sessions
+            pages_per_session: Concurrent pages per session
+            per_host_rate: Navigations per second per host
+            per_host_burst: Navigation burst per host
+            block_resources: Playwright resource types to abort
+            session_timeout: Browserbase session timeout (seconds)
+            idle_release: Release sessions idle for this long (seconds, 0 = keep until close)
+            max_pages_per_session: Recycle a session after serving this many pages
+            headless: Local backend only
+            user_agent: Local backend only (Browserbase manages its own fingerprint)
+        """
+        self.api_key = os.getenv('BROWSERBASE_API_KEY')
+        self.project_id = os.getenv('BROWSERBASE_PROJECT_ID')
+        self.backend = backend or os.getenv('BROWSER_POOL_BACKEND') or (
+            'browserbase' if self.api_key and self.project_id else 'local'
+        )
+        if self.backend not in ('browserbase', 'local'):
+            raise ValueError(f"Unknown browser backend: {self.backend}")
+        if self.backend == 'browserbase' and not (self.api_key and self.project_id):
+            raise ValueError("Browserbase credentials not found in .env")
+
+        self.max_sessions = max(1, sessions)
+        self.pages_per_session = max(1, pages_per_session)
+        self.per_host_rate = per_host_rate
+        self.per_host_burst = per_host_burst
+        self.block_resources = frozenset(block_resources or ())
+        self.session_timeout = session_timeout
+        self.idle_release = idle_release
+        self.max_pages_per_session = max_pages_per_session
+        self.headless = headless
+        self.user_agent = user_agent
+
+        self.stats = {
+            'sessions_opened': 0,
+            'pages': 0,
+            'navigations': 0,
+            'blocked_requests': 0,
+            'session_seconds': 0.0
+        }
+
+        self._playwright = None
+        self._bb = None
+        self._sessions: List[_Session] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def start(self):
+        """Start Playwright (sessions themselves open on first use)"""
+        if self._playwright is not None:
+            return
+        if async_playwright is None:
+            raise ImportError("playwright is required: pip install playwright && playwright install chromium")
+        if self.backend == 'browserbase':
+            if Browserbase is None:
+                raise ImportError("browserbase is required: pip install browserbase")
+            self._bb = Browserbase(api_key=self.api_key)
+
+        self._sessions = [_Session(i) for i in range(self.max_sessions)]
+        self._slots = asyncio.Semaphore(self.max_sessions * self.pages_per_session)
+        self._playwright = await async_playwright().start()
+        if self.idle_release:
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def close(self):
+        """Release every session and stop Playwright"""
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        for session in self._sessions:
+            await self._close_session(session)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    async def _route(self, route):
+        if route.request.resource_type in self.block_resources:
+            self.stats['blocked_requests'] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _open_session(self, session: _Session):
+        if self.backend == 'browserbase':
+            remote = await asyncio.to_thread(
+                self._bb.sessions.create, project_id=self.project_id, timeout=self.session_timeout
+            )
+            session.remote_id = remote.id
+            session.browser = await self._playwright.chromium.connect_over_cdp(
+                BROWSERBASE_CONNECT_URL.format(api_key=self.api_key, session_id=remote.id)
+            )
+            contexts = session.browser.contexts
+            session.context = contexts[0] if contexts else await session.browser.new_context()
+        else:
+            session.browser = await self._playwright.chromium.launch(headless=self.headless)
+            session.context = await session.browser.new_context(user_agent=self.user_agent)
+
+        if self.block_resources:
+            await session.context.route('**/*', self._route)
+
+        session.pages_served = 0
+        session.opened_at = session.last_used = time.monotonic()
+        self.stats['sessions_opened'] += 1
+        logger.info("Browser session %d opened (%s%s)", session.index, self.backend,
+                    f" {session.remote_id}" if session.remote_id else "")
+
+    async def _close_session(self, session: _Session):
+        if session.browser is None:
+            return
+        browser, remote_id = session.browser, session.remote_id
+        session.browser = session.context = session.remote_id = None
+        self.stats['session_seconds'] += time.monotonic() - session.opened_at
+
+        try:
+            await browser.close()
+        except Exception:
+            pass
+        if remote_id:
+            try:
+                await asyncio.to_thread(self._bb.sessions.delete, remote_id)
+            except Exception as e:
+                logger.debug("Could not release Browserbase session %s: %s", remote_id, e)
+        logger.info("Browser session %d released", session.index)
+
+    def _pick_session(self) -> _Session:
+        available = [s for s in self._sessions if s.active < self.pages_per_session]
+        # Fill open (or opening) sessions before paying for a new one
+        warm = [s for s in available if s.is_open or s.active]
+        return min(warm or available, key=lambda s: s.active)
+
+    async def _reap_idle(self):
+        interval = max(1.0, min(self.idle_release, 15.0))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for session in self._sessions:
+                if session.is_open and session.active == 0 and now - session.last_used > self.idle_release:
+                    async with session.lock:
+                        if session.active == 0:
+                            await self._close_session(session)
+
+    # ------------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a fresh page in a pooled session; it is closed on exit"""
+        if self._playwright is None:
+            await self.start()
+
+        async with self._slots:
+            session = self._pick_session()
+            session.active += 1
+            try:
+                async with session.lock:
+                    if not session.is_open:
+                        await self._close_session(session)
+                        await self._open_session(session)
+                    page = await session.context.new_page()
+                self.stats['pages'] += 1
+
+                try:
+                    yield page
+                finally:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+            finally:
+                session.active -= 1
+                session.pages_served += 1
+                session.last_used = time.monotonic()
+                if session.active == 0 and session.pages_served >= self.max_pages_per_session:
+                    async with session.lock:
+                        await self._close_session(session)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.per_host_rate, self.per_host_burst)
+        return bucket
+
+    async def goto(self, page, url: str, wait_until: str = "domcontentloaded", timeout: int = 60000):
+        """Navigate once the host's politeness budget allows it"""
+        await self._bucket(urlsplit(url).netloc).acquire()
+        self.stats['navigations'] += 1
+        return await page.goto(url, wait_until=wait_until, timeout=timeout)
+
+    async def map(self, fn, items: Iterable, *args, **kwargs) -> List:
+        """
+        Run `await fn(pool, item, *args, **kwargs)` for every item concurrently
+
+        Concurrency is bounded by sessions x pages_per_session (fn borrows pages
+        via pool.page()). Exceptions are logged and returned as None.
+
+        Returns:
+            Results in input order
+        """
+        async def _one(item):
+            try:
+                return await fn(self, item, *args, **kwargs)
+            except Exception as e:
+                logger.warning("Browser task failed for %s: %s", item, e)
+                return None
+
+        return await asyncio.gather(*(_one(item) for item in items))
+
+    def summary(self) -> str:
+        open_seconds = sum(time.monotonic() - s.opened_at for s in self._sessions if s.is_open)
+        minutes = (self.stats['session_seconds'] + open_seconds) / 60
+        return (f"{self.stats['pages']} pages over {self.stats['sessions_opened']} session(s), "
+                f"{self.stats['blocked_requests']} requests blocked, {minutes:.1f} session minutes")
+
+
+def run_with_pool(fn, *args, pool_kwargs: Optional[Dict] = None, **kwargs):
+    """Synchronous helper: run `await fn(pool, *args, **kwargs)` with a short-lived BrowserPool"""
+    async def _run():
+        async with BrowserPool(**(pool_kwargs or {})) as pool:
+            result = await fn(pool, *args, **kwargs)
+            print(f"🌐 Browser pool: {pool.summary()}")
+            return result
+
+    return asyncio.run(_run())
+
+
+def map_pages(fn, items: Iterable, **pool_kwargs) -> List:
+    """Synchronous helper: BrowserPool.map with a short-lived pool"""
+    async def _map(pool):
+        return await pool.map(fn, items)
+
+    return run_with_pool(_map, pool_kwargs=pool_kwargs)
+
+
+class BackgroundBrowserPool:
+    """BrowserPool on a private event-loop thread, shared by synchronous callers"""
+
+    def __init__(self, **pool_kwargs):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='browser-pool', daemon=True)
+        self._thread.start()
+        self.pool = BrowserPool(**pool_kwargs)
+        self._call(self.pool.start())
+
+    def _call(self, coro, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def run(self, fn, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Run `await fn(pool, *args, **kwargs)` on the pool's loop and wait for the result
+
+        Safe to call from many threads at once; their pages run concurrently.
+        """
+        return self._call(fn(self.pool, *args, **kwargs), timeout)
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        try:
+            self._call(self.pool.close(), timeout=60)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+
+
+_shared_pool: Optional[BackgroundBrowserPool] = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool(**pool_kwargs) -> BackgroundBrowserPool:
+    """
+    Process-wide background pool (created on first call, released at exit)
+
+    pool_kwargs only apply to the call that creates it.
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = BackgroundBrowserPool(**pool_kwargs)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
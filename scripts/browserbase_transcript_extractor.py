@@ -2,299 +2,324 @@
 """
 YouTube Transcript Extractor using Browserbase
 Bypasses IP blocks using real browser automation
+Sessions are pooled and reused across videos (see browser_pool.py)
 """
 
 import os
+import sys
 import json
-import time
+import math
 from pathlib import Path
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
-from browserbase import Browserbase
-from playwright.sync_api import sync_playwright
 
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from browser_pool import BrowserPool, BackgroundBrowserPool, shared_pool, map_pages
+
+# Extended session timeout (10 minutes for long videos); pages share sessions.
+# The shared default pool runs at most sessions * pages_per_session (3) videos
+# at once; multi-threaded callers should size their own with pool_for_workers.
+POOL_KWARGS = {
+    'sessions': 1,
+    'pages_per_session': 3,
+    'session_timeout': 600,
+    'per_host_rate': 1.0
+}
+
+SEGMENTS_JS = """
+els => els.map(el => ({
+    timestamp: (el.querySelector('.segment-timestamp') || {}).innerText || '',
+    text: (el.querySelector('.segment-text') || {}).innerText || ''
+}))
+"""
+
+COMMENTS_JS = """
+els => els.map(el => ({
+    author: (el.querySelector('#author-text') || {}).innerText || '',
+    text: (el.querySelector('#content-text') || {}).innerText || '',
+    likes: (el.querySelector('#vote-count-middle') || {}).innerText || ''
+}))
+"""
+
+
+def pool_for_workers(workers: int, **pool_kwargs) -> BackgroundBrowserPool:
+    """
+    Background pool with one page slot per worker thread
 
-def extract_youtube_transcript(video_id: str) -> dict:
+    Pages are packed pages_per_session to a session, so `workers` threads keep
+    as many videos in flight as they did with one session each. Close it when
+    the batch is done.
+    """
+    kwargs = {**POOL_KWARGS, **pool_kwargs}
+    kwargs['sessions'] = max(1, math.ceil(workers / kwargs['pages_per_session']))
+    return BackgroundBrowserPool(**kwargs)
+
+
+def pool_capacity(pool: BackgroundBrowserPool) -> int:
+    """Videos a background pool can extract at once"""
+    return pool.pool.max_sessions * pool.pool.pages_per_session
+
+
+def extract_youtube_transcript(video_id: str, pool: Optional[BackgroundBrowserPool] = None) -> dict:
     """
     Extract YouTube transcript using Browserbase browser automation
 
+    Sessions come from a process-wide pool, so consecutive calls (and calls
+    from several worker threads) reuse the same Browserbase sessions.
+
     Args:
         video_id: YouTube video ID
+        pool: Background pool to use (default: shared_pool(**POOL_KWARGS))
 
     Returns:
         dict with transcript data
     """
+    return (pool or shared_pool(**POOL_KWARGS)).run(scrape_youtube_transcript, video_id)
 
-    api_key = os.getenv('BROWSERBASE_API_KEY')
-    project_id = os.getenv('BROWSERBASE_PROJECT_ID')
 
-    if not api_key or not project_id:
-        raise ValueError("Browserbase credentials not found in .env")
-
-    print(f"🌐 Starting Browserbase session...")
-    print(f"📹 Video ID: {video_id}")
+def extract_youtube_transcripts(video_ids: List[str], **pool_kwargs) -> Dict[str, dict]:
+    """
+    Extract many transcripts concurrently over a short-lived pool
 
-    # Initialize Browserbase
-    bb = Browserbase(api_key=api_key)
+    Returns:
+        {video_id: result} in the extract_youtube_transcript format
+    """
+    results = map_pages(scrape_youtube_transcript, video_ids, **{**POOL_KWARGS, **pool_kwargs})
+    return {
+        video_id: result or {'video_id': video_id, 'error': 'Browser task failed', 'status': 'error'}
+        for video_id, result in zip(video_ids, results)
+    }
 
-    # Create a session with extended timeout (10 minutes for long videos)
-    session = bb.sessions.create(
-        project_id=project_id,
-        timeout=600  # 10 minutes in seconds
-    )
-    session_id = session.id
 
-    print(f"✅ Session created: {session_id} (timeout: 10min)")
+async def scrape_youtube_transcript(pool: BrowserPool, video_id: str) -> dict:
+    """Transcript, metadata and top comments for one video on a pooled page"""
+    print(f"📹 Video ID: {video_id}")
 
     video_url = f"https://www.youtube.com/watch?v={video_id}"
 
-    try:
-        with sync_playwright() as playwright:
-            # Connect to Browserbase session
-            browser = playwright.chromium.connect_over_cdp(
-                f"wss://connect.browserbase.com?apiKey={api_key}&sessionId={session_id}"
-            )
-
-            context = browser.contexts[0]
-            page = context.pages[0]
+    async with pool.page() as page:
+        print(f"🔗 Navigating to: {video_url}")
+        await pool.goto(page, video_url, timeout=30000)
 
-            print(f"🔗 Navigating to: {video_url}")
-            page.goto(video_url, wait_until="domcontentloaded", timeout=30000)
+        # Wait for page to load
+        await page.wait_for_timeout(3000)
 
-            # Wait for page to load
-            time.sleep(3)
+        print(f"📄 Looking for transcript button...")
 
-            print(f"📄 Looking for transcript button...")
-
-            # Try to click "Show transcript" button
-            try:
-                # Look for the transcript button (multiple selectors as YouTube layout changes)
-                selectors = [
-                    'button[aria-label*="transcript" i]',
-                    'button[aria-label*="Show transcript" i]',
-                    'ytd-engagement-panel-title-header-renderer button',
-                    '#primary-button button'
-                ]
-
-                clicked = False
-                for selector in selectors:
+        # Try to click "Show transcript" button
+        try:
+            # Look for the transcript button (multiple selectors as YouTube layout changes)
+            selectors = [
+                'button[aria-label*="transcript" i]',
+                'button[aria-label*="Show transcript" i]',
+                'ytd-engagement-panel-title-header-renderer button',
+                '#primary-button button'
+            ]
+
+            clicked = False
+            for selector in selectors:
+                try:
+                    button = await page.wait_for_selector(selector, timeout=5000)
+                    if button and 'transcript' in ((await button.get_attribute('aria-label')) or '').lower():
+                        await button.click()
+                        clicked = True
+                        print(f"✅ Clicked transcript button")
+                        break
+                except:
+                    continue
+
+            if not clicked:
+                # Try alternative: look for "...more" button first
+                try:
+                    more_button = await page.wait_for_selector('#expand', timeout=3000)
+                    if more_button:
+                        await more_button.click()
+                        await page.wait_for_timeout(1000)
+                except:
+                    pass
+
+                # Then try Show transcript
+                try:
+                    transcript_button = page.locator('text=/show transcript/i').first
+                    await transcript_button.click()
+                    clicked = True
+                    print(f"✅ Clicked transcript button (alt method)")
+                except:
+                    pass
+
+            if clicked:
+                await page.wait_for_timeout(2000)
+
+                # Extract transcript segments
+                print(f"📝 Extracting transcript segments...")
+
+                # Transcript segments are in ytd-transcript-segment-renderer
+                # One round trip for all segments instead of two per segment
+                segments = await page.locator('ytd-transcript-segment-renderer').evaluate_all(SEGMENTS_JS)
+
+                transcript_data = []
+                for segment in segments:
                     try:
-                        button = page.wait_for_selector(selector, timeout=5000)
-                        if button and 'transcript' in button.get_attribute('aria-label').lower():
-                            button.click()
-                            clicked = True
-                            print(f"✅ Clicked transcript button")
-                            break
+                        timestamp_text = segment['timestamp'] or "0:00"
+                        text = segment['text'] or ""
+
+                        # Convert timestamp to seconds
+                        time_parts = timestamp_text.strip().split(':')
+                        if len(time_parts) == 2:
+                            start_seconds = int(time_parts[0]) * 60 + int(time_parts[1])
+                        else:
+                            start_seconds = 0
+
+                        transcript_data.append({
+                            'text': text.strip(),
+                            'start': start_seconds,
+                            'duration': 0  # Duration not available
+                        })
                     except:
                         continue
 
-                if not clicked:
-                    # Try alternative: look for "...more" button first
+                if transcript_data:
+                    print(f"✅ Extracted {len(transcript_data)} segments")
+
+                    # Get video title
                     try:
-                        more_button = page.wait_for_selector('#expand', timeout=3000)
-                        if more_button:
-                            more_button.click()
-                            time.sleep(1)
+                        title_elem = page.locator('h1.ytd-watch-metadata yt-formatted-string').first
+                        title = await title_elem.inner_text() if title_elem else "Unknown Title"
                     except:
-                        pass
+                        title = "Unknown Title"
 
-                    # Then try Show transcript
+                    # Get channel name
                     try:
-                        transcript_button = page.locator('text=/show transcript/i').first
-                        transcript_button.click()
-                        clicked = True
-                        print(f"✅ Clicked transcript button (alt method)")
+                        channel_elem = page.locator('ytd-channel-name a').first
+                        channel = await channel_elem.inner_text() if channel_elem else "Unknown Channel"
                     except:
-                        pass
+                        channel = "Unknown Channel"
 
-                if clicked:
-                    time.sleep(2)
-
-                    # Extract transcript segments
-                    print(f"📝 Extracting transcript segments...")
-
-                    # Transcript segments are in ytd-transcript-segment-renderer
-                    segments = page.locator('ytd-transcript-segment-renderer').all()
+                    # Extract video metadata
+                    try:
+                        view_count_elem = page.locator('span.view-count').first
+                        views = await view_count_elem.inner_text() if view_count_elem else "0"
+                    except:
+                        views = "0"
 
-                    transcript_data = []
-                    for segment in segments:
-                        try:
-                            # Get timestamp
-                            timestamp_elem = segment.locator('.segment-timestamp').first
-                            timestamp_text = timestamp_elem.inner_text() if timestamp_elem else "0:00"
+                    # Scroll to load comments (optimized for speed)
+                    print(f"💬 Loading comments...")
+                    comments = []
+                    try:
+                        # Check if page is still alive before comment extraction
+                        if page.is_closed():
+                            print(f"⚠️  Page closed before comment extraction")
+                            comments = []
+                        else:
+                            # Initial scroll to comments section
+                            await page.evaluate("window.scrollTo(0, 800)")
+                            await page.wait_for_timeout(1000)
+
+                            # Try to load more comments by scrolling to bottom of comment section
+                            # and clicking "Show more" buttons (reduced to 3 attempts for speed)
+                            for attempt in range(3):
+                                try:
+                                    # Check page still alive before each scroll
+                                    if page.is_closed():
+                                        print(f"  ⚠️  Page closed during scroll attempt {attempt + 1}")
+                                        break
 
-                            # Get text
-                            text_elem = segment.locator('.segment-text').first
-                            text = text_elem.inner_text() if text_elem else ""
+                                    # Scroll to bottom of loaded comments
+                                    await page.evaluate("""
+                                        const comments = document.querySelector('ytd-comments#comments');
+                                        if (comments) {
+                                            comments.scrollIntoView({block: 'end', behavior: 'smooth'});
+                                        }
+                                    """)
+                                    await page.wait_for_timeout(1000)
 
-                            # Convert timestamp to seconds
-                            time_parts = timestamp_text.split(':')
-                            if len(time_parts) == 2:
-                                start_seconds = int(time_parts[0]) * 60 + int(time_parts[1])
+                                    # Try to click continuation button (Show more comments)
+                                    try:
+                                        continuation_button = page.locator('ytd-continuation-item-renderer button').first
+                                        if await continuation_button.is_visible(timeout=1000):
+                                            await continuation_button.click()
+                                            print(f"  🔄 Clicked 'Show more' (attempt {attempt + 1})")
+                                            await page.wait_for_timeout(1000)
+                                    except:
+                                        pass  # Button might not exist or not be visible
+                                except Exception as scroll_error:
+                                    print(f"  ⚠️  Scroll attempt {attempt + 1} failed: {scroll_error}")
+                                    break
+
+                            print(f"  📜 Attempted to load more comments...")
+
+                            # Extract top comments (limit to 100)
+                            if not page.is_closed():
+                                # One round trip for all comment fields
+                                all_comments = await page.locator('ytd-comment-thread-renderer').evaluate_all(COMMENTS_JS)
+                                print(f"  💬 Found {len(all_comments)} comment elements")
+                                comment_elements = all_comments[:100]
+
+                                for comment in comment_elements:
+                                    try:
+                                        author = comment['author'] or ""
+                                        text = comment['text'] or ""
+                                        likes_text = (comment['likes'] or "0").strip()
+                                        likes = int(likes_text.replace('K', '000').replace('M', '000000')) if likes_text and likes_text != "0" else 0
+
+                                        if text:
+                                            comments.append({
+                                                'author': author.strip(),
+                                                'text': text.strip(),
+                                                'likes': likes
+                                            })
+                                    except:
+                                        continue
+
+                                print(f"✅ Extracted {len(comments)} comments")
                             else:
-                                start_seconds = 0
-
-                            transcript_data.append({
-                                'text': text.strip(),
-                                'start': start_seconds,
-                                'duration': 0  # Duration not available
-                            })
-                        except:
-                            continue
-
-                    if transcript_data:
-                        print(f"✅ Extracted {len(transcript_data)} segments")
-
-                        # Get video title
-                        try:
-                            title_elem = page.locator('h1.ytd-watch-metadata yt-formatted-string').first
-                            title = title_elem.inner_text() if title_elem else "Unknown Title"
-                        except:
-                            title = "Unknown Title"
-
-                        # Get channel name
-                        try:
-                            channel_elem = page.locator('ytd-channel-name a').first
-                            channel = channel_elem.inner_text() if channel_elem else "Unknown Channel"
-                        except:
-                            channel = "Unknown Channel"
-
-                        # Extract video metadata
-                        try:
-                            view_count_elem = page.locator('span.view-count').first
-                            views = view_count_elem.inner_text() if view_count_elem else "0"
-                        except:
-                            views = "0"
-
-                        # Scroll to load comments (optimized for speed)
-                        print(f"💬 Loading comments...")
-                        comments = []
-                        try:
-                            # Check if page is still alive before comment extraction
-                            if page.is_closed():
                                 print(f"⚠️  Page closed before comment extraction")
-                                comments = []
-                            else:
-                                # Initial scroll to comments section
-                                page.evaluate("window.scrollTo(0, 800)")
-                                time.sleep(1)
-
-                                # Try to load more comments by scrolling to bottom of comment section
-                                # and clicking "Show more" buttons (reduced to 3 attempts for speed)
-                                for attempt in range(3):
-                                    try:
-                                        # Check page still alive before each scroll
-                                        if page.is_closed():
-                                            print(f"  ⚠️  Page closed during scroll attempt {attempt + 1}")
-                                            break
-
-                                        # Scroll to bottom of loaded comments
-                                        page.evaluate("""
-                                            const comments = document.querySelector('ytd-comments#comments');
-                                            if (comments) {
-                                                comments.scrollIntoView({block: 'end', behavior: 'smooth'});
-                                            }
-                                        """)
-                                        time.sleep(1)
-
-                                        # Try to click continuation button (Show more comments)
-                                        try:
-                                            continuation_button = page.locator('ytd-continuation-item-renderer button').first
-                                            if continuation_button.is_visible(timeout=1000):
-                                                continuation_button.click()
-                                                print(f"  🔄 Clicked 'Show more' (attempt {attempt + 1})")
-                                                time.sleep(1)
-                                        except:
-                                            pass  # Button might not exist or not be visible
-                                    except Exception as scroll_error:
-                                        print(f"  ⚠️  Scroll attempt {attempt + 1} failed: {scroll_error}")
-                                        break
+                    except Exception as e:
+                        print(f"⚠️  Could not extract comments: {e}")
+                        comments = []
 
-                                print(f"  📜 Attempted to load more comments...")
-
-                                # Extract top comments (limit to 100)
-                                if not page.is_closed():
-                                    all_comments = page.locator('ytd-comment-thread-renderer').all()
-                                    print(f"  💬 Found {len(all_comments)} comment elements")
-                                    comment_elements = all_comments[:100]
-
-                                    for comment_elem in comment_elements:
-                                        try:
-                                            author_elem = comment_elem.locator('#author-text').first
-                                            author = author_elem.inner_text() if author_elem else ""
-
-                                            text_elem = comment_elem.locator('#content-text').first
-                                            text = text_elem.inner_text() if text_elem else ""
-
-                                            likes_elem = comment_elem.locator('#vote-count-middle').first
-                                            likes_text = likes_elem.inner_text() if likes_elem else "0"
-                                            likes = int(likes_text.replace('K', '000').replace('M', '000000')) if likes_text and likes_text != "0" else 0
-
-                                            if text:
-                                                comments.append({
-                                                    'author': author.strip(),
-                                                    'text': text.strip(),
-                                                    'likes': likes
-                                                })
-                                        except:
-                                            continue
-
-                                    print(f"✅ Extracted {len(comments)} comments")
-                                else:
-                                    print(f"⚠️  Page closed before comment extraction")
-                        except Exception as e:
-                            print(f"⚠️  Could not extract comments: {e}")
-                            comments = []
+                    result = {
+                        'video_id': video_id,
+                        'title': title,
+                        'channel': channel,
+                        'views': views,
+                        'transcript': {
+                            'segments': transcript_data,
+                            'segment_count': len(transcript_data)
+                        },
+                        'comments': {
+                            'top_comments': comments,
+                            'count': len(comments)
+                        },
+                        'method': 'browserbase',
+                        'status': 'success'
+                    }
 
-                        result = {
-                            'video_id': video_id,
-                            'title': title,
-                            'channel': channel,
-                            'views': views,
-                            'transcript': {
-                                'segments': transcript_data,
-                                'segment_count': len(transcript_data)
-                            },
-                            'comments': {
-                                'top_comments': comments,
-                                'count': len(comments)
-                            },
-                            'method': 'browserbase',
-                            'status': 'success'
-                        }
-
-                        return result
-                    else:
-                        print(f"⚠️  No transcript segments found")
-                        return {
-                            'video_id': video_id,
-                            'error': 'No transcript segments extracted',
-                            'status': 'error'
-                        }
+                    return result
                 else:
-                    print(f"⚠️  Could not find transcript button")
+                    print(f"⚠️  No transcript segments found")
                     return {
                         'video_id': video_id,
-                        'error': 'Transcript button not found',
+                        'error': 'No transcript segments extracted',
                         'status': 'error'
                     }
-
-            except Exception as e:
-                print(f"❌ Error extracting transcript: {e}")
+            else:
+                print(f"⚠️  Could not find transcript button")
                 return {
                     'video_id': video_id,
-                    'error': str(e),
+                    'error': 'Transcript button not found',
                     'status': 'error'
                 }
 
-    finally:
-        # Clean up session
-        try:
-            bb.sessions.delete(session_id)
-            print(f"🧹 Session closed")
-        except:
-            pass
+        except Exception as e:
+            print(f"❌ Error extracting transcript: {e}")
+            return {
+                'video_id': video_id,
+                'error': str(e),
+                'status': 'error'
+            }
 
     return {
         'video_id': video_id,
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Bulk Upsert - Batched INSERT ... ON CONFLICT for the PostgreSQL collectors
+
+Replaces per-row `cursor.execute` loops with psycopg2's execute_values:
+- Rows go out as multi-row VALUES pages (one round trip per page)
+- Commits happen once per chunk instead of once per run (or per row)
+- A failing chunk is replayed row-by-row under savepoints, so one bad row
+  is reported and skipped without rolling back its neighbours
+- Duplicate conflict keys inside a batch are collapsed (last wins), which
+  Postgres would otherwise reject with "cannot affect row a second time"
+
+Usage:
+    result = bulk_upsert(
+        conn, 'external_content', EXTERNAL_CONTENT_COLUMNS, rows,
+        conflict_columns=['url'],
+        update_columns=['fetched_at', 'raw_score'],
+    )
+    print(result.saved, result.failed)
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_PAGE_SIZE = 250
+
+
+@dataclass
+class UpsertResult:
+    saved: int = 0
+    failed: int = 0
+    errors: List[Tuple[Any, str]] = field(default_factory=list)
+    returned: List[Any] = field(default_factory=list)
+    round_trips: int = 0
+
+
+def build_upsert_sql(
+    table: str,
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+    extra_set: Optional[Dict[str, str]] = None,
+    returning: Optional[str] = None,
+) -> str:
+    """
+    Build an INSERT ... VALUES %s ON CONFLICT statement for execute_values
+
+    Args:
+        table: Target table
+        columns: Inserted columns, in row order
+        conflict_columns: Unique key for ON CONFLICT
+        update_columns: Columns overwritten from EXCLUDED (None/empty = DO NOTHING)
+        extra_set: Raw SQL assignments added to the update, e.g. {"updated_at_db": "NOW()"}
+        returning: Optional RETURNING clause body, e.g. "id, repo_full_name"
+    """
+    assignments = [f"{col} = EXCLUDED.{col}" for col in (update_columns or [])]
+    assignments += [f"{col} = {expr}" for col, expr in (extra_set or {}).items()]
+
+    if assignments:
+        conflict = f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {', '.join(assignments)}"
+    else:
+        conflict = f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"
+
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s {conflict}"
+    if returning:
+        sql += f" RETURNING {returning}"
+    return sql
+
+
+def dedupe_rows(rows: Iterable[Sequence], key_indexes: Sequence[int]) -> List[Sequence]:
+    """Collapse rows sharing a conflict key; the last occurrence wins"""
+    by_key = {}
+    for row in rows:
+        by_key[tuple(row[i] for i in key_indexes)] = row
+    return list(by_key.values())
+
+
+def _chunks(rows: List, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def execute_batch_isolated(
+    conn,
+    sql: str,
+    rows: List[Sequence],
+    template: Optional[str] = None,
+    fetch: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    commit: bool = True,
+) -> UpsertResult:
+    """
+    Run an execute_values statement over rows in committed chunks
+
+    Each chunk runs under a savepoint. If it fails, the chunk is replayed one
+    row at a time (each under its own savepoint) and only the failing rows are
+    dropped and reported in `errors`.
+
+    Args:
+        conn: psycopg2 connection
+        sql: Statement with a single VALUES %s placeholder
+        rows: Row tuples
+        template: Optional execute_values row template
+        fetch: Collect RETURNING rows into `returned`
+        chunk_size: Rows per commit
+        page_size: Rows per VALUES page (per round trip)
+        commit: Commit after each chunk (False leaves the transaction to the caller)
+    """
+    result = UpsertResult()
+    if not rows:
+        return result
+
+    cursor = conn.cursor()
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            cursor.execute("SAVEPOINT bulk_chunk")
+            try:
+                returned = execute_values(cursor, sql, chunk, template=template,
+                                          page_size=page_size, fetch=fetch)
+                cursor.execute("RELEASE SAVEPOINT bulk_chunk")
+                result.saved += len(chunk)
+                result.round_trips += -(-len(chunk) // page_size)
+                if fetch:
+                    result.returned.extend(returned)
+
+            except Exception as chunk_error:
+                cursor.execute("ROLLBACK TO SAVEPOINT bulk_chunk")
+                logger.warning(f"Bulk chunk of {len(chunk)} rows failed ({chunk_error}); retrying row by row")
+
+                for row in chunk:
+                    cursor.execute("SAVEPOINT bulk_row")
+                    try:
+                        returned = execute_values(cursor, sql, [row], template=template, fetch=fetch)
+                        cursor.execute("RELEASE SAVEPOINT bulk_row")
+                        result.saved += 1
+                        if fetch:
+                            result.returned.extend(returned)
+                    except Exception as row_error:
+                        cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                        result.failed += 1
+                        result.errors.append((row, str(row_error).strip()))
+                    result.round_trips += 1
+
+            if commit:
+                conn.commit()
+    finally:
+        cursor.close()
+
+    return result
+
+
+def bulk_upsert(
+    conn,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+    extra_set: Optional[Dict[str, str]] = None,
+    returning: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    commit: bool = True,
+) -> UpsertResult:
+    """
+    Upsert rows into a table with batched execute_values + ON CONFLICT
+
+    Args:
+        conn: psycopg2 connection
+        table: Target table
+        columns: Column names, in row order
+        rows: Row tuples matching `columns`
+        conflict_columns: Unique key for ON CONFLICT (must be a subset of columns)
+        update_columns: Columns to overwrite on conflict (None = DO NOTHING)
+        extra_set: Raw SQL assignments added on conflict
+        returning: Optional RETURNING clause body
+        chunk_size: Rows per commit
+        page_size: Rows per round trip
+        commit: Commit after each chunk
+
+    Returns:
+        UpsertResult with saved/failed counts, (conflict key, error) pairs and RETURNING rows
+    """
+    key_indexes = [list(columns).index(col) for col in conflict_columns]
+    rows = dedupe_rows(rows, key_indexes)
+
+    sql = build_upsert_sql(table, columns, conflict_columns, update_columns, extra_set, returning)
+    result = execute_batch_isolated(conn, sql, rows, fetch=bool(returning),
+                                    chunk_size=chunk_size, page_size=page_size, commit=commit)
+
+    # Report failed rows by their conflict key rather than the full tuple
+    result.errors = [
+        (row[key_indexes[0]] if len(key_indexes) == 1 else tuple(row[i] for i in key_indexes), error)
+        for row, error in result.errors
+    ]
+    return result
+
+
+# ----------------------------------------------------------------------
+# external_content (RSS, NewsAPI and scraper collectors)
+# ----------------------------------------------------------------------
+
+EXTERNAL_CONTENT_COLUMNS = (
+    'content_id', 'source_id', 'title', 'url', 'author',
+    'published_at', 'fetched_at', 'content_type',
+    'content_text', 'content_length', 'tags', 'categories',
+    'raw_score', 'final_score',
+)
+
+
+def external_content_row(article: Dict, include_tags: bool = True) -> Tuple:
+    """Map a collector article dict onto EXTERNAL_CONTENT_COLUMNS"""
+    return (
+        article['content_id'],
+        article['source_id'],
+        article['title'],
+        article['url'],
+        article.get('author'),
+        article['published_at'],
+        article['fetched_at'],
+        article['content_type'],
+        article['content_text'],
+        article['content_length'],
+        json.dumps(article.get('tags', []) if include_tags else []),
+        json.dumps([article['category']]),
+        article['raw_score'],
+        article['raw_score'],  # Use raw_score as final_score for now
+    )
+
+
+def upsert_external_content(
+    conn,
+    articles: List[Dict],
+    update_columns: Sequence[str],
+    include_tags: bool = True,
+    commit: bool = True,
+) -> UpsertResult:
+    """
+    Upsert collector articles into external_content keyed on url
+
+    Args:
+        conn: psycopg2 connection
+        articles: Article dicts as produced by the collectors
+        update_columns: Columns refreshed when the url already exists
+        include_tags: Store article['tags'] (False stores an empty list)
+        commit: Commit after each chunk
+    """
+    rows = []
+    result = UpsertResult()
+    for article in articles:
+        try:
+            rows.append(external_content_row(article, include_tags=include_tags))
+        except (KeyError, TypeError) as e:
+            result.failed += 1
+            result.errors.append((article.get('url'), f"malformed article: {e}"))
+
+    upserted = bulk_upsert(conn, 'external_content', EXTERNAL_CONTENT_COLUMNS, rows,
+                           conflict_columns=['url'], update_columns=update_columns,
+                           commit=commit)
+    upserted.failed += result.failed
+    upserted.errors = result.errors + upserted.errors
+    return upserted
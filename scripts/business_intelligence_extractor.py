@@ -11,6 +11,8 @@ from typing import Dict, List, Optional
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from transcript_store import Transcript, get_library
+
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 
@@ -22,28 +24,35 @@ class BusinessIntelligenceExtractor:
         self.model = "claude-sonnet-4-20250514"
         self.workspace_dir = Path("/Users/yourox/AI-Workspace")
         self.transcripts_dir = self.workspace_dir / "data" / "transcripts"
+        self.transcripts = get_library(self.transcripts_dir)  # Shared header index and transcript cache
         self.insights_dir = self.workspace_dir / "data" / "business_insights"
         self.insights_dir.mkdir(parents=True, exist_ok=True)
 
-    def extract_insights(self, transcript_data: Dict) -> Dict:
+    def extract_insights(self, transcript: Transcript) -> Dict:
         """
         Extract comprehensive business intelligence from transcript
 
+        Only the first 8000 characters go into the prompt, so segments are
+        read lazily up to that point; the length check uses the cached header.
+
         Returns structured insights following the schema
         """
-        video_id = transcript_data.get('video_id')
-        title = transcript_data.get('title', '')
+        video_id = transcript.header.get('video_id') or transcript.video_id
+        title = transcript.title
 
-        # Get full transcript text
-        segments = transcript_data.get('transcript', {}).get('segments', [])
-        full_text = " ".join([seg.get('text', '') for seg in segments])
-
-        if not full_text or len(full_text) < 500:
+        text_length = transcript.header['text_chars']
+        if text_length < 500:
             return {"error": "Transcript too short for analysis"}
 
+        # Prompt excerpt
+        full_text = transcript.head_text(8000)
+
         # Get comments data
-        comments_data = transcript_data.get('comments', {})
-        top_comments = comments_data.get('top_comments', [])
+        comments_data = transcript.comments()
+        if isinstance(comments_data, dict):
+            top_comments = comments_data.get('top_comments', [])
+        else:
+            top_comments = comments_data or []
         has_comments = len(top_comments) > 0
 
         print(f"  🧠 Analyzing: {title[:60]}...")
@@ -297,7 +306,7 @@ IMPORTANT:
                     'title': title,
                     'extracted_at': __import__('datetime').datetime.now().isoformat(),
                     'model': self.model,
-                    'transcript_length': len(full_text),
+                    'transcript_length': text_length,
                     'processing_time_seconds': elapsed
                 }
 
@@ -327,12 +336,8 @@ IMPORTANT:
             with open(insights_file, 'r') as f:
                 return json.load(f)
 
-        # Load transcript
-        with open(transcript_file, 'r') as f:
-            transcript_data = json.load(f)
-
-        # Extract insights
-        insights = self.extract_insights(transcript_data)
+        # Extract insights (header + lazily read segments, no full parse)
+        insights = self.extract_insights(self.transcripts.get(video_id))
 
         if 'error' not in insights:
             # Save insights
@@ -396,6 +401,8 @@ IMPORTANT:
                 print(f"    ❌ Exception: {e}")
                 results['errors'] += 1
 
+        self.transcripts.save_index()
+
         total_time = time.time() - start_time
         print(f"\n{'='*70}")
         print(f"✅ EXTRACTION COMPLETE")
@@ -13,6 +13,7 @@ from collections import defaultdict
 sys.path.insert(0, str(Path(__file__).parent))
 
 from coding_history_core import CodingHistoryDB, CompressionManager
+from coding_history_search import ChunkReader
 from coding_history_capture_async import get_capture_manager
 
 
@@ -28,6 +29,7 @@ def format_size(bytes):
 def main():
     db = CodingHistoryDB()
     compression = CompressionManager()
+    reader = ChunkReader(fallback=compression.decompress_chunk)
     capture = get_capture_manager()
 
     print("\n" + "=" * 60)
@@ -162,7 +164,7 @@ def main():
                 # Try to show preview for small entries
                 if size < 200 and row[5]:
                     try:
-                        content = compression.decompress_chunk(row[5])
+                        content = reader.read(row[5])
                         preview = content[:100].replace('\n', ' ')
                         if len(preview) > 80:
                             preview = preview[:80] + "..."
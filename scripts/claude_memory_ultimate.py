@@ -3,11 +3,21 @@
 Claude Ultimate Memory System - DUAL-LAYER ARCHITECTURE (Thread-Safe)
 Combines JSON (fast/reliable) with Mem0 (semantic/vast)
 FIXED: Threading issues resolved
+
+JSON layer storage: append-only JSONL log (memories.jsonl) replayed into an
+in-memory token + type index on startup. Saves are single-line appends,
+searches are index lookups, and a background thread compacts the log once
+superseded records pile up. A legacy memories.json is migrated on first run.
 """
 
 import os
+import re
 import sys
 import json
+import time
+import fcntl
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
@@ -31,6 +41,14 @@ except ImportError:
     MEM0_AVAILABLE = False
     print("⚠️  Mem0 not available, running in JSON-only mode")
 
+JSON_DIR = Path("/Users/yourox/AI-Workspace/data/claude_memory_json")
+MEM0_DIR = Path("/Users/yourox/AI-Workspace/data/claude_memory_qdrant")
+
+TOKEN_RE = re.compile(r'\w+')
+LOG_COMPACT_INTERVAL = 300      # seconds between background compaction checks
+LOG_COMPACT_MIN_GARBAGE = 200   # superseded log records before compaction is worthwhile
+CONTAINING_CACHE_SIZE = 256     # query words whose matching vocabulary tokens are cached
+
 
 class ThreadSafeMemory:
     """Thread-safe wrapper for Mem0"""
@@ -65,16 +83,29 @@ class UltimateMemorySystem:
     - Layer 2 (Mem0): Semantic search, unlimited scale
     """
     
-    def __init__(self, user_id: str = "yourox_default"):
+    def __init__(self, user_id: str = "yourox_default", json_dir: Path = JSON_DIR, mem0_dir: Path = MEM0_DIR):
         self.user_id = user_id
         
         # Layer 1: JSON paths
-        self.json_dir = Path("/Users/yourox/AI-Workspace/data/claude_memory_json")
-        self.json_file = self.json_dir / "memories.json"
+        self.json_dir = Path(json_dir)
+        self.json_file = self.json_dir / "memories.json"  # legacy snapshot, migrated once
+        self.json_log = self.json_dir / "memories.jsonl"
+        self.json_lock = self.json_dir / "memories.lock"
         self.json_index = self.json_dir / "index.json"
+
+        # In-memory state rebuilt from the log
+        self._lock = threading.RLock()
+        self._memories: List[Dict] = []
+        self._by_id: Dict[int, int] = {}            # memory id -> position
+        self._tokens: Dict[str, List[int]] = {}     # token -> positions
+        self._types: Dict[str, List[int]] = {}      # memory type -> positions
+        self._containing: Dict[str, set] = {}       # query word -> vocabulary tokens containing it
+        self._log_offset = 0
+        self._log_inode = None
+        self._log_records = 0
         
         # Layer 2: Mem0 paths
-        self.mem0_dir = Path("/Users/yourox/AI-Workspace/data/claude_memory_qdrant")
+        self.mem0_dir = Path(mem0_dir)
         
         # Create directories
         self.json_dir.mkdir(parents=True, exist_ok=True)
@@ -98,14 +129,22 @@ class UltimateMemorySystem:
             print("✓ JSON layer initialized")
         
         print(f"✓ User: {user_id}")
-        print(f"✓ JSON: {self.json_file}")
+        print(f"✓ JSON: {self.json_log}")
         if self.mem0_enabled:
             print(f"✓ Mem0: {self.mem0_dir} (Thread-Safe)")
+
+        self._start_compactor()
     
     def _init_json_layer(self):
         """Initialize JSON storage"""
-        if not self.json_file.exists():
-            self._save_json([])
+        with self._locked_log():
+            if not self.json_log.exists():
+                legacy = []
+                if self.json_file.exists():
+                    with open(self.json_file, 'r') as f:
+                        legacy = json.load(f)
+                self._rewrite_log(legacy)
+            self._reload()
         
         if not self.json_index.exists():
             self._save_index({
@@ -152,17 +191,182 @@ class UltimateMemorySystem:
         # Use thread-safe wrapper
         self.mem0 = ThreadSafeMemory(config)
     
+    @contextmanager
+    def _locked_log(self):
+        """Exclusive access to the log across threads and processes"""
+        with self._lock:
+            with open(self.json_lock, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reload(self):
+        """Rebuild the in-memory state by replaying the whole log"""
+        self._memories = []
+        self._by_id = {}
+        self._tokens = {}
+        self._types = {}
+        self._containing = {}
+        self._log_offset = 0
+        self._log_records = 0
+        self._log_inode = os.stat(self.json_log).st_ino
+        self._replay_from_offset()
+
+    def _catch_up(self):
+        """Apply records appended by other processes since the last read"""
+        with self._lock:
+            try:
+                stat = os.stat(self.json_log)
+            except FileNotFoundError:
+                return
+            if stat.st_ino != self._log_inode or stat.st_size < self._log_offset:
+                # Compacted (replaced) by another process
+                self._reload()
+            elif stat.st_size > self._log_offset:
+                self._replay_from_offset()
+
+    def _replay_from_offset(self):
+        """Apply complete log lines from the current offset to EOF"""
+        with open(self.json_log, 'rb') as f:
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # partial line still being written
+                self._log_offset += len(line)
+                if line.strip():
+                    self._apply(json.loads(line))
+
+    def _apply(self, record: Dict):
+        """Apply one log record to the in-memory state"""
+        self._log_records += 1
+        if record.get('op') == 'add':
+            memory = record['memory']
+            position = len(self._memories)
+            self._memories.append(memory)
+            self._by_id[memory.get('id')] = position
+            self._index_memory(position, memory)
+        elif record.get('op') == 'update':
+            position = self._by_id.get(record.get('id'))
+            if position is not None:
+                self._memories[position].update(record.get('fields', {}))
+
+    def _index_memory(self, position: int, memory: Dict):
+        """Add a memory to the token and type indexes"""
+        for token in set(TOKEN_RE.findall(memory.get('text', '').lower())):
+            postings = self._tokens.get(token)
+            if postings is None:
+                postings = self._tokens[token] = []
+                for word, tokens in self._containing.items():
+                    if word in token:
+                        tokens.add(token)
+            postings.append(position)
+        self._types.setdefault(memory.get('type', 'conversation'), []).append(position)
+
+    def _append(self, records: List[Dict]):
+        """Append records to the log (caller holds _locked_log and has caught up)"""
+        data = b''.join(json.dumps(r, ensure_ascii=False).encode('utf-8') + b'\n' for r in records)
+        with open(self.json_log, 'ab') as f:
+            f.write(data)
+            f.flush()
+        self._log_offset += len(data)
+        for record in records:
+            self._apply(record)
+
+    def _rewrite_log(self, memories: List[Dict]):
+        """Atomically replace the log with one add record per memory"""
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.json_dir), prefix=".memories.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for memory in memories:
+                    record = {"op": "add", "memory": memory}
+                    f.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.json_log)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def compact(self) -> int:
+        """
+        Rewrite the log without superseded records
+
+        Returns:
+            Number of records dropped
+        """
+        with self._locked_log():
+            self._catch_up()
+            garbage = self._log_records - len(self._memories)
+            if garbage <= 0:
+                return 0
+            self._rewrite_log(self._memories)
+            self._reload()
+            return garbage
+
+    def _start_compactor(self):
+        """Background thread that compacts the log once enough records are superseded"""
+        def run():
+            while True:
+                time.sleep(LOG_COMPACT_INTERVAL)
+                try:
+                    if self._log_records - len(self._memories) >= LOG_COMPACT_MIN_GARBAGE:
+                        self.compact()
+                except Exception as e:
+                    print(f"⚠️  Memory log compaction failed: {e}")
+
+        threading.Thread(target=run, name="memory-log-compactor", daemon=True).start()
+
+    def _tokens_containing(self, word: str) -> set:
+        """Vocabulary tokens that contain word (cached, kept current on insert)"""
+        tokens = self._containing.get(word)
+        if tokens is None:
+            tokens = {token for token in self._tokens if word in token}
+            if len(self._containing) >= CONTAINING_CACHE_SIZE:
+                self._containing.clear()
+            self._containing[word] = tokens
+        return tokens
+
+    def _search(self, query_lower: str) -> List[Dict]:
+        """
+        Memories whose text contains query_lower, oldest first
+
+        Candidates come from the token index (every word of the query must
+        sit inside some token of the memory) and are then verified with the
+        same substring test as a full scan.
+        """
+        words = set(TOKEN_RE.findall(query_lower))
+        if words:
+            candidates = None
+            for word in sorted(words, key=len, reverse=True):
+                positions = set()
+                for token in self._tokens_containing(word):
+                    positions.update(self._tokens[token])
+                candidates = positions if candidates is None else candidates & positions
+                if not candidates:
+                    return []
+            positions = sorted(candidates)
+        else:
+            positions = range(len(self._memories))
+
+        return [
+            self._memories[p] for p in positions
+            if query_lower in self._memories[p]['text'].lower()
+        ]
+
     def _load_json(self) -> List[Dict]:
-        """Load memories from JSON"""
-        if not self.json_file.exists():
-            return []
-        with open(self.json_file, 'r') as f:
-            return json.load(f)
-    
-    def _save_json(self, memories: List[Dict]):
-        """Save memories to JSON"""
-        with open(self.json_file, 'w') as f:
-            json.dump(memories, f, indent=2)
+        """All memories, oldest first (current with the log)"""
+        self._catch_up()
+        return list(self._memories)
+
+    def get_memories_by_type(self, memory_type: str, limit: int = 15) -> List[Dict]:
+        """Most recent memories of one type, oldest first"""
+        with self._lock:
+            self._catch_up()
+            positions = self._types.get(memory_type, [])
+            return [self._memories[p] for p in positions[-limit:]]
     
     def _load_index(self) -> Dict:
         """Load index metadata"""
@@ -185,25 +389,26 @@ class UltimateMemorySystem:
         """
         timestamp = datetime.now().isoformat()
         
-        # Layer 1: Save to JSON (always succeeds)
-        json_memories = self._load_json()
-        new_memory = {
-            "id": len(json_memories) + 1,
-            "text": text,
-            "type": memory_type,
-            "timestamp": timestamp,
-            "user_id": self.user_id,
-            "synced_to_mem0": False
-        }
-        json_memories.append(new_memory)
-        self._save_json(json_memories)
-        
-        # Update index
-        index = self._load_index()
-        index["total_memories"] = len(json_memories)
-        index["last_updated"] = timestamp
-        index["mem0_enabled"] = self.mem0_enabled
-        self._save_index(index)
+        # Layer 1: Append to the JSON log (always succeeds)
+        with self._locked_log():
+            self._catch_up()
+            new_memory = {
+                "id": len(self._memories) + 1,
+                "text": text,
+                "type": memory_type,
+                "timestamp": timestamp,
+                "user_id": self.user_id,
+                "synced_to_mem0": False
+            }
+            self._append([{"op": "add", "memory": new_memory}])
+            total_memories = len(self._memories)
+
+            # Update index
+            index = self._load_index()
+            index["total_memories"] = total_memories
+            index["last_updated"] = timestamp
+            index["mem0_enabled"] = self.mem0_enabled
+            self._save_index(index)
         
         # Layer 2: Save to Mem0 (if available) - Thread-Safe
         mem0_status = "skipped"
@@ -219,8 +424,9 @@ class UltimateMemorySystem:
                         "json_id": new_memory["id"]
                     }
                 )
-                new_memory["synced_to_mem0"] = True
-                self._save_json(json_memories)  # Update sync status
+                with self._locked_log():  # Update sync status
+                    self._catch_up()
+                    self._append([{"op": "update", "id": new_memory["id"], "fields": {"synced_to_mem0": True}}])
                 mem0_count = len(result.get('results', [])) if isinstance(result, dict) else 1
                 mem0_status = "synced"
             except Exception as e:
@@ -250,19 +456,21 @@ class UltimateMemorySystem:
             Formatted context string
         """
         # Layer 1: JSON (fast path)
-        json_memories = self._load_json()
-        
-        if not json_memories:
-            return self._format_empty_context()
-        
-        # If no query, just return recent from JSON
-        if not query:
-            recent = json_memories[-limit:]
-            return self._format_context(recent, len(json_memories), "JSON (Recent)")
-        
-        # Text search in JSON
-        query_lower = query.lower()
-        json_matches = [m for m in json_memories if query_lower in m['text'].lower()]
+        with self._lock:
+            self._catch_up()
+            total = len(self._memories)
+            
+            if not total:
+                return self._format_empty_context()
+            
+            # If no query, just return recent from JSON
+            if not query:
+                recent = self._memories[-limit:]
+                return self._format_context(recent, total, "JSON (Recent)")
+            
+            # Text search in JSON (token index lookup)
+            json_matches = self._search(query.lower())
+            fallback = self._memories[-limit:]
         
         # Layer 2: Mem0 semantic search (if available and requested)
         mem0_matches = []
@@ -278,10 +486,10 @@ class UltimateMemorySystem:
         if mem0_matches:
             combined_text = f"JSON matches: {len(json_matches)}, Mem0 semantic: {len(mem0_matches)}"
             display_memories = json_matches[-limit:] if json_matches else []
-            return self._format_context(display_memories, len(json_memories), combined_text)
+            return self._format_context(display_memories, total, combined_text)
         else:
-            display_memories = json_matches[-limit:] if json_matches else json_memories[-limit:]
-            return self._format_context(display_memories, len(json_memories), "JSON Search")
+            display_memories = json_matches[-limit:] if json_matches else fallback
+            return self._format_context(display_memories, total, "JSON Search")
     
     def _format_context(self, memories: List[Dict], total: int, source: str) -> str:
         """Format memories as context string"""
@@ -349,7 +557,8 @@ No memories stored yet. Use save command to add your first memory!
             "total_memories": len(json_memories),
             "synced_to_mem0": synced_count,
             "mem0_enabled": self.mem0_enabled,
-            "json_path": str(self.json_file),
+            "log_records": self._log_records,
+            "json_path": str(self.json_log),
             "mem0_path": str(self.mem0_dir) if self.mem0_enabled else None
         }
 
@@ -361,6 +570,7 @@ def main():
         print("  python claude_memory_ultimate_v2.py load [query]")
         print("  python claude_memory_ultimate_v2.py save 'memory text'")
         print("  python claude_memory_ultimate_v2.py stats")
+        print("  python claude_memory_ultimate_v2.py compact")
         sys.exit(1)
     
     command = sys.argv[1]
@@ -392,6 +602,10 @@ def main():
         if stats['mem0_path']:
             print(f"   Mem0 path: {stats['mem0_path']}")
     
+    elif command == "compact":
+        dropped = mem.compact()
+        print(f"✓ Compacted memory log ({dropped} superseded records dropped)")
+    
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
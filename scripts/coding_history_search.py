@@ -0,0 +1,732 @@
+#!/usr/bin/env python3
+"""
+Coding History Search - FTS5 sidecar index and cached chunk reader
+
+Terminal output chunks are stored as one small .zst file each, so every
+search used to decompress every candidate chunk. This module adds:
+- A SQLite FTS5 sidecar (data/coding_history/search_index.db) holding the
+  full command / output / error text of each chunk, populated incrementally
+  from the history DB as chunks are captured (large backlogs are indexed in
+  a background thread; searches scan the history DB until it catches up)
+- The same sidecar for the read-only session log (.coding_history.db), so
+  `command LIKE` searches hit the trigram index instead of scanning
+- Shared zstd dictionaries trained over the small chunk files, which shrink
+  and speed up tiny frames
+- A bounded LRU of decompressed chunks for repeated reads
+
+The FTS tables use the trigram tokenizer when SQLite supports it, so
+`LIKE '%query%'` keeps its exact substring semantics while using the index.
+
+Usage:
+    python3 coding_history_search.py sync                 # index new chunks
+    python3 coding_history_search.py sync-sessions        # index the session log
+    python3 coding_history_search.py train-dict [--recompress]
+    python3 coding_history_search.py search "ModuleNotFoundError"
+    python3 coding_history_search.py stats
+"""
+
+import os
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+import logging
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+from server_metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+WORKSPACE_DIR = Path("/Users/yourox/AI-Workspace")
+DATA_DIR = WORKSPACE_DIR / "data" / "coding_history"
+OUTPUTS_DIR = DATA_DIR / "outputs"
+DICT_DIR = DATA_DIR / "dictionaries"
+INDEX_DB_PATH = DATA_DIR / "search_index.db"
+SESSION_LOG_PATH = Path.home() / "AI-Workspace" / ".coding_history.db"
+
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+ZSTD_LEVEL = 3
+
+SMALL_CHUNK_BYTES = 4096      # chunk files at or below this size train/use the dictionary
+DICT_SIZE = 16 * 1024
+MIN_DICT_SAMPLES = 100
+
+INDEX_VERSION = 2             # 2: full chunk text (1 kept only the first 8000 chars)
+PREVIEW_CHARS = 8000          # text returned per search result
+SYNC_BATCH = 500              # chunks per sync transaction; also the inline-sync budget
+
+CACHE_ENTRIES = 512
+CACHE_BYTES = 32 * 1024 * 1024
+QUERY_CACHE_ENTRIES = 128
+
+
+def _write_bytes_atomic(path: Path, data: bytes):
+    """Write a file via temp file + rename so readers never see partial writes"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def fts_tokenizer(conn: sqlite3.Connection) -> str:
+    """trigram if this SQLite build supports it (3.34+), else unicode61"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.tokenizer_probe USING fts5(x, tokenize='trigram')")
+        conn.execute("DROP TABLE temp.tokenizer_probe")
+        return 'trigram'
+    except sqlite3.OperationalError:
+        return 'unicode61'
+
+
+def like_pattern(query: str) -> str:
+    """The LIKE pattern the history tools have always used for a query"""
+    return f'%{query}%'
+
+
+class ChunkReader:
+    """Decompresses chunk files (with or without a shared dictionary) through a bounded LRU"""
+
+    def __init__(
+        self,
+        dict_dir: Path = DICT_DIR,
+        max_entries: int = CACHE_ENTRIES,
+        max_bytes: int = CACHE_BYTES,
+        fallback: Optional[Callable[[str], str]] = None
+    ):
+        """
+        Args:
+            dict_dir: Directory of trained dictionaries (<dict_id>.zdict)
+            max_entries: Maximum cached chunks
+            max_bytes: Maximum total cached text size
+            fallback: Decompressor for anything this reader cannot handle
+                      (e.g. CompressionManager.decompress_chunk)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.fallback = fallback
+        self.hits = 0
+        self.misses = 0
+
+        self._cache: OrderedDict = OrderedDict()  # path -> (mtime_ns, text)
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+        self._plain = zstd.ZstdDecompressor() if zstd else None
+        self._by_dict_id: Dict[int, Any] = {}
+        self.load_dictionaries(dict_dir)
+
+    def load_dictionaries(self, dict_dir: Path = DICT_DIR):
+        """Load every trained dictionary so files from older trainings stay readable"""
+        if zstd is None or not Path(dict_dir).exists():
+            return
+        for dict_file in Path(dict_dir).glob("*.zdict"):
+            try:
+                dict_data = zstd.ZstdCompressionDict(dict_file.read_bytes())
+                self._by_dict_id[dict_data.dict_id()] = zstd.ZstdDecompressor(dict_data=dict_data)
+            except Exception as e:
+                logger.warning(f"Skipping dictionary {dict_file}: {e}")
+
+    def read(self, path: str) -> str:
+        """
+        Decompressed text of a chunk file
+
+        Args:
+            path: Chunk file path (compressed_path)
+
+        Returns:
+            Chunk text
+        """
+        path = str(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            if self.fallback:
+                return self.fallback(path)
+            raise
+
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is not None and entry[0] == mtime:
+                self._cache.move_to_end(path)
+                self.hits += 1
+                METRICS.cache("chunk_text", hit=True)
+                return entry[1]
+            self.misses += 1
+        METRICS.cache("chunk_text", hit=False)
+
+        text = self._decompress(path)
+
+        with self._lock:
+            old = self._cache.pop(path, None)
+            if old is not None:
+                self._cached_bytes -= len(old[1])
+            self._cache[path] = (mtime, text)
+            self._cached_bytes += len(text)
+            while self._cache and (len(self._cache) > self.max_entries or self._cached_bytes > self.max_bytes):
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+
+        return text
+
+    def _decompress(self, path: str) -> str:
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        if zstd is None or not data.startswith(ZSTD_MAGIC):
+            if self.fallback:
+                return self.fallback(path)
+            raise ValueError(f"Not a zstd chunk (or zstandard not installed): {path}")
+
+        decompressor = self._plain
+        dict_id = zstd.get_frame_parameters(data).dict_id
+        if dict_id:
+            decompressor = self._by_dict_id.get(dict_id)
+            if decompressor is None:
+                raise ValueError(f"Chunk {path} needs dictionary {dict_id}, not found in {DICT_DIR}")
+
+        return decompressor.decompressobj().decompress(data).decode('utf-8', errors='replace')
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        with self._lock:
+            return {
+                'entries': len(self._cache),
+                'cached_bytes': self._cached_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'dictionaries': len(self._by_dict_id)
+            }
+
+
+def train_dictionary(
+    outputs_dir: Path = OUTPUTS_DIR,
+    dict_dir: Path = DICT_DIR,
+    dict_size: int = DICT_SIZE,
+    recompress: bool = False
+) -> Dict[str, Any]:
+    """
+    Train a zstd dictionary over the small chunk files
+
+    Args:
+        outputs_dir: Chunk file directory
+        dict_dir: Where to save <dict_id>.zdict
+        dict_size: Target dictionary size in bytes
+        recompress: Rewrite small chunk files with the new dictionary when smaller
+                    (every reader in this tree goes through ChunkReader;
+                    plain CompressionManager.decompress_chunk cannot decode them)
+
+    Returns:
+        Training and recompression statistics
+    """
+    if zstd is None:
+        raise RuntimeError("zstandard not installed: pip install zstandard")
+
+    reader = ChunkReader(dict_dir=dict_dir, max_entries=0)
+    paths, samples = [], []
+    for path in sorted(Path(outputs_dir).rglob("*.zst")):
+        if path.stat().st_size > SMALL_CHUNK_BYTES:
+            continue
+        try:
+            samples.append(reader.read(str(path)).encode('utf-8'))
+            paths.append(path)
+        except Exception as e:
+            logger.warning(f"Skipping {path}: {e}")
+
+    stats = {'samples': len(samples), 'trained': False}
+    if len(samples) < MIN_DICT_SAMPLES:
+        logger.info(f"Only {len(samples)} small chunks (need {MIN_DICT_SAMPLES}) - not training")
+        return stats
+
+    dict_data = zstd.train_dictionary(dict_size, samples, level=ZSTD_LEVEL)
+    dict_dir = Path(dict_dir)
+    dict_dir.mkdir(parents=True, exist_ok=True)
+    dict_path = dict_dir / f"{dict_data.dict_id()}.zdict"
+    _write_bytes_atomic(dict_path, dict_data.as_bytes())
+    stats.update({'trained': True, 'dict_id': dict_data.dict_id(), 'dict_path': str(dict_path)})
+
+    if recompress:
+        compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data)
+        before = after = rewritten = 0
+        for path, raw in zip(paths, samples):
+            old_size = path.stat().st_size
+            packed = compressor.compress(raw)
+            before += old_size
+            if len(packed) < old_size:
+                _write_bytes_atomic(path, packed)
+                after += len(packed)
+                rewritten += 1
+            else:
+                after += old_size
+        stats.update({'rewritten': rewritten, 'bytes_before': before, 'bytes_after': after})
+
+    return stats
+
+
+class HistorySearchIndex:
+    """FTS5 sidecar index over coding-history chunks and the session log"""
+
+    def __init__(self, db_path: Path = INDEX_DB_PATH, reader: Optional[ChunkReader] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.reader = reader or ChunkReader()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+
+        self._query_cache: OrderedDict = OrderedDict()
+        self._generation = 0
+        self._sync_lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize sidecar schema"""
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+            tokenizer = self._get_meta('tokenizer') or fts_tokenizer(self.conn)
+            self._set_meta('tokenizer', tokenizer)
+
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id INTEGER PRIMARY KEY,
+                    compressed_path TEXT UNIQUE,
+                    session_id TEXT,
+                    project_path TEXT,
+                    output_type TEXT,
+                    timestamp TEXT,
+                    text_length INTEGER,
+                    fields TEXT
+                )
+            """)
+            self.conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(text, tokenize='{tokenizer}')")
+
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_log (
+                    id INTEGER PRIMARY KEY,
+                    timestamp TEXT
+                )
+            """)
+            self.conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS session_log_fts USING fts5(command, tokenize='{tokenizer}')")
+
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_timestamp ON chunks(timestamp)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_session ON chunks(session_id)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_project ON chunks(project_path)")
+
+            # Older indexes held truncated text: rebuild chunks from scratch
+            if self._get_meta('index_version') != str(INDEX_VERSION):
+                self.conn.execute("DELETE FROM chunks")
+                self.conn.execute("DELETE FROM chunks_fts")
+                self._set_meta('chunks_rowid', 0)
+                self._set_meta('index_version', INDEX_VERSION)
+            self.conn.commit()
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Any):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def backlog(self, db) -> int:
+        """Upper bound on history-DB chunks not yet indexed (rowid gap, O(1))"""
+        with db.lock:
+            row = db.conn.execute("SELECT MAX(rowid) FROM output_chunks").fetchone()
+        with self.lock:
+            high_water = int(self._get_meta('chunks_rowid') or 0)
+        return max((row[0] or 0) - high_water, 0)
+
+    def sync(self, db, max_rows: Optional[int] = None) -> int:
+        """
+        Index chunks added to the history DB since the last sync
+
+        Args:
+            db: CodingHistoryDB (uses db.conn and db.lock)
+            max_rows: Stop after about this many chunks (None = until caught up)
+
+        Returns:
+            Number of chunks indexed
+        """
+        with self._sync_lock:
+            return self._sync(db, max_rows)
+
+    def _sync(self, db, max_rows: Optional[int]) -> int:
+        with self.lock:
+            high_water = int(self._get_meta('chunks_rowid') or 0)
+
+        indexed = scanned = 0
+        while max_rows is None or scanned < max_rows:
+            with db.lock:
+                cursor = db.conn.cursor()
+                cursor.execute("""
+                    SELECT c.rowid AS source_rowid, c.*, s.project_path AS project_path, s.tool_name AS tool_name
+                    FROM output_chunks c
+                    LEFT JOIN sessions s ON c.session_id = s.session_id
+                    WHERE c.rowid > ?
+                    ORDER BY c.rowid
+                    LIMIT ?
+                """, (high_water, SYNC_BATCH))
+                columns = [d[0] for d in cursor.description]
+                rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+            if not rows:
+                break
+            scanned += len(rows)
+
+            for row in rows:
+                high_water = row.pop('source_rowid')
+                if self.add(row, commit=False):
+                    indexed += 1
+
+            with self.lock:
+                self._set_meta('chunks_rowid', high_water)
+                self.conn.commit()
+
+            if len(rows) < SYNC_BATCH:
+                break
+
+        return indexed
+
+    def sync_in_background(self, db, session_log: bool = True) -> threading.Thread:
+        """
+        Catch the index up (chunks, then the session log) in a daemon thread
+
+        Returns the running sync thread if one is already in progress.
+        """
+        with self.lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return self._sync_thread
+
+            def run():
+                start = time.time()
+                try:
+                    count = self.sync(db)
+                    if session_log:
+                        count += self.sync_session_log()
+                    if count:
+                        logger.info(f"Background index sync: {count} rows in {time.time() - start:.1f}s")
+                except Exception as e:
+                    logger.error(f"Background index sync failed: {e}")
+
+            self._sync_thread = threading.Thread(target=run, name="history-index-sync", daemon=True)
+            self._sync_thread.start()
+            return self._sync_thread
+
+    def sync_or_defer(self, db, max_rows: int = SYNC_BATCH) -> bool:
+        """
+        Bring the index up to date without blocking a request on a large backlog
+
+        Indexes inline when at most max_rows chunks are pending; otherwise
+        starts (or leaves running) a background sync.
+
+        Returns:
+            True if the index is current and can answer searches, False if
+            callers should scan the history DB while the background sync runs
+        """
+        thread = self._sync_thread
+        if thread is not None and thread.is_alive():
+            return False
+        if self.backlog(db) > max_rows:
+            self.sync_in_background(db)
+            return False
+        self.sync(db, max_rows)
+        return True
+
+    def add(self, chunk: Dict[str, Any], content: Optional[str] = None, commit: bool = True) -> bool:
+        """
+        Index one chunk
+
+        Args:
+            chunk: Chunk row (as returned by search_chunks) including compressed_path
+            content: Chunk text (read through the ChunkReader if not given)
+            commit: Commit immediately
+
+        Returns:
+            True if the chunk was new to the index
+        """
+        path = chunk.get('compressed_path')
+        if content is None:
+            try:
+                content = self.reader.read(path) if path else ''
+            except Exception as e:
+                logger.warning(f"Indexing {path} without text: {e}")
+                content = ''
+
+        with self.lock:
+            cursor = self.conn.execute("""
+                INSERT OR IGNORE INTO chunks
+                (compressed_path, session_id, project_path, output_type, timestamp, text_length, fields)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                path,
+                chunk.get('session_id'),
+                chunk.get('project_path'),
+                chunk.get('output_type'),
+                chunk.get('timestamp'),
+                len(content),
+                json.dumps(chunk, default=str)
+            ))
+            if cursor.rowcount == 0:
+                return False
+            self.conn.execute(
+                "INSERT INTO chunks_fts (rowid, text) VALUES (?, ?)",
+                (cursor.lastrowid, content)
+            )
+            self._generation += 1
+            if commit:
+                self.conn.commit()
+        return True
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        project_path: Optional[str] = None,
+        output_type: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        session_id: Optional[str] = None,
+        limit: int = 50,
+        preview_chars: int = PREVIEW_CHARS
+    ) -> List[Dict[str, Any]]:
+        """
+        Search indexed chunks, newest first
+
+        The whole text of each chunk is matched. Returns chunk rows with
+        'content' (the first preview_chars of the text) and 'text_length'
+        (full text length), so callers do not need to decompress anything.
+        """
+        key = (query, project_path, output_type, start_time, session_id, limit, preview_chars)
+
+        with self.lock:
+            cached = self._query_cache.get(key)
+            if cached is not None and cached[0] == self._generation:
+                self._query_cache.move_to_end(key)
+                METRICS.cache("history_query", hit=True)
+                return [dict(row) for row in cached[1]]
+            METRICS.cache("history_query", hit=False)
+
+            conditions, params = [], []
+            if query:
+                conditions.append("f.text LIKE ?")
+                params.append(like_pattern(query))
+            if project_path:
+                conditions.append("c.project_path = ?")
+                params.append(project_path)
+            if output_type:
+                conditions.append("c.output_type = ?")
+                params.append(output_type)
+            if start_time:
+                conditions.append("c.timestamp >= ?")
+                params.append(start_time.isoformat())
+            if session_id:
+                conditions.append("c.session_id = ?")
+                params.append(session_id)
+
+            sql = "SELECT c.fields, c.text_length, substr(f.text, 1, ?) AS text FROM chunks c JOIN chunks_fts f ON f.rowid = c.id"
+            params.insert(0, preview_chars)
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " ORDER BY c.timestamp DESC LIMIT ?"
+            params.append(limit)
+
+            results = []
+            for row in self.conn.execute(sql, params):
+                chunk = json.loads(row['fields'])
+                chunk['content'] = row['text']
+                chunk['text_length'] = row['text_length']
+                results.append(chunk)
+
+            self._query_cache[key] = (self._generation, results)
+            while len(self._query_cache) > QUERY_CACHE_ENTRIES:
+                self._query_cache.popitem(last=False)
+
+        return [dict(row) for row in results]
+
+    def sync_session_log(self, log_path: Path = SESSION_LOG_PATH) -> int:
+        """
+        Index session-log rows added since the last sync
+
+        The session log is opened read-only; only the sidecar is written.
+
+        Returns:
+            Number of rows indexed
+        """
+        if not Path(log_path).exists():
+            return 0
+
+        with self.lock:
+            high_water = int(self._get_meta('session_log_id') or 0)
+
+        source = sqlite3.connect(f"file:{log_path}?mode=ro", uri=True)
+        try:
+            rows = source.execute(
+                "SELECT id, timestamp, command FROM sessions WHERE id > ? ORDER BY id",
+                (high_water,)
+            ).fetchall()
+        finally:
+            source.close()
+
+        with self.lock:
+            for row_id, timestamp, command in rows:
+                self.conn.execute("INSERT OR REPLACE INTO session_log (id, timestamp) VALUES (?, ?)", (row_id, timestamp))
+                self.conn.execute("DELETE FROM session_log_fts WHERE rowid = ?", (row_id,))
+                self.conn.execute("INSERT INTO session_log_fts (rowid, command) VALUES (?, ?)", (row_id, command or ''))
+            if rows:
+                self._set_meta('session_log_id', rows[-1][0])
+            self.conn.commit()
+
+        return len(rows)
+
+    def count(self) -> int:
+        """Number of indexed chunks"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Index statistics"""
+        with self.lock:
+            return {
+                'db_path': str(self.db_path),
+                'tokenizer': self._get_meta('tokenizer'),
+                'chunks': self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0],
+                'chunks_rowid': int(self._get_meta('chunks_rowid') or 0),
+                'session_log_rows': self.conn.execute("SELECT COUNT(*) FROM session_log").fetchone()[0],
+                'session_log_id': int(self._get_meta('session_log_id') or 0),
+                'reader': self.reader.stats()
+            }
+
+    def close(self):
+        self.conn.close()
+
+
+def search_session_log(
+    conn: sqlite3.Connection,
+    query: Optional[str] = None,
+    cutoff: Optional[str] = None,
+    limit: int = 20,
+    index_path: Path = INDEX_DB_PATH
+) -> Optional[List[sqlite3.Row]]:
+    """
+    `command LIKE` search over the session log using the sidecar index
+
+    Rows already indexed are found through session_log_fts; rows newer than
+    the last sync are scanned directly, so results match the plain LIKE query.
+    Nothing is written - the sidecar is attached read-only.
+
+    Args:
+        conn: Read-only connection to the session log (opened with uri=True)
+        query: Substring to match in command
+        cutoff: Only rows with timestamp > cutoff
+        limit: Maximum rows
+
+    Returns:
+        Rows (id, timestamp, command, prompt, outcome), or None when no
+        sidecar index is available and the caller should scan
+    """
+    if not query or not Path(index_path).exists():
+        return None
+
+    try:
+        conn.execute("ATTACH DATABASE ? AS search_index", (f"file:{index_path}?mode=ro",))
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Search index unavailable: {e}")
+        return None
+
+    try:
+        row = conn.execute("SELECT value FROM search_index.meta WHERE key = 'session_log_id'").fetchone()
+        high_water = int(row[0]) if row else 0
+
+        time_filter = " AND timestamp > ?" if cutoff else ""
+        time_params = [cutoff] if cutoff else []
+        pattern = like_pattern(query)
+
+        sql = f"""
+            SELECT id, timestamp, command, prompt, outcome FROM sessions
+            WHERE id IN (SELECT rowid FROM search_index.session_log_fts WHERE command LIKE ?)
+              AND command LIKE ?{time_filter}
+            UNION ALL
+            SELECT id, timestamp, command, prompt, outcome FROM sessions
+            WHERE id > ? AND command LIKE ?{time_filter}
+            ORDER BY timestamp DESC
+            LIMIT ?
+        """
+        params = [pattern, pattern, *time_params, high_water, pattern, *time_params, limit]
+        return conn.execute(sql, params).fetchall()
+    except sqlite3.Error as e:
+        logger.warning(f"Indexed session search failed, falling back to scan: {e}")
+        return None
+    finally:
+        conn.execute("DETACH DATABASE search_index")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coding history search index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('sync', help='Index new chunks from the history DB')
+    subparsers.add_parser('sync-sessions', help='Index new rows from the read-only session log')
+
+    train_parser = subparsers.add_parser('train-dict', help='Train a zstd dictionary over small chunk files')
+    train_parser.add_argument('--dict-size', type=int, default=DICT_SIZE)
+    train_parser.add_argument('--recompress', action='store_true',
+                              help='Rewrite small chunk files with the new dictionary')
+
+    search_parser = subparsers.add_parser('search', help='Search indexed chunks')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=20)
+
+    subparsers.add_parser('stats', help='Show index statistics')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.command == 'train-dict':
+        stats = train_dictionary(dict_size=args.dict_size, recompress=args.recompress)
+        print(json.dumps(stats, indent=2))
+        return
+
+    index = HistorySearchIndex()
+    try:
+        if args.command == 'sync':
+            from coding_history_core import CodingHistoryDB
+            db = CodingHistoryDB()
+            start = time.time()
+            count = index.sync(db)
+            print(f"✅ Indexed {count} chunks in {time.time() - start:.2f}s")
+        elif args.command == 'sync-sessions':
+            start = time.time()
+            count = index.sync_session_log()
+            print(f"✅ Indexed {count} session-log rows in {time.time() - start:.2f}s")
+        elif args.command == 'search':
+            start = time.time()
+            results = index.search(query=args.query, limit=args.limit)
+            elapsed_ms = (time.time() - start) * 1000
+            for chunk in results:
+                preview = chunk['content'][:100].replace('\n', ' ')
+                print(f"[{chunk.get('timestamp')}] {str(chunk.get('output_type')).upper():7} {preview}")
+            print(f"\n{len(results)} results in {elapsed_ms:.2f}ms")
+        elif args.command == 'stats':
+            print(json.dumps(index.stats(), indent=2))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
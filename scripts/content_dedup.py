@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Content Dedup - Near-duplicate detection for collected articles (MinHash LSH)
+
+external_content is only unique on url, so syndicated copies and lightly
+edited reposts of the same story were scored, stored and embedded once per
+outlet. This stage drops them before the JSON/DB save:
+- content_text is normalized and split into word shingles
+- A MinHash signature (128 permutations, numpy-vectorized) estimates
+  Jaccard similarity between articles
+- Signatures are banded for LSH (16 bands x 8 rows), so a lookup only
+  compares against articles sharing a band bucket, not the whole corpus
+- Signatures, band buckets and detected duplicates persist in SQLite
+  (data/content_signatures.db), shared by every collector
+
+Re-fetching a known url is never a duplicate (the url upsert handles it);
+its signature is refreshed instead.
+
+Usage:
+    from scripts.content_dedup import drop_near_duplicates
+    articles = drop_near_duplicates(articles)
+
+    python3 content_dedup.py --stats
+    python3 content_dedup.py --backfill     # index existing external_content rows
+"""
+
+import os
+import re
+import time
+import zlib
+import hashlib
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_DB_PATH = Path('/Users/yourox/AI-Workspace/data/content_signatures.db')
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 5
+# Estimated Jaccard at or above this is a duplicate
+DEFAULT_THRESHOLD = 0.8
+# Shorter texts are kept as-is (too little signal to call them duplicates)
+MIN_WORDS = 50
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SEED = 1
+
+WORD_RE = re.compile(r'\w+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    url TEXT PRIMARY KEY,
+    source_id TEXT,
+    signature BLOB NOT NULL,
+    word_count INTEGER,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    url TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands(band, bucket);
+CREATE INDEX IF NOT EXISTS idx_bands_url ON bands(url);
+CREATE TABLE IF NOT EXISTS duplicates (
+    url TEXT PRIMARY KEY,
+    duplicate_of TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    source_id TEXT,
+    seen_at REAL NOT NULL
+);
+"""
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Tuple[set, int]:
+    """
+    Word shingles of normalized text
+
+    Returns:
+        (set of shingle strings, word count)
+    """
+    words = WORD_RE.findall((text or '').lower())
+    if len(words) < size:
+        return ({' '.join(words)} if words else set()), len(words)
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}, len(words)
+
+
+class MinHasher:
+    """Vectorized MinHash over 32-bit shingle hashes"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = _SEED):
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        # Coefficients < 2^32 keep a * hash + b inside uint64
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set), dtype=np.uint64)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        permuted = (np.outer(hashes, self.a) + self.b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class ContentDeduplicator:
+    """Persistent MinHash LSH index over article text"""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, threshold: float = DEFAULT_THRESHOLD,
+                 num_perm: int = NUM_PERM, bands: int = BANDS, shingle_size: int = SHINGLE_SIZE,
+                 min_words: int = MIN_WORDS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_words = min_words
+        self.hasher = MinHasher(num_perm)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._check_params()
+
+    def _check_params(self):
+        params = {'num_perm': str(self.num_perm), 'bands': str(self.bands),
+                  'shingle_size': str(self.shingle_size), 'seed': str(_SEED)}
+        stored = dict(self.conn.execute("SELECT key, value FROM meta").fetchall())
+        if stored and stored != params:
+            raise ValueError(f"Signature index {self.db_path} was built with {stored}, not {params}; "
+                             f"rebuild it with --backfill into a new file")
+        if not stored:
+            self.conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", params.items())
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Signatures
+    # ------------------------------------------------------------------
+
+    def signature(self, text: str) -> Tuple[Optional[np.ndarray], int]:
+        """
+        MinHash signature of a text
+
+        Returns:
+            (signature or None when the text is shorter than min_words, word count)
+        """
+        shingle_set, word_count = shingles(text, self.shingle_size)
+        if word_count < self.min_words:
+            return None, word_count
+        return self.hasher.signature(shingle_set), word_count
+
+    def _buckets(self, signature: np.ndarray) -> List[int]:
+        buckets = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            buckets.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'big', signed=True))
+        return buckets
+
+    def _candidates(self, buckets: List[int]) -> List[Tuple[str, bytes]]:
+        clause = " OR ".join(["(b.band = ? AND b.bucket = ?)"] * self.bands)
+        params = [value for band, bucket in enumerate(buckets) for value in (band, bucket)]
+        return self.conn.execute(f"""
+            SELECT DISTINCT s.url, s.signature
+            FROM bands b JOIN signatures s ON s.url = b.url
+            WHERE {clause}
+        """, params).fetchall()
+
+    def _best_match(self, signature: np.ndarray, buckets: List[int], url: Optional[str]) -> Optional[Tuple[str, float]]:
+        best = None
+        for other_url, blob in self._candidates(buckets):
+            if other_url == url:
+                continue
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (other_url, score)
+        return best
+
+    def _store(self, url: str, signature: np.ndarray, buckets: List[int], word_count: int,
+               source_id: Optional[str]):
+        self.conn.execute("DELETE FROM bands WHERE url = ?", (url,))
+        self.conn.execute("""
+            INSERT OR REPLACE INTO signatures (url, source_id, signature, word_count, added_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (url, source_id, signature.tobytes(), word_count, time.time()))
+        self.conn.executemany("INSERT INTO bands (band, bucket, url) VALUES (?, ?, ?)",
+                              [(band, bucket, url) for band, bucket in enumerate(buckets)])
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def check(self, url: str, text: str, source_id: Optional[str] = None,
+              add: bool = True) -> Optional[Tuple[str, float]]:
+        """
+        Look a text up in the index (and index it when it is new)
+
+        Args:
+            url: Article url (a known url is refreshed, never reported as its own duplicate)
+            text: Article text
+            source_id: Stored with the signature for reporting
+            add: Index unique texts and record duplicates
+
+        Returns:
+            (duplicate_of url, estimated similarity) or None if unique
+        """
+        signature, word_count = self.signature(text)
+
+        with self._lock:
+            known = self.conn.execute(
+                "SELECT duplicate_of, similarity FROM duplicates WHERE url = ?", (url,)
+            ).fetchone()
+            if known:
+                return known[0], known[1]
+            if signature is None:
+                return None
+
+            buckets = self._buckets(signature)
+            match = self._best_match(signature, buckets, url)
+            if add:
+                if match:
+                    self.conn.execute("""
+                        INSERT OR REPLACE INTO duplicates (url, duplicate_of, similarity, source_id, seen_at)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, (url, match[0], match[1], source_id, time.time()))
+                else:
+                    self._store(url, signature, buckets, word_count, source_id)
+                self.conn.commit()
+            return match
+
+    def filter_articles(self, articles: List[Dict], text_key: str = 'content_text',
+                        add: bool = True) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split collector articles into unique ones and near-duplicates
+
+        Articles are checked in order, so a later copy inside the same batch
+        is caught against an earlier one. Duplicates get 'duplicate_of' and
+        'duplicate_similarity' keys.
+
+        Returns:
+            (unique articles, duplicate articles)
+        """
+        unique, duplicates = [], []
+        for article in articles:
+            text = f"{article.get('title', '')}\n{article.get(text_key, '') or ''}"
+            match = self.check(article['url'], text, source_id=article.get('source_id'), add=add)
+            if match:
+                duplicates.append({**article, 'duplicate_of': match[0], 'duplicate_similarity': round(match[1], 3)})
+            else:
+                unique.append(article)
+        return unique, duplicates
+
+    def stats(self) -> Dict:
+        with self._lock:
+            signatures = self.conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+            duplicates = self.conn.execute("SELECT COUNT(*) FROM duplicates").fetchone()[0]
+            by_source = self.conn.execute("""
+                SELECT COALESCE(source_id, '?'), COUNT(*) FROM duplicates
+                GROUP BY source_id ORDER BY COUNT(*) DESC LIMIT 10
+            """).fetchall()
+        return {
+            'signatures': signatures,
+            'duplicates': duplicates,
+            'duplicates_by_source': dict(by_source),
+            'db_size_mb': round(self.db_path.stat().st_size / (1024 * 1024), 2) if self.db_path.exists() else 0
+        }
+
+
+_deduplicator = None
+_deduplicator_lock = threading.Lock()
+
+
+def get_deduplicator() -> ContentDeduplicator:
+    """Process-wide deduplicator on the default index"""
+    global _deduplicator
+    with _deduplicator_lock:
+        if _deduplicator is None:
+            _deduplicator = ContentDeduplicator()
+        return _deduplicator
+
+
+def drop_near_duplicates(articles: List[Dict], verbose: bool = True) -> List[Dict]:
+    """
+    Drop articles whose content near-duplicates an already indexed article
+
+    Survivors are added to the index, so call this right before saving.
+    """
+    if not articles:
+        return articles
+
+    unique, duplicates = get_deduplicator().filter_articles(articles)
+    if duplicates and verbose:
+        print(f"   🔁 Dropped {len(duplicates)} near-duplicate article(s)")
+        for article in duplicates[:3]:
+            print(f"      {article['url'][:60]} ≈ {article['duplicate_of'][:60]} "
+                  f"({article['duplicate_similarity']:.2f})")
+    return unique
+
+
+def backfill_from_database(dedup: ContentDeduplicator, batch_size: int = 1000) -> Dict:
+    """Index existing external_content rows, oldest first (the earliest copy stays canonical)"""
+    import psycopg2
+    from dotenv import load_dotenv
+
+    load_dotenv('/Users/yourox/AI-Workspace/.env')
+    conn_string = os.getenv('RAILWAY_DATABASE_URL')
+    if not conn_string:
+        raise ValueError("RAILWAY_DATABASE_URL not found in .env")
+
+    counts = {'rows': 0, 'duplicates': 0}
+    conn = psycopg2.connect(conn_string)
+    try:
+        cursor = conn.cursor(name='content_dedup_backfill')
+        cursor.itersize = batch_size
+        cursor.execute("""
+            SELECT url, source_id, title, content_text
+            FROM external_content
+            ORDER BY COALESCE(published_at, fetched_at), content_id
+        """)
+        for url, source_id, title, content_text in cursor:
+            counts['rows'] += 1
+            if dedup.check(url, f"{title or ''}\n{content_text or ''}", source_id=source_id):
+                counts['duplicates'] += 1
+            if counts['rows'] % batch_size == 0:
+                print(f"   {counts['rows']:,} rows, {counts['duplicates']:,} duplicates")
+        cursor.close()
+    finally:
+        conn.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Near-duplicate article index (MinHash LSH)')
+    parser.add_argument('--db', default=str(DEFAULT_DB_PATH), help='Signature index path')
+    parser.add_argument('--stats', action='store_true', help='Show index statistics')
+    parser.add_argument('--backfill', action='store_true', help='Index existing external_content rows')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Similarity threshold')
+    args = parser.parse_args()
+
+    dedup = ContentDeduplicator(Path(args.db), threshold=args.threshold)
+
+    if args.backfill:
+        print(f"\n{'='*70}")
+        print(f"🔁 BACKFILLING SIGNATURE INDEX")
+        print(f"{'='*70}\n")
+        start = time.time()
+        counts = backfill_from_database(dedup)
+        print(f"\n✅ Indexed {counts['rows']:,} rows in {time.time() - start:.1f}s "
+              f"({counts['duplicates']:,} near-duplicates)")
+
+    if args.stats or not args.backfill:
+        stats = dedup.stats()
+        print(f"\n📊 Signatures: {stats['signatures']:,}")
+        print(f"🔁 Duplicates: {stats['duplicates']:,}")
+        for source_id, count in stats['duplicates_by_source'].items():
+            print(f"   {source_id}: {count}")
+        print(f"💾 Index size: {stats['db_size_mb']} MB")
+
+    dedup.close()
+
+
+if __name__ == "__main__":
+    main()
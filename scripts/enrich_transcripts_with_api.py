@@ -6,15 +6,60 @@ Batch enrich existing transcripts with YouTube API metadata and comments
 import json
 import time
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from youtube_api_comment_extractor import YouTubeAPIExtractor
 
+# Videos fetched per API round (videos.list in 50-id batches + concurrent comment pages)
+PREFETCH_CHUNK = 200
 
-def enrich_single_transcript(transcript_file: Path, max_comments: int = 100) -> dict:
-    """Enrich a single transcript file"""
+
+def _existing_comment_count(data: Dict) -> int:
+    existing_comments = data.get('comments', [])
+    if isinstance(existing_comments, list):
+        return len(existing_comments)
+    if isinstance(existing_comments, dict):
+        return len(existing_comments.get('top_comments', []))
+    return 0
+
+
+def enrichment_candidate(transcript_file: Path) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Check whether a transcript still needs API enrichment
+
+    Returns:
+        (video_id, None) if it needs enrichment, otherwise (None, skip_reason)
+    """
     try:
-        extractor = YouTubeAPIExtractor()
+        with open(transcript_file) as f:
+            data = json.load(f)
+    except Exception as e:
+        return None, f"unreadable: {e}"
+
+    video_id = data.get('video_id')
+    if not video_id:
+        return None, 'no_video_id'
+
+    # Skip if we already have 20+ comments (good quality)
+    if _existing_comment_count(data) >= 20 and data.get('extraction_method') == 'youtube_api_v3':
+        return None, 'already_enriched'
+
+    return video_id, None
+
+
+def enrich_single_transcript(transcript_file: Path, max_comments: int = 100,
+                             extractor: Optional[YouTubeAPIExtractor] = None,
+                             api_data: Optional[Dict] = None) -> dict:
+    """
+    Enrich a single transcript file
 
+    Args:
+        transcript_file: *_full.json transcript
+        max_comments: Max comments to fetch (when api_data is not supplied)
+        extractor: Shared extractor (created if missing)
+        api_data: Prefetched get_video_full_data result (skips the API call)
+    """
+    try:
         with open(transcript_file) as f:
             data = json.load(f)
 
@@ -22,21 +67,16 @@ def enrich_single_transcript(transcript_file: Path, max_comments: int = 100) ->
         if not video_id:
             return {'file': transcript_file.name, 'status': 'skipped', 'reason': 'no_video_id'}
 
-        # Check if already enriched with good comment data
-        existing_comments = data.get('comments', [])
-        if isinstance(existing_comments, list):
-            comment_count = len(existing_comments)
-        elif isinstance(existing_comments, dict):
-            comment_count = len(existing_comments.get('top_comments', []))
-        else:
-            comment_count = 0
+        comment_count = _existing_comment_count(data)
 
         # Skip if we already have 20+ comments (good quality)
         if comment_count >= 20 and data.get('extraction_method') == 'youtube_api_v3':
             return {'file': transcript_file.name, 'status': 'skipped', 'reason': 'already_enriched'}
 
         # Get API data
-        api_data = extractor.get_video_full_data(video_id, max_comments)
+        if api_data is None:
+            extractor = extractor or YouTubeAPIExtractor()
+            api_data = extractor.get_video_full_data(video_id, max_comments)
 
         if api_data.get('status') == 'error':
             return {'file': transcript_file.name, 'status': 'error', 'error': api_data.get('error')}
@@ -70,8 +110,7 @@ def enrich_single_transcript(transcript_file: Path, max_comments: int = 100) ->
             'file': transcript_file.name,
             'status': 'success',
             'comments_before': comment_count,
-            'comments_after': len(api_data.get('comments', [])),
-            'quota_used': api_data.get('quota_used', 0)
+            'comments_after': len(api_data.get('comments', []))
         }
 
     except Exception as e:
@@ -87,8 +126,11 @@ def batch_enrich_transcripts(
     """
     Batch enrich transcripts with API data
 
+    Metadata is fetched 50 videos per request and comment pages for a whole
+    chunk of videos are fetched concurrently; workers only read and write files.
+
     Args:
-        max_workers: Number of parallel workers (be careful with API quota)
+        max_workers: Number of parallel file workers
         max_comments_per_video: Max comments to fetch per video
         limit: Limit number of files to process (for testing)
     """
@@ -107,18 +149,6 @@ def batch_enrich_transcripts(
     print(f"⚙️  Workers: {max_workers}")
     print(f"💬 Max comments per video: {max_comments_per_video}")
 
-    # Daily API quota: 10,000 units
-    # Cost per video: ~2-3 units (1 metadata + 1-2 comments)
-    # Max videos per day: ~3,000-5,000
-    estimated_quota = len(all_files) * 3
-    print(f"📊 Estimated quota usage: {estimated_quota:,} units")
-
-    if estimated_quota > 10000:
-        print(f"⚠️  WARNING: Estimated quota exceeds daily limit!")
-        print(f"   Consider processing in batches or reducing max_comments")
-
-    print(f"\n{'='*70}\n")
-
     results = {
         'success': 0,
         'skipped': 0,
@@ -127,43 +157,77 @@ def batch_enrich_transcripts(
         'comments_improved': 0
     }
 
+    extractor = YouTubeAPIExtractor()
     start_time = time.time()
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(enrich_single_transcript, file, max_comments_per_video): file
-            for file in all_files
-        }
-
-        for i, future in enumerate(as_completed(futures), 1):
-            result = future.result()
-
-            status = result.get('status')
-            results[status] = results.get(status, 0) + 1
-
-            if status == 'success':
-                results['total_quota'] += result.get('quota_used', 0)
-                before = result.get('comments_before', 0)
-                after = result.get('comments_after', 0)
-                if after > before:
-                    results['comments_improved'] += 1
-                    print(f"✅ [{i}/{len(all_files)}] {result['file']}: {before} → {after} comments")
-                else:
-                    print(f"✅ [{i}/{len(all_files)}] {result['file']}: {after} comments")
-            elif status == 'skipped':
-                print(f"⏭️  [{i}/{len(all_files)}] {result['file']}: {result.get('reason')}")
+    done = 0
+
+    def report(result: dict):
+        nonlocal done
+        done += 1
+        status = result.get('status')
+        results[status] = results.get(status, 0) + 1
+
+        if status == 'success':
+            before = result.get('comments_before', 0)
+            after = result.get('comments_after', 0)
+            if after > before:
+                results['comments_improved'] += 1
+                print(f"✅ [{done}/{len(all_files)}] {result['file']}: {before} → {after} comments")
             else:
-                print(f"❌ [{i}/{len(all_files)}] {result['file']}: {result.get('error')}")
+                print(f"✅ [{done}/{len(all_files)}] {result['file']}: {after} comments")
+        elif status == 'skipped':
+            print(f"⏭️  [{done}/{len(all_files)}] {result['file']}: {result.get('reason')}")
+        else:
+            print(f"❌ [{done}/{len(all_files)}] {result['file']}: {result.get('error')}")
 
-            # Progress report every 50 files
-            if i % 50 == 0:
-                elapsed = time.time() - start_time
-                rate = i / elapsed
-                remaining = (len(all_files) - i) / rate if rate > 0 else 0
-                print(f"\n📊 Progress: {i}/{len(all_files)} ({i/len(all_files)*100:.1f}%)")
-                print(f"⏱️  Rate: {rate:.1f} files/sec | ETA: {remaining/60:.1f} min")
-                print(f"📈 Quota used: {results['total_quota']:,} units\n")
+        # Progress report every 50 files
+        if done % 50 == 0:
+            elapsed = time.time() - start_time
+            rate = done / elapsed
+            remaining = (len(all_files) - done) / rate if rate > 0 else 0
+            print(f"\n📊 Progress: {done}/{len(all_files)} ({done/len(all_files)*100:.1f}%)")
+            print(f"⏱️  Rate: {rate:.1f} files/sec | ETA: {remaining/60:.1f} min")
+            print(f"📈 Quota used: {extractor.quota_used:,} units\n")
 
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Pass 1: find transcripts that still need enrichment
+        pending = {}
+        for file, (video_id, reason) in zip(all_files, executor.map(enrichment_candidate, all_files)):
+            if video_id:
+                pending.setdefault(video_id, []).append(file)
+            elif reason.startswith('unreadable'):
+                report({'file': file.name, 'status': 'error', 'error': reason})
+            else:
+                report({'file': file.name, 'status': 'skipped', 'reason': reason})
+
+        # Cost: 1 unit per 50 videos (metadata) + 1 unit per 100 comments per video
+        video_ids = list(pending)
+        comment_pages = -(-max_comments_per_video // 100)
+        estimated_quota = -(-len(video_ids) // 50) + len(video_ids) * comment_pages
+        print(f"\n📊 {len(video_ids)} videos to enrich, estimated quota: {estimated_quota:,} units "
+              f"({extractor.service.quota.remaining:,} left today)")
+
+        if estimated_quota > extractor.service.quota.remaining:
+            print(f"⚠️  WARNING: Estimated quota exceeds what is left today!")
+            print(f"   Consider processing in batches or reducing max_comments")
+
+        print(f"\n{'='*70}\n")
+
+        # Pass 2: fetch API data per chunk, then merge/write files in parallel
+        for start in range(0, len(video_ids), PREFETCH_CHUNK):
+            chunk = video_ids[start:start + PREFETCH_CHUNK]
+            api_data = extractor.get_videos_full_data(chunk, max_comments_per_video)
+
+            futures = [
+                executor.submit(enrich_single_transcript, file, max_comments_per_video,
+                                extractor, api_data[video_id])
+                for video_id in chunk
+                for file in pending[video_id]
+            ]
+            for future in as_completed(futures):
+                report(future.result())
+
+    results['total_quota'] = extractor.quota_used
     elapsed = time.time() - start_time
 
     print(f"\n{'='*70}")
@@ -28,14 +28,11 @@ echo -e "${BLUE}================================================================
 
 # Function to run full enrichment pipeline
 run_enrichment() {
-    echo -e "\n${GREEN}🧠 Step 1/3: Running enrichment engine...${NC}"
+    echo -e "\n${GREEN}🧬 Step 1/2: Classifying, enriching and summarizing videos...${NC}"
     cd "$SCRIPT_DIR"
-    python3 enrichment_engine.py enrich-all
+    python3 derive_pipeline.py derive-all
 
-    echo -e "\n${GREEN}📝 Step 2/3: Generating video summaries...${NC}"
-    python3 video_summarizer.py
-
-    echo -e "\n${GREEN}🔍 Step 3/3: Updating meta-intelligence...${NC}"
+    echo -e "\n${GREEN}🔍 Step 2/2: Updating meta-intelligence...${NC}"
     python3 meta_intelligence.py
 
     echo -e "\n${GREEN}✅ Enrichment pipeline complete!${NC}"
@@ -4,68 +4,89 @@ Check enrichment coverage for all videos
 Identifies which videos have complete enrichment data
 """
 
+import sys
 import json
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from artifact_store import open_existing_store, artifact_ids, iter_artifacts
+from artifact_store import load_artifact as _load_artifact
+
 # Directories
 INSIGHTS_DIR = Path("/Users/yourox/AI-Workspace/data/business_insights")
 ENRICHED_DIR = Path("/Users/yourox/AI-Workspace/data/enriched_insights")
 SUMMARIES_DIR = Path("/Users/yourox/AI-Workspace/data/video_summaries")
 META_FILE = Path("/Users/yourox/AI-Workspace/data/meta_intelligence/meta_intelligence_report.json")
 
+# kind -> (directory, filename suffix)
+LAYOUT = {
+    'insights': (INSIGHTS_DIR, '_insights.json'),
+    'enriched': (ENRICHED_DIR, '_enriched.json'),
+    'summary': (SUMMARIES_DIR, '_summary.json'),
+}
+
+@lru_cache(maxsize=None)
+def get_store():
+    """Artifact store, or None if it has not been created yet"""
+    return open_existing_store()
+
+def load_artifact(kind, video_id):
+    """Load one artifact from the store or its JSON file"""
+    directory, suffix = LAYOUT[kind]
+    return _load_artifact(kind, video_id, directory, suffix, get_store())
+
+def get_video_ids(kind):
+    """Video IDs with an artifact of this kind in the store or as a JSON file"""
+    directory, suffix = LAYOUT[kind]
+    return artifact_ids(kind, directory, suffix, get_store())
+
 def get_video_ids_from_insights():
     """Get all video IDs that have insight files"""
-    video_ids = set()
-    for file_path in INSIGHTS_DIR.glob("*_insights.json"):
-        video_id = file_path.stem.replace('_insights', '')
-        video_ids.add(video_id)
-    return video_ids
+    return get_video_ids('insights')
 
 def get_video_ids_from_enriched():
     """Get all video IDs that have enriched files"""
-    video_ids = set()
-    for file_path in ENRICHED_DIR.glob("*_enriched.json"):
-        video_id = file_path.stem.replace('_enriched', '')
-        video_ids.add(video_id)
-    return video_ids
+    return get_video_ids('enriched')
 
 def get_video_ids_from_summaries():
     """Get all video IDs that have summary files"""
-    video_ids = set()
-    for file_path in SUMMARIES_DIR.glob("*_summary.json"):
-        video_id = file_path.stem.replace('_summary', '')
-        video_ids.add(video_id)
-    return video_ids
+    return get_video_ids('summary')
 
+@lru_cache(maxsize=None)
 def get_video_metadata(video_id):
     """Get metadata for a video"""
-    insight_file = INSIGHTS_DIR / f"{video_id}_insights.json"
-
-    if not insight_file.exists():
-        return None
-
     try:
-        with open(insight_file, 'r') as f:
-            data = json.load(f)
-            meta = data.get('meta', {})
-            return {
-                'title': meta.get('title', 'Unknown'),
-                'channel': meta.get('channel_title', 'Unknown'),
-                'created': meta.get('created_at', 'Unknown')
-            }
+        data = load_artifact('insights', video_id)
+        if data is None:
+            return None
+        meta = data.get('meta', {})
+        return {
+            'title': meta.get('title', 'Unknown'),
+            'channel': meta.get('channel_title', 'Unknown'),
+            'created': meta.get('created_at', 'Unknown')
+        }
     except:
         return None
 
 def check_enrichment_quality(video_id):
     """Check the quality of enrichment for a video"""
-    enriched_file = ENRICHED_DIR / f"{video_id}_enriched.json"
-    summary_file = SUMMARIES_DIR / f"{video_id}_summary.json"
+    enriched_data = None
+    summary_data = None
+    try:
+        enriched_data = load_artifact('enriched', video_id)
+    except:
+        pass
+    try:
+        summary_data = load_artifact('summary', video_id)
+    except:
+        pass
 
     quality = {
-        'has_enriched': enriched_file.exists(),
-        'has_summary': summary_file.exists(),
+        'has_enriched': enriched_data is not None,
+        'has_summary': summary_data is not None,
         'enriched_version': None,
         'enriched_at': None,
         'high_value_insights': 0,
@@ -74,30 +95,20 @@ def check_enrichment_quality(video_id):
         'opportunity_count': 0
     }
 
-    # Check enriched file
-    if enriched_file.exists():
-        try:
-            with open(enriched_file, 'r') as f:
-                data = json.load(f)
-                quality['enriched_version'] = data.get('_version')
-                quality['enriched_at'] = data.get('_computed_at')
-
-                metrics = data.get('video_level_metrics', {})
-                quality['high_value_insights'] = metrics.get('high_value_insights', 0)
-                quality['avg_actionability'] = metrics.get('avg_actionability_score', 0)
-                quality['total_insights'] = metrics.get('total_insights', 0)
-        except:
-            pass
-
-    # Check summary file
-    if summary_file.exists():
-        try:
-            with open(summary_file, 'r') as f:
-                data = json.load(f)
-                opp_map = data.get('opportunity_map', {})
-                quality['opportunity_count'] = opp_map.get('total_opportunities', 0)
-        except:
-            pass
+    # Check enriched data
+    if enriched_data:
+        quality['enriched_version'] = enriched_data.get('_version')
+        quality['enriched_at'] = enriched_data.get('_computed_at')
+
+        metrics = enriched_data.get('video_level_metrics', {})
+        quality['high_value_insights'] = metrics.get('high_value_insights', 0)
+        quality['avg_actionability'] = metrics.get('avg_actionability_score', 0)
+        quality['total_insights'] = metrics.get('total_insights', 0)
+
+    # Check summary data
+    if summary_data:
+        opp_map = summary_data.get('opportunity_map', {})
+        quality['opportunity_count'] = opp_map.get('total_opportunities', 0)
 
     return quality
 
@@ -230,15 +241,10 @@ def main():
     # Check for recent files
     print(f"\n📅 Recent Enrichment Activity:")
     recent_files = []
-    for file_path in ENRICHED_DIR.glob("*_enriched.json"):
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                computed_at = data.get('_computed_at')
-                if computed_at:
-                    recent_files.append((file_path.stem.replace('_enriched', ''), computed_at))
-        except:
-            pass
+    for video_id, data, _ in iter_artifacts('enriched', ENRICHED_DIR, '_enriched.json', get_store()):
+        computed_at = data.get('_computed_at')
+        if computed_at:
+            recent_files.append((video_id, computed_at))
 
     recent_files.sort(key=lambda x: x[1], reverse=True)
 
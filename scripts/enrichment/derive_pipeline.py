@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Derive Pipeline - Fused classify → enrich → summarize stage
+Parses each insight/enriched file once per pass and fans videos out over a process pool
+
+`derive-queue` pulls 'enrich' jobs from the pipeline job queue instead of
+globbing the insights directory; the fused stage completes both enrich and
+summarize, so finished videos are handed straight to 'vector_ingest'.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from enrichment_engine import EnrichmentEngine
+from video_summarizer import VideoSummarizer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from job_queue import JobQueue, worker_name, DEFAULT_LEASE_SECONDS
+
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class DerivePipeline:
+    """Run classification, enrichment and summarization in one pass per video"""
+
+    VERSION = "1.0.0"
+
+    def __init__(self, workspace_dir: Path = None):
+        if workspace_dir is None:
+            workspace_dir = Path("/Users/yourox/AI-Workspace")
+
+        self.workspace_dir = workspace_dir
+        self.engine = EnrichmentEngine(workspace_dir)
+        self.summarizer = VideoSummarizer(workspace_dir, store=self.engine.store)
+
+    def get_summary_path(self, video_id: str) -> Path:
+        """Get path to summary file"""
+        return self.summarizer.summaries_dir / f"{video_id}_summary.json"
+
+    def derive_video(self, video_id: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Classify, enrich and summarize a single video
+
+        Each input file is parsed at most once. A current enriched file is
+        reused for the summary instead of being recomputed.
+
+        Args:
+            video_id: Video to process
+            force: Recompute enrichment and summary even if up to date
+
+        Returns:
+            Status dict with result info
+        """
+        if not self.engine.get_insight_path(video_id).exists():
+            return {"status": "skipped", "reason": "not_extracted"}
+
+        summary_exists = self.get_summary_path(video_id).exists()
+
+        enriched = None
+        if not force:
+            enriched = self.engine.load_enriched(video_id)
+            if enriched and enriched.get('_version') != self.engine.VERSION:
+                enriched = None
+            if enriched and summary_exists:
+                return {"status": "cached", "reason": "already_derived"}
+
+        insights = self.engine.load_insights(video_id)
+        if insights is None:
+            return {"status": "error", "reason": "cannot_load_insights"}
+
+        enriched_computed = enriched is None
+        if enriched_computed:
+            if not self.engine.is_complete_insight(insights):
+                return {"status": "skipped", "reason": "incomplete_data"}
+
+            try:
+                enriched = self.engine.build_enriched(video_id, insights)
+            except Exception as e:
+                logger.error(f"Error computing metrics for {video_id}: {e}")
+                return {"status": "error", "reason": f"metric_computation_failed: {e}"}
+
+        summary = self.summarizer.generate_summary(video_id, insights=insights, enriched=enriched)
+        if summary is None:
+            return {"status": "error", "reason": "summary_failed"}
+
+        try:
+            if enriched_computed:
+                self.engine.save_enriched(video_id, enriched)
+            self.summarizer.save_summary(video_id, summary)
+        except Exception as e:
+            return {"status": "error", "reason": f"save_failed: {e}"}
+
+        return {
+            "status": "success",
+            "video_type": enriched.get("video_type", "general"),
+            "confidence": enriched.get("type_confidence", 0),
+            "enriched": enriched_computed
+        }
+
+    def derive_all_videos(
+        self,
+        force: bool = False,
+        limit: int = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Derive enrichment and summaries for all extracted videos
+
+        Args:
+            force: Recompute even if already derived
+            limit: Optional limit on number of videos to process
+            workers: Worker processes (defaults to CPU count)
+        """
+        print(f"\n{'='*70}")
+        print(f"🧬 DERIVE PIPELINE v{self.VERSION} (classify → enrich → summarize)")
+        print(f"{'='*70}\n")
+
+        video_ids = [
+            f.stem.replace("_insights", "")
+            for f in self.engine.insights_dir.glob("*_insights.json")
+        ]
+
+        if limit:
+            video_ids = video_ids[:limit]
+
+        total = len(video_ids)
+        workers = workers or os.cpu_count() or 1
+
+        print(f"📹 Found {total} insight files")
+        print(f"⚙️  Workers: {workers}\n")
+
+        stats = {"processed": 0, "cached": 0, "errors": 0, "skipped": 0}
+        start_time = time.time()
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.workspace_dir,)
+        ) as executor:
+            futures = {
+                executor.submit(_derive_worker, video_id, force): video_id
+                for video_id in video_ids
+            }
+
+            for i, future in enumerate(as_completed(futures), 1):
+                video_id = futures[future]
+                print(f"[{i}/{total}] {video_id} ", end="", flush=True)
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    stats["errors"] += 1
+                    print(f"❌ exception: {e}")
+                    logger.exception(f"Exception processing {video_id}")
+                    continue
+
+                status = result["status"]
+
+                if status == "success":
+                    stats["processed"] += 1
+                    vtype = result.get("video_type", "unknown")
+                    conf = result.get("confidence", 0)
+                    print(f"✅ {vtype} (conf: {conf:.2f})")
+
+                elif status == "cached":
+                    stats["cached"] += 1
+                    print("⚡ cached")
+
+                elif status == "skipped":
+                    stats["skipped"] += 1
+                    print(f"⏭️  skipped ({result.get('reason', 'unknown')})")
+
+                else:
+                    stats["errors"] += 1
+                    print(f"❌ error ({result.get('reason', 'unknown')})")
+
+        total_time = time.time() - start_time
+
+        print(f"\n{'='*70}")
+        print(f"✅ DERIVE COMPLETE")
+        print(f"{'='*70}")
+        print(f"✅ Successfully processed: {stats['processed']}")
+        print(f"⚡ Cached (skipped): {stats['cached']}")
+        print(f"⏭️  Skipped: {stats['skipped']}")
+        print(f"❌ Errors: {stats['errors']}")
+        print(f"⏱️  Total time: {total_time:.1f}s ({total_time/60:.1f} minutes)")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+    def derive_queue(
+        self,
+        force: bool = False,
+        workers: Optional[int] = None,
+        idle_exit: bool = True,
+        poll_interval: float = 5.0
+    ) -> Dict[str, int]:
+        """
+        Process 'enrich' jobs from the pipeline job queue over a process pool
+
+        Args:
+            force: Recompute even if already derived
+            workers: Worker processes (defaults to CPU count)
+            idle_exit: Stop when the stage is drained (False = keep waiting for new jobs)
+            poll_interval: Queue poll interval when idle
+        """
+        queue = JobQueue()
+        owner = worker_name('derive')
+        workers = workers or os.cpu_count() or 1
+
+        print(f"\n{'='*70}")
+        print(f"🧬 DERIVE PIPELINE v{self.VERSION} - queue mode")
+        print(f"{'='*70}\n")
+        print(f"📥 Pending 'enrich' jobs: {queue.outstanding(['enrich'])}")
+        print(f"⚙️  Workers: {workers}\n")
+
+        stats = {"processed": 0, "cached": 0, "errors": 0, "skipped": 0}
+        start_time = time.time()
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.workspace_dir,)
+        ) as executor:
+            in_flight = {}
+            last_heartbeat = time.monotonic()
+
+            while True:
+                # Leased jobs wait in the pool backlog and run long: keep their leases alive
+                if time.monotonic() - last_heartbeat >= DEFAULT_LEASE_SECONDS / 3:
+                    for job in in_flight.values():
+                        queue.heartbeat(job)
+                    last_heartbeat = time.monotonic()
+
+                # Keep the pool fed with a small lease backlog
+                backlog = workers * 2 - len(in_flight)
+                if backlog > 0:
+                    for job in queue.lease('enrich', owner, limit=backlog):
+                        in_flight[executor.submit(_derive_worker, job.item_id, force)] = job
+
+                if not in_flight:
+                    if idle_exit and queue.outstanding(['enrich']) == 0:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"status": "error", "reason": f"exception: {e}"}
+
+                    status = result["status"]
+                    if status in ("success", "cached", "skipped"):
+                        # Skipped = nothing to derive (not extracted / incomplete): stop here
+                        next_stage = None if status == "skipped" else 'vector_ingest'
+                        if not queue.complete(job, next_stage=next_stage):
+                            print(f"⚠️  {job.item_id} lease was reclaimed by another worker - result discarded")
+                        elif status == "skipped":
+                            stats["skipped"] += 1
+                            print(f"⏭️  {job.item_id} skipped ({result.get('reason', 'unknown')})")
+                        else:
+                            stats["processed" if status == "success" else "cached"] += 1
+                            print(f"✅ {job.item_id} {status}")
+                    else:
+                        stats["errors"] += 1
+                        new_status = queue.fail(job, result.get("reason", "unknown")) or "reclaimed by another worker"
+                        print(f"❌ {job.item_id} error ({result.get('reason', 'unknown')}) → {new_status}")
+
+        queue.close()
+        total_time = time.time() - start_time
+
+        print(f"\n{'='*70}")
+        print(f"✅ DERIVE QUEUE DRAINED")
+        print(f"{'='*70}")
+        print(f"✅ Processed: {stats['processed']} | ⚡ Cached: {stats['cached']} | "
+              f"⏭️  Skipped: {stats['skipped']} | ❌ Errors: {stats['errors']}")
+        print(f"⏱️  Total time: {total_time:.1f}s")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+# Per-process pipeline, built once by the pool initializer
+_worker_pipeline: Optional[DerivePipeline] = None
+
+
+def _init_worker(workspace_dir: Path):
+    global _worker_pipeline
+    logging.getLogger().setLevel(logging.WARNING)
+    _worker_pipeline = DerivePipeline(workspace_dir)
+
+
+def _derive_worker(video_id: str, force: bool) -> Dict[str, Any]:
+    return _worker_pipeline.derive_video(video_id, force=force)
+
+
+def main():
+    """CLI interface"""
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fused classify/enrich/summarize pipeline")
+    parser.add_argument('command', nargs='?', default='derive-all',
+                       choices=['derive', 'derive-all', 'derive-queue'],
+                       help='Command to run')
+    parser.add_argument('--video-id', help='Video ID to derive')
+    parser.add_argument('--force', action='store_true', help='Force recompute')
+    parser.add_argument('--limit', type=int, help='Limit number of videos')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--follow', action='store_true', help='derive-queue: keep waiting for new jobs')
+
+    args = parser.parse_args()
+
+    pipeline = DerivePipeline()
+
+    if args.command == 'derive':
+        if not args.video_id:
+            print("Error: --video-id required for 'derive' command")
+            sys.exit(1)
+
+        result = pipeline.derive_video(args.video_id, force=args.force)
+        print(json.dumps(result, indent=2))
+
+    elif args.command == 'derive-all':
+        pipeline.derive_all_videos(force=args.force, limit=args.limit, workers=args.workers)
+
+    elif args.command == 'derive-queue':
+        pipeline.derive_queue(force=args.force, workers=args.workers, idle_exit=not args.follow)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Enrichment Engine - Main engine for computing enrichment metrics
 Handles safe loading, versioning, and retroactive metric computation
 """
 
+import sys
 import json
 import logging
 import time
@@ -14,6 +15,9 @@ from datetime import datetime
 from metric_registry import MetricRegistry
 from video_classifier import VideoTypeClassifier
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from artifact_store import ArtifactStore, write_json_atomic
+
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -33,6 +37,9 @@ class EnrichmentEngine:
         self.enriched_dir = workspace_dir / "data" / "enriched_insights"
         self.enriched_dir.mkdir(parents=True, exist_ok=True)
 
+        # Consolidated artifact store (mirrors the per-file layout)
+        self.store = ArtifactStore(workspace_dir / "data" / "artifacts.db")
+
         # Initialize components
         self.registry = MetricRegistry()
         self.classifier = VideoTypeClassifier()
@@ -99,8 +106,8 @@ class EnrichmentEngine:
         enriched_file = self.get_enriched_path(video_id)
 
         try:
-            with open(enriched_file, 'w') as f:
-                json.dump(enriched_data, f, indent=2)
+            write_json_atomic(enriched_file, enriched_data)
+            self.store.put("enriched", video_id, enriched_data)
             logger.debug(f"Saved enriched data for {video_id}")
         except Exception as e:
             logger.error(f"Error saving enriched data for {video_id}: {e}")
@@ -241,6 +248,52 @@ class EnrichmentEngine:
 
         return aggregates
 
+    def build_enriched(
+        self,
+        video_id: str,
+        insights: Dict,
+        video_type: str = None
+    ) -> Dict[str, Any]:
+        """
+        Classify and compute metrics for already-loaded insights
+
+        Args:
+            video_id: Video being enriched
+            insights: Parsed insights data
+            video_type: Optional manual type override
+
+        Returns:
+            Enriched data structure (not saved)
+        """
+        # Detect or use provided type
+        if video_type is None:
+            video_type, confidence, scores = self.classifier.classify_with_confidence(insights)
+        else:
+            confidence = 1.0  # Manual override
+            scores = {}
+
+        # Compute all metrics
+        all_metrics = self.compute_all_metrics(insights, video_type)
+
+        return {
+            "video_id": video_id,
+            "video_title": insights.get('meta', {}).get('title', ''),
+            "video_type": video_type,
+            "type_confidence": round(confidence, 3),
+            "type_scores": {k: round(v, 1) for k, v in scores.items()},
+
+            # Computed metrics
+            **all_metrics,
+
+            # Metadata
+            "_version": self.VERSION,
+            "_computed_at": datetime.now().isoformat(),
+            "_metrics_applied": len(self.registry.get_metrics_for_type(video_type)),
+            "_engine_version": self.VERSION,
+            "_metric_registry_version": self.registry.VERSION,
+            "_classifier_version": self.classifier.VERSION
+        }
+
     def enrich_video(
         self,
         video_id: str,
@@ -292,40 +345,13 @@ class EnrichmentEngine:
         if not self.is_complete_insight(insights):
             return {"status": "skipped", "reason": "incomplete_data"}
 
-        # Detect or use provided type
-        if video_type is None:
-            video_type, confidence, scores = self.classifier.classify_with_confidence(insights)
-        else:
-            confidence = 1.0  # Manual override
-            scores = {}
-
-        # Compute all metrics
+        # Classify and compute metrics
         try:
-            all_metrics = self.compute_all_metrics(insights, video_type)
+            enriched = self.build_enriched(video_id, insights, video_type)
         except Exception as e:
             logger.error(f"Error computing metrics for {video_id}: {e}")
             return {"status": "error", "reason": f"metric_computation_failed: {e}"}
 
-        # Build enriched data structure
-        enriched = {
-            "video_id": video_id,
-            "video_title": insights.get('meta', {}).get('title', ''),
-            "video_type": video_type,
-            "type_confidence": round(confidence, 3),
-            "type_scores": {k: round(v, 1) for k, v in scores.items()},
-
-            # Computed metrics
-            **all_metrics,
-
-            # Metadata
-            "_version": self.VERSION,
-            "_computed_at": datetime.now().isoformat(),
-            "_metrics_applied": len(self.registry.get_metrics_for_type(video_type)),
-            "_engine_version": self.VERSION,
-            "_metric_registry_version": self.registry.VERSION,
-            "_classifier_version": self.classifier.VERSION
-        }
-
         # Save enriched data
         try:
             self.save_enriched(video_id, enriched)
@@ -334,8 +360,8 @@ class EnrichmentEngine:
 
         return {
             "status": "success",
-            "video_type": video_type,
-            "confidence": confidence,
+            "video_type": enriched["video_type"],
+            "confidence": enriched["type_confidence"],
             "metrics_computed": enriched["_metrics_applied"]
         }
 
@@ -4,12 +4,16 @@ Video Summarizer - Generate comprehensive video-level summaries
 Creates key takeaways, content profiles, and opportunity maps
 """
 
+import sys
 import json
 import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from collections import Counter
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from artifact_store import ArtifactStore, write_json_atomic
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -19,7 +23,7 @@ class VideoSummarizer:
 
     VERSION = "1.0.0"
 
-    def __init__(self, workspace_dir: Path = None):
+    def __init__(self, workspace_dir: Path = None, store: Optional[ArtifactStore] = None):
         if workspace_dir is None:
             workspace_dir = Path("/Users/yourox/AI-Workspace")
 
@@ -29,6 +33,11 @@ class VideoSummarizer:
         self.summaries_dir = workspace_dir / "data" / "video_summaries"
         self.summaries_dir.mkdir(parents=True, exist_ok=True)
 
+        # Consolidated artifact store (mirrors the per-file layout); a shared
+        # store passed in by the caller stays owned by the caller
+        self._owns_store = store is None
+        self.store = store if store is not None else ArtifactStore(workspace_dir / "data" / "artifacts.db")
+
     def load_insight(self, video_id: str) -> Optional[Dict]:
         """Load original insight data"""
         insight_file = self.insights_dir / f"{video_id}_insights.json"
@@ -324,12 +333,26 @@ class VideoSummarizer:
             'comment_derived_trends': comment_trends
         }
 
-    def generate_summary(self, video_id: str) -> Optional[Dict]:
-        """Generate complete video summary"""
+    def generate_summary(
+        self,
+        video_id: str,
+        insights: Optional[Dict] = None,
+        enriched: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Generate complete video summary
+
+        Args:
+            video_id: Video to summarize
+            insights: Already-loaded insight data (loaded from disk if None)
+            enriched: Already-loaded enriched data (loaded from disk if None)
+        """
 
         # Load data
-        insights = self.load_insight(video_id)
-        enriched = self.load_enriched(video_id)
+        if insights is None:
+            insights = self.load_insight(video_id)
+        if enriched is None:
+            enriched = self.load_enriched(video_id)
 
         if not insights or not enriched:
             logger.error(f"Missing data for {video_id}")
@@ -367,7 +390,7 @@ class VideoSummarizer:
             },
 
             'practical_next_steps': self._generate_next_steps(insights, standout_insights),
-            'related_videos_keywords': self._extract_keywords(insights, enriched)
+            'related_videos_keywords': self._extract_keywords(insights, enriched, content_profile)
         }
 
         return summary
@@ -399,13 +422,19 @@ class VideoSummarizer:
 
         return next_steps[:5]
 
-    def _extract_keywords(self, insights: Dict, enriched: Dict) -> List[str]:
+    def _extract_keywords(
+        self,
+        insights: Dict,
+        enriched: Dict,
+        profile: Optional[Dict] = None
+    ) -> List[str]:
         """Extract keywords for finding related videos"""
 
         keywords = set()
 
         # From content profile themes
-        profile = self.generate_content_profile(insights, enriched)
+        if profile is None:
+            profile = self.generate_content_profile(insights, enriched)
         keywords.update(profile.get('primary_themes', []))
         keywords.update(profile.get('industry_focus', []))
 
@@ -426,8 +455,8 @@ class VideoSummarizer:
         summary_file = self.summaries_dir / f"{video_id}_summary.json"
 
         try:
-            with open(summary_file, 'w') as f:
-                json.dump(summary, f, indent=2)
+            write_json_atomic(summary_file, summary)
+            self.store.put("summary", video_id, summary)
             logger.info(f"Saved summary for {video_id}")
         except Exception as e:
             logger.error(f"Error saving summary for {video_id}: {e}")
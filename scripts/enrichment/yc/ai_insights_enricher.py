@@ -14,17 +14,21 @@ Cost: ~$0.001 per company = $5 total for 5,490 companies
 
 import os
 import json
-from typing import Dict
+from typing import Dict, Optional
 from datetime import datetime
 import logging
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from llm_dispatch import LLMRequest
+
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "You are a startup analyst providing strategic insights on Y Combinator companies. Always respond with valid JSON."
+
 
 class AIInsightsEnricher:
     """Enriches YC companies with AI-generated insights"""
@@ -58,8 +62,9 @@ class AIInsightsEnricher:
 
         company_name = company.get('name', '').strip()
 
-        if not company_name:
-            enrichment_data["status"] = "no_company_name"
+        skip_status = self.skip_status(company)
+        if skip_status:
+            enrichment_data["status"] = skip_status
             return enrichment_data
 
         logger.info(f"Generating AI insights for {company_name}")
@@ -129,10 +134,9 @@ class AIInsightsEnricher:
 
         return "\n".join(context_parts)
 
-    def _generate_insights(self, company_name: str, context: str) -> Dict:
-        """Generate AI insights using GPT-4o-mini"""
-
-        prompt = f"""Analyze this Y Combinator company and provide strategic insights:
+    def _build_prompt(self, context: str) -> str:
+        """Build the structured-analysis prompt"""
+        return f"""Analyze this Y Combinator company and provide strategic insights:
 
 {context}
 
@@ -181,11 +185,42 @@ Provide a structured analysis in JSON format with these fields:
 
 Respond ONLY with valid JSON. Be concise but insightful."""
 
+    @staticmethod
+    def skip_status(company: Dict) -> Optional[str]:
+        """Status recorded instead of calling the model, or None if the company can be analyzed"""
+        if not company.get('name', '').strip():
+            return "no_company_name"
+        return None
+
+    def build_request(self, company: Dict, provider: str = "openai") -> LLMRequest:
+        """
+        Dispatch request for batch runs through llm_dispatch (same prompt as enrich)
+
+        Args:
+            company: Full company data dict with all enrichment data
+            provider: Dispatch provider the request is built for
+
+        Returns:
+            LLMRequest for this company
+        """
+        return LLMRequest(
+            id=company.get('slug', ''),
+            system=SYSTEM_PROMPT,
+            prompt=self._build_prompt(self._build_context(company)),
+            temperature=0.3,
+            max_tokens=1500
+        )
+
+    def _generate_insights(self, company_name: str, context: str) -> Dict:
+        """Generate AI insights using GPT-4o-mini"""
+
+        prompt = self._build_prompt(context)
+
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a startup analyst providing strategic insights on Y Combinator companies. Always respond with valid JSON."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,  # Lower temperature for more consistent output
@@ -3,6 +3,8 @@
 Dual-Engine Parallel Enrichment
 Runs OpenAI and Claude Sonnet 4 in parallel for maximum throughput
 Target: Complete 2,451 companies in 30 minutes
+Both engines run through the shared LLM dispatch layer (llm_dispatch.py)
+and pull from one work queue instead of a fixed 50/50 split.
 """
 
 import json
@@ -10,11 +12,10 @@ import time
 import logging
 from pathlib import Path
 from typing import Dict, List
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ai_insights_enricher import AIInsightsEnricher  # OpenAI version
 from ai_insights_enricher_claude import AIInsightsEnricherClaude  # Claude version
+from llm_dispatch import LLMRequest, run_insights
 
 logging.basicConfig(
     level=logging.INFO,
@@ -69,8 +70,12 @@ class DualEngineEnrichment:
         with open(enriched_file, 'w') as f:
             json.dump(enriched_data, f, indent=2)
 
-    def get_incomplete_companies(self) -> List[Dict]:
-        """Get companies that need Phase 8 enrichment"""
+    def get_incomplete_companies(self) -> List[tuple]:
+        """
+        Get companies that need Phase 8 enrichment
+
+        Returns (slug, enriched_file, enriched_data, full_company) tuples
+        """
         all_companies = self.load_companies()
         incomplete = []
 
@@ -80,7 +85,7 @@ class DualEngineEnrichment:
 
             if enriched and not enriched.get('phase8_complete'):
                 # Merge company data with enriched data
-                incomplete.append({**company, **enriched})
+                incomplete.append((slug, self.get_enriched_path(slug), enriched, {**company, **enriched}))
             elif enriched is None:
                 # No enriched file at all - skip
                 continue
@@ -88,58 +93,19 @@ class DualEngineEnrichment:
         logger.info(f"Found {len(incomplete)} companies needing Phase 8")
         return incomplete
 
-    def enrich_company(self, company: Dict, engine: str) -> Dict:
-        """
-        Enrich a single company with specified engine
-
-        Args:
-            company: Company data with existing enrichment
-            engine: 'openai' or 'claude'
-        """
-        slug = company.get('slug', '')
-        name = company.get('name', 'Unknown')
-
-        try:
-            # Choose enricher
-            if engine == 'openai':
-                ai_insights = self.openai_enricher.enrich(company)
-            else:
-                ai_insights = self.claude_enricher.enrich(company)
-
-            # Update enriched data
-            enriched = self.load_enriched(slug)
-            if enriched:
-                enriched['ai_insights'] = ai_insights
-                enriched['phase8_complete'] = True
-                enriched['enriched_at'] = datetime.now().isoformat()
-                self.save_enriched(slug, enriched)
-
-            self.stats[engine]["processed"] += 1
-            return {
-                "status": "success",
-                "slug": slug,
-                "name": name,
-                "engine": engine
-            }
-
-        except Exception as e:
-            self.stats[engine]["errors"] += 1
-            logger.error(f"[{engine.upper()}] Error enriching {name}: {e}")
-            return {
-                "status": "error",
-                "slug": slug,
-                "name": name,
-                "engine": engine,
-                "error": str(e)[:200]
-            }
+    def build_request(self, company: Dict, provider: str) -> LLMRequest:
+        """Dispatch request for whichever engine picked up this company"""
+        if provider == 'openai':
+            return self.openai_enricher.build_request(company, provider)
+        return self.claude_enricher.build_request(company, provider)
 
     def run_parallel(self, openai_workers: int = 40, claude_workers: int = 40):
         """
         Run parallel enrichment with both engines
 
         Args:
-            openai_workers: Number of parallel OpenAI workers
-            claude_workers: Number of parallel Claude workers
+            openai_workers: Max concurrent OpenAI requests (adaptive)
+            claude_workers: Max concurrent Claude requests (adaptive)
         """
         # Get incomplete companies
         companies = self.get_incomplete_companies()
@@ -149,63 +115,34 @@ class DualEngineEnrichment:
             logger.info("✅ All companies already have Phase 8 complete!")
             return
 
-        # Split companies between engines (interleaved for balance)
-        openai_batch = companies[0::2]  # Even indices
-        claude_batch = companies[1::2]  # Odd indices
-
         logger.info(f"\n{'='*70}")
         logger.info(f"🚀 DUAL-ENGINE PARALLEL ENRICHMENT")
         logger.info(f"{'='*70}")
         logger.info(f"Total companies: {total}")
-        logger.info(f"OpenAI batch: {len(openai_batch)} companies ({openai_workers} workers)")
-        logger.info(f"Claude batch: {len(claude_batch)} companies ({claude_workers} workers)")
+        logger.info(f"OpenAI: up to {openai_workers} concurrent requests")
+        logger.info(f"Claude: up to {claude_workers} concurrent requests")
         logger.info(f"Target: Complete in 30 minutes")
         logger.info(f"{'='*70}\n")
 
         start_time = time.time()
 
-        # Run both batches in parallel using separate thread pools
-        with ThreadPoolExecutor(max_workers=openai_workers + claude_workers) as executor:
-            futures = {}
-
-            # Submit OpenAI jobs
-            for company in openai_batch:
-                future = executor.submit(self.enrich_company, company, 'openai')
-                futures[future] = ('openai', company)
-
-            # Submit Claude jobs
-            for company in claude_batch:
-                future = executor.submit(self.enrich_company, company, 'claude')
-                futures[future] = ('claude', company)
-
-            # Process results as they complete
-            completed = 0
-            for future in as_completed(futures):
-                completed += 1
-                engine, company = futures[future]
-
-                try:
-                    result = future.result()
-                    if result["status"] == "success":
-                        if completed % 50 == 0:  # Progress update every 50
-                            elapsed = time.time() - start_time
-                            rate = completed / elapsed
-                            remaining = (total - completed) / rate if rate > 0 else 0
-
-                            logger.info(
-                                f"[{completed}/{total}] {completed/total*100:.1f}% | "
-                                f"Rate: {rate:.1f}/s | ETA: {remaining/60:.1f}m | "
-                                f"OpenAI: {self.stats['openai']['processed']} | "
-                                f"Claude: {self.stats['claude']['processed']}"
-                            )
-                    else:
-                        logger.error(
-                            f"[{engine.upper()}] ❌ {result['name'][:40]}: "
-                            f"{result.get('error', 'unknown')[:100]}"
-                        )
-
-                except Exception as e:
-                    logger.error(f"Exception processing {company.get('name', 'Unknown')}: {e}")
+        # Both engines drain one shared queue, so the faster provider takes more companies
+        run_stats = run_insights(
+            companies,
+            {
+                "openai": {"model": self.openai_enricher.model, "max_concurrency": openai_workers},
+                "anthropic": {"model": self.claude_enricher.model, "max_concurrency": claude_workers},
+            },
+            self.build_request,
+            version={"openai": self.openai_enricher.VERSION, "anthropic": self.claude_enricher.VERSION},
+            progress_every=50,
+            skip=self.openai_enricher.skip_status,
+            stamp_enriched_at=True
+        )
+        for engine, provider in (("openai", "openai"), ("claude", "anthropic")):
+            provider_stats = run_stats['providers'][provider]
+            self.stats[engine]["processed"] += provider_stats['success']
+            self.stats[engine]["errors"] += provider_stats['error']
 
         total_time = time.time() - start_time
 
@@ -3,6 +3,8 @@
 Dual-Key GPT-4o Enrichment
 Uses both OpenAI API keys to double throughput for GPT-4o enrichment
 Each key gets 500 RPM + 30K TPM = 1000 RPM total, 60K TPM total
+Requests rotate across both keys through the shared LLM dispatch layer
+(llm_dispatch.py), so each key is paced by its own RPM/TPM budget.
 """
 
 import json
@@ -12,10 +14,11 @@ import os
 from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from llm_dispatch import LLMRequest, run_insights
+
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -39,6 +42,7 @@ class DualKeyEnricher:
 
         self.client1 = OpenAI(api_key=key1)
         self.client2 = OpenAI(api_key=key2)
+        self.keys = [key1, key2]
         self.model = "gpt-4o"
 
         logger.info(f"✓ Dual-key enricher initialized with {self.model}")
@@ -71,7 +75,7 @@ class DualKeyEnricher:
                     slug = data.get('slug')
                     if slug in all_companies:
                         full_company = {**all_companies[slug], **data}
-                        failed.append((slug, enriched_file, full_company))
+                        failed.append((slug, enriched_file, data, full_company))
 
             except Exception as e:
                 logger.warning(f"Error reading {enriched_file}: {e}")
@@ -139,6 +143,16 @@ class DualKeyEnricher:
                 "error": str(e)[:200]
             }
 
+    def build_request(self, company: Dict, provider: str = "openai") -> LLMRequest:
+        """Dispatch request for one company (same prompt as enrich_with_key)"""
+        return LLMRequest(
+            id=company.get('slug', ''),
+            system="You are a startup analyst providing strategic insights on Y Combinator companies. Always respond with valid JSON.",
+            prompt=self._build_prompt(self._build_context(company)),
+            temperature=0.3,
+            max_tokens=1500
+        )
+
     def _build_context(self, company: Dict) -> str:
         """Build context from company data"""
         context_parts = [
@@ -219,7 +233,7 @@ Provide a structured analysis in JSON format with these fields:
 Respond ONLY with valid JSON. Be concise but insightful."""
 
     def run(self, max_workers: int = 16):
-        """Run dual-key enrichment"""
+        """Run dual-key enrichment (max_workers caps concurrent requests across both keys)"""
         companies = self.get_failed_companies()
         total = len(companies)
 
@@ -227,68 +241,26 @@ Respond ONLY with valid JSON. Be concise but insightful."""
             logger.info("✅ All companies already enriched!")
             return
 
-        # Split companies between two keys (interleaved)
-        key1_companies = companies[0::2]
-        key2_companies = companies[1::2]
-
         logger.info(f"\n{'='*70}")
         logger.info(f"🚀 DUAL-KEY GPT-4O ENRICHMENT")
         logger.info(f"{'='*70}")
         logger.info(f"Total companies: {total}")
-        logger.info(f"Key 1 batch: {len(key1_companies)} companies")
-        logger.info(f"Key 2 batch: {len(key2_companies)} companies")
-        logger.info(f"Workers per key: {max_workers // 2}")
+        logger.info(f"Keys: 2 (rotated per request, 500 RPM + 30K TPM each)")
+        logger.info(f"Max concurrency: {max_workers}")
         logger.info(f"Combined throughput: ~1000 requests/min")
         logger.info(f"{'='*70}\n")
 
         start_time = time.time()
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {}
-
-            # Submit key1 jobs
-            for slug, enriched_file, company in key1_companies:
-                future = executor.submit(self.enrich_with_key, company, 1)
-                futures[future] = (slug, enriched_file, company, 1)
-
-            # Submit key2 jobs
-            for slug, enriched_file, company in key2_companies:
-                future = executor.submit(self.enrich_with_key, company, 2)
-                futures[future] = (slug, enriched_file, company, 2)
-
-            # Process results
-            completed = 0
-            for future in as_completed(futures):
-                completed += 1
-                slug, enriched_file, company, key_num = futures[future]
-
-                try:
-                    ai_insights = future.result()
-
-                    # Update enriched file
-                    with open(enriched_file, 'r') as f:
-                        enriched_data = json.load(f)
-
-                    enriched_data['ai_insights'] = ai_insights
-                    enriched_data['phase8_complete'] = (ai_insights.get('status') == 'success')
-
-                    with open(enriched_file, 'w') as f:
-                        json.dump(enriched_data, f, indent=2)
-
-                    if completed % 100 == 0:
-                        elapsed = time.time() - start_time
-                        rate = completed / elapsed
-                        remaining = (total - completed) / rate if rate > 0 else 0
-
-                        logger.info(
-                            f"[{completed}/{total}] {completed/total*100:.1f}% | "
-                            f"Rate: {rate:.1f}/s | ETA: {remaining/60:.1f}m | "
-                            f"K1: {self.stats['key1']['success']}✓/{self.stats['key1']['error']}✗ | "
-                            f"K2: {self.stats['key2']['success']}✓/{self.stats['key2']['error']}✗"
-                        )
-
-                except Exception as e:
-                    logger.error(f"Error processing {company.get('name', slug)}: {e}")
+        # Both keys share one queue; each request goes to whichever key has budget
+        run_stats = run_insights(
+            companies,
+            {"openai": {"model": self.model, "keys": self.keys, "max_concurrency": max_workers}},
+            self.build_request
+        )
+        for key_name, key_stats in run_stats['providers']['openai']['keys'].items():
+            self.stats[key_name]["success"] += key_stats['success']
+            self.stats[key_name]["error"] += key_stats['error']
 
         total_time = time.time() - start_time
 
@@ -305,4 +277,4 @@ Respond ONLY with valid JSON. Be concise but insightful."""
 
 if __name__ == "__main__":
     enricher = DualKeyEnricher()
-    enricher.run(max_workers=16)  # 8 workers per key
+    enricher.run(max_workers=16)  # Shared by both keys
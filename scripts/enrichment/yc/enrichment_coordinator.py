@@ -20,6 +20,7 @@ from patent_enricher import PatentEnricher
 from reviews_enricher import ReviewsEnricher
 from hiring_enricher import HiringEnricher
 from ai_insights_enricher import AIInsightsEnricher
+from llm_dispatch import run_insights
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -259,7 +260,7 @@ class YCEnrichmentCoordinator:
 
         return self.stats
 
-    def enrich_company_all_phases(self, company: Dict, force: bool = False) -> Dict:
+    def enrich_company_all_phases(self, company: Dict, force: bool = False, include_ai: bool = True) -> Dict:
         """
         Enrich a single company with all phases (2-8)
         Phase 1 should already be complete
@@ -321,8 +322,8 @@ class YCEnrichmentCoordinator:
                 enriched['hiring_data'] = hiring_data
                 enriched['phase7_complete'] = True
 
-            # Phase 8: AI Insights
-            if force or not enriched.get('phase8_complete'):
+            # Phase 8: AI Insights (batch runs dispatch it separately via enrich_all_insights)
+            if include_ai and (force or not enriched.get('phase8_complete')):
                 ai_data = self.ai_enricher.enrich(full_company)
                 enriched['ai_insights'] = ai_data
                 enriched['phase8_complete'] = True
@@ -399,7 +400,7 @@ class YCEnrichmentCoordinator:
             futures = {}
 
             for company in companies:
-                future = executor.submit(self.enrich_company_all_phases, company, force)
+                future = executor.submit(self.enrich_company_all_phases, company, force, False)
                 futures[future] = company
                 time.sleep(0.2)  # Rate limiting
 
@@ -430,6 +431,10 @@ class YCEnrichmentCoordinator:
                     self.stats["errors"] += 1
                     print(f"[{i}/{total}] ❌ Exception: {company.get('name', 'Unknown')}: {e}")
 
+        # Phase 8 at the provider's rate limit instead of inside the worker threads
+        insights_stats = self.enrich_all_insights(force=force, limit=limit)
+        self.stats["ai_insights"] = {k: insights_stats.get(k, 0) for k in ("success", "error")}
+
         total_time = time.time() - start_time
 
         print(f"\n{'='*70}")
@@ -443,6 +448,83 @@ class YCEnrichmentCoordinator:
 
         return self.stats
 
+    def enrich_all_insights(
+        self,
+        force: bool = False,
+        max_concurrency: int = 16,
+        limit: Optional[int] = None
+    ) -> Dict:
+        """
+        Run Phase 8 (AI insights) for all companies through the LLM dispatch layer
+
+        Args:
+            force: Re-run companies that already have insights
+            max_concurrency: Ceiling for concurrent requests (adaptive on 429/5xx)
+            limit: Limit number of companies
+        """
+        companies = self.load_companies()
+        if limit:
+            companies = companies[:limit]
+
+        jobs = []
+        for company in companies:
+            slug = company.get('slug', '')
+            enriched = self.load_enriched(slug)
+            if enriched and (force or not enriched.get('phase8_complete')):
+                jobs.append((slug, self.get_enriched_path(slug), enriched, {**company, **enriched}))
+
+        if not jobs:
+            logger.info("✅ Phase 8 already complete for all companies")
+            return {"total": 0, "success": 0, "error": 0}
+
+        logger.info(f"Dispatching Phase 8 for {len(jobs)} companies ({self.ai_enricher.model})")
+        return run_insights(
+            jobs,
+            {"openai": {"model": self.ai_enricher.model, "max_concurrency": max_concurrency}},
+            self.ai_enricher.build_request,
+            version=self.ai_enricher.VERSION,
+            skip=self.ai_enricher.skip_status,
+            stamp_enriched_at=True
+        )
+
+    def enrich_all_density(self) -> Dict:
+        """
+        Recompute ecosystem density for every geocoded company in one pass
+
+        Needs Phase 2 coordinates, so run it after the geographic phase.
+        """
+        companies = self.load_companies()
+
+        print(f"\n{'='*70}")
+        print(f"🗺️  YC COMPANIES ECOSYSTEM DENSITY")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        enriched_by_slug = {}
+        for company in companies:
+            slug = company.get('slug', '')
+            enriched = self.load_enriched(slug)
+            if enriched and enriched.get('geographic_data'):
+                enriched_by_slug[slug] = enriched
+
+        full_companies = [{**company, **enriched_by_slug[company.get('slug', '')]}
+                          for company in companies if company.get('slug', '') in enriched_by_slug]
+        index = self.geo_enricher.build_density_index(full_companies)
+        densities = index.density_all()
+        compute_time = time.time() - start_time
+
+        for slug, density in densities.items():
+            enriched = enriched_by_slug[slug]
+            enriched['geographic_data']['ecosystem_density'] = density
+            self.save_enriched(slug, enriched)
+
+        total_time = time.time() - start_time
+        print(f"✅ Density for {len(densities)} companies ({len(full_companies)} with geographic data)")
+        print(f"⏱️  Computed in {compute_time:.1f}s, total {total_time:.1f}s")
+        print(f"{'='*70}\n")
+
+        return {"companies": len(densities), "compute_seconds": round(compute_time, 2)}
+
     def get_enrichment_stats(self) -> Dict:
         """Get statistics on enriched companies"""
         enriched_files = list(self.enriched_dir.glob("*_enriched.json"))
@@ -508,7 +590,7 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="YC Companies Enrichment Coordinator")
-    parser.add_argument('command', choices=['phase1', 'all-phases', 'stats', 'test'],
+    parser.add_argument('command', choices=['phase1', 'all-phases', 'insights', 'density', 'stats', 'test'],
                        help='Command to run')
     parser.add_argument('--force', action='store_true', help='Force re-enrichment')
     parser.add_argument('--workers', type=int, default=3, help='Number of parallel workers')
@@ -535,6 +617,12 @@ def main():
             limit=args.limit
         )
 
+    elif args.command == 'insights':
+        coordinator.enrich_all_insights(force=args.force, limit=args.limit)
+
+    elif args.command == 'density':
+        coordinator.enrich_all_density()
+
     elif args.command == 'stats':
         stats = coordinator.get_enrichment_stats()
         print("\n" + "="*70)
@@ -2,8 +2,11 @@
 """
 Production Gemini 2.0 Flash Enrichment - Maximum Speed
 95%+ cost savings vs Claude Sonnet 4
+Runs through the shared LLM dispatch layer (llm_dispatch.py): throughput is
+bounded by OpenRouter's rate limits, not by a 200-thread pool.
 """
 
+import sys
 import json
 import time
 import logging
@@ -11,15 +14,20 @@ import os
 from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from artifact_store import ArtifactStore
+from llm_dispatch import LLMRequest, run_insights
+
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "You are a startup analyst providing strategic insights on Y Combinator companies. Always respond with valid JSON."
+
 
 class GeminiFlashProduction:
     """Production Gemini 2.0 Flash enrichment - ultra-fast, ultra-cheap"""
@@ -28,6 +36,7 @@ class GeminiFlashProduction:
         self.workspace_dir = Path("/Users/yourox/AI-Workspace")
         self.enriched_dir = self.workspace_dir / "data" / "yc_enriched"
         self.companies_file = self.workspace_dir / "data" / "yc_companies" / "all_companies.json"
+        self.store = ArtifactStore(self.workspace_dir / "data" / "artifacts.db")
 
         # Initialize OpenRouter client
         self.client = OpenAI(
@@ -49,7 +58,12 @@ class GeminiFlashProduction:
         return {c['slug']: c for c in companies}
 
     def get_incomplete_companies(self) -> List[tuple]:
-        """Get companies needing Phase 8"""
+        """
+        Get companies needing Phase 8
+
+        Returns (slug, enriched_file, enriched_data, full_company) tuples; the
+        parsed enriched data is kept so results can be written without re-reading.
+        """
         all_companies = self.load_companies()
         incomplete = []
 
@@ -62,7 +76,7 @@ class GeminiFlashProduction:
                     slug = data.get('slug')
                     if slug in all_companies:
                         full_company = {**all_companies[slug], **data}
-                        incomplete.append((slug, enriched_file, full_company))
+                        incomplete.append((slug, enriched_file, data, full_company))
 
             except Exception as e:
                 logger.warning(f"Error reading {enriched_file}: {e}")
@@ -81,7 +95,7 @@ class GeminiFlashProduction:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a startup analyst providing strategic insights on Y Combinator companies. Always respond with valid JSON."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
@@ -124,6 +138,16 @@ class GeminiFlashProduction:
                 "error": str(e)[:200]
             }
 
+    def build_request(self, company: Dict, provider: str = "openrouter") -> LLMRequest:
+        """Dispatch request for one company (same prompt as enrich_with_gemini)"""
+        return LLMRequest(
+            id=company.get('slug', ''),
+            system=SYSTEM_PROMPT,
+            prompt=self._build_prompt(self._build_context(company)),
+            temperature=0.3,
+            max_tokens=1500
+        )
+
     def _build_context(self, company: Dict) -> str:
         """Build context from company data"""
         context_parts = [
@@ -207,7 +231,7 @@ Respond ONLY with valid JSON. Be concise but insightful."""
         Run production enrichment with Gemini Flash
 
         Args:
-            workers: Number of parallel workers (default 150 for max speed)
+            workers: Max concurrent requests (adaptive; halves on 429/5xx)
         """
         companies = self.get_incomplete_companies()
         total = len(companies)
@@ -220,54 +244,25 @@ Respond ONLY with valid JSON. Be concise but insightful."""
         logger.info(f"🚀 GEMINI FLASH PRODUCTION - MAXIMUM SPEED")
         logger.info(f"{'='*70}")
         logger.info(f"Total companies: {total}")
-        logger.info(f"Workers: {workers}")
+        logger.info(f"Max concurrency: {workers}")
         logger.info(f"Model: {self.model}")
         logger.info(f"Expected cost: ${total * 0.00045:.2f}")
         logger.info(f"{'='*70}\n")
 
         start_time = time.time()
 
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = {}
-
-            for slug, enriched_file, company in companies:
-                future = executor.submit(self.enrich_with_gemini, company)
-                futures[future] = (slug, enriched_file, company)
-
-            completed = 0
-            for future in as_completed(futures):
-                completed += 1
-                slug, enriched_file, company = futures[future]
-
-                try:
-                    ai_insights = future.result()
-
-                    # Update enriched file
-                    with open(enriched_file, 'r') as f:
-                        enriched_data = json.load(f)
-
-                    enriched_data['ai_insights'] = ai_insights
-                    enriched_data['phase8_complete'] = (ai_insights.get('status') == 'success')
-
-                    with open(enriched_file, 'w') as f:
-                        json.dump(enriched_data, f, indent=2)
-
-                    if completed % 100 == 0:
-                        elapsed = time.time() - start_time
-                        rate = completed / elapsed
-                        remaining = (total - completed) / rate if rate > 0 else 0
-
-                        logger.info(
-                            f"[{completed}/{total}] {completed/total*100:.1f}% | "
-                            f"Rate: {rate:.1f}/s | ETA: {remaining/60:.1f}m | "
-                            f"Success: {self.stats['success']}✓ / Errors: {self.stats['error']}✗"
-                        )
-
-                except Exception as e:
-                    logger.error(f"Error processing {company.get('name', slug)}: {e}")
+        # Rate-limited async dispatch; results are written back in batches
+        run_stats = run_insights(
+            companies,
+            {"openrouter": {"model": self.model, "max_concurrency": workers}},
+            self.build_request,
+            store=self.store
+        )
+        self.stats["success"] += run_stats["success"]
+        self.stats["error"] += run_stats["error"]
 
         total_time = time.time() - start_time
-        total_cost = self.stats['success'] * 0.00045
+        total_cost = run_stats['providers']['openrouter']['cost']
 
         logger.info(f"\n{'='*70}")
         logger.info(f"✅ GEMINI FLASH PRODUCTION COMPLETE")
@@ -284,5 +279,5 @@ Respond ONLY with valid JSON. Be concise but insightful."""
 
 if __name__ == "__main__":
     enricher = GeminiFlashProduction()
-    # Run with 200 workers for maximum speed (optimized for remaining companies)
+    # Up to 200 concurrent requests, paced by OpenRouter's rate limits
     enricher.run(workers=200)
@@ -6,17 +6,22 @@ Multi-source geocoding with smart fallbacks:
 2. Nominatim/OpenStreetMap (free, 1 req/sec)
 3. GeoNames.org (free, 30k req/day, no key needed)
 4. Google Maps (if API enabled)
+
+Ecosystem density (YC companies within 1-50km) is computed against an
+EcosystemDensityIndex: coordinates live in latitude-sorted NumPy arrays, a
+query only scans the latitude band that can fall inside 50km, and distances
+are vectorized haversine instead of per-pair geopy calls.
 """
 
 import os
 import requests
 import json
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 import logging
 import time
 from pathlib import Path
-from geopy.distance import geodesic
+import numpy as np
 from dotenv import load_dotenv
 import re
 
@@ -105,6 +110,8 @@ class GeographicEnricherV2:
         self.base_url = "https://maps.googleapis.com/maps/api"
         self.last_nominatim_request = 0  # Rate limiting
         self.geocode_cache = {}  # In-memory cache
+        self.density_index = None  # Built on first density lookup
+        self._density_source = None
 
     def _test_google_api(self) -> bool:
         """Test if Google Geocoding API is enabled"""
@@ -143,6 +150,8 @@ class GeographicEnricherV2:
                     all_companies
                 )
                 enrichment_data["ecosystem_density"] = ecosystem_density
+            elif self.density_index is not None:
+                enrichment_data["ecosystem_density"] = self.density_index.density(place_data["coordinates"])
 
         return enrichment_data
 
@@ -360,58 +369,134 @@ class GeographicEnricherV2:
             logger.debug(f"GeoNames geocoding failed: {e}")
             return {"status": "error", "error": str(e)[:200]}
 
+    def build_density_index(self, all_companies: List[Dict]) -> "EcosystemDensityIndex":
+        """Index all company coordinates once for ecosystem density lookups"""
+        self.density_index = EcosystemDensityIndex(all_companies)
+        self._density_source = all_companies
+        return self.density_index
+
     def _calculate_ecosystem_density(self, coordinates: Dict, all_companies: List[Dict]) -> Dict:
         """Calculate startup ecosystem density"""
-        lat = coordinates["latitude"]
-        lng = coordinates["longitude"]
-        origin = (lat, lng)
+        # Rebuild only when called with a different company list
+        if self._density_source is not all_companies:
+            self.build_density_index(all_companies)
+        return self.density_index.density(coordinates)
 
-        radii = {"1km": 0, "5km": 0, "10km": 0, "25km": 0, "50km": 0}
-        nearby_companies = []
 
-        for other_company in all_companies:
-            geo_data = other_company.get('geographic_data', {})
-            place_data = geo_data.get('place_data', {})
-            other_coords = place_data.get('coordinates')
-
-            if not other_coords:
-                continue
-
-            other_lat = other_coords.get('latitude')
-            other_lng = other_coords.get('longitude')
-
-            if not other_lat or not other_lng:
-                continue
-
-            other_point = (other_lat, other_lng)
-            distance_km = geodesic(origin, other_point).kilometers
-
-            if distance_km <= 1:
-                radii["1km"] += 1
-            if distance_km <= 5:
-                radii["5km"] += 1
-            if distance_km <= 10:
-                radii["10km"] += 1
-                nearby_companies.append({
-                    "name": other_company.get("name"),
-                    "slug": other_company.get("slug"),
-                    "batch": other_company.get("batch"),
-                    "distance_km": round(distance_km, 2)
-                })
-            if distance_km <= 25:
-                radii["25km"] += 1
-            if distance_km <= 50:
-                radii["50km"] += 1
-
-        nearby_companies.sort(key=lambda x: x["distance_km"])
+EARTH_RADIUS_KM = 6371.0088
+DENSITY_RADII_KM = {"1km": 1.0, "5km": 5.0, "10km": 10.0, "25km": 25.0, "50km": 50.0}
+NEARBY_RADIUS_KM = 10.0
+MAX_NEARBY_COMPANIES = 20
+
+
+def company_coordinates(company: Dict) -> Optional[Tuple[float, float]]:
+    """(lat, lng) from a company's geographic_data, or None"""
+    geo_data = company.get('geographic_data') or {}
+    place_data = geo_data.get('place_data') or {}
+    coords = place_data.get('coordinates')
+    if not coords:
+        return None
+
+    lat = coords.get('latitude')
+    lng = coords.get('longitude')
+    if not lat or not lng:
+        return None
+    return float(lat), float(lng)
+
+
+class EcosystemDensityIndex:
+    """Latitude-sorted coordinate index for vectorized radius counts"""
+
+    def __init__(self, all_companies: List[Dict], max_radius_km: float = max(DENSITY_RADII_KM.values())):
+        located = [(coords, i, company) for i, company in enumerate(all_companies)
+                   if (coords := company_coordinates(company))]
+        # Sort by latitude, keeping input order for ties (nearby lists stay stable)
+        located.sort(key=lambda item: (item[0][0], item[1]))
+
+        self.companies = [company for _, _, company in located]
+        self.input_order = np.array([i for _, i, _ in located], dtype=np.int64)
+        self.lat_deg = np.array([coords[0] for coords, _, _ in located], dtype=np.float64)
+        self.lat = np.radians(self.lat_deg)
+        self.lng = np.radians(np.array([coords[1] for coords, _, _ in located], dtype=np.float64))
+        self.max_radius_km = max_radius_km
+        self._cache: Dict[Tuple[float, float], Dict] = {}
+
+        logger.info(f"✓ Density index: {len(self.companies)}/{len(all_companies)} companies with coordinates")
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    def neighbours(self, lat: float, lng: float, radius_km: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Companies within radius_km of a point
+
+        Returns:
+            (index positions, distances in km), unsorted
+        """
+        radius_km = self.max_radius_km if radius_km is None else radius_km
+        # Nothing outside this latitude band can be within radius_km
+        band = np.degrees(radius_km / EARTH_RADIUS_KM)
+        lo = np.searchsorted(self.lat_deg, lat - band, side='left')
+        hi = np.searchsorted(self.lat_deg, lat + band, side='right')
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        lat1, lng1 = np.radians(lat), np.radians(lng)
+        lat2, lng2 = self.lat[lo:hi], self.lng[lo:hi]
+        a = (np.sin((lat2 - lat1) / 2) ** 2
+             + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2)
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+        within = np.nonzero(distances <= radius_km)[0]
+        return within + lo, distances[within]
+
+    def density(self, coordinates: Dict) -> Dict:
+        """Ecosystem density around a coordinates dict (latitude/longitude)"""
+        key = (coordinates["latitude"], coordinates["longitude"])
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._density(*key)
+            self._cache[key] = cached
+
+        return {**cached, "calculated_at": datetime.now().isoformat()}
+
+    def _density(self, lat: float, lng: float) -> Dict:
+        positions, distances = self.neighbours(lat, lng)
+
+        radii = {label: int(np.count_nonzero(distances <= km)) for label, km in DENSITY_RADII_KM.items()}
+
+        nearby = distances <= NEARBY_RADIUS_KM
+        near_positions, near_distances = positions[nearby], distances[nearby]
+        order = np.lexsort((self.input_order[near_positions], near_distances))[:MAX_NEARBY_COMPANIES]
+        nearby_companies = []
+        for idx in order:
+            other_company = self.companies[near_positions[idx]]
+            nearby_companies.append({
+                "name": other_company.get("name"),
+                "slug": other_company.get("slug"),
+                "batch": other_company.get("batch"),
+                "distance_km": round(float(near_distances[idx]), 2)
+            })
 
         return {
             "companies_within": radii,
             "density_score": radii["10km"],
-            "nearby_companies": nearby_companies[:20],
-            "calculated_at": datetime.now().isoformat()
+            "nearby_companies": nearby_companies
         }
 
+    def density_all(self) -> Dict[str, Dict]:
+        """
+        Ecosystem density for every indexed company in one pass
+
+        Returns:
+            slug -> density dict (companies sharing coordinates share one computation)
+        """
+        results = {}
+        for company in self.companies:
+            lat, lng = company_coordinates(company)
+            results[company.get("slug")] = self.density({"latitude": lat, "longitude": lng})
+        return results
+
 
 def main():
     """Test the enhanced enricher"""
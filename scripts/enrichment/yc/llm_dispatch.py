@@ -0,0 +1,795 @@
+#!/usr/bin/env python3
+"""
+LLM Dispatch - Shared asyncio LLM worker pool for YC enrichment scripts
+
+Replaces the per-script ThreadPoolExecutor fan-outs (200 Gemini threads,
+8 threads per OpenAI key, 40+40 dual-engine threads) with one dispatch
+layer whose throughput is bounded by provider limits, not thread counts:
+- Per-provider and per-key token buckets (requests/min and tokens/min)
+- Key rotation across every configured key for a provider
+- Adaptive concurrency (AIMD): halve on 429/5xx, creep back up on success
+- Retry with backoff on 429/5xx/timeouts (honors Retry-After, cools the key)
+- Batched enriched-file writes off the event loop (plus artifact store upserts)
+- One pooled httpx.AsyncClient per provider
+
+Usage:
+    from llm_dispatch import LLMRequest, run_insights
+
+    stats = run_insights(jobs, {"openrouter": {"max_concurrency": 200}}, build_request)
+
+    # Local mock server (no API keys, no spend) for testing throughput/backoff
+    python3 llm_dispatch.py mock --port 8765 --rpm 600 --error-rate 0.05
+    python3 llm_dispatch.py bench --base-url http://127.0.0.1:8765/v1 --requests 500
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import httpx
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from polite_fetcher import TokenBucket
+from artifact_store import write_json_atomic
+
+load_dotenv('/Users/yourox/AI-Workspace/.env')
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+THROTTLE_STATUSES = {429, 529}
+
+
+@dataclass
+class ProviderConfig:
+    """Endpoint, keys and limits for one LLM provider"""
+    name: str
+    base_url: str
+    api_style: str                      # 'openai' (chat/completions) or 'anthropic' (messages)
+    key_envs: Tuple[str, ...]
+    model: str
+    rpm_per_key: float
+    tpm_per_key: Optional[float] = None
+    provider_rpm: Optional[float] = None
+    max_concurrency: int = 32
+    input_price: float = 0.0            # $ per 1M prompt tokens
+    output_price: float = 0.0           # $ per 1M completion tokens
+
+
+PROVIDERS: Dict[str, ProviderConfig] = {
+    "openrouter": ProviderConfig(
+        name="openrouter",
+        base_url="https://openrouter.ai/api/v1",
+        api_style="openai",
+        key_envs=("OPENROUTER_API_KEY",),
+        model="google/gemini-2.0-flash-001",
+        rpm_per_key=1000,
+        max_concurrency=200,
+        input_price=0.075,
+        output_price=0.30,
+    ),
+    "openai": ProviderConfig(
+        name="openai",
+        base_url="https://api.openai.com/v1",
+        api_style="openai",
+        key_envs=("OPENAI_API_KEY", "OPENAI_API_KEY2"),
+        model="gpt-4o",
+        rpm_per_key=500,
+        tpm_per_key=30_000,
+        max_concurrency=16,
+        input_price=2.50,
+        output_price=10.0,
+    ),
+    "anthropic": ProviderConfig(
+        name="anthropic",
+        base_url="https://api.anthropic.com/v1",
+        api_style="anthropic",
+        key_envs=("ANTHROPIC_API_KEY",),
+        model="claude-sonnet-4-20250514",
+        rpm_per_key=1000,
+        max_concurrency=48,
+        input_price=3.0,
+        output_price=15.0,
+    ),
+}
+
+
+@dataclass
+class LLMRequest:
+    """One chat completion to dispatch"""
+    id: str
+    prompt: str
+    system: Optional[str] = None
+    max_tokens: int = 1500
+    temperature: float = 0.3
+    json_mode: bool = True
+
+    def estimated_tokens(self) -> int:
+        """Rough prompt + completion token count for TPM budgeting"""
+        return (len(self.prompt) + len(self.system or '')) // 4 + self.max_tokens
+
+
+@dataclass
+class LLMResult:
+    """Outcome of one dispatched request"""
+    id: str
+    provider: str
+    model: str
+    status: str = 'error'               # 'success' or 'error'
+    content: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    key: Optional[str] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 'success'
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit: additive increase on success, halve on throttling"""
+
+    def __init__(self, maximum: int, initial: Optional[int] = None, minimum: int = 1,
+                 decrease_interval: float = 1.0):
+        self.maximum = max(maximum, 1)
+        self.minimum = max(min(minimum, self.maximum), 1)
+        # Start at the ceiling (token buckets pace the rate); back off only when the provider pushes back
+        self.limit = float(initial or self.maximum)
+        self.in_flight = 0
+        self.decrease_interval = decrease_interval
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+
+    def on_throttle(self):
+        # A burst of 429s from one window counts as a single congestion signal
+        now = time.monotonic()
+        if now - self._last_decrease >= self.decrease_interval:
+            self.limit = max(float(self.minimum), self.limit / 2)
+            self._last_decrease = now
+
+
+class _KeyState:
+    """Per-key buckets, cooldown and counters"""
+
+    def __init__(self, label: str, api_key: str, rpm: float, tpm: Optional[float]):
+        self.label = label
+        self.api_key = api_key
+        self.requests = TokenBucket(rpm / 60.0, max(rpm / 60.0, 1.0))
+        self.tokens = TokenBucket(tpm / 60.0, tpm / 60.0 * 10) if tpm else None
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self.stats = {'success': 0, 'error': 0, 'throttled': 0, 'retries': 0}
+
+
+class LLMDispatcher:
+    """Rate-limited, key-rotating async client for one provider"""
+
+    def __init__(
+        self,
+        provider: str,
+        model: Optional[str] = None,
+        keys: Optional[List[str]] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        rpm_per_key: Optional[float] = None,
+        tpm_per_key: Optional[float] = None,
+        timeout: float = 120.0,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        """
+        Args:
+            provider: Key into PROVIDERS ('openrouter', 'openai', 'anthropic')
+            model: Override the provider's default model
+            keys: Explicit API keys (default: the provider's env vars that are set)
+            base_url: Override the endpoint (e.g. a local mock server)
+            max_concurrency: Ceiling for the adaptive in-flight limit
+            rpm_per_key / tpm_per_key: Override per-key rate limits
+            timeout: Per-request timeout in seconds
+            max_retries: Retries on 429/5xx/timeouts
+            backoff_base / backoff_max: Exponential backoff (with jitter) bounds
+        """
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown provider '{provider}' (choose from {', '.join(PROVIDERS)})")
+
+        self.config = PROVIDERS[provider]
+        self.provider = provider
+        self.model = model or self.config.model
+        self.base_url = (base_url or self.config.base_url).rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        if keys is None:
+            keys = [os.getenv(env) for env in self.config.key_envs]
+            keys = [k for k in keys if k]
+        if not keys:
+            raise ValueError(f"No API key found for {provider} ({', '.join(self.config.key_envs)})")
+
+        rpm = rpm_per_key or self.config.rpm_per_key
+        tpm = tpm_per_key or self.config.tpm_per_key
+        self.keys = [_KeyState(f"key{i}", key, rpm, tpm) for i, key in enumerate(keys, 1)]
+        self._next_key = 0
+
+        provider_rpm = self.config.provider_rpm
+        self.provider_bucket = TokenBucket(provider_rpm / 60.0, max(provider_rpm / 60.0, 1.0)) if provider_rpm else None
+        self.limit = AdaptiveLimit(max_concurrency or self.config.max_concurrency)
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = {'requests': 0, 'success': 0, 'error': 0, 'retries': 0, 'throttled': 0,
+                      'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def __aenter__(self):
+        connections = self.limit.maximum + 8
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ------------------------------------------------------------------
+    # Keys and rate limits
+    # ------------------------------------------------------------------
+
+    async def _checkout_key(self, estimated_tokens: int) -> _KeyState:
+        """Pick the next key that is not cooling down and wait for its budget"""
+        while True:
+            now = time.monotonic()
+            available = [k for k in self.keys if k.cooldown_until <= now]
+            if available:
+                break
+            await asyncio.sleep(min(k.cooldown_until for k in self.keys) - now)
+
+        # Round-robin, preferring the least-loaded key
+        start = self._next_key
+        self._next_key = (self._next_key + 1) % len(self.keys)
+        ordered = self.keys[start:] + self.keys[:start]
+        key = min((k for k in ordered if k in available), key=lambda k: k.in_flight)
+
+        if self.provider_bucket:
+            await self.provider_bucket.acquire()
+        await key.requests.acquire()
+        if key.tokens:
+            await key.tokens.acquire(estimated_tokens)
+        return key
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay, self.backoff_max) * (0.5 + random.random() / 2)
+
+    # ------------------------------------------------------------------
+    # Provider wire formats
+    # ------------------------------------------------------------------
+
+    def _build_http_request(self, request: LLMRequest, api_key: str) -> Tuple[str, Dict, Dict]:
+        if self.config.api_style == 'anthropic':
+            body = {
+                "model": self.model,
+                "max_tokens": request.max_tokens,
+                "temperature": request.temperature,
+                "messages": [{"role": "user", "content": request.prompt}],
+            }
+            if request.system:
+                body["system"] = request.system
+            headers = {"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+            return f"{self.base_url}/messages", headers, body
+
+        messages = []
+        if request.system:
+            messages.append({"role": "system", "content": request.system})
+        messages.append({"role": "user", "content": request.prompt})
+        body = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+        }
+        if request.json_mode:
+            body["response_format"] = {"type": "json_object"}
+        headers = {"Authorization": f"Bearer {api_key}"}
+        return f"{self.base_url}/chat/completions", headers, body
+
+    def _parse_response(self, data: Dict, result: LLMResult):
+        if self.config.api_style == 'anthropic':
+            result.content = data["content"][0]["text"]
+            usage = data.get("usage", {})
+            result.prompt_tokens = usage.get("input_tokens", 0)
+            result.completion_tokens = usage.get("output_tokens", 0)
+        else:
+            result.content = data["choices"][0]["message"]["content"]
+            usage = data.get("usage", {})
+            result.prompt_tokens = usage.get("prompt_tokens", 0)
+            result.completion_tokens = usage.get("completion_tokens", 0)
+
+        result.cost = (result.prompt_tokens / 1_000_000 * self.config.input_price
+                       + result.completion_tokens / 1_000_000 * self.config.output_price)
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    async def complete(self, request: LLMRequest) -> LLMResult:
+        """
+        Run one request under the provider's rate limits
+
+        Never raises for API failures; they come back as status='error'.
+        """
+        if self._client is None:
+            raise RuntimeError("LLMDispatcher must be used as 'async with LLMDispatcher(...) as d'")
+
+        result = LLMResult(id=request.id, provider=self.provider, model=self.model)
+        start = time.monotonic()
+
+        for attempt in range(self.max_retries + 1):
+            result.attempts = attempt + 1
+            retry_after = None
+            retryable = False
+
+            async with self.limit:
+                key = await self._checkout_key(request.estimated_tokens())
+                result.key = key.label
+                url, headers, body = self._build_http_request(request, key.api_key)
+
+                key.in_flight += 1
+                self.stats['requests'] += 1
+                try:
+                    response = await self._client.post(url, headers=headers, json=body)
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    response = None
+                    result.error = f"{type(e).__name__}: {e}"
+                    retryable = True
+                finally:
+                    key.in_flight -= 1
+
+                if response is not None:
+                    if response.status_code == 200:
+                        try:
+                            self._parse_response(response.json(), result)
+                            result.status = 'success'
+                            result.error = None
+                        except (ValueError, KeyError, IndexError, TypeError) as e:
+                            result.error = f"Malformed response: {e}"
+                    else:
+                        result.error = f"HTTP {response.status_code}: {response.text[:200]}"
+                        retryable = response.status_code in RETRY_STATUSES
+                        retry_after = response.headers.get('retry-after')
+
+                        if response.status_code in THROTTLE_STATUSES or response.status_code >= 500:
+                            self.limit.on_throttle()
+                        if response.status_code in THROTTLE_STATUSES:
+                            key.stats['throttled'] += 1
+                            self.stats['throttled'] += 1
+                            key.cooldown_until = time.monotonic() + self._backoff_delay(attempt, retry_after)
+
+                if result.ok:
+                    self.limit.on_success()
+                    key.stats['success'] += 1
+                    break
+
+            if not retryable or attempt == self.max_retries:
+                key.stats['error'] += 1
+                break
+
+            key.stats['retries'] += 1
+            self.stats['retries'] += 1
+            await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+
+        result.elapsed = time.monotonic() - start
+        self.stats['success' if result.ok else 'error'] += 1
+        self.stats['prompt_tokens'] += result.prompt_tokens
+        self.stats['completion_tokens'] += result.completion_tokens
+        self.stats['cost'] += result.cost
+        return result
+
+    async def drain(self, queue: asyncio.Queue, build_request: Callable, handle: Callable):
+        """
+        Pull jobs off a shared queue until it is empty
+
+        Runs as many workers as the concurrency ceiling; the adaptive limit
+        decides how many are actually in flight. Several dispatchers can
+        drain one queue, so a faster provider naturally takes more of the work.
+
+        Args:
+            queue: asyncio.Queue of job payloads
+            build_request: payload -> LLMRequest for this provider
+            handle: async (dispatcher, result, payload) callback
+        """
+        async def worker():
+            while True:
+                try:
+                    payload = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    result = await self.complete(build_request(payload))
+                    await handle(self, result, payload)
+                except Exception as e:
+                    logger.error(f"[{self.provider}] Job failed: {e}")
+                finally:
+                    queue.task_done()
+
+        await asyncio.gather(*(worker() for _ in range(self.limit.maximum)))
+
+    def summary(self) -> Dict:
+        return {
+            **self.stats,
+            'cost': round(self.stats['cost'], 4),
+            'concurrency_limit': round(self.limit.limit, 1),
+            'keys': {k.label: dict(k.stats) for k in self.keys},
+        }
+
+
+# ----------------------------------------------------------------------
+# Batched result writes
+# ----------------------------------------------------------------------
+
+class EnrichedWriter:
+    """Buffers enriched-file updates and writes them in batches off the event loop"""
+
+    def __init__(self, store=None, namespace: str = "yc_enriched", batch_size: int = 100):
+        self.store = store
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self.pending: List[Tuple[str, Path, Dict]] = []
+        self.written = 0
+
+    async def add(self, slug: str, path: Path, data: Dict):
+        self.pending.append((slug, path, data))
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        await asyncio.to_thread(self._write, batch)
+        self.written += len(batch)
+
+    def _write(self, batch: List[Tuple[str, Path, Dict]]):
+        for slug, path, data in batch:
+            write_json_atomic(path, data)
+        if self.store is not None:
+            self.store.put_many(self.namespace, [(slug, data) for slug, _, data in batch])
+
+
+# ----------------------------------------------------------------------
+# Phase 8 (AI insights) runner
+# ----------------------------------------------------------------------
+
+def parse_json_content(content: str) -> Dict:
+    """JSON object from a completion, unwrapping markdown code fences"""
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+    return json.loads(content)
+
+
+def insights_from_result(result: LLMResult, api_style: str, version: str = "1.0.0") -> Dict:
+    """ai_insights dict in the shape the enrichers have always written"""
+    base = {
+        "ai_insights_version": version,
+        "model_used": result.model,
+        "enriched_at": datetime.now().isoformat(),
+    }
+
+    if result.ok:
+        try:
+            insights = parse_json_content(result.content)
+        except (ValueError, IndexError) as e:
+            return {**base, "status": "error", "error": f"Invalid JSON response from AI: {e}"[:200]}
+
+        if api_style == 'anthropic':
+            tokens = {"input": result.prompt_tokens, "output": result.completion_tokens}
+        else:
+            tokens = {"prompt": result.prompt_tokens, "completion": result.completion_tokens}
+        # Status last: a model reply with its own "status" key must not override it
+        return {
+            **base,
+            **insights,
+            "status": "success",
+            "tokens_used": {
+                **tokens,
+                "total": result.prompt_tokens + result.completion_tokens,
+                "estimated_cost": round(result.cost, 6)
+            }
+        }
+
+    return {**base, "status": "error", "error": (result.error or "unknown error")[:200]}
+
+
+async def _run_insights(jobs, providers, build_request, store, batch_size, version, progress_every, base_url,
+                        skip, stamp_enriched_at):
+    queue: asyncio.Queue = asyncio.Queue()
+    skipped = []
+    for job in jobs:
+        reason = skip(job[3]) if skip else None
+        if reason:
+            skipped.append((job, reason))
+        else:
+            queue.put_nowait(job)
+
+    total = queue.qsize()
+    writer = EnrichedWriter(store, batch_size=batch_size)
+    dispatchers = [LLMDispatcher(name, base_url=base_url, **(options or {})) for name, options in providers.items()]
+    counts = {'completed': 0, 'success': 0, 'error': 0, 'skipped': len(skipped)}
+    start_time = time.time()
+
+    # Companies that cannot be analyzed are recorded without an LLM call
+    for (slug, enriched_file, enriched_data, _), reason in skipped:
+        first = dispatchers[0]
+        provider_version = version.get(first.provider, "1.0.0") if isinstance(version, dict) else version
+        enriched_data['ai_insights'] = {
+            "ai_insights_version": provider_version,
+            "model_used": first.model,
+            "enriched_at": datetime.now().isoformat(),
+            "status": reason,
+        }
+        enriched_data['phase8_complete'] = True
+        if stamp_enriched_at:
+            enriched_data['enriched_at'] = enriched_data['ai_insights']['enriched_at']
+        await writer.add(slug, enriched_file, enriched_data)
+    if skipped:
+        logger.info(f"Skipped {len(skipped)} companies without an LLM call "
+                    f"({', '.join(sorted({reason for _, reason in skipped}))})")
+
+    async def handle(dispatcher: LLMDispatcher, result: LLMResult, job):
+        slug, enriched_file, enriched_data, company = job
+        provider_version = version.get(dispatcher.provider, "1.0.0") if isinstance(version, dict) else version
+        ai_insights = insights_from_result(result, dispatcher.config.api_style, provider_version)
+
+        # Update the already-loaded enriched data (no re-read)
+        enriched_data['ai_insights'] = ai_insights
+        enriched_data['phase8_complete'] = (ai_insights.get('status') == 'success')
+        if stamp_enriched_at:
+            enriched_data['enriched_at'] = ai_insights['enriched_at']
+        await writer.add(slug, enriched_file, enriched_data)
+
+        counts['completed'] += 1
+        if enriched_data['phase8_complete']:
+            counts['success'] += 1
+        else:
+            counts['error'] += 1
+            logger.error(f"[{dispatcher.provider.upper()}] Error enriching {company.get('name', slug)}: "
+                         f"{ai_insights['error'][:100]}")
+
+        if counts['completed'] % progress_every == 0:
+            elapsed = time.time() - start_time
+            rate = counts['completed'] / elapsed
+            remaining = (total - counts['completed']) / rate if rate > 0 else 0
+            limits = " | ".join(f"{d.provider}: {d.limit.in_flight}/{d.limit.limit:.0f}" for d in dispatchers)
+            logger.info(
+                f"[{counts['completed']}/{total}] {counts['completed']/total*100:.1f}% | "
+                f"Rate: {rate:.1f}/s | ETA: {remaining/60:.1f}m | "
+                f"Success: {counts['success']}✓ / Errors: {counts['error']}✗ | {limits}"
+            )
+
+    async def drain(dispatcher: LLMDispatcher):
+        async with dispatcher:
+            await dispatcher.drain(queue, lambda job: build_request(job[3], dispatcher.provider), handle)
+
+    try:
+        await asyncio.gather(*(drain(d) for d in dispatchers))
+    finally:
+        await writer.flush()
+
+    return {
+        'total': total,
+        'success': counts['success'],
+        'error': counts['error'],
+        'skipped': counts['skipped'],
+        'written': writer.written,
+        'elapsed': time.time() - start_time,
+        'providers': {d.provider: d.summary() for d in dispatchers},
+    }
+
+
+def run_insights(
+    jobs: Iterable[Tuple[str, Path, Dict, Dict]],
+    providers: Dict[str, Optional[Dict]],
+    build_request: Callable[[Dict, str], LLMRequest],
+    store=None,
+    batch_size: int = 100,
+    version: Union[str, Dict[str, str]] = "1.0.0",
+    progress_every: int = 100,
+    base_url: Optional[str] = None,
+    skip: Optional[Callable[[Dict], Optional[str]]] = None,
+    stamp_enriched_at: bool = False,
+) -> Dict:
+    """
+    Run Phase 8 (AI insights) for many companies through the dispatch layer
+
+    Args:
+        jobs: (slug, enriched_file, enriched_data, full_company) tuples
+        providers: {provider: LLMDispatcher kwargs}; several providers share one work queue
+        build_request: (full_company, provider) -> LLMRequest
+        store: Optional ArtifactStore mirrored alongside the JSON files
+        batch_size: Enriched files written per batch
+        version: ai_insights_version recorded in each result (or {provider: version})
+        progress_every: Log progress every N completions
+        base_url: Point every provider at one endpoint (e.g. the mock server)
+        skip: full_company -> status (e.g. "no_company_name") for companies that
+            are recorded as complete without an LLM call, or None to dispatch
+        stamp_enriched_at: Also set the top-level enriched_at of each written file
+
+    Returns:
+        Run statistics, including per-provider and per-key counters
+    """
+    return asyncio.run(_run_insights(list(jobs), providers, build_request, store,
+                                     batch_size, version, progress_every, base_url,
+                                     skip, stamp_enriched_at))
+
+
+# ----------------------------------------------------------------------
+# Local mock server + benchmark
+# ----------------------------------------------------------------------
+
+MOCK_INSIGHTS = {
+    "market_analysis": {"market_size": "large", "market_stage": "growing", "key_trends": ["mock"]},
+    "risk_analysis": {"overall_risk_score": 5, "key_risks": ["mock"]},
+}
+
+
+def serve_mock(host: str = "127.0.0.1", port: int = 8765, rpm: float = 600, error_rate: float = 0.0,
+               latency: float = 0.2):
+    """
+    OpenAI/Anthropic-compatible mock endpoint with a global rate limit
+
+    Requests over `rpm` get 429 + Retry-After, and `error_rate` of the rest
+    get a 503, so backoff and adaptive concurrency can be exercised offline.
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    lock = threading.Lock()
+    window = {'start': time.monotonic(), 'count': 0}
+    counters = {'ok': 0, '429': 0, '503': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+
+            with lock:
+                now = time.monotonic()
+                if now - window['start'] >= 60:
+                    window['start'], window['count'] = now, 0
+                window['count'] += 1
+                over_limit = window['count'] > rpm
+                retry_after = max(1, int(60 - (now - window['start'])))
+
+            if over_limit:
+                counters['429'] += 1
+                return self._send(429, {"error": {"message": "rate limited"}}, {'Retry-After': str(retry_after)})
+            if random.random() < error_rate:
+                counters['503'] += 1
+                return self._send(503, {"error": {"message": "overloaded"}})
+
+            time.sleep(latency)
+            counters['ok'] += 1
+            text = json.dumps(MOCK_INSIGHTS)
+            if self.path.endswith('/messages'):
+                return self._send(200, {"content": [{"type": "text", "text": text}],
+                                        "usage": {"input_tokens": 400, "output_tokens": 300}})
+            return self._send(200, {"model": request.get('model'),
+                                    "choices": [{"message": {"role": "assistant", "content": text}}],
+                                    "usage": {"prompt_tokens": 400, "completion_tokens": 300, "total_tokens": 700}})
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"🧪 Mock LLM server on http://{host}:{port}/v1 ({rpm:.0f} RPM, {error_rate:.0%} 503s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served: {counters}")
+
+
+async def _bench(provider: str, base_url: str, requests: int, concurrency: int, rpm: float) -> Dict:
+    dispatcher = LLMDispatcher(provider, keys=["mock-key-1", "mock-key-2"], base_url=base_url,
+                               max_concurrency=concurrency, rpm_per_key=rpm / 2)
+    start = time.time()
+    async with dispatcher:
+        results = await asyncio.gather(*(
+            dispatcher.complete(LLMRequest(id=str(i), prompt=f"Mock company {i}", system="mock"))
+            for i in range(requests)
+        ))
+    elapsed = time.time() - start
+    return {
+        **dispatcher.summary(),
+        'jobs': requests,
+        'success': sum(1 for r in results if r.ok),
+        'elapsed': round(elapsed, 2),
+        'rate_per_min': round(requests / elapsed * 60, 1),
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shared LLM dispatch layer (mock server + benchmark)")
+    parser.add_argument('command', choices=['mock', 'bench'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rpm', type=float, default=600, help='Mock server limit / client budget (requests/min)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Mock server 503 ratio')
+    parser.add_argument('--latency', type=float, default=0.2, help='Mock server response latency (s)')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8765/v1')
+    parser.add_argument('--provider', default='openrouter', choices=list(PROVIDERS),
+                        help='Wire format and limits preset (openai preset also enforces 30K TPM per key)')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
+    if args.command == 'mock':
+        serve_mock(args.host, args.port, args.rpm, args.error_rate, args.latency)
+    else:
+        stats = asyncio.run(_bench(args.provider, args.base_url, args.requests, args.concurrency, args.rpm))
+        print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
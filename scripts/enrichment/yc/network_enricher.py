@@ -8,10 +8,16 @@ Analyzes relationships and connections between companies:
 - Technology stack overlaps
 - Market/industry overlaps
 - Geographic clusters
+
+Similar-company search generates candidates from the batch/industry/city
+inverted indexes and scores them with per-company features precomputed at
+init, so enriching the full dataset is near-linear instead of scoring every
+pair of companies.
 """
 
 import json
-from typing import Dict, List, Optional, Set
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 import logging
 from pathlib import Path
@@ -37,6 +43,7 @@ class NetworkEnricher:
         self.companies_by_batch = self._index_by_batch()
         self.companies_by_industry = self._index_by_industry()
         self.companies_by_location = self._index_by_location()
+        self._build_similarity_index()
 
         logger.info(f"NetworkEnricher initialized with {len(all_companies)} companies")
 
@@ -70,6 +77,51 @@ class NetworkEnricher:
                     index[city].append(company)
         return dict(index)
 
+    @staticmethod
+    def _city(company: Dict) -> str:
+        """City-level location (first part of all_locations)"""
+        location = company.get('all_locations', '')
+        return location.split(',')[0].strip() if location else ''
+
+    @staticmethod
+    def _primary_language(company: Dict) -> Optional[str]:
+        """Primary GitHub language from Phase 3 data"""
+        github_data = company.get('github_data') or {}
+        return (github_data.get('tech_stack') or {}).get('primary_language')
+
+    def _features(self, company: Dict) -> Tuple:
+        """(slug, batch, industries, city, primary_language) used for similarity scoring"""
+        return (
+            company.get('slug'),
+            company.get('batch'),
+            frozenset(company.get('industries', [])),
+            self._city(company),
+            self._primary_language(company)
+        )
+
+    def _build_similarity_index(self):
+        """Precompute per-company features and position-based inverted indexes"""
+        self._company_features = []
+        self._positions_by_slug = defaultdict(list)
+        self._positions_by_batch = defaultdict(list)
+        self._positions_by_industry = defaultdict(list)
+        self._positions_by_city = defaultdict(list)
+        self._positions_by_language = defaultdict(list)
+
+        for position, company in enumerate(self.all_companies):
+            features = self._features(company)
+            slug, batch, industries, city, language = features
+            self._company_features.append(features)
+
+            self._positions_by_slug[slug].append(position)
+            # None batches/languages are indexed too: they compare equal when scoring
+            self._positions_by_batch[batch].append(position)
+            self._positions_by_language[language].append(position)
+            for industry in industries:
+                self._positions_by_industry[industry].append(position)
+            if city:
+                self._positions_by_city[city].append(position)
+
     def enrich(self, company: Dict) -> Dict:
         """
         Main enrichment function for network data
@@ -171,8 +223,8 @@ class NetworkEnricher:
 
         # Get full peer data
         peers = [
-            c for c in self.all_companies
-            if c.get('slug') in industry_peers
+            self.all_companies[position]
+            for position in sorted(p for slug in industry_peers for p in self._positions_by_slug.get(slug, []))
         ]
 
         # Find direct competitors (same subindustry)
@@ -251,21 +303,17 @@ class NetworkEnricher:
 
         # Find companies using same primary language
         same_tech_companies = []
-        for other in self.all_companies:
+        for position in self._positions_by_language.get(primary_language, []):
+            other = self.all_companies[position]
             if other.get('slug') == company_slug:
                 continue
 
-            other_github = other.get('github_data', {})
-            other_tech = other_github.get('tech_stack', {})
-            other_language = other_tech.get('primary_language')
-
-            if other_language == primary_language:
-                same_tech_companies.append({
-                    "name": other.get('name'),
-                    "slug": other.get('slug'),
-                    "batch": other.get('batch'),
-                    "industry": other.get('industry')
-                })
+            same_tech_companies.append({
+                "name": other.get('name'),
+                "slug": other.get('slug'),
+                "batch": other.get('batch'),
+                "industry": other.get('industry')
+            })
 
         return {
             "primary_language": primary_language,
@@ -274,65 +322,79 @@ class NetworkEnricher:
             "potential_integration_partners": same_tech_companies[:5]
         }
 
-    def _find_similar_companies(self, company: Dict) -> List[Dict]:
-        """Find most similar companies based on multiple factors"""
-        company_slug = company.get('slug')
-        batch = company.get('batch')
-        industries = set(company.get('industries', []))
-        location = company.get('all_locations', '')
-        city = location.split(',')[0].strip() if location else ''
+    def _find_similar_companies(self, company: Dict, limit: int = 10) -> List[Dict]:
+        """
+        Find most similar companies based on multiple factors
 
-        # Score each company by similarity
-        similarity_scores = []
+        Scoring: same batch +3, +2 per shared industry, same city +2,
+        same primary language +1. Ties keep dataset order.
+        """
+        company_slug, batch, industries, city, language = self._features(company)
 
-        for other in self.all_companies:
-            if other.get('slug') == company_slug:
+        # Candidates: anything sharing a batch, industry or city
+        candidates = set(self._positions_by_batch.get(batch, []))
+        for industry in industries:
+            candidates.update(self._positions_by_industry.get(industry, []))
+        if city:
+            candidates.update(self._positions_by_city.get(city, []))
+
+        scored = []
+        for position in candidates:
+            other_slug, other_batch, other_industries, other_city, other_language = self._company_features[position]
+            if other_slug == company_slug:
                 continue
 
             score = 0
             reasons = []
 
             # Same batch (+3 points)
-            if other.get('batch') == batch:
+            if other_batch == batch:
                 score += 3
                 reasons.append("same_batch")
 
             # Industry overlap (+2 points per shared industry)
-            other_industries = set(other.get('industries', []))
-            shared_industries = industries & other_industries
+            shared_industries = len(industries & other_industries)
             if shared_industries:
-                score += len(shared_industries) * 2
-                reasons.append(f"shared_industries:{len(shared_industries)}")
+                score += shared_industries * 2
+                reasons.append(f"shared_industries:{shared_industries}")
 
             # Same city (+2 points)
-            other_location = other.get('all_locations', '')
-            other_city = other_location.split(',')[0].strip() if other_location else ''
             if city and city == other_city:
                 score += 2
                 reasons.append("same_city")
 
             # Same tech stack (+1 point)
-            github_data = company.get('github_data', {})
-            other_github = other.get('github_data', {})
-            if github_data.get('tech_stack', {}).get('primary_language') == other_github.get('tech_stack', {}).get('primary_language'):
+            if other_language == language:
                 score += 1
                 reasons.append("same_tech")
 
-            if score > 0:
-                similarity_scores.append({
-                    "name": other.get('name'),
-                    "slug": other.get('slug'),
-                    "batch": other.get('batch'),
-                    "industry": other.get('industry'),
-                    "status": other.get('status'),
-                    "similarity_score": score,
-                    "similarity_reasons": reasons
-                })
-
-        # Sort by score
-        similarity_scores.sort(key=lambda x: x['similarity_score'], reverse=True)
-
-        return similarity_scores[:10]  # Top 10 most similar
+            scored.append((-score, position, reasons))
+
+        top = heapq.nsmallest(limit, scored)
+
+        # Everything else scores at most 1 (same tech only); fill remaining slots in dataset order
+        if len(top) < limit:
+            for position in self._positions_by_language.get(language, []):
+                if position in candidates or self._company_features[position][0] == company_slug:
+                    continue
+                top.append((-1, position, ["same_tech"]))
+                if len(top) == limit:
+                    break
+
+        similar = []
+        for neg_score, position, reasons in top:
+            other = self.all_companies[position]
+            similar.append({
+                "name": other.get('name'),
+                "slug": other.get('slug'),
+                "batch": other.get('batch'),
+                "industry": other.get('industry'),
+                "status": other.get('status'),
+                "similarity_score": -neg_score,
+                "similarity_reasons": reasons
+            })
+
+        return similar
 
     def _calculate_network_metrics(self, company: Dict, enrichment_data: Dict) -> Dict:
         """Calculate overall network metrics"""
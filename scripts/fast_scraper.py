@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Fast Content Scraper - requests + BeautifulSoup
+Fast Content Scraper - httpx (polite async fetcher) + BeautifulSoup
 
 Scrapes historical articles from top 10 priority sources.
 10-50x faster than browser-based scraping.
@@ -9,7 +9,7 @@ Usage:
     python3 fast_scraper.py --test              # Test with 1 source
     python3 fast_scraper.py --source inc        # Scrape specific source
     python3 fast_scraper.py --scrape            # Scrape all top 10
-    python3 fast_scraper.py --scrape --parallel # Parallel (10 workers)
+    python3 fast_scraper.py --scrape --parallel # All sources concurrently (shared polite fetcher)
 """
 
 import os
@@ -17,18 +17,19 @@ import sys
 import json
 import time
 import hashlib
+import asyncio
 import argparse
-import requests
 from datetime import datetime, timedelta
 from pathlib import Path
 from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 sys.path.append('/Users/yourox/AI-Workspace')
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 from scripts.rss_expanded_collector import ALL_SOURCES
+from scripts.polite_fetcher import run_with_fetcher
+from scripts.content_dedup import drop_near_duplicates
 
 # Top 10 priority sources
 TOP_10_SOURCES = [
@@ -80,16 +81,19 @@ CONTENT_SELECTORS = {
 }
 
 class FastScraper:
-    """Fast HTML scraper using requests + BeautifulSoup"""
+    """Fast HTML scraper using the shared polite fetcher + BeautifulSoup"""
 
     def __init__(self):
         self.output_dir = Path('/Users/yourox/AI-Workspace/data/scraped_articles')
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+        # Politeness budget for the shared fetcher (replaces fixed 0.5s sleeps)
+        self.fetcher_kwargs = {
+            'per_host_concurrency': 4,
+            'per_host_rate': 2.0,
+            'timeout': 15,
+            'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+        }
 
         self.stats = {
             'total_articles': 0,
@@ -99,6 +103,11 @@ class FastScraper:
 
     def scrape_source(self, source_id, max_articles=100, verbose=True):
         """Scrape articles from a single source"""
+        return run_with_fetcher(self.scrape_source_async, source_id, max_articles, verbose,
+                                fetcher_kwargs=self.fetcher_kwargs)
+
+    async def scrape_source_async(self, fetcher, source_id, max_articles=100, verbose=True):
+        """Scrape articles from a single source using a shared PoliteFetcher"""
 
         if source_id not in ALL_SOURCES:
             print(f"❌ Unknown source: {source_id}")
@@ -119,8 +128,9 @@ class FastScraper:
             if verbose:
                 print(f"📄 Loading: {archive_url}")
 
-            response = self.session.get(archive_url, timeout=15)
-            response.raise_for_status()
+            response = await fetcher.fetch(archive_url)
+            if not response.ok:
+                raise Exception(response.error)
 
             soup = BeautifulSoup(response.content, 'lxml')
 
@@ -156,10 +166,13 @@ class FastScraper:
             if verbose:
                 print(f"🎯 Extracted {len(article_urls)} unique article URLs")
 
-            # Scrape full articles
+            # Fetch full articles concurrently (bounded by per-host politeness)
+            urls = list(article_urls)[:max_articles]
+            results = await fetcher.fetch_many(urls)
+
             articles = []
-            for i, url in enumerate(list(article_urls)[:max_articles], 1):
-                article = self.scrape_article(url, source_id, config)
+            for i, (url, result) in enumerate(zip(urls, results), 1):
+                article = self.parse_article(result.content, url, source_id, config) if result.ok else None
                 if article:
                     articles.append(article)
                     if verbose:
@@ -168,9 +181,6 @@ class FastScraper:
                     if verbose:
                         print(f"   ✗ [{i}/{len(article_urls)}] Failed: {url[:60]}...")
 
-                # Rate limiting
-                time.sleep(0.5)
-
             elapsed = time.time() - start_time
             self.stats['sources'][source_id] = {
                 'articles': len(articles),
@@ -191,11 +201,18 @@ class FastScraper:
 
     def scrape_article(self, url, source_id, config):
         """Scrape full article content"""
-        try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+        async def _fetch(fetcher):
+            return await fetcher.fetch(url)
 
-            soup = BeautifulSoup(response.content, 'lxml')
+        result = run_with_fetcher(_fetch, fetcher_kwargs=self.fetcher_kwargs)
+        if not result.ok:
+            return None
+        return self.parse_article(result.content, url, source_id, config)
+
+    def parse_article(self, html, url, source_id, config):
+        """Parse a fetched article page into an article object"""
+        try:
+            soup = BeautifulSoup(html, 'lxml')
 
             # Extract title
             title = None
@@ -320,6 +337,10 @@ class FastScraper:
         if not articles:
             return
 
+        articles = drop_near_duplicates(articles)
+        if not articles:
+            return
+
         # Save to JSON
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         source_dir = self.output_dir / source_id
@@ -346,89 +367,59 @@ class FastScraper:
             print(f"   ⚠️  Database save failed: {e}")
 
     def save_to_database(self, source_id, articles):
-        """Store articles in Railway PostgreSQL"""
+        """Store articles in Railway PostgreSQL (batched upsert)"""
         import psycopg2
+        from scripts.bulk_upsert import upsert_external_content
 
         conn_string = os.getenv('RAILWAY_DATABASE_URL')
         if not conn_string:
             return
 
         conn = psycopg2.connect(conn_string)
-        cursor = conn.cursor()
-
-        saved_count = 0
-
-        for article in articles:
-            try:
-                cursor.execute("""
-                    INSERT INTO external_content (
-                        content_id, source_id, title, url, author,
-                        published_at, fetched_at, content_type,
-                        content_text, content_length, tags, categories,
-                        raw_score, final_score
-                    ) VALUES (
-                        %s, %s, %s, %s, %s,
-                        %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s, %s
-                    )
-                    ON CONFLICT (url) DO UPDATE SET
-                        fetched_at = EXCLUDED.fetched_at,
-                        content_text = EXCLUDED.content_text,
-                        content_length = EXCLUDED.content_length,
-                        raw_score = EXCLUDED.raw_score
-                """, (
-                    article['content_id'],
-                    article['source_id'],
-                    article['title'],
-                    article['url'],
-                    article['author'],
-                    article['published_at'],
-                    article['fetched_at'],
-                    article['content_type'],
-                    article['content_text'],
-                    article['content_length'],
-                    json.dumps([]),
-                    json.dumps([article['category']]),
-                    article['raw_score'],
-                    article['raw_score']
-                ))
-
-                saved_count += 1
-
-            except Exception as e:
-                conn.rollback()
-                continue
+        try:
+            result = upsert_external_content(
+                conn, articles,
+                update_columns=['fetched_at', 'content_text', 'content_length', 'raw_score'],
+                include_tags=False
+            )
+        finally:
+            conn.close()
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+        for url, error in result.errors:
+            print(f"   ⚠️  Skipped {url}: {error}")
 
-        print(f"✅ Stored {saved_count} articles in database")
+        print(f"✅ Stored {result.saved} articles in database")
 
     def scrape_all_parallel(self, sources, max_workers=10):
-        """Scrape multiple sources in parallel"""
+        """Scrape multiple sources concurrently through one shared polite fetcher"""
         print(f"\n{'='*70}")
         print(f"🚀 PARALLEL SCRAPING")
         print(f"{'='*70}")
         print(f"Sources: {len(sources)}")
-        print(f"Max workers: {max_workers}")
+        print(f"Max connections: {max_workers * self.fetcher_kwargs['per_host_concurrency']}")
         print(f"{'='*70}\n")
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self.scrape_source, source_id, 100, True): source_id
-                for source_id in sources
-            }
+        async def _scrape_all(fetcher):
+            return await asyncio.gather(
+                *(self.scrape_source_async(fetcher, source_id, 100, True) for source_id in sources),
+                return_exceptions=True
+            )
 
-            for future in as_completed(futures):
-                source_id = futures[future]
-                try:
-                    articles = future.result()
-                    if articles:
-                        self.save_articles(source_id, articles)
-                except Exception as e:
-                    print(f"❌ Error with {source_id}: {e}")
+        fetcher_kwargs = {
+            **self.fetcher_kwargs,
+            'max_connections': max_workers * self.fetcher_kwargs['per_host_concurrency']
+        }
+        results = run_with_fetcher(_scrape_all, fetcher_kwargs=fetcher_kwargs)
+
+        for source_id, articles in zip(sources, results):
+            if isinstance(articles, Exception):
+                print(f"❌ Error with {source_id}: {articles}")
+                continue
+            try:
+                if articles:
+                    self.save_articles(source_id, articles)
+            except Exception as e:
+                print(f"❌ Error with {source_id}: {e}")
 
         # Print final stats
         print(f"\n{'='*70}")
@@ -5,6 +5,7 @@ Fetches top GitHub repositories by stars for each programming language and store
 """
 
 import os
+import sys
 import json
 import time
 import requests
@@ -14,6 +15,9 @@ from datetime import datetime
 from dotenv import load_dotenv
 from typing import List, Dict, Any
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bulk_upsert import UpsertResult, build_upsert_sql, bulk_upsert
+
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 # GitHub API setup
@@ -113,114 +117,73 @@ def fetch_top_repos_for_language(language: str, limit: int = 100) -> List[Dict[s
 
     return repos
 
+REPO_COLUMNS = (
+    'repo_full_name', 'owner', 'repo_name', 'description', 'language',
+    'stars', 'forks', 'watchers', 'open_issues',
+    'created_at', 'updated_at', 'pushed_at',
+    'clone_url', 'homepage', 'topics', 'license',
+    'has_wiki', 'has_pages', 'repo_data'
+)
+
+# Identity columns are insert-only; everything else is refreshed on conflict
+REPO_UPDATE_COLUMNS = [col for col in REPO_COLUMNS if col not in ('repo_full_name', 'owner', 'repo_name')]
+
+def repository_row(repo_data: Dict[str, Any]) -> tuple:
+    """Map a GitHub API repo payload onto REPO_COLUMNS"""
+    return (
+        repo_data['full_name'],
+        repo_data['owner']['login'],
+        repo_data['name'],
+        repo_data.get('description', ''),
+        repo_data.get('language', ''),
+        repo_data.get('stargazers_count', 0),
+        repo_data.get('forks_count', 0),
+        repo_data.get('watchers_count', 0),
+        repo_data.get('open_issues_count', 0),
+        repo_data.get('created_at'),
+        repo_data.get('updated_at'),
+        repo_data.get('pushed_at'),
+        repo_data.get('clone_url', ''),
+        repo_data.get('homepage', ''),
+        repo_data.get('topics', []),
+        repo_data.get('license', {}).get('spdx_id', '') if repo_data.get('license') else '',
+        repo_data.get('has_wiki', False),
+        repo_data.get('has_pages', False),
+        json.dumps(repo_data)
+    )
+
+def store_repositories(conn, repos: List[Dict[str, Any]]) -> UpsertResult:
+    """
+    Upsert many repositories in batched round trips (keyed on repo_full_name)
+
+    Returns:
+        UpsertResult; `returned` holds {'id', 'repo_full_name'} rows
+    """
+    return bulk_upsert(
+        conn, 'github_repositories', REPO_COLUMNS,
+        [repository_row(repo) for repo in repos],
+        conflict_columns=['repo_full_name'],
+        update_columns=REPO_UPDATE_COLUMNS,
+        extra_set={'updated_at_db': 'NOW()'},
+        returning='id, repo_full_name'
+    )
+
 def store_repository(cursor, repo_data: Dict[str, Any]) -> int:
     """
-    Store or update repository in database
+    Store or update repository in database (single-statement upsert)
 
     Returns:
         Repository ID
     """
-    # Check if repo exists
-    cursor.execute(
-        "SELECT id FROM github_repositories WHERE repo_full_name = %s;",
-        (repo_data['full_name'],)
+    sql = build_upsert_sql(
+        'github_repositories', REPO_COLUMNS,
+        conflict_columns=['repo_full_name'],
+        update_columns=REPO_UPDATE_COLUMNS,
+        extra_set={'updated_at_db': 'NOW()'},
+        returning='id'
     )
-    existing = cursor.fetchone()
-
-    # Extract topics (tags)
-    topics = repo_data.get('topics', [])
-
-    if existing:
-        # Update existing repo
-        cursor.execute("""
-            UPDATE github_repositories SET
-                description = %s,
-                language = %s,
-                stars = %s,
-                forks = %s,
-                watchers = %s,
-                open_issues = %s,
-                created_at = %s,
-                updated_at = %s,
-                pushed_at = %s,
-                clone_url = %s,
-                homepage = %s,
-                topics = %s,
-                license = %s,
-                has_wiki = %s,
-                has_pages = %s,
-                repo_data = %s,
-                updated_at_db = NOW()
-            WHERE id = %s
-            RETURNING id;
-        """, (
-            repo_data.get('description', ''),
-            repo_data.get('language', ''),
-            repo_data.get('stargazers_count', 0),
-            repo_data.get('forks_count', 0),
-            repo_data.get('watchers_count', 0),
-            repo_data.get('open_issues_count', 0),
-            repo_data.get('created_at'),
-            repo_data.get('updated_at'),
-            repo_data.get('pushed_at'),
-            repo_data.get('clone_url', ''),
-            repo_data.get('homepage', ''),
-            topics,
-            repo_data.get('license', {}).get('spdx_id', '') if repo_data.get('license') else '',
-            repo_data.get('has_wiki', False),
-            repo_data.get('has_pages', False),
-            json.dumps(repo_data),
-            existing['id']
-        ))
-        return existing['id']
-    else:
-        # Insert new repo
-        cursor.execute("""
-            INSERT INTO github_repositories (
-                repo_full_name,
-                owner,
-                repo_name,
-                description,
-                language,
-                stars,
-                forks,
-                watchers,
-                open_issues,
-                created_at,
-                updated_at,
-                pushed_at,
-                clone_url,
-                homepage,
-                topics,
-                license,
-                has_wiki,
-                has_pages,
-                repo_data
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id;
-        """, (
-            repo_data['full_name'],
-            repo_data['owner']['login'],
-            repo_data['name'],
-            repo_data.get('description', ''),
-            repo_data.get('language', ''),
-            repo_data.get('stargazers_count', 0),
-            repo_data.get('forks_count', 0),
-            repo_data.get('watchers_count', 0),
-            repo_data.get('open_issues_count', 0),
-            repo_data.get('created_at'),
-            repo_data.get('updated_at'),
-            repo_data.get('pushed_at'),
-            repo_data.get('clone_url', ''),
-            repo_data.get('homepage', ''),
-            topics,
-            repo_data.get('license', {}).get('spdx_id', '') if repo_data.get('license') else '',
-            repo_data.get('has_wiki', False),
-            repo_data.get('has_pages', False),
-            json.dumps(repo_data)
-        ))
-
-        return cursor.fetchone()['id']
+    rows = psycopg2.extras.execute_values(cursor, sql, [repository_row(repo_data)], fetch=True)
+    return rows[0]['id']
 
 def collect_repos_for_language(language: str, limit: int = 100):
     """Collect and store repositories for a specific language"""
@@ -235,28 +198,17 @@ def collect_repos_for_language(language: str, limit: int = 100):
         print(f"⚠️  No repositories found for {language}")
         return 0
 
-    # Store in database
+    # Store in database (batched upsert, one round trip per page of repos)
     conn = get_db_connection()
-    cursor = conn.cursor()
-
-    stored_count = 0
-    for i, repo in enumerate(repos, 1):
-        try:
-            repo_id = store_repository(cursor, repo)
-            stored_count += 1
-
-            if i % 10 == 0:
-                print(f"   ✅ Stored {i}/{len(repos)} repos")
-                conn.commit()  # Commit in batches
-
-        except Exception as e:
-            print(f"   ❌ Error storing {repo.get('full_name', 'unknown')}: {e}")
-            continue
+    try:
+        result = store_repositories(conn, repos)
+    finally:
+        conn.close()
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+    for repo_full_name, error in result.errors:
+        print(f"   ❌ Error storing {repo_full_name}: {error}")
 
+    stored_count = result.saved
     print(f"\n✅ Stored {stored_count}/{len(repos)} {language} repositories")
     return stored_count
 
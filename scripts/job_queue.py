@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Job Queue - Durable SQLite (WAL) work queue for the video pipeline
+
+Replaces JSON checkpoints and directory polling with one persistent queue:
+- Stages: discover → transcript → comments → insights → enrich → summarize → vector_ingest
+- One row per (stage, item); enqueueing an item twice is a no-op, so re-running
+  a batch resumes it instead of redoing finished work
+- Leases: a worker claims a job until its lease expires and heartbeats while
+  it runs; jobs leased by a crashed worker are picked up again after expiry,
+  and a worker that lost its lease cannot overwrite the new owner's result
+- Retries with exponential backoff, then dead-lettering after max_attempts
+- Completing a job enqueues the item for the next stage in the same
+  transaction, so downstream workers discover work by queue insert
+
+Usage:
+    queue = JobQueue()
+    queue.enqueue('transcript', video_ids)
+    run_workers(queue, {'transcript': handle_transcript}, max_workers=10)
+
+    python3 job_queue.py stats
+    python3 job_queue.py enqueue --stage transcript --file videos.txt
+    python3 job_queue.py dead --stage insights
+    python3 job_queue.py retry-dead --stage insights
+    python3 job_queue.py backfill
+"""
+
+import os
+import json
+import time
+import random
+import socket
+import sqlite3
+import logging
+import argparse
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKSPACE_DIR = Path("/Users/yourox/AI-Workspace")
+DEFAULT_DB_PATH = WORKSPACE_DIR / "data" / "pipeline_queue.db"
+
+STAGES = ('discover', 'transcript', 'comments', 'insights', 'enrich', 'summarize', 'vector_ingest')
+NEXT_STAGE = {stage: STAGES[i + 1] if i + 1 < len(STAGES) else None for i, stage in enumerate(STAGES)}
+
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_MAX_ATTEMPTS = 3
+BACKOFF_BASE = 30.0
+BACKOFF_MAX = 3600.0
+
+# Handler result statuses that complete a job (anything else is a failure)
+DONE_STATUSES = {'success', 'skipped', 'cached'}
+
+_UNSET = object()
+
+
+@dataclass
+class Job:
+    stage: str
+    item_id: str
+    attempts: int
+    max_attempts: int
+    lease_owner: str
+    payload: Dict = field(default_factory=dict)
+
+
+class JobQueue:
+    """SQLite-backed work queue with leases, retries and a dead-letter state"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            stage TEXT NOT NULL,
+            item_id TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            available_at REAL NOT NULL,
+            lease_owner TEXT,
+            lease_expires REAL,
+            last_error TEXT,
+            payload TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (stage, item_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (stage, status, available_at);
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One connection per thread; WAL lets readers run alongside the writer
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+
+    def enqueue(self, stage: str, item_ids: Iterable[str], payload: Optional[Dict] = None,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS, reset: bool = False) -> int:
+        """
+        Add items to a stage
+
+        Args:
+            stage: Pipeline stage
+            item_ids: Item ids (video ids)
+            payload: Optional JSON payload stored with each job
+            max_attempts: Attempts before a job is dead-lettered
+            reset: Re-queue items that are already done or dead (force reprocessing)
+
+        Returns:
+            Number of jobs inserted or reset
+        """
+        self._check_stage(stage)
+        now = time.time()
+        payload_json = json.dumps(payload) if payload else None
+        rows = [(stage, item_id, max_attempts, now, payload_json, now, now)
+                for item_id in dict.fromkeys(item_ids) if item_id]
+
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs "
+                "(stage, item_id, max_attempts, available_at, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            if reset:
+                conn.executemany(
+                    "UPDATE jobs SET status = 'pending', attempts = 0, available_at = ?, "
+                    "lease_owner = NULL, lease_expires = NULL, last_error = NULL, updated_at = ? "
+                    "WHERE stage = ? AND item_id = ? AND status IN ('done', 'dead')",
+                    [(now, now, stage, row[1]) for row in rows]
+                )
+            return conn.total_changes - before
+
+    # ------------------------------------------------------------------
+    # Consumers
+    # ------------------------------------------------------------------
+
+    def lease(self, stage: str, owner: str, limit: int = 1,
+              lease_seconds: float = DEFAULT_LEASE_SECONDS,
+              item_ids: Optional[Iterable[str]] = None) -> List[Job]:
+        """
+        Atomically claim up to `limit` ready jobs of a stage
+
+        Ready means pending and past its backoff, or leased with an expired lease.
+        An expired lease on the final attempt (the worker died mid-job every
+        time) dead-letters the job instead of re-leasing it forever.
+
+        Args:
+            stage: Pipeline stage
+            owner: Lease owner name
+            limit: Max jobs to claim
+            lease_seconds: Lease length
+            item_ids: Only claim jobs for these items (None = any item)
+        """
+        now = time.time()
+        scope, scope_params = self._item_filter(item_ids)
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE jobs SET status = 'dead', lease_owner = NULL, lease_expires = NULL, "
+                "last_error = 'lease expired on final attempt', updated_at = ? "
+                "WHERE stage = ? AND status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, stage, now)
+            )
+            rows = conn.execute(
+                "SELECT item_id, attempts, max_attempts, payload FROM jobs "
+                "WHERE stage = ? AND ((status = 'pending' AND available_at <= ?) "
+                f"OR (status = 'leased' AND lease_expires < ?)){scope} "
+                "ORDER BY available_at LIMIT ?",
+                (stage, now, now, *scope_params, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE stage = ? AND item_id = ?",
+                [(owner, now + lease_seconds, now, stage, row[0]) for row in rows]
+            )
+
+        return [
+            Job(stage=stage, item_id=item_id, attempts=attempts + 1, max_attempts=max_attempts,
+                lease_owner=owner, payload=json.loads(payload) if payload else {})
+            for item_id, attempts, max_attempts, payload in rows
+        ]
+
+    def heartbeat(self, job: Job, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a lease; False if the job was reclaimed by another worker"""
+        now = time.time()
+        cursor = self._conn().execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+            "WHERE stage = ? AND item_id = ? AND status = 'leased' AND lease_owner = ?",
+            (now + lease_seconds, now, job.stage, job.item_id, job.lease_owner)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job: Job, next_stage=_UNSET, payload: Optional[Dict] = None) -> bool:
+        """
+        Mark a job done and enqueue the item for the next stage in one transaction
+
+        Args:
+            job: Leased job
+            next_stage: Stage to enqueue next (default: the following stage; None = stop)
+            payload: Payload for the next-stage job (default: this job's payload)
+
+        Returns:
+            False if the lease expired and another worker reclaimed the job
+            (nothing is written; the new owner reports the result)
+        """
+        if next_stage is _UNSET:
+            next_stage = NEXT_STAGE[job.stage]
+        now = time.time()
+        next_payload = payload if payload is not None else job.payload
+
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL, "
+                "last_error = NULL, updated_at = ? "
+                "WHERE stage = ? AND item_id = ? AND status = 'leased' AND lease_owner = ?",
+                (now, job.stage, job.item_id, job.lease_owner)
+            )
+            if cursor.rowcount != 1:
+                return False
+            if next_stage:
+                self._check_stage(next_stage)
+                # A later pass of an upstream stage re-opens the downstream job
+                conn.execute(
+                    "INSERT INTO jobs (stage, item_id, max_attempts, available_at, payload, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (stage, item_id) DO UPDATE SET status = 'pending', attempts = 0, "
+                    "available_at = excluded.available_at, last_error = NULL, payload = excluded.payload, "
+                    "updated_at = excluded.updated_at "
+                    "WHERE jobs.status IN ('done', 'dead')",
+                    (next_stage, job.item_id, job.max_attempts, now,
+                     json.dumps(next_payload) if next_payload else None, now, now)
+                )
+        return True
+
+    def fail(self, job: Job, error: str) -> Optional[str]:
+        """
+        Record a failed attempt: retry with backoff, or dead-letter when out of attempts
+
+        Returns:
+            New status ('pending' or 'dead'), or None if the lease expired and
+            another worker reclaimed the job (nothing is written)
+        """
+        now = time.time()
+        if job.attempts >= job.max_attempts:
+            status, available_at = 'dead', now
+        else:
+            delay = min(BACKOFF_BASE * (2 ** (job.attempts - 1)), BACKOFF_MAX)
+            status, available_at = 'pending', now + delay * (0.5 + random.random() / 2)
+
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = ?, available_at = ?, lease_owner = NULL, lease_expires = NULL, "
+            "last_error = ?, updated_at = ? "
+            "WHERE stage = ? AND item_id = ? AND status = 'leased' AND lease_owner = ?",
+            (status, available_at, str(error)[:2000], now, job.stage, job.item_id, job.lease_owner)
+        )
+        return status if cursor.rowcount == 1 else None
+
+    # ------------------------------------------------------------------
+    # Inspection / dead letters
+    # ------------------------------------------------------------------
+
+    def outstanding(self, stages: Iterable[str], item_ids: Optional[Iterable[str]] = None) -> int:
+        """Jobs of the given stages (optionally only these items) that are pending or leased"""
+        stages = list(stages)
+        scope, scope_params = self._item_filter(item_ids)
+        return self._conn().execute(
+            f"SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased') "
+            f"AND stage IN ({','.join('?' * len(stages))}){scope}",
+            (*stages, *scope_params)
+        ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """{stage: {status: count}} in pipeline order"""
+        counts = {stage: {} for stage in STAGES}
+        for stage, status, count in self._conn().execute(
+            "SELECT stage, status, COUNT(*) FROM jobs GROUP BY stage, status"
+        ):
+            counts.setdefault(stage, {})[status] = count
+        return counts
+
+    def status_of(self, stage: str, item_ids: Iterable[str]) -> Dict[str, str]:
+        """{item_id: status} for items of one stage"""
+        ids = list(item_ids)
+        statuses = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for item_id, status in self._conn().execute(
+                f"SELECT item_id, status FROM jobs WHERE stage = ? AND item_id IN ({','.join('?' * len(chunk))})",
+                (stage, *chunk)
+            ):
+                statuses[item_id] = status
+        return statuses
+
+    def dead(self, stage: str) -> List[Dict]:
+        """Dead-lettered jobs of a stage with their last error"""
+        rows = self._conn().execute(
+            "SELECT item_id, attempts, last_error, updated_at FROM jobs "
+            "WHERE stage = ? AND status = 'dead' ORDER BY updated_at",
+            (stage,)
+        ).fetchall()
+        return [
+            {'item_id': item_id, 'attempts': attempts, 'error': error, 'failed_at': updated_at}
+            for item_id, attempts, error, updated_at in rows
+        ]
+
+    def retry_dead(self, stage: str) -> int:
+        """Move a stage's dead-lettered jobs back to pending with fresh attempts"""
+        now = time.time()
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = 'pending', attempts = 0, available_at = ?, updated_at = ? "
+            "WHERE stage = ? AND status = 'dead'",
+            (now, now, stage)
+        )
+        return cursor.rowcount
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _item_filter(item_ids: Optional[Iterable[str]]):
+        """SQL condition restricting a query to item_ids (one JSON parameter, no variable limit)"""
+        if item_ids is None:
+            return "", ()
+        return " AND item_id IN (SELECT value FROM json_each(?))", (json.dumps(list(item_ids)),)
+
+    @staticmethod
+    def _check_stage(stage: str):
+        if stage not in NEXT_STAGE:
+            raise ValueError(f"Unknown stage '{stage}' (expected one of {', '.join(STAGES)})")
+
+
+def worker_name(prefix: str = 'worker') -> str:
+    """Unique lease owner name for this process"""
+    return f"{prefix}@{socket.gethostname()}:{os.getpid()}"
+
+
+def run_workers(
+    queue: JobQueue,
+    handlers: Dict[str, Callable[[Job], Dict]],
+    max_workers: int = 4,
+    owner: Optional[str] = None,
+    idle_exit: bool = True,
+    poll_interval: float = 2.0,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    on_result: Optional[Callable[[Job, Dict], None]] = None,
+    stop_event: Optional[threading.Event] = None,
+    item_ids: Optional[Iterable[str]] = None,
+) -> Dict[str, int]:
+    """
+    Run worker threads that pull jobs for the handled stages until the queue drains
+
+    Handlers return a status dict: 'success'/'skipped'/'cached' complete the job
+    (optional 'next_stage' / 'payload' keys override the downstream stage and
+    its payload); any
+    other status, or an exception, counts as a failed attempt. Leases of running
+    jobs are extended every lease_seconds / 3, so long handlers are not
+    re-leased to another worker while they still run.
+
+    Args:
+        queue: Job queue
+        handlers: {stage: handler(job) -> result dict}
+        max_workers: Worker threads
+        owner: Lease owner prefix (defaults to host:pid)
+        idle_exit: Exit once the handled stages have no pending or leased jobs
+            (False = keep polling for newly inserted work)
+        poll_interval: Sleep when nothing is ready
+        lease_seconds: Lease length per job
+        on_result: Callback(job, result) after each job (called from worker threads)
+        stop_event: Optional event to stop the workers
+        item_ids: Only process jobs for these items, e.g. the batch this run
+            enqueued (None = any job of the handled stages)
+
+    Returns:
+        {'done': n, 'retried': n, 'dead': n, 'lost': n} ('lost' = lease expired
+        and the job was reclaimed by another worker before it finished)
+    """
+    owner = owner or worker_name()
+    stop_event = stop_event or threading.Event()
+    item_ids = list(dict.fromkeys(item_ids)) if item_ids is not None else None
+    # Later stages first, so items already in flight finish before new ones start
+    stages = sorted(handlers, key=lambda s: -STAGES.index(s))
+    totals = {'done': 0, 'retried': 0, 'dead': 0, 'lost': 0}
+    totals_lock = threading.Lock()
+
+    # Jobs currently running, by worker name (extended by the heartbeat thread)
+    running: Dict[str, Job] = {}
+    running_lock = threading.Lock()
+    workers_done = threading.Event()
+
+    def heartbeat():
+        try:
+            while not workers_done.wait(lease_seconds / 3):
+                with running_lock:
+                    jobs = list(running.values())
+                for job in jobs:
+                    if not queue.heartbeat(job, lease_seconds):
+                        logger.warning(f"Lost lease on {job.stage}/{job.item_id} ({job.lease_owner})")
+        finally:
+            queue.close()
+
+    def worker(index: int):
+        name = f"{owner}#{index}"
+        try:
+            while not stop_event.is_set():
+                job = None
+                for stage in stages:
+                    leased = queue.lease(stage, name, limit=1, lease_seconds=lease_seconds,
+                                         item_ids=item_ids)
+                    if leased:
+                        job = leased[0]
+                        break
+
+                if job is None:
+                    if idle_exit and queue.outstanding(stages, item_ids) == 0:
+                        return
+                    stop_event.wait(poll_interval)
+                    continue
+
+                with running_lock:
+                    running[name] = job
+                try:
+                    result = handlers[job.stage](job) or {'status': 'success'}
+                except Exception as e:
+                    logger.exception(f"{job.stage} handler failed for {job.item_id}")
+                    result = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+                finally:
+                    with running_lock:
+                        running.pop(name, None)
+
+                if result.get('status') in DONE_STATUSES:
+                    kwargs = {'payload': result.get('payload')}
+                    if 'next_stage' in result:
+                        kwargs['next_stage'] = result['next_stage']
+                    outcome = 'done' if queue.complete(job, **kwargs) else 'lost'
+                else:
+                    error = result.get('error') or result.get('reason') or 'unknown error'
+                    status = queue.fail(job, error)
+                    outcome = {'dead': 'dead', 'pending': 'retried'}.get(status, 'lost')
+
+                with totals_lock:
+                    totals[outcome] += 1
+                if outcome == 'lost':
+                    # The worker that reclaimed the job records and reports it
+                    logger.warning(f"Discarded result for {job.stage}/{job.item_id}: lease was reclaimed")
+                    continue
+                if on_result:
+                    on_result(job, {**result, 'outcome': outcome})
+        finally:
+            queue.close()
+
+    keeper = threading.Thread(target=heartbeat, daemon=True)
+    keeper.start()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(max_workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1.0)
+    except KeyboardInterrupt:
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+        raise
+    finally:
+        workers_done.set()
+        keeper.join()
+
+    return totals
+
+
+def backfill(queue: JobQueue, workspace_dir: Path = WORKSPACE_DIR) -> Dict[str, int]:
+    """
+    Seed the queue from the existing data directories (one scan)
+
+    Transcripts without insights go to 'insights'; insights without a summary
+    go to 'enrich'. Items already in those stages are left alone.
+    """
+    data_dir = Path(workspace_dir) / "data"
+    transcripts = {f.name[:-len('_full.json')] for f in (data_dir / "transcripts").glob("*_full.json")}
+    insights = {f.name[:-len('_insights.json')] for f in (data_dir / "business_insights").glob("*_insights.json")}
+    summaries = {f.name[:-len('_summary.json')] for f in (data_dir / "video_summaries").glob("*_summary.json")}
+
+    return {
+        'insights': queue.enqueue('insights', sorted(transcripts - insights)),
+        'enrich': queue.enqueue('enrich', sorted(insights - summaries)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline job queue")
+    parser.add_argument('command', choices=['stats', 'enqueue', 'dead', 'retry-dead', 'backfill'])
+    parser.add_argument('--stage', choices=STAGES, help='Pipeline stage')
+    parser.add_argument('--file', help='File of item ids, one per line (enqueue)')
+    parser.add_argument('ids', nargs='*', help='Item ids (enqueue)')
+    parser.add_argument('--force', action='store_true', help='Re-queue items already done or dead (enqueue)')
+    parser.add_argument('--db', default=str(DEFAULT_DB_PATH), help='Queue path')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    queue = JobQueue(Path(args.db))
+
+    if args.command == 'stats':
+        print(f"{'stage':<14} {'pending':>8} {'leased':>8} {'done':>8} {'dead':>8}")
+        for stage, counts in queue.stats().items():
+            print(f"{stage:<14} {counts.get('pending', 0):>8} {counts.get('leased', 0):>8} "
+                  f"{counts.get('done', 0):>8} {counts.get('dead', 0):>8}")
+
+    elif args.command == 'enqueue':
+        if not args.stage:
+            parser.error("enqueue requires --stage")
+        ids = list(args.ids)
+        if args.file:
+            with open(args.file, 'r') as f:
+                ids.extend(line.strip() for line in f if line.strip())
+        count = queue.enqueue(args.stage, ids, reset=args.force)
+        print(f"✅ Enqueued {count} of {len(ids)} items into '{args.stage}'")
+
+    elif args.command == 'dead':
+        if not args.stage:
+            parser.error("dead requires --stage")
+        for job in queue.dead(args.stage):
+            print(f"  {job['item_id']}  ({job['attempts']} attempts)  {job['error']}")
+
+    elif args.command == 'retry-dead':
+        if not args.stage:
+            parser.error("retry-dead requires --stage")
+        print(f"✅ Re-queued {queue.retry_dead(args.stage)} dead '{args.stage}' jobs")
+
+    elif args.command == 'backfill':
+        for stage, count in backfill(queue).items():
+            print(f"✅ {stage:<10} +{count} jobs")
+
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
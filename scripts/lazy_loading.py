@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Lazy Loading - Deferred imports and on-first-use resources for MCP servers
+
+Claude clients spawn an MCP server and wait for its list_tools response, so
+anything a server does at import time (loading embedding models, JSON
+snapshots, database drivers) is paid on every spawn. This module defers it:
+- lazy_import(): module proxy that imports on first attribute access
+- LazyResource: proxy that builds an object (model, snapshot database) on
+  first attribute access, thread-safe, with load time recorded in metrics
+- warm_up_in_background(): load resources in a daemon thread after the
+  server starts answering, so the first tool call usually finds them ready
+  (MCP_WARMUP=0 disables it)
+
+Usage:
+    from lazy_loading import LazyResource, lazy_import, warm_up_in_background
+
+    psycopg2 = lazy_import("psycopg2", "psycopg2.extras")
+    db = LazyResource(BusinessIntelligenceDB, "bi-vault snapshots")
+
+    if __name__ == "__main__":
+        warm_up_in_background(db)
+        mcp.run(transport="stdio")
+"""
+
+import os
+import time
+import logging
+import importlib
+import threading
+from typing import Any, Callable, Optional
+
+from server_metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule:
+    """Module proxy that imports the module on first attribute access"""
+
+    def __init__(self, name: str, *also: str):
+        self._name = name
+        self._also = also
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    module = importlib.import_module(self._name)
+                    for extra in self._also:
+                        importlib.import_module(extra)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str, *also: str) -> LazyModule:
+    """
+    Defer importing a module until it is first used
+
+    Args:
+        name: Module to return (e.g. "psycopg2")
+        also: Submodules to import alongside it (e.g. "psycopg2.extras")
+
+    Returns:
+        Proxy that behaves like the module for attribute access
+    """
+    return LazyModule(name, *also)
+
+
+class LazyResource:
+    """
+    Proxy that builds an object on first attribute access
+
+    Attribute access (db.all_data, MODEL.encode) is forwarded to the object,
+    so call sites stay unchanged. Concurrent first uses wait for one load;
+    a failed load is retried on the next access.
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str):
+        self._factory = factory
+        self._name = name
+        self._value: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> Any:
+        """The underlying object (loaded on first call)"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    logger.info(f"Loading {self._name}...")
+                    start = time.perf_counter()
+                    try:
+                        self._value = self._factory()
+                    except BaseException:
+                        METRICS.observe("load", self._name, time.perf_counter() - start, error=True)
+                        raise
+                    self.load_seconds = time.perf_counter() - start
+                    METRICS.observe("load", self._name, self.load_seconds)
+                    self._loaded = True
+                    logger.info(f"Loaded {self._name} in {self.load_seconds:.2f}s")
+        return self._value
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.get(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._loaded else "not loaded"
+        return f"<lazy {self._name} ({state})>"
+
+
+def warm_up_in_background(*resources: LazyResource, delay: float = 0.0) -> Optional[threading.Thread]:
+    """
+    Load resources one after another in a daemon thread
+
+    Call right before mcp.run() so the handshake and list_tools are answered
+    immediately while loading proceeds. Set MCP_WARMUP=0 to load purely on
+    first use instead.
+
+    Args:
+        resources: Resources to load, in order
+        delay: Seconds to wait before starting (lets the handshake finish first)
+
+    Returns:
+        The warm-up thread, or None when disabled
+    """
+    if os.getenv("MCP_WARMUP", "1") == "0":
+        return None
+
+    def run():
+        if delay:
+            time.sleep(delay)
+        for resource in resources:
+            try:
+                resource.get()
+            except Exception as e:
+                logger.error(f"Background warm-up of {resource._name} failed: {e}")
+
+    thread = threading.Thread(target=run, name="mcp-warm-up", daemon=True)
+    thread.start()
+    return thread
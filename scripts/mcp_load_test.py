@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+MCP Load Test - Latency and throughput benchmark for the MCP servers
+
+Starts each server over stdio with the same multiplexed client bi-chat uses,
+replays a recorded mix of tool calls at a fixed concurrency and writes a JSON
+report per run:
+- Startup time (spawn -> initialize -> tools/list) per process
+- p50/p95/p99/mean/max latency, first-call latency and errors per tool
+- Throughput and wall time per server
+- RSS of the server processes after startup and at peak
+- Startup budget: time to list_tools beyond an empty FastMCP server started
+  the same way (interpreter and mcp import cost excluded); the run exits
+  non-zero when a server is over budget. Both sides are the median of
+  --startup-samples single-process spawns, interleaved round-robin with the
+  baseline so machine noise hits them alike (after one unrecorded warm-up
+  round)
+- Exit status: non-zero when any requested server failed to start (or has
+  no recorded calls) or is over the startup budget, so an empty report
+  never passes a comparison
+
+JSON servers (bi-vault, cycling-intelligence) load the checked-in fixture
+snapshot in config/mcp_load_fixtures by default, through AI_WORKSPACE_DATA_DIR
+and without RAILWAY_DATABASE_URL, so their numbers do not move as data is
+collected; --data-dir picks another snapshot and --live-data uses the
+workspace data. Postgres-backed servers read RAILWAY_DATABASE_URL, which
+--database-url overrides (point it at a local Postgres for repeatable
+numbers). The mix is replayed in a fixed, seeded order so runs on different
+commits are comparable.
+
+Usage:
+    python mcp_load_test.py                                   # All servers
+    python mcp_load_test.py --servers bi-vault cycling-intelligence
+    python mcp_load_test.py --requests 500 --concurrency 16 --processes 2
+    python mcp_load_test.py --database-url postgresql://localhost/bench
+    python mcp_load_test.py --live-data                       # Workspace data, not fixtures
+    python mcp_load_test.py --output before.json
+    python mcp_load_test.py --output after.json --compare before.json
+    python mcp_load_test.py --requests 0 --startup-budget-ms 200   # Startup check only
+    python mcp_load_test.py --requests 0 --startup-samples 9        # Steadier startup medians
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+WORKSPACE = Path(__file__).parent.parent
+sys.path.insert(0, str(WORKSPACE / "bi-chat" / "server"))
+
+from mcp_client_simple import MCPStdioConnection
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+SERVERS = {
+    "bi-vault": WORKSPACE / "mcp-servers" / "bi-vault" / "server.py",
+    "cycling-intelligence": WORKSPACE / "mcp-servers" / "cycling-intelligence" / "server.py",
+    "coding-intelligence": WORKSPACE / "mcp-servers" / "coding-intelligence" / "server.py",
+    "railway-postgres": WORKSPACE / "mcp-servers" / "railway-postgres" / "server.py",
+    "coding-history": WORKSPACE / "mcp-servers" / "coding-history" / "server.py",
+}
+
+# Servers that load JSON snapshots from AI_WORKSPACE_DATA_DIR
+FIXTURE_SERVERS = {"bi-vault", "cycling-intelligence"}
+
+DEFAULT_MIX = WORKSPACE / "config" / "mcp_load_mix.json"
+DEFAULT_FIXTURES = WORKSPACE / "config" / "mcp_load_fixtures"
+REPORT_DIR = WORKSPACE / "data" / "benchmarks"
+
+RSS_SAMPLE_INTERVAL = 0.25
+
+DEFAULT_STARTUP_BUDGET_MS = 200.0
+DEFAULT_STARTUP_SAMPLES = 7
+BASELINE = "baseline"
+
+# Floor for startup: interpreter + mcp import + handshake, no server code
+BASELINE_SERVER = """
+from mcp.server.fastmcp import FastMCP
+mcp = FastMCP("startup-baseline")
+
+@mcp.tool()
+def ping() -> str:
+    return "pong"
+
+mcp.run(transport="stdio")
+"""
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (None if it is gone)"""
+    try:
+        if PSUTIL_AVAILABLE:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        output = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)],
+                                capture_output=True, text=True).stdout.strip()
+        return int(output) / 1024 if output else None
+    except Exception:
+        return None
+
+
+def total_rss_mb(pids: List[int]) -> float:
+    return sum(filter(None, (rss_mb(pid) for pid in pids)))
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "-C", str(WORKSPACE), "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def server_env(name: str, data_dir: Optional[Path]) -> Optional[Dict[str, str]]:
+    """Environment for a server process (None inherits ours)"""
+    if data_dir is None or name not in FIXTURE_SERVERS:
+        return None
+    env = dict(os.environ, AI_WORKSPACE_DATA_DIR=str(data_dir))
+    env.pop("RAILWAY_DATABASE_URL", None)  # Fixture snapshot only, no live rows
+    return env
+
+
+def build_schedule(mix: List[Dict[str, Any]], requests: int, seed: int) -> List[Dict[str, Any]]:
+    """Fixed, weighted sequence of calls to replay"""
+    rng = random.Random(seed)
+    weights = [call.get("weight", 1) for call in mix]
+    return rng.choices(mix, weights=weights, k=requests)
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p95_ms": round(percentile(ordered, 95), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "mean_ms": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+async def start_timed(connection: MCPStdioConnection) -> float:
+    """Seconds from spawn to the list_tools response"""
+    started = time.perf_counter()
+    await connection.start()
+    return time.perf_counter() - started
+
+
+async def spawn_once(name: str, server_path: Path, env: Optional[Dict[str, str]]) -> float:
+    """Startup seconds of one fresh process (closed afterwards)"""
+    connection = MCPStdioConnection(name, server_path, env=env)
+    try:
+        return await start_timed(connection)
+    finally:
+        await connection.close()
+
+
+async def measure_startup(
+    servers: List[str],
+    samples: int,
+    data_dir: Optional[Path]
+) -> Dict[str, List[float]]:
+    """
+    Startup samples for the empty baseline server and each server
+
+    Spawns run one at a time in interleaved rounds (the starting position
+    rotates every round), so a slow stretch on the machine affects the
+    baseline and the servers alike instead of one single spawn. A first
+    warm-up round fills the OS file cache and is not recorded.
+
+    Returns:
+        {name: startup seconds}, with BASELINE for the empty server; a name
+        whose spawn failed is left with the samples taken before the failure
+    """
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as f:
+        f.write(BASELINE_SERVER)
+    targets = {BASELINE: (Path(f.name), None)}
+    targets.update((name, (SERVERS[name], server_env(name, data_dir))) for name in servers)
+
+    times: Dict[str, List[float]] = {name: [] for name in targets}
+    failed = set()
+    names = list(targets)
+    try:
+        for round_number in range(samples + 1):
+            shift = round_number % len(names)
+            for name in names[shift:] + names[:shift]:
+                if name in failed:
+                    continue
+                try:
+                    seconds = await spawn_once(name, *targets[name])
+                    if round_number:
+                        times[name].append(seconds)
+                except Exception as e:
+                    failed.add(name)
+                    print(f"⚠️  {name} failed to start during startup sampling: {e!r}")
+    finally:
+        os.unlink(f.name)
+    return times
+
+
+async def run_server(
+    name: str,
+    mix: List[Dict[str, Any]],
+    requests: int,
+    concurrency: int,
+    processes: int,
+    timeout: float,
+    seed: int,
+    data_dir: Optional[Path] = None
+) -> Dict[str, Any]:
+    """Start one server's processes, replay the mix and measure it"""
+    server_path = SERVERS[name]
+    env = server_env(name, data_dir)
+    connections = [MCPStdioConnection(name, server_path, env=env) for _ in range(processes)]
+
+    startup = await asyncio.gather(*(start_timed(c) for c in connections), return_exceptions=True)
+    failures = [repr(r) for r in startup if isinstance(r, BaseException)]
+    if failures:
+        for connection in connections:
+            await connection.close()
+        return {"error": failures[0]}
+
+    pids = [c.process.pid for c in connections]
+    rss_after_start = total_rss_mb(pids)
+    peak_rss = rss_after_start
+
+    async def sample_rss():
+        nonlocal peak_rss
+        while True:
+            await asyncio.sleep(RSS_SAMPLE_INTERVAL)
+            # Off the event loop so sampling never delays a response
+            current = await asyncio.to_thread(total_rss_mb, pids)
+            peak_rss = max(peak_rss, current)
+
+    schedule = build_schedule(mix, requests, seed)
+    latencies: Dict[str, List[float]] = {}
+    first_call: Dict[str, float] = {}
+    errors: Dict[str, int] = {}
+    next_call = 0
+
+    async def worker():
+        nonlocal next_call
+        while next_call < len(schedule):
+            call = schedule[next_call]
+            next_call += 1
+            tool = call["tool"]
+            connection = min((c for c in connections if c.alive), key=lambda c: c.in_flight, default=None)
+            if connection is None:
+                errors[tool] = errors.get(tool, 0) + 1
+                continue
+
+            started = time.perf_counter()
+            try:
+                result = await connection.request(
+                    "tools/call", {"name": tool, "arguments": call.get("arguments", {})}, timeout=timeout
+                )
+                failed = bool(result.get("isError"))
+            except Exception:
+                failed = True
+            elapsed = (time.perf_counter() - started) * 1000
+
+            first_call.setdefault(tool, elapsed)
+            latencies.setdefault(tool, []).append(elapsed)
+            if failed:
+                errors[tool] = errors.get(tool, 0) + 1
+
+    sampler = asyncio.create_task(sample_rss())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    sampler.cancel()
+    peak_rss = max(peak_rss, total_rss_mb(pids))
+
+    for connection in connections:
+        await connection.close()
+
+    all_latencies = [ms for values in latencies.values() for ms in values]
+    tools = {}
+    for tool in sorted(latencies):
+        tools[tool] = {
+            "calls": len(latencies[tool]),
+            "errors": errors.get(tool, 0),
+            "first_call_ms": round(first_call[tool], 2),
+            **summarize(latencies[tool]),
+        }
+
+    return {
+        "processes": processes,
+        "startup_seconds": [round(s, 3) for s in startup],
+        "rss_mb": {"after_start": round(rss_after_start, 1), "peak": round(peak_rss, 1)},
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(all_latencies) / wall, 2) if wall else 0.0,
+        "errors": sum(errors.values()),
+        "overall": summarize(all_latencies),
+        "tools": tools,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]):
+    """Print p50/p95/throughput deltas against a previous report"""
+    print(f"\n📊 Compared with {baseline.get('git_commit') or 'baseline'}:")
+    for name, current in report["servers"].items():
+        before = baseline.get("servers", {}).get(name)
+        if not before or "error" in before or "error" in current:
+            continue
+        print(f"\n   {name}")
+        rows = [("overall", before["overall"], current["overall"])]
+        rows += [(tool, before["tools"][tool], stats)
+                 for tool, stats in current["tools"].items() if tool in before.get("tools", {})]
+        for label, old, new in rows:
+            deltas = []
+            for key in ("p50_ms", "p95_ms"):
+                change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+                deltas.append(f"{key[:3]} {old[key]:.1f}->{new[key]:.1f}ms ({change:+.0f}%)")
+            print(f"     {label:<32} {'  '.join(deltas)}")
+        print(f"     {'throughput':<32} {before['throughput_rps']:.1f} -> {current['throughput_rps']:.1f} req/s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load-test the MCP servers over stdio")
+    parser.add_argument("--servers", nargs="+", choices=sorted(SERVERS), help="Servers to test (default: all in the mix)")
+    parser.add_argument("--mix", type=Path, default=DEFAULT_MIX, help="Recorded tool call mix (JSON)")
+    parser.add_argument("--requests", type=int, default=200, help="Tool calls per server")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight per server")
+    parser.add_argument("--processes", type=int, default=1, help="Server processes per server")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-call timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the replay order")
+    parser.add_argument("--database-url", help="Postgres URL for the database-backed servers")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_FIXTURES,
+                        help="Data snapshot for the JSON servers (default: checked-in fixtures)")
+    parser.add_argument("--live-data", action="store_true",
+                        help="Let the JSON servers read the workspace data instead of a snapshot")
+    parser.add_argument("--output", type=Path, help="Report path (default: data/benchmarks/mcp_load_<time>.json)")
+    parser.add_argument("--compare", type=Path, help="Previous report to diff against")
+    parser.add_argument("--startup-budget-ms", type=float, default=DEFAULT_STARTUP_BUDGET_MS,
+                        help="Max startup beyond an empty FastMCP server (0 disables)")
+    parser.add_argument("--startup-samples", type=int, default=DEFAULT_STARTUP_SAMPLES,
+                        help="Interleaved spawns per server (and baseline) for the startup budget")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["RAILWAY_DATABASE_URL"] = args.database_url
+    data_dir = None if args.live_data else args.data_dir.resolve()
+    if data_dir is not None and not data_dir.is_dir():
+        print(f"❌ Data snapshot not found: {data_dir}")
+        return 1
+
+    with open(args.mix) as f:
+        mixes = json.load(f)
+    servers = args.servers or [name for name in mixes if name in SERVERS]
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mix": str(args.mix),
+        "data_dir": str(data_dir) if data_dir else "live",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "startup_budget_ms": args.startup_budget_ms,
+        "startup_samples": args.startup_samples,
+        "servers": {},
+    }
+
+    startup_samples: Dict[str, List[float]] = {}
+    if args.startup_budget_ms:
+        budgeted = [name for name in servers if name in mixes]
+        print(f"⏱️  Sampling startup: {args.startup_samples} interleaved spawns of the "
+              f"baseline and {len(budgeted)} server(s)")
+        startup_samples = await measure_startup(budgeted, max(1, args.startup_samples), data_dir)
+    baseline_samples = startup_samples.get(BASELINE)
+    baseline = statistics.median(baseline_samples) if baseline_samples else None
+    report["baseline_startup_seconds"] = round(baseline, 3) if baseline is not None else None
+    if baseline is not None:
+        print(f"⏱️  Empty FastMCP server starts in {baseline * 1000:.0f}ms "
+              f"(median of {len(baseline_samples)}, range "
+              f"{min(baseline_samples) * 1000:.0f}-{max(baseline_samples) * 1000:.0f}ms)")
+    over_budget = []
+    failed = []
+
+    for name in servers:
+        if name not in mixes:
+            print(f"⚠️  No calls recorded for {name} in {args.mix}")
+            failed.append(name)
+            continue
+        print(f"🚀 {name}: {args.requests} calls, concurrency {args.concurrency}, {args.processes} process(es)")
+        result = await run_server(name, mixes[name], args.requests, args.concurrency,
+                                  args.processes, args.timeout, args.seed, data_dir)
+        report["servers"][name] = result
+        if "error" in result:
+            failed.append(name)
+            print(f"   ❌ Failed to start: {result['error']}")
+        else:
+            samples = startup_samples.get(name)
+            if baseline is not None and samples:
+                overhead_ms = (statistics.median(samples) - baseline) * 1000
+                result["startup_sample_seconds"] = [round(sample, 3) for sample in samples]
+                result["startup_overhead_ms"] = round(overhead_ms, 1)
+                result["within_startup_budget"] = overhead_ms <= args.startup_budget_ms
+                if not result["within_startup_budget"]:
+                    over_budget.append(name)
+                    print(f"   ❌ Startup {overhead_ms:.0f}ms over baseline (budget {args.startup_budget_ms:.0f}ms)")
+            overall = result["overall"]
+            print(f"   ✅ startup {max(result['startup_seconds']):.2f}s | "
+                  f"p50 {overall['p50_ms']}ms p95 {overall['p95_ms']}ms p99 {overall['p99_ms']}ms | "
+                  f"{result['throughput_rps']} req/s | peak RSS {result['rss_mb']['peak']} MB | "
+                  f"{result['errors']} errors")
+
+    output = args.output or REPORT_DIR / f"mcp_load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report saved: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+    if failed:
+        print(f"\n❌ Not measured: {', '.join(failed)}")
+    if over_budget:
+        print(f"\n❌ Over startup budget: {', '.join(over_budget)}")
+    return 1 if failed or over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -26,6 +26,7 @@ load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 # Import RSS sources for domain list
 from scripts.rss_expanded_collector import ALL_SOURCES
+from scripts.content_dedup import drop_near_duplicates
 
 try:
     from eventregistry import EventRegistry, QueryArticlesIter
@@ -236,6 +237,10 @@ class NewsAPICollector:
         if not articles:
             return None
 
+        articles = drop_near_duplicates(articles)
+        if not articles:
+            return None
+
         # Save to JSON
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         source_dir = self.output_dir / source_id
@@ -264,65 +269,28 @@ class NewsAPICollector:
         return str(output_file)
 
     def save_to_database(self, source_id, articles):
-        """Store articles in Railway PostgreSQL"""
+        """Store articles in Railway PostgreSQL (batched upsert)"""
         import psycopg2
+        from scripts.bulk_upsert import upsert_external_content
 
         conn_string = os.getenv('RAILWAY_DATABASE_URL')
         if not conn_string:
             return
 
         conn = psycopg2.connect(conn_string)
-        cursor = conn.cursor()
-
-        saved_count = 0
-
-        for article in articles:
-            try:
-                cursor.execute("""
-                    INSERT INTO external_content (
-                        content_id, source_id, title, url, author,
-                        published_at, fetched_at, content_type,
-                        content_text, content_length, tags, categories,
-                        raw_score, final_score
-                    ) VALUES (
-                        %s, %s, %s, %s, %s,
-                        %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s, %s
-                    )
-                    ON CONFLICT (url) DO UPDATE SET
-                        fetched_at = EXCLUDED.fetched_at,
-                        content_text = EXCLUDED.content_text,
-                        content_length = EXCLUDED.content_length,
-                        raw_score = EXCLUDED.raw_score
-                """, (
-                    article['content_id'],
-                    article['source_id'],
-                    article['title'],
-                    article['url'],
-                    article['author'],
-                    article['published_at'],
-                    article['fetched_at'],
-                    article['content_type'],
-                    article['content_text'],
-                    article['content_length'],
-                    json.dumps([]),
-                    json.dumps([article['category']]),
-                    article['raw_score'],
-                    article['raw_score']
-                ))
-
-                saved_count += 1
-
-            except Exception as e:
-                conn.rollback()
-                continue
-
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        print(f"✅ Stored {saved_count} articles in database")
+        try:
+            result = upsert_external_content(
+                conn, articles,
+                update_columns=['fetched_at', 'content_text', 'content_length', 'raw_score'],
+                include_tags=False
+            )
+        finally:
+            conn.close()
+
+        for url, error in result.errors:
+            print(f"   ⚠️  Skipped {url}: {error}")
+
+        print(f"✅ Stored {result.saved} articles in database")
 
     def collect_all(self, date_start, date_end, max_per_source=100, verbose=True):
         """Collect from all 26 sources"""
@@ -6,6 +6,7 @@ Collects commercial-friendly open source projects from awesome lists and other s
 
 import os
 import re
+import sys
 import json
 import time
 import requests
@@ -13,10 +14,16 @@ import psycopg2
 import psycopg2.extras
 from datetime import datetime
 from dotenv import load_dotenv
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bulk_upsert import build_upsert_sql, bulk_upsert, execute_batch_isolated
 
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
+# Repos upserted per round trip while walking an awesome list
+OSS_BATCH_SIZE = 25
+
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 HEADERS = {'Accept': 'application/vnd.github.v3+json'}
 if GITHUB_TOKEN:
@@ -159,116 +166,118 @@ def categorize_repo(repo_data: Dict, source_category: str = None) -> List[str]:
 
     return list(set(categories)) or ['general']
 
-def store_oss_repo(cursor, repo_data: Dict, categories: List[str]) -> Optional[int]:
-    """Store OSS repository in database"""
-
-    # Check if exists
-    cursor.execute(
-        "SELECT id FROM oss_commercial_repos WHERE repo_full_name = %s;",
-        (repo_data['full_name'],)
+OSS_COLUMNS = (
+    'repo_full_name', 'owner', 'repo_name', 'description', 'primary_language',
+    'license_type', 'is_commercial_friendly', 'stars', 'forks', 'watchers',
+    'last_commit_date', 'has_readme', 'has_wiki', 'repo_url', 'homepage',
+    'repo_metadata'
+)
+
+# Identity columns are insert-only; everything else is refreshed on conflict
+OSS_UPDATE_COLUMNS = [col for col in OSS_COLUMNS if col not in ('repo_full_name', 'owner', 'repo_name')]
+
+# Commercial-friendly licenses
+COMMERCIAL_LICENSES = ['MIT', 'Apache-2.0', 'BSD-2-Clause', 'BSD-3-Clause', 'ISC', 'Unlicense']
+
+# oss_repo_categories has no unique key, so skip pairs that already exist
+CATEGORY_INSERT_SQL = """
+    INSERT INTO oss_repo_categories (repo_id, category, relevance_score)
+    SELECT v.repo_id, v.category, v.relevance_score
+    FROM (VALUES %s) AS v(repo_id, category, relevance_score)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM oss_repo_categories c
+        WHERE c.repo_id = v.repo_id AND c.category = v.category
     )
-    existing = cursor.fetchone()
+"""
 
+def oss_repo_row(repo_data: Dict) -> tuple:
+    """Map a GitHub API repo payload onto OSS_COLUMNS"""
     license_type = 'Unknown'
     if repo_data.get('license'):
         license_type = repo_data['license'].get('spdx_id', 'Unknown')
 
-    # Commercial-friendly licenses
-    commercial_licenses = ['MIT', 'Apache-2.0', 'BSD-2-Clause', 'BSD-3-Clause', 'ISC', 'Unlicense']
-    is_commercial_friendly = license_type in commercial_licenses
+    return (
+        repo_data['full_name'],
+        repo_data['owner']['login'],
+        repo_data['name'],
+        repo_data.get('description', ''),
+        repo_data.get('language', ''),
+        license_type,
+        license_type in COMMERCIAL_LICENSES,
+        repo_data.get('stargazers_count', 0),
+        repo_data.get('forks_count', 0),
+        repo_data.get('watchers_count', 0),
+        repo_data.get('pushed_at'),
+        True,  # has_readme (we don't check this yet)
+        repo_data.get('has_wiki', False),
+        repo_data.get('html_url', ''),
+        repo_data.get('homepage', ''),
+        json.dumps(repo_data)
+    )
+
+def store_oss_repos(conn, items: List[Tuple[Dict, List[str]]]) -> int:
+    """
+    Upsert many OSS repositories and their categories in batched round trips
 
-    repo_id = None
+    Args:
+        conn: Database connection
+        items: (repo_data, categories) pairs
+
+    Returns:
+        Number of repositories stored
+    """
+    if not items:
+        return 0
+
+    result = bulk_upsert(
+        conn, 'oss_commercial_repos', OSS_COLUMNS,
+        [oss_repo_row(repo_data) for repo_data, _ in items],
+        conflict_columns=['repo_full_name'],
+        update_columns=OSS_UPDATE_COLUMNS,
+        returning='id, repo_full_name'
+    )
+    for repo_full_name, error in result.errors:
+        print(f"   ❌ Error storing {repo_full_name}: {error}")
+
+    repo_ids = {row['repo_full_name']: row['id'] for row in result.returned}
+    category_rows = {
+        (repo_ids[repo_data['full_name']], category, 80)
+        for repo_data, categories in items
+        if repo_data['full_name'] in repo_ids
+        for category in categories
+    }
+    categories_result = execute_batch_isolated(conn, CATEGORY_INSERT_SQL, sorted(category_rows))
+    for row, error in categories_result.errors:
+        print(f"   ⚠️  Error storing category {row[1]} for repo {row[0]}: {error}")
+
+    return result.saved
+
+def store_oss_repo(cursor, repo_data: Dict, categories: List[str]) -> Optional[int]:
+    """Store OSS repository in database (single-statement upsert)"""
+    sql = build_upsert_sql(
+        'oss_commercial_repos', OSS_COLUMNS,
+        conflict_columns=['repo_full_name'],
+        update_columns=OSS_UPDATE_COLUMNS,
+        returning='id'
+    )
 
     try:
-        if existing:
-            # Update
-            cursor.execute("""
-                UPDATE oss_commercial_repos SET
-                    description = %s,
-                    primary_language = %s,
-                    license_type = %s,
-                    is_commercial_friendly = %s,
-                    stars = %s,
-                    forks = %s,
-                    watchers = %s,
-                    last_commit_date = %s,
-                    has_readme = %s,
-                    has_wiki = %s,
-                    repo_url = %s,
-                    homepage = %s,
-                    repo_metadata = %s
-                WHERE id = %s
-                RETURNING id;
-            """, (
-                repo_data.get('description', ''),
-                repo_data.get('language', ''),
-                license_type,
-                is_commercial_friendly,
-                repo_data.get('stargazers_count', 0),
-                repo_data.get('forks_count', 0),
-                repo_data.get('watchers_count', 0),
-                repo_data.get('pushed_at'),
-                True,  # has_readme (we don't check this yet)
-                repo_data.get('has_wiki', False),
-                repo_data.get('html_url', ''),
-                repo_data.get('homepage', ''),
-                json.dumps(repo_data),
-                existing['id']
-            ))
-            repo_id = existing['id']
-        else:
-            # Insert
-            cursor.execute("""
-                INSERT INTO oss_commercial_repos (
-                    repo_full_name,
-                    owner,
-                    repo_name,
-                    description,
-                    primary_language,
-                    license_type,
-                    is_commercial_friendly,
-                    stars,
-                    forks,
-                    watchers,
-                    last_commit_date,
-                    has_readme,
-                    has_wiki,
-                    repo_url,
-                    homepage,
-                    repo_metadata
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id;
-            """, (
-                repo_data['full_name'],
-                repo_data['owner']['login'],
-                repo_data['name'],
-                repo_data.get('description', ''),
-                repo_data.get('language', ''),
-                license_type,
-                is_commercial_friendly,
-                repo_data.get('stargazers_count', 0),
-                repo_data.get('forks_count', 0),
-                repo_data.get('watchers_count', 0),
-                repo_data.get('pushed_at'),
-                True,
-                repo_data.get('has_wiki', False),
-                repo_data.get('html_url', ''),
-                repo_data.get('homepage', ''),
-                json.dumps(repo_data)
-            ))
-            repo_id = cursor.fetchone()['id']
+        cursor.execute("SAVEPOINT store_oss_repo")
+        rows = psycopg2.extras.execute_values(cursor, sql, [oss_repo_row(repo_data)], fetch=True)
+        repo_id = rows[0]['id']
 
         # Store categories
-        for category in categories:
-            cursor.execute("""
-                INSERT INTO oss_repo_categories (repo_id, category, relevance_score)
-                VALUES (%s, %s, %s)
-                ON CONFLICT DO NOTHING;
-            """, (repo_id, category, 80))
+        if categories:
+            psycopg2.extras.execute_values(
+                cursor, CATEGORY_INSERT_SQL,
+                [(repo_id, category, 80) for category in set(categories)]
+            )
 
+        cursor.execute("RELEASE SAVEPOINT store_oss_repo")
         return repo_id
 
     except Exception as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT store_oss_repo")
         print(f"   ❌ Error storing {repo_data['full_name']}: {e}")
         return None
 
@@ -287,9 +296,9 @@ def collect_from_awesome_list(list_repo: str):
     print(f"   Found {len(repos)} repository links")
 
     conn = get_db_connection()
-    cursor = conn.cursor()
 
     stored_count = 0
+    pending = []
     for i, repo_name in enumerate(repos[:100], 1):  # Limit to 100 per list
         try:
             # Fetch repo details
@@ -301,17 +310,15 @@ def collect_from_awesome_list(list_repo: str):
             if repo_data.get('stargazers_count', 0) < 100:
                 continue
 
-            # Categorize
-            categories = categorize_repo(repo_data)
-
-            # Store
-            repo_id = store_oss_repo(cursor, repo_data, categories)
-            if repo_id:
-                stored_count += 1
+            # Categorize and queue for the next batch
+            pending.append((repo_data, categorize_repo(repo_data)))
 
             if i % 10 == 0:
-                print(f"   Processed {i}/{min(len(repos), 100)} repos ({stored_count} stored)")
-                conn.commit()
+                print(f"   Processed {i}/{min(len(repos), 100)} repos ({stored_count + len(pending)} queued/stored)")
+
+            if len(pending) >= OSS_BATCH_SIZE:
+                stored_count += store_oss_repos(conn, pending)
+                pending = []
 
             time.sleep(0.5)  # Be nice to API
 
@@ -319,8 +326,7 @@ def collect_from_awesome_list(list_repo: str):
             print(f"   ❌ Error processing {repo_name}: {e}")
             continue
 
-    conn.commit()
-    cursor.close()
+    stored_count += store_oss_repos(conn, pending)
     conn.close()
 
     print(f"   ✅ Stored {stored_count} repos from {list_repo}")
@@ -330,10 +336,7 @@ def collect_known_projects():
     """Collect known commercial-friendly projects"""
     print(f"\n📦 Collecting known commercial projects...")
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    stored_count = 0
+    pending = []
     for project in KNOWN_PROJECTS:
         try:
             repo_data = fetch_repo_details(project['repo'])
@@ -342,11 +345,8 @@ def collect_known_projects():
 
             categories = [project['category']]
             categories.extend(categorize_repo(repo_data))
-
-            repo_id = store_oss_repo(cursor, repo_data, categories)
-            if repo_id:
-                stored_count += 1
-                print(f"   ✅ {project['repo']}")
+            pending.append((repo_data, categories))
+            print(f"   ✅ {project['repo']}")
 
             time.sleep(0.5)
 
@@ -354,9 +354,11 @@ def collect_known_projects():
             print(f"   ❌ Error: {e}")
             continue
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+    conn = get_db_connection()
+    try:
+        stored_count = store_oss_repos(conn, pending)
+    finally:
+        conn.close()
 
     print(f"\n   ✅ Stored {stored_count}/{len(KNOWN_PROJECTS)} known projects")
     return stored_count
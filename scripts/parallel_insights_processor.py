@@ -1,16 +1,20 @@
 #!/usr/bin/env python3
 """
 Parallel Insights Processor
-Monitors transcripts and processes them with OpenRouter workers in parallel
+Pulls 'insights' jobs from the pipeline job queue and processes them with
+OpenRouter workers in parallel. New transcripts arrive as queue inserts from
+the transcript stage, so monitor mode polls the queue instead of re-globbing
+the transcripts directory.
 """
 
 import os
 import json
 import time
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Set
+from threading import Lock
+from typing import List
 from openrouter_bi_extractor import OpenRouterBIExtractor
+from job_queue import JobQueue, Job, run_workers, backfill
 
 
 class ParallelInsightsProcessor:
@@ -22,9 +26,10 @@ class ParallelInsightsProcessor:
         self.insights_dir = self.workspace_dir / "data" / "business_insights"
         self.max_workers = max_workers
         self.extractor = OpenRouterBIExtractor()
+        self.queue = JobQueue()
 
     def get_transcripts_needing_insights(self) -> List[str]:
-        """Find all transcripts that don't have insights yet"""
+        """Find all transcripts that don't have insights yet (directory scan)"""
         transcript_files = list(self.transcripts_dir.glob("*_full.json"))
         needing_insights = []
 
@@ -52,59 +57,91 @@ class ParallelInsightsProcessor:
         except Exception as e:
             return (video_id, False, 0, str(e))
 
-    def process_batch(self, video_ids: List[str]) -> dict:
-        """Process a batch of videos with parallel workers"""
-        print(f"\n{'='*80}")
-        print(f"🚀 PARALLEL INSIGHTS PROCESSING - OpenRouter")
-        print(f"{'='*80}\n")
-        print(f"Videos to process: {len(video_ids)}")
-        print(f"Workers: {self.max_workers}")
-        print(f"Model: {self.extractor.model}\n")
+    def process_job(self, job: Job) -> dict:
+        """Queue handler for the 'insights' stage"""
+        vid, success, elapsed, error = self.process_single_video(job.item_id)
+        if success:
+            return {'status': 'success', 'elapsed': elapsed}
+        return {'status': 'error', 'error': error, 'elapsed': elapsed}
+
+    def run_queue(self, expected: int = None, idle_exit: bool = True, poll_interval: float = 2.0,
+                  item_ids: List[str] = None) -> dict:
+        """
+        Run workers on the 'insights' stage of the job queue
 
+        Args:
+            expected: Number of jobs expected (for progress/ETA output only)
+            idle_exit: Stop when the stage is drained (False = keep waiting for new jobs)
+            poll_interval: Queue poll interval when idle
+            item_ids: Only process these videos (None = every queued insights job)
+        """
         results = {
             'success': 0,
             'failed': 0,
+            'retried': 0,
             'total_time': 0,
             'errors': []
         }
-
+        lock = Lock()
+        counter = {'done': 0}
         start_time = time.time()
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all jobs
-            futures = {executor.submit(self.process_single_video, vid): vid
-                      for vid in video_ids}
-
-            # Process results as they complete
-            for i, future in enumerate(as_completed(futures), 1):
-                video_id = futures[future]
-
-                try:
-                    vid, success, elapsed, error = future.result()
-
-                    if success:
-                        results['success'] += 1
-                        print(f"✅ [{i}/{len(video_ids)}] {vid} ({elapsed:.1f}s)")
-                    else:
-                        results['failed'] += 1
-                        results['errors'].append({'video_id': vid, 'error': error})
-                        print(f"❌ [{i}/{len(video_ids)}] {vid}: {error}")
-
-                except Exception as e:
+        total = expected or '?'
+
+        def on_result(job: Job, result: dict):
+            with lock:
+                counter['done'] += 1
+                i = counter['done']
+                elapsed = result.get('elapsed', 0)
+
+                if result['outcome'] == 'done':
+                    results['success'] += 1
+                    print(f"✅ [{i}/{total}] {job.item_id} ({elapsed:.1f}s)")
+                elif result['outcome'] == 'retried':
+                    results['retried'] += 1
+                    print(f"🔁 [{i}/{total}] {job.item_id}: {result.get('error')} (will retry)")
+                else:
                     results['failed'] += 1
-                    results['errors'].append({'video_id': video_id, 'error': str(e)})
-                    print(f"❌ [{i}/{len(video_ids)}] {video_id}: Exception: {e}")
+                    results['errors'].append({'video_id': job.item_id, 'error': result.get('error')})
+                    print(f"❌ [{i}/{total}] {job.item_id}: {result.get('error')} (dead-lettered)")
 
                 # Show progress every 10 videos
                 if i % 10 == 0:
                     elapsed_total = time.time() - start_time
                     avg_time = elapsed_total / i
-                    remaining = (len(video_ids) - i) * avg_time
-                    print(f"\n📊 Progress: {i}/{len(video_ids)} ({i/len(video_ids)*100:.1f}%)")
-                    print(f"   Success: {results['success']} | Failed: {results['failed']}")
-                    print(f"   Avg time: {avg_time:.1f}s/video | ETA: {remaining/60:.1f}m\n")
+                    print(f"\n📊 Progress: {i} jobs" + (f"/{expected} ({i/expected*100:.1f}%)" if expected else ""))
+                    print(f"   Success: {results['success']} | Failed: {results['failed']} | Retrying: {results['retried']}")
+                    if expected:
+                        remaining = max(expected - i, 0) * avg_time
+                        print(f"   Avg time: {avg_time:.1f}s/video | ETA: {remaining/60:.1f}m\n")
+
+        run_workers(
+            self.queue,
+            {'insights': self.process_job},
+            max_workers=self.max_workers,
+            owner='insights',
+            idle_exit=idle_exit,
+            poll_interval=poll_interval,
+            on_result=on_result,
+            item_ids=item_ids
+        )
 
         results['total_time'] = time.time() - start_time
+        return results
+
+    def process_batch(self, video_ids: List[str]) -> dict:
+        """Enqueue a batch of videos and process the insights stage with parallel workers"""
+        print(f"\n{'='*80}")
+        print(f"🚀 PARALLEL INSIGHTS PROCESSING - OpenRouter")
+        print(f"{'='*80}\n")
+
+        added = self.queue.enqueue('insights', video_ids)
+        pending = self.queue.outstanding(['insights'], video_ids)
+
+        print(f"Videos to process: {len(video_ids)} ({added} newly queued, {pending} pending in queue)")
+        print(f"Workers: {self.max_workers}")
+        print(f"Model: {self.extractor.model}\n")
+
+        results = self.run_queue(expected=pending, item_ids=video_ids)
 
         print(f"\n{'='*80}")
         print(f"✅ PARALLEL PROCESSING COMPLETE")
@@ -112,50 +149,33 @@ class ParallelInsightsProcessor:
         print(f"Success: {results['success']}")
         print(f"Failed: {results['failed']}")
         print(f"Total time: {results['total_time']:.1f}s ({results['total_time']/60:.1f} minutes)")
-        print(f"Average: {results['total_time']/len(video_ids):.1f}s per video")
+        if pending:
+            print(f"Average: {results['total_time']/pending:.1f}s per video")
         print(f"{'='*80}\n")
 
         return results
 
-    def monitor_and_process(self, check_interval: int = 30):
+    def monitor_and_process(self, check_interval: int = 5):
         """
-        Monitor for new transcripts and process them continuously
+        Process insights jobs continuously as upstream stages enqueue them
         """
         print(f"\n{'='*80}")
-        print(f"👀 MONITORING MODE - Processing transcripts as they appear")
+        print(f"👀 MONITORING MODE - Processing insights jobs as they are queued")
         print(f"{'='*80}\n")
-        print(f"Check interval: {check_interval}s")
+        print(f"Queue poll interval: {check_interval}s")
         print(f"Workers: {self.max_workers}")
         print(f"Press Ctrl+C to stop\n")
 
-        processed: Set[str] = set()
-
-        # Get initial state
-        initial_needing = set(self.get_transcripts_needing_insights())
-        print(f"Found {len(initial_needing)} transcripts needing insights\n")
+        # One-time scan picks up transcripts written before the queue existed
+        seeded = backfill(self.queue, self.workspace_dir)
+        print(f"Queued {seeded['insights']} transcripts needing insights "
+              f"({self.queue.outstanding(['insights'])} pending)\n")
 
         try:
-            while True:
-                # Check for new transcripts
-                current_needing = set(self.get_transcripts_needing_insights())
-                new_transcripts = current_needing - processed
-
-                if new_transcripts:
-                    print(f"🆕 Found {len(new_transcripts)} new transcripts to process")
-                    new_list = list(new_transcripts)
-
-                    # Process them
-                    self.process_batch(new_list)
-
-                    # Mark as processed
-                    processed.update(new_transcripts)
-
-                # Wait before next check
-                time.sleep(check_interval)
-
+            self.run_queue(idle_exit=False, poll_interval=check_interval)
         except KeyboardInterrupt:
             print("\n\n🛑 Monitoring stopped by user")
-            print(f"Processed {len(processed)} videos total")
+            print(f"Leased jobs are returned to the queue when their lease expires")
 
 
 def main():
@@ -165,7 +185,7 @@ def main():
     parser = argparse.ArgumentParser(description='Parallel Insights Processing via OpenRouter')
     parser.add_argument('--workers', type=int, default=50, help='Number of parallel workers (default: 50)')
     parser.add_argument('--monitor', action='store_true', help='Monitor mode: continuously process new transcripts')
-    parser.add_argument('--interval', type=int, default=30, help='Monitor check interval in seconds (default: 30)')
+    parser.add_argument('--interval', type=int, default=5, help='Monitor queue poll interval in seconds (default: 5)')
     parser.add_argument('--batch', type=str, help='Process specific batch of video IDs from file')
 
     args = parser.parse_args()
@@ -29,6 +29,8 @@ except ImportError:
 # OpenAI for Whisper and Claude verification
 from anthropic import Anthropic
 
+from transcript_store import join_segments
+
 # Load environment
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
@@ -152,7 +154,8 @@ class QCVerifier:
             return transcript_data
         
         segments = transcript_data['transcript']['segments']
-        full_text = " ".join([seg.get('text', '') for seg in segments])
+        # Only the first 3000 chars reach the prompt
+        full_text = join_segments(segments, limit=3000)
         
         # Quick check - if too short, skip AI verification
         if len(full_text) < 100:
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Polite Fetcher - Shared asyncio HTTP fetch layer for all scrapers and collectors
+
+Replaces per-collector `requests.get` + `time.sleep(0.5)` loops with one
+concurrent fetch layer whose throughput is bounded by politeness rules:
+- Per-host concurrency limits and token-bucket request rates
+- Connection reuse (one pooled httpx.AsyncClient per fetcher)
+- Conditional GET (ETag / Last-Modified validators)
+- robots.txt caching (allow/deny + Crawl-delay)
+- Retry with exponential backoff + jitter on timeouts, 429 and 5xx (honors Retry-After)
+
+Usage:
+    async with PoliteFetcher() as fetcher:
+        results = await fetcher.fetch_many(urls)
+
+    # From synchronous code
+    results = fetch_all(urls)
+"""
+
+import json
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: Optional[int] = None
+    content: bytes = b''
+    headers: Dict[str, str] = field(default_factory=dict)
+    final_url: Optional[str] = None
+    not_modified: bool = False
+    error: Optional[str] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `capacity` burst"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def set_rate(self, rate: float):
+        self.rate = rate
+
+    async def acquire(self, amount: float = 1.0):
+        # A request larger than the bucket would never fit; cap it at a full bucket
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class _HostState:
+    """Per-host politeness state"""
+
+    def __init__(self, concurrency: int, rate: float, burst: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(rate, burst)
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_lock = asyncio.Lock()
+        self.robots_loaded = False
+
+
+class PoliteFetcher:
+    """Concurrent HTTP fetcher bounded by per-host politeness rules"""
+
+    def __init__(
+        self,
+        per_host_concurrency: int = 2,
+        per_host_rate: float = 2.0,
+        per_host_burst: float = 2.0,
+        max_connections: int = 64,
+        timeout: float = 20.0,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        respect_robots: bool = True,
+        user_agent: str = DEFAULT_USER_AGENT,
+        headers: Optional[Dict[str, str]] = None,
+        validator_path: Optional[Path] = None,
+        host_overrides: Optional[Dict[str, Dict[str, float]]] = None,
+    ):
+        """
+        Args:
+            per_host_concurrency: Max in-flight requests per host
+            per_host_rate: Sustained requests per second per host
+            per_host_burst: Token bucket capacity per host
+            max_connections: Connection pool size across all hosts
+            timeout: Per-request timeout in seconds
+            max_retries: Retries on timeouts, connection errors, 429 and 5xx
+            backoff_base: First backoff delay (doubles per retry, with jitter)
+            backoff_max: Backoff delay cap
+            respect_robots: Check robots.txt (cached per host) before fetching
+            user_agent: User-Agent header (also used for robots matching)
+            headers: Extra default headers
+            validator_path: Optional JSON file persisting ETag/Last-Modified per URL
+            host_overrides: {host: {"concurrency": n, "rate": r, "burst": b}}
+        """
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_rate = per_host_rate
+        self.per_host_burst = per_host_burst
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self.headers = {
+            'User-Agent': user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            **(headers or {})
+        }
+        self.host_overrides = host_overrides or {}
+
+        self.validator_path = Path(validator_path) if validator_path else None
+        self.validators: Dict[str, Dict[str, str]] = self._load_validators()
+
+        self._hosts: Dict[str, _HostState] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self.stats = {
+            'requests': 0,
+            'ok': 0,
+            'not_modified': 0,
+            'retries': 0,
+            'errors': 0,
+            'robots_blocked': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.save_validators()
+
+    # ------------------------------------------------------------------
+    # Conditional GET validators
+    # ------------------------------------------------------------------
+
+    def _load_validators(self) -> Dict[str, Dict[str, str]]:
+        if not self.validator_path or not self.validator_path.exists():
+            return {}
+        try:
+            with open(self.validator_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load validators from {self.validator_path}: {e}")
+            return {}
+
+    def save_validators(self):
+        if not self.validator_path:
+            return
+        self.validator_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.validator_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.validators, f)
+        tmp_path.replace(self.validator_path)
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        validator = self.validators.get(url, {})
+        headers = {}
+        if validator.get('etag'):
+            headers['If-None-Match'] = validator['etag']
+        if validator.get('last_modified'):
+            headers['If-Modified-Since'] = validator['last_modified']
+        return headers
+
+    def _remember_validators(self, url: str, headers: httpx.Headers):
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        if etag or last_modified:
+            self.validators[url] = {
+                k: v for k, v in (('etag', etag), ('last_modified', last_modified)) if v
+            }
+
+    # ------------------------------------------------------------------
+    # Politeness
+    # ------------------------------------------------------------------
+
+    def _host_state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            override = self.host_overrides.get(host, {})
+            state = _HostState(
+                concurrency=int(override.get('concurrency', self.per_host_concurrency)),
+                rate=override.get('rate', self.per_host_rate),
+                burst=override.get('burst', self.per_host_burst),
+            )
+            self._hosts[host] = state
+        return state
+
+    async def _allowed_by_robots(self, url: str, scheme: str, host: str, state: _HostState) -> bool:
+        if not self.respect_robots:
+            return True
+
+        async with state.robots_lock:
+            if not state.robots_loaded:
+                state.robots_loaded = True
+                robots_url = f"{scheme}://{host}/robots.txt"
+                try:
+                    response = await self._client.get(robots_url)
+                    if response.status_code == 200:
+                        parser = RobotFileParser(robots_url)
+                        parser.parse(response.text.splitlines())
+                        state.robots = parser
+
+                        delay = parser.crawl_delay(self.user_agent)
+                        if delay:
+                            state.bucket.set_rate(min(state.bucket.rate, 1.0 / float(delay)))
+                except httpx.HTTPError as e:
+                    logger.debug(f"robots.txt unavailable for {host}: {e}")
+
+        if state.robots is None:
+            return True
+        return state.robots.can_fetch(self.user_agent, url)
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay, self.backoff_max) * (0.5 + random.random() / 2)
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    async def fetch(self, url: str, conditional: bool = False) -> FetchResult:
+        """
+        Fetch one URL under the host's politeness budget
+
+        Args:
+            url: URL to fetch
+            conditional: Send stored ETag/Last-Modified; 304 yields not_modified=True
+        """
+        if self._client is None:
+            raise RuntimeError("PoliteFetcher must be used as 'async with PoliteFetcher() as f'")
+
+        result = FetchResult(url=url)
+        parts = urlsplit(url)
+        host = parts.netloc
+        state = self._host_state(host)
+        start = time.monotonic()
+
+        if not await self._allowed_by_robots(url, parts.scheme or 'https', host, state):
+            self.stats['robots_blocked'] += 1
+            result.error = 'robots_disallowed'
+            return result
+
+        headers = self._conditional_headers(url) if conditional else {}
+
+        for attempt in range(self.max_retries + 1):
+            result.attempts = attempt + 1
+            retry_after = None
+
+            async with state.semaphore:
+                await state.bucket.acquire()
+                self.stats['requests'] += 1
+                try:
+                    response = await self._client.get(url, headers=headers)
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    result.error = f"{type(e).__name__}: {e}"
+                    response = None
+
+            if response is not None:
+                result.status = response.status_code
+                result.headers = dict(response.headers)
+                result.final_url = str(response.url)
+
+                if response.status_code == 304:
+                    result.not_modified = True
+                    result.error = None
+                    self.stats['not_modified'] += 1
+                    break
+
+                if response.status_code not in RETRY_STATUSES:
+                    result.content = response.content
+                    if response.is_success:
+                        result.error = None
+                        self.stats['ok'] += 1
+                        if conditional:
+                            self._remember_validators(url, response.headers)
+                    else:
+                        result.error = f"HTTP {response.status_code}"
+                    break
+
+                result.error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get('retry-after')
+
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+
+        if result.error:
+            self.stats['errors'] += 1
+
+        result.elapsed = time.monotonic() - start
+        return result
+
+    async def fetch_many(self, urls: Iterable[str], conditional: bool = False) -> List[FetchResult]:
+        """Fetch many URLs concurrently; results are returned in input order"""
+        return await asyncio.gather(*(self.fetch(url, conditional=conditional) for url in urls))
+
+
+def fetch_all(urls: Iterable[str], conditional: bool = False, **fetcher_kwargs) -> List[FetchResult]:
+    """Synchronous helper: fetch URLs with a short-lived PoliteFetcher"""
+    async def _run():
+        async with PoliteFetcher(**fetcher_kwargs) as fetcher:
+            return await fetcher.fetch_many(urls, conditional=conditional)
+
+    return asyncio.run(_run())
+
+
+def run_with_fetcher(fn, *args, fetcher_kwargs: Optional[Dict] = None, **kwargs):
+    """Synchronous helper: run `await fn(fetcher, *args, **kwargs)` inside a fresh event loop"""
+    async def _run():
+        async with PoliteFetcher(**(fetcher_kwargs or {})) as fetcher:
+            return await fn(fetcher, *args, **kwargs)
+
+    return asyncio.run(_run())
@@ -9,18 +9,21 @@ import os
 import sys
 import json
 import hashlib
-import requests
+import asyncio
 import feedparser
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import psycopg2
 
 sys.path.append('/Users/yourox/AI-Workspace')
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
+from scripts.polite_fetcher import run_with_fetcher
+from scripts.bulk_upsert import upsert_external_content
+from scripts.content_dedup import drop_near_duplicates
+
 # PREMIUM SOURCES - Tier 1 (Science-Based)
 SCIENCE_SOURCES = {
     "greatergood": {
@@ -207,20 +210,24 @@ class PremiumCollector:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'max-age=0'
-        })
+        # Politeness budget for the shared fetcher
+        self.fetcher_kwargs = {
+            'per_host_concurrency': 3,
+            'per_host_rate': 1.0,
+            'timeout': 20,
+            'headers': {'Cache-Control': 'max-age=0'}
+        }
 
         self.min_word_count = 200  # Higher quality threshold
         self.six_months_ago = datetime.now() - timedelta(days=180)
 
     def collect_source(self, source_id, config, max_articles=50, verbose=True):
         """Try multiple methods to collect content"""
+        return run_with_fetcher(self.collect_source_async, source_id, config, max_articles, verbose,
+                                fetcher_kwargs=self.fetcher_kwargs)
+
+    async def collect_source_async(self, fetcher, source_id, config, max_articles=50, verbose=True):
+        """Try multiple methods to collect content using a shared PoliteFetcher"""
 
         if verbose:
             print(f"\n{'='*70}")
@@ -234,40 +241,41 @@ class PremiumCollector:
         if config.get('rss_url'):
             if verbose:
                 print(f"📡 Method 1: RSS Feed")
-            articles = self.collect_via_rss(source_id, config, max_articles, verbose)
+            articles = await self.collect_via_rss(fetcher, source_id, config, max_articles, verbose)
 
         # Method 2: Fallback to web scraping
         if len(articles) == 0 and config.get('archive_url'):
             if verbose:
                 print(f"🌐 Method 2: Web Scraping (RSS failed or empty)")
-            articles = self.collect_via_scraping(source_id, config, max_articles, verbose)
+            articles = await self.collect_via_scraping(fetcher, source_id, config, max_articles, verbose)
 
         return articles
 
-    def collect_via_rss(self, source_id, config, max_articles, verbose):
+    async def collect_via_rss(self, fetcher, source_id, config, max_articles, verbose):
         """Collect via RSS feed"""
 
         try:
             if verbose:
                 print(f"   Loading: {config['rss_url']}")
 
-            response = self.session.get(config['rss_url'], timeout=20)
-            response.raise_for_status()
+            response = await fetcher.fetch(config['rss_url'])
+            if not response.ok:
+                raise Exception(response.error)
 
             feed = feedparser.parse(response.content)
 
             if verbose:
                 print(f"   ✅ Found {len(feed.entries)} RSS entries")
 
+            # Fetch full article pages concurrently (bounded by per-host politeness)
+            article_urls = [entry.get('link', '') for entry in feed.entries[:max_articles]]
+            article_urls = [url for url in article_urls if url]
+            results = await fetcher.fetch_many(article_urls)
+
             articles = []
-            for entry in feed.entries[:max_articles]:
+            for article_url, result in zip(article_urls, results):
                 try:
-                    # Get full article content by fetching URL
-                    article_url = entry.get('link', '')
-                    if not article_url:
-                        continue
-
-                    article = self.fetch_full_article(article_url, source_id, config)
+                    article = self.parse_full_article(result, article_url, source_id, config)
 
                     if article and self.is_high_quality(article):
                         # Check date
@@ -295,15 +303,16 @@ class PremiumCollector:
                 print(f"   ❌ RSS failed: {e}")
             return []
 
-    def collect_via_scraping(self, source_id, config, max_articles, verbose):
+    async def collect_via_scraping(self, fetcher, source_id, config, max_articles, verbose):
         """Collect via web scraping"""
 
         try:
             if verbose:
                 print(f"   Loading: {config['archive_url']}")
 
-            response = self.session.get(config['archive_url'], timeout=20)
-            response.raise_for_status()
+            response = await fetcher.fetch(config['archive_url'])
+            if not response.ok:
+                raise Exception(response.error)
 
             soup = BeautifulSoup(response.content, 'lxml')
 
@@ -333,11 +342,13 @@ class PremiumCollector:
                     if len(article_urls) >= max_articles:
                         break
 
-            # Fetch full articles
+            # Fetch full articles concurrently (bounded by per-host politeness)
+            results = await fetcher.fetch_many(article_urls)
+
             articles = []
-            for i, url in enumerate(article_urls, 1):
+            for i, (url, result) in enumerate(zip(article_urls, results), 1):
                 try:
-                    article = self.fetch_full_article(url, source_id, config)
+                    article = self.parse_full_article(result, url, source_id, config)
 
                     if article and self.is_high_quality(article):
                         pub_date = datetime.fromisoformat(article['published_at'].replace('Z', '+00:00'))
@@ -366,12 +377,20 @@ class PremiumCollector:
 
     def fetch_full_article(self, url, source_id, config):
         """Fetch and parse full article"""
+        async def _fetch(fetcher):
+            return await fetcher.fetch(url)
+
+        result = run_with_fetcher(_fetch, fetcher_kwargs=self.fetcher_kwargs)
+        return self.parse_full_article(result, url, source_id, config)
+
+    def parse_full_article(self, result, url, source_id, config):
+        """Parse a fetched article page (FetchResult) into an article object"""
 
         try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
+            if not result.ok:
+                raise Exception(result.error)
 
-            soup = BeautifulSoup(response.content, 'lxml')
+            soup = BeautifulSoup(result.content, 'lxml')
 
             # Extract title
             title_elem = soup.select_one(config['selectors']['title'])
@@ -461,6 +480,10 @@ class PremiumCollector:
         if not articles:
             return None
 
+        articles = drop_near_duplicates(articles)
+        if not articles:
+            return None
+
         # Save to JSON
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         source_dir = self.output_dir / source_id
@@ -488,63 +511,25 @@ class PremiumCollector:
         return str(output_file)
 
     def save_to_database(self, source_id, articles):
-        """Store in Railway PostgreSQL"""
+        """Store in Railway PostgreSQL (batched upsert)"""
         conn_string = os.getenv('RAILWAY_DATABASE_URL')
         if not conn_string:
             return
 
         conn = psycopg2.connect(conn_string)
-        cursor = conn.cursor()
-
-        saved_count = 0
-
-        for article in articles:
-            try:
-                cursor.execute("""
-                    INSERT INTO external_content (
-                        content_id, source_id, title, url, author,
-                        published_at, fetched_at, content_type,
-                        content_text, content_length, tags, categories,
-                        raw_score, final_score
-                    ) VALUES (
-                        %s, %s, %s, %s, %s,
-                        %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s, %s
-                    )
-                    ON CONFLICT (url) DO UPDATE SET
-                        fetched_at = EXCLUDED.fetched_at,
-                        content_text = EXCLUDED.content_text,
-                        content_length = EXCLUDED.content_length,
-                        raw_score = EXCLUDED.raw_score
-                """, (
-                    article['content_id'],
-                    article['source_id'],
-                    article['title'],
-                    article['url'],
-                    article['author'],
-                    article['published_at'],
-                    article['fetched_at'],
-                    article['content_type'],
-                    article['content_text'],
-                    article['content_length'],
-                    json.dumps([]),
-                    json.dumps([article['category']]),
-                    article['raw_score'],
-                    article['raw_score']
-                ))
-
-                saved_count += 1
-
-            except Exception as e:
-                conn.rollback()
-                continue
+        try:
+            result = upsert_external_content(
+                conn, articles,
+                update_columns=['fetched_at', 'content_text', 'content_length', 'raw_score'],
+                include_tags=False
+            )
+        finally:
+            conn.close()
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+        for url, error in result.errors:
+            print(f"   ⚠️  Skipped {url}: {error}")
 
-        print(f"✅ Stored {saved_count} articles in database")
+        print(f"✅ Stored {result.saved} articles in database")
 
     def collect_all_parallel(self, sources, max_workers=3):
         """Collect from multiple sources in parallel"""
@@ -560,24 +545,31 @@ class PremiumCollector:
         start_time = datetime.now()
         results = {}
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self.collect_source, source_id, ALL_PREMIUM_SOURCES[source_id], 50, True): source_id
-                for source_id in sources
-            }
+        # All sources share one fetcher so per-host limits hold across sources
+        async def _collect_all(fetcher):
+            return await asyncio.gather(
+                *(self.collect_source_async(fetcher, source_id, ALL_PREMIUM_SOURCES[source_id], 50, True)
+                  for source_id in sources),
+                return_exceptions=True
+            )
+
+        collected = run_with_fetcher(
+            _collect_all,
+            fetcher_kwargs={**self.fetcher_kwargs, 'max_connections': max_workers * 8}
+        )
 
-            for future in futures:
-                source_id = futures[future]
-                try:
-                    articles = future.result()
-                    if articles:
-                        self.save_articles(source_id, articles)
-                        results[source_id] = len(articles)
-                    else:
-                        results[source_id] = 0
-                except Exception as e:
-                    print(f"❌ Error with {source_id}: {e}")
+        for source_id, articles in zip(sources, collected):
+            try:
+                if isinstance(articles, Exception):
+                    raise articles
+                if articles:
+                    self.save_articles(source_id, articles)
+                    results[source_id] = len(articles)
+                else:
                     results[source_id] = 0
+            except Exception as e:
+                print(f"❌ Error with {source_id}: {e}")
+                results[source_id] = 0
 
         # Summary
         elapsed = (datetime.now() - start_time).total_seconds()
@@ -8,17 +8,20 @@ import os
 import sys
 import json
 import hashlib
-import requests
+import asyncio
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import psycopg2
 
 sys.path.append('/Users/yourox/AI-Workspace')
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
+from scripts.polite_fetcher import run_with_fetcher
+from scripts.bulk_upsert import upsert_external_content
+from scripts.content_dedup import drop_near_duplicates
+
 # HIGH-QUALITY QUANTUM PHYSICS SOURCES
 QUANTUM_SOURCES = {
     "sciencedaily_quantum": {
@@ -176,16 +179,21 @@ class QualityScraper:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-        })
+        # Politeness budget for the shared fetcher
+        self.fetcher_kwargs = {
+            'per_host_concurrency': 3,
+            'per_host_rate': 1.0,
+            'timeout': 20,
+            'headers': {'Accept-Language': 'en-US,en;q=0.5'}
+        }
 
     def scrape_source(self, source_id, config, max_articles=50, verbose=True):
         """Scrape articles from a single source"""
+        return run_with_fetcher(self.scrape_source_async, source_id, config, max_articles, verbose,
+                                fetcher_kwargs=self.fetcher_kwargs)
+
+    async def scrape_source_async(self, fetcher, source_id, config, max_articles=50, verbose=True):
+        """Scrape articles from a single source using a shared PoliteFetcher"""
 
         if verbose:
             print(f"\n{'='*70}")
@@ -195,8 +203,9 @@ class QualityScraper:
 
         try:
             # Get archive page
-            response = self.session.get(config['archive_url'], timeout=20)
-            response.raise_for_status()
+            response = await fetcher.fetch(config['archive_url'])
+            if not response.ok:
+                raise Exception(response.error)
 
             soup = BeautifulSoup(response.content, 'lxml')
 
@@ -229,13 +238,16 @@ class QualityScraper:
             if verbose:
                 print(f"🎯 Extracted {len(article_urls)} unique article URLs\n")
 
-            # Scrape each article
+            # Fetch all articles concurrently (bounded by per-host politeness)
+            start = datetime.now()
+            results = await fetcher.fetch_many(article_urls)
+
             articles = []
             six_months_ago = datetime.now() - timedelta(days=180)
 
-            for i, url in enumerate(article_urls, 1):
+            for i, (url, result) in enumerate(zip(article_urls, results), 1):
                 try:
-                    article = self.scrape_article(url, source_id, config)
+                    article = self.parse_article(result, url, source_id, config)
 
                     if article:
                         # Check date (only last 6 months)
@@ -257,7 +269,7 @@ class QualityScraper:
                     continue
 
             if verbose:
-                elapsed = len(articles) * 1.2  # estimate
+                elapsed = (datetime.now() - start).total_seconds()
                 print(f"\n✅ Scraped {len(articles)} articles in {elapsed:.1f}s")
                 if len(articles) > 0:
                     print(f"⏱️  Average: {elapsed/len(articles):.1f}s per article")
@@ -270,12 +282,20 @@ class QualityScraper:
 
     def scrape_article(self, url, source_id, config):
         """Scrape a single article"""
+        async def _fetch(fetcher):
+            return await fetcher.fetch(url)
+
+        result = run_with_fetcher(_fetch, fetcher_kwargs=self.fetcher_kwargs)
+        return self.parse_article(result, url, source_id, config)
+
+    def parse_article(self, result, url, source_id, config):
+        """Parse a fetched article page (FetchResult) into an article object"""
 
         try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
+            if not result.ok:
+                raise Exception(result.error)
 
-            soup = BeautifulSoup(response.content, 'lxml')
+            soup = BeautifulSoup(result.content, 'lxml')
 
             # Extract title
             title_elem = soup.select_one(config['selectors']['title'])
@@ -361,6 +381,10 @@ class QualityScraper:
         if not articles:
             return None
 
+        articles = drop_near_duplicates(articles)
+        if not articles:
+            return None
+
         # Save to JSON
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         source_dir = self.output_dir / source_id
@@ -388,63 +412,25 @@ class QualityScraper:
         return str(output_file)
 
     def save_to_database(self, source_id, articles):
-        """Store articles in Railway PostgreSQL"""
+        """Store articles in Railway PostgreSQL (batched upsert)"""
         conn_string = os.getenv('RAILWAY_DATABASE_URL')
         if not conn_string:
             return
 
         conn = psycopg2.connect(conn_string)
-        cursor = conn.cursor()
-
-        saved_count = 0
-
-        for article in articles:
-            try:
-                cursor.execute("""
-                    INSERT INTO external_content (
-                        content_id, source_id, title, url, author,
-                        published_at, fetched_at, content_type,
-                        content_text, content_length, tags, categories,
-                        raw_score, final_score
-                    ) VALUES (
-                        %s, %s, %s, %s, %s,
-                        %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s, %s
-                    )
-                    ON CONFLICT (url) DO UPDATE SET
-                        fetched_at = EXCLUDED.fetched_at,
-                        content_text = EXCLUDED.content_text,
-                        content_length = EXCLUDED.content_length,
-                        raw_score = EXCLUDED.raw_score
-                """, (
-                    article['content_id'],
-                    article['source_id'],
-                    article['title'],
-                    article['url'],
-                    article['author'],
-                    article['published_at'],
-                    article['fetched_at'],
-                    article['content_type'],
-                    article['content_text'],
-                    article['content_length'],
-                    json.dumps([]),
-                    json.dumps([article['category']]),
-                    article['raw_score'],
-                    article['raw_score']
-                ))
-
-                saved_count += 1
-
-            except Exception as e:
-                conn.rollback()
-                continue
+        try:
+            result = upsert_external_content(
+                conn, articles,
+                update_columns=['fetched_at', 'content_text', 'content_length', 'raw_score'],
+                include_tags=False
+            )
+        finally:
+            conn.close()
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+        for url, error in result.errors:
+            print(f"   ⚠️  Skipped {url}: {error}")
 
-        print(f"✅ Stored {saved_count} articles in database")
+        print(f"✅ Stored {result.saved} articles in database")
 
     def scrape_all_parallel(self, sources, max_workers=5):
         """Scrape multiple sources in parallel"""
@@ -459,24 +445,31 @@ class QualityScraper:
         start_time = datetime.now()
         results = {}
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self.scrape_source, source_id, ALL_QUALITY_SOURCES[source_id], 50, True): source_id
-                for source_id in sources
-            }
+        # All sources share one fetcher so per-host limits hold across sources
+        async def _scrape_all(fetcher):
+            return await asyncio.gather(
+                *(self.scrape_source_async(fetcher, source_id, ALL_QUALITY_SOURCES[source_id], 50, True)
+                  for source_id in sources),
+                return_exceptions=True
+            )
 
-            for future in futures:
-                source_id = futures[future]
-                try:
-                    articles = future.result()
-                    if articles:
-                        self.save_articles(source_id, articles)
-                        results[source_id] = len(articles)
-                    else:
-                        results[source_id] = 0
-                except Exception as e:
-                    print(f"❌ Error with {source_id}: {e}")
+        scraped = run_with_fetcher(
+            _scrape_all,
+            fetcher_kwargs={**self.fetcher_kwargs, 'max_connections': max_workers * 8}
+        )
+
+        for source_id, articles in zip(sources, scraped):
+            try:
+                if isinstance(articles, Exception):
+                    raise articles
+                if articles:
+                    self.save_articles(source_id, articles)
+                    results[source_id] = len(articles)
+                else:
                     results[source_id] = 0
+            except Exception as e:
+                print(f"❌ Error with {source_id}: {e}")
+                results[source_id] = 0
 
         # Summary
         elapsed = (datetime.now() - start_time).total_seconds()
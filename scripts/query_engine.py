@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Query Engine - Indexed in-memory collections for the JSON-snapshot MCP servers
+
+The MCP servers load their JSON snapshots once and then answer every tool call
+by serializing each item with json.dumps(item).lower() and substring-matching
+the query. This module builds the indexes once at load time instead:
+- Token inverted index over the lowered JSON text of each item (the same text
+  the linear scan used, so results are identical - candidates from the index
+  are verified with a substring check on the precomputed text)
+- Typed field indexes: hash buckets for equality filters, sorted numeric
+  arrays for threshold filters
+- Precomputed sort keys with stable top-k ordering (heapq.nlargest)
+- Composable predicates (Text, Match, Equals, AtLeast) combined per query
+
+Usage:
+    from query_engine import Collection, Text, Match, AtLeast
+
+    bikes = Collection(items, fields=['category', 'sentiment'])
+    bikes.find(Text('enduro'), Match({'sentiment': 'positive'}), limit=20)
+    comments.find(AtLeast('likes', 10000), order_by='likes', limit=20)
+"""
+
+import re
+import json
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+WORD_RE = re.compile(r'\w+')
+
+# Separator between vocabulary tokens in the joined vocabulary string; never
+# part of a \w+ token, so substring hits cannot straddle two tokens
+VOCAB_SEP = '\x00'
+
+_MISSING = object()
+
+Key = Union[str, Tuple[str, ...]]
+
+
+def search_text(item: Any) -> str:
+    """Lowered JSON text of an item - what the servers substring-match against"""
+    return json.dumps(item).lower()
+
+
+def resolve(item: Any, key: Key, default: Any = None) -> Any:
+    """
+    Read a field or nested path from an item
+
+    Args:
+        item: Item dict
+        key: Field name, or tuple of field names for nested dicts
+        default: Value when the field (or any parent) is missing
+
+    Returns:
+        Field value or default
+    """
+    if isinstance(key, str):
+        return item.get(key, default) if isinstance(item, dict) else default
+    value = item
+    for part in key:
+        if not isinstance(value, dict):
+            return default
+        value = value.get(part, _MISSING)
+        if value is _MISSING:
+            return default
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and value == value
+
+
+class TokenIndex:
+    """Inverted index from \\w+ tokens of each item's search text to positions"""
+
+    def __init__(self, texts: Sequence[str]):
+        postings: Dict[str, List[int]] = {}
+        for pos, text in enumerate(texts):
+            for token in set(WORD_RE.findall(text)):
+                postings.setdefault(token, []).append(pos)
+
+        self.postings = postings
+        self.vocab = list(postings)
+        self._blob = VOCAB_SEP.join(self.vocab)
+        self._starts = []
+        offset = 0
+        for token in self.vocab:
+            self._starts.append(offset)
+            offset += len(token) + 1
+
+    def tokens_containing(self, word: str) -> List[str]:
+        """All vocabulary tokens that contain word as a substring"""
+        found = []
+        blob, starts = self._blob, self._starts
+        i = blob.find(word)
+        while i != -1:
+            idx = bisect_right(starts, i) - 1
+            found.append(self.vocab[idx])
+            # Skip to the next token so each token is reported once
+            next_start = starts[idx + 1] if idx + 1 < len(starts) else len(blob)
+            i = blob.find(word, next_start)
+        return found
+
+    def candidates(self, word: str) -> Set[int]:
+        """Positions whose text has a token containing word"""
+        exact = self.postings.get(word)
+        tokens = self.tokens_containing(word)
+        if len(tokens) == 1 and exact is not None:
+            return set(exact)
+        result: Set[int] = set()
+        for token in tokens:
+            result.update(self.postings[token])
+        return result
+
+
+class FieldIndex:
+    """Equality index for one field: value -> positions, plus missing/unhashable"""
+
+    def __init__(self, items: Sequence[Any], key: Key, default: Any = _MISSING):
+        self.buckets: Dict[Any, List[int]] = {}
+        self.missing: List[int] = []
+        self.unhashable: List[Tuple[int, Any]] = []
+
+        for pos, item in enumerate(items):
+            value = resolve(item, key, default)
+            if value is _MISSING:
+                self.missing.append(pos)
+                continue
+            try:
+                self.buckets.setdefault(value, []).append(pos)
+            except TypeError:
+                self.unhashable.append((pos, value))
+
+    def equal(self, value: Any) -> Set[int]:
+        """Positions whose value equals the given value"""
+        try:
+            result = set(self.buckets.get(value, ()))
+        except TypeError:
+            # Unhashable filter value - only compare against stored values
+            result = {pos for bucket_value, positions in self.buckets.items()
+                      if bucket_value == value for pos in positions}
+        result.update(pos for pos, stored in self.unhashable if stored == value)
+        return result
+
+
+class RangeIndex:
+    """Sorted numeric values for one key, for >= threshold lookups"""
+
+    def __init__(self, values: Sequence[Any]):
+        numeric = sorted((v, pos) for pos, v in enumerate(values) if _is_number(v))
+        self.values = [v for v, _ in numeric]
+        self.positions = [pos for _, pos in numeric]
+        self.other = [(pos, v) for pos, v in enumerate(values) if not _is_number(v)]
+
+    def at_least(self, threshold: Any) -> Set[int]:
+        """Positions whose value is >= threshold"""
+        if _is_number(threshold):
+            result = set(self.positions[bisect_left(self.values, threshold):])
+        else:
+            result = set()
+            for v, pos in zip(self.values, self.positions):
+                try:
+                    if v >= threshold:
+                        result.add(pos)
+                except TypeError:
+                    pass
+        for pos, v in self.other:
+            try:
+                if v >= threshold:
+                    result.add(pos)
+            except TypeError:
+                pass
+        return result
+
+
+class Predicate:
+    """
+    One query condition
+
+    candidates() returns a superset of matching positions (None = no narrowing);
+    accepts() is the exact check, only called when exact is False.
+    """
+
+    exact = True
+
+    def candidates(self, coll: 'Collection') -> Optional[Set[int]]:
+        raise NotImplementedError
+
+    def accepts(self, coll: 'Collection', pos: int) -> bool:
+        return True
+
+
+class Text(Predicate):
+    """Case-insensitive substring match against the item's JSON text"""
+
+    exact = False
+
+    def __init__(self, query: Optional[str]):
+        self.query = query.lower() if query else ""
+
+    def candidates(self, coll: 'Collection') -> Optional[Set[int]]:
+        if not self.query:
+            return None
+        words = WORD_RE.findall(self.query)
+        if not words:
+            return None
+        result = None
+        # Longest words first - they are the most selective
+        for word in sorted(set(words), key=len, reverse=True):
+            positions = coll.tokens.candidates(word)
+            result = positions if result is None else result & positions
+            if not result:
+                break
+        return result
+
+    def accepts(self, coll: 'Collection', pos: int) -> bool:
+        return not self.query or self.query in coll.texts[pos]
+
+
+class Match(Predicate):
+    """
+    Server filter semantics: for each key, the item either lacks the key or
+    has exactly that value
+    """
+
+    def __init__(self, filters: Optional[Dict[str, Any]]):
+        self.filters = filters or {}
+
+    def candidates(self, coll: 'Collection') -> Optional[Set[int]]:
+        result = None
+        for key, value in self.filters.items():
+            index = coll.field_index(key)
+            positions = index.equal(value)
+            positions.update(index.missing)
+            result = positions if result is None else result & positions
+        return result
+
+
+class Equals(Predicate):
+    """Strict equality on a field or nested path (missing reads as None)"""
+
+    def __init__(self, key: Key, value: Any):
+        self.key = key
+        self.value = value
+
+    def candidates(self, coll: 'Collection') -> Optional[Set[int]]:
+        index = coll.field_index(self.key, default=None)
+        return index.equal(self.value)
+
+
+class AtLeast(Predicate):
+    """Numeric threshold on a field, nested path or registered key"""
+
+    def __init__(self, key: Key, threshold: Any, default: Any = 0):
+        self.key = key
+        self.threshold = threshold
+        self.default = default
+
+    def candidates(self, coll: 'Collection') -> Optional[Set[int]]:
+        return coll.range_index(self.key, self.default).at_least(self.threshold)
+
+
+class Collection:
+    """Indexed, read-only view over a list of JSON items"""
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        fields: Iterable[Key] = (),
+        ranges: Iterable[Key] = (),
+        keys: Optional[Dict[str, Callable[[Any], Any]]] = None,
+        text: bool = True,
+    ):
+        """
+        Build the text index plus any field indexes known up front
+
+        Args:
+            items: Items to index (the list is copied; items are not)
+            fields: Filter fields to index for equality
+            ranges: Numeric fields to index for thresholds and ordering
+            keys: Derived keys (name -> function of item), usable anywhere a
+                  field name is accepted
+            text: Build the text index now (otherwise on the first Text query)
+        """
+        self.items = list(items)
+        self.derived = dict(keys or {})
+        self._texts: Optional[List[str]] = None
+        self._tokens: Optional[TokenIndex] = None
+
+        self._field_indexes: Dict[Tuple[Key, Any], FieldIndex] = {}
+        self._range_indexes: Dict[Tuple[Key, Any], RangeIndex] = {}
+        self._sort_keys: Dict[Tuple[Key, Any], List[Any]] = {}
+
+        for key in fields:
+            self.field_index(key)
+        for key in ranges:
+            self.range_index(key)
+        if text:
+            self._tokens = TokenIndex(self.texts)
+
+    @property
+    def texts(self) -> List[str]:
+        """Lowered JSON text per item (built on first use)"""
+        if self._texts is None:
+            self._texts = [search_text(item) for item in self.items]
+        return self._texts
+
+    @property
+    def tokens(self) -> TokenIndex:
+        """Token inverted index over texts (built on first use)"""
+        if self._tokens is None:
+            self._tokens = TokenIndex(self.texts)
+        return self._tokens
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def values(self, key: Key, default: Any = 0) -> List[Any]:
+        """Precomputed per-item values of a key (cached)"""
+        cache_key = (key, default)
+        values = self._sort_keys.get(cache_key)
+        if values is None:
+            func = self.derived.get(key) if isinstance(key, str) else None
+            if func is not None:
+                values = [func(item) for item in self.items]
+            else:
+                values = [resolve(item, key, default) for item in self.items]
+            self._sort_keys[cache_key] = values
+        return values
+
+    def field_index(self, key: Key, default: Any = _MISSING) -> FieldIndex:
+        """Equality index for a field (built on first use)"""
+        cache_key = (key, default)
+        index = self._field_indexes.get(cache_key)
+        if index is None:
+            index = FieldIndex(self.items, key, default)
+            self._field_indexes[cache_key] = index
+        return index
+
+    def range_index(self, key: Key, default: Any = 0) -> RangeIndex:
+        """Threshold index for a numeric key (built on first use)"""
+        cache_key = (key, default)
+        index = self._range_indexes.get(cache_key)
+        if index is None:
+            index = RangeIndex(self.values(key, default))
+            self._range_indexes[cache_key] = index
+        return index
+
+    def positions(self, *predicates: Predicate, limit: Optional[int] = None) -> List[int]:
+        """Sorted positions of items matching every predicate (first limit only)"""
+        if limit == 0:
+            return []
+        candidates = None
+        for predicate in predicates:
+            found = predicate.candidates(self)
+            if found is None:
+                continue
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return []
+
+        ordered = range(len(self.items)) if candidates is None else sorted(candidates)
+        checks = [p for p in predicates if not p.exact]
+        if not checks:
+            return list(ordered)
+
+        found = []
+        for pos in ordered:
+            if all(p.accepts(self, pos) for p in checks):
+                found.append(pos)
+                if limit is not None and len(found) == limit:
+                    break
+        return found
+
+    def find(
+        self,
+        *predicates: Predicate,
+        order_by: Optional[Key] = None,
+        default: Any = 0,
+        reverse: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Items matching every predicate, in load order or by a sort key
+
+        Ordering matches sorted(items, key=..., reverse=reverse)[:limit], so
+        ties keep their load order.
+
+        Args:
+            predicates: Conditions to combine (all must hold)
+            order_by: Field, nested path or derived key to sort by
+            default: Sort value for items missing the key
+            reverse: Descending order (default)
+            limit: Maximum items to return
+
+        Returns:
+            Matching items
+        """
+        early = limit if order_by is None and limit is not None and limit >= 0 else None
+        positions = self.positions(*predicates, limit=early)
+
+        if order_by is not None:
+            values = self.values(order_by, default)
+            if limit is not None and limit >= 0:
+                top = heapq.nlargest if reverse else heapq.nsmallest
+                positions = top(limit, positions, key=values.__getitem__)
+            else:
+                positions = sorted(positions, key=values.__getitem__, reverse=reverse)
+
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.items[pos] for pos in positions]
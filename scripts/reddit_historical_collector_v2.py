@@ -3,19 +3,30 @@
 Reddit Historical Sentiment Analyzer v2
 Uses Reddit JSON API (no authentication required for public data)
 Collects weekly snapshots for past 52 weeks with 10 core qualifiers
+
+By default the subreddit listing is paged through once and posts are bucketed
+into weeks in memory (instead of re-downloading /top?t=year for every week).
+Comments are fetched concurrently under a per-host rate budget, and raw
+listing/comment responses are cached on disk so re-analysis can run offline.
 """
 
 import os
 import sys
 import json
+import math
+import asyncio
 import requests
 from datetime import datetime, timedelta
-from collections import Counter, defaultdict
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import re
-from typing import Dict, List, Any
+from collections import defaultdict
+from urllib.parse import urlencode
+from typing import Dict, List, Any, Optional
 import time
 
+sys.path.append('/Users/yourox/AI-Workspace')
+from scripts.polite_fetcher import run_with_fetcher
+from scripts.artifact_store import write_json_atomic
+from scripts import text_analytics
+
 # Tier 1 Subreddits (52 weeks history)
 TIER_1_SUBREDDITS = {
     "Entrepreneur": {
@@ -74,12 +85,26 @@ TIER_1_SUBREDDITS = {
 class RedditHistoricalAnalyzer:
     """Collect and analyze Reddit data for sentiment and trends"""
 
-    def __init__(self):
-        """Initialize analyzer"""
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+    def __init__(self, cache_ttl_hours: float = 24, offline: bool = False,
+                 analysis_workers: Optional[int] = None):
+        """
+        Initialize analyzer
+
+        Args:
+            cache_ttl_hours: Reuse cached raw listing/comment pages younger than this
+            offline: Only read the on-disk cache, never hit Reddit
+            analysis_workers: Processes for text analytics on large backfills (None = CPU count)
+        """
+        self.sentiment_analyzer = text_analytics.get_sentiment_analyzer()
+        self.analysis_workers = analysis_workers
         self.data_dir = "/Users/yourox/AI-Workspace/data/reddit_snapshots"
         os.makedirs(self.data_dir, exist_ok=True)
 
+        # Raw API responses (listing pages + comment threads)
+        self.cache_dir = os.path.join(self.data_dir, "_raw_cache")
+        self.cache_ttl_hours = cache_ttl_hours
+        self.offline = offline
+
         # Reddit JSON API doesn't need authentication for public data
         self.headers = {
             'User-Agent': 'python:reddit-sentiment-analyzer:v2.0'
@@ -87,6 +112,18 @@ class RedditHistoricalAnalyzer:
         self.session = requests.Session()
         self.session.headers.update(self.headers)
 
+        # Single-fetch mode: ~1 req/s sustained, a few comment threads in flight.
+        # robots.txt is not consulted, matching the per-week path's use of the JSON API.
+        self.fetcher_kwargs = {
+            'user_agent': self.headers['User-Agent'],
+            'per_host_concurrency': 4,
+            'per_host_rate': 1.0,
+            'per_host_burst': 4.0,
+            'timeout': 20,
+            'respect_robots': False,
+        }
+        self.cache_hits = 0
+
     def get_week_date_range(self, weeks_ago: int = 0) -> tuple:
         """Get start and end dates for a week"""
         today = datetime.now()
@@ -98,12 +135,235 @@ class RedditHistoricalAnalyzer:
         """Get ISO week identifier (e.g., '2024-W42')"""
         return date.strftime("%Y-W%U")
 
+    def get_week_windows(self, weeks: int) -> List[tuple]:
+        """
+        Contiguous Monday-00:00 week windows, newest first
+
+        Window i covers [start, start + 7 days); the returned end date is
+        start + 6 days for display, matching get_week_date_range.
+        """
+        today = datetime.now()
+        current_start = (today - timedelta(days=today.weekday())).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return [
+            (current_start - timedelta(weeks=n), current_start - timedelta(weeks=n) + timedelta(days=6))
+            for n in range(weeks)
+        ]
+
+    def _build_post(self, post_data: Dict, comments: List[Dict]) -> Dict:
+        """Normalize a listing child into the post dict used by the analyzers"""
+        return {
+            'id': post_data['id'],
+            'title': post_data['title'],
+            'selftext': post_data.get('selftext', ''),
+            'score': post_data['score'],
+            'upvote_ratio': post_data['upvote_ratio'],
+            'num_comments': post_data['num_comments'],
+            'created_utc': post_data['created_utc'],
+            'author': post_data['author'],
+            'url': post_data['url'],
+            'permalink': f"https://reddit.com{post_data['permalink']}",
+            'link_flair_text': post_data.get('link_flair_text', ''),
+            'is_self': post_data['is_self'],
+            'gilded': post_data['gilded'],
+            'comments': comments
+        }
+
+    def _parse_comments(self, data: Any, limit: int) -> List[Dict]:
+        """Extract top-level comments from a /comments/<id>/.json response"""
+        if not data or len(data) < 2:
+            return []
+
+        comments = []
+        for item in data[1]['data']['children'][:limit]:
+            if item['kind'] == 't1':  # Comment
+                comment_data = item['data']
+                comments.append({
+                    'body': comment_data.get('body', ''),
+                    'score': comment_data.get('score', 0),
+                    'author': comment_data.get('author', '[deleted]')
+                })
+        return comments
+
+    # ------------------------------------------------------------------
+    # Raw response cache
+    # ------------------------------------------------------------------
+
+    def _cache_path(self, subreddit_name: str, key: str) -> str:
+        return os.path.join(self.cache_dir, subreddit_name.lower(), f"{key}.json")
+
+    def _cache_get(self, subreddit_name: str, key: str) -> Optional[Any]:
+        """Cached raw response, or None if missing/stale (stale is fine offline)"""
+        path = self._cache_path(subreddit_name, key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+        except Exception:
+            return None
+
+        age_hours = (time.time() - cached.get('fetched_at', 0)) / 3600
+        if not self.offline and age_hours > self.cache_ttl_hours:
+            return None
+
+        self.cache_hits += 1
+        return cached.get('data')
+
+    def _cache_put(self, subreddit_name: str, key: str, data: Any):
+        path = self._cache_path(subreddit_name, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_json_atomic(path, {'fetched_at': time.time(), 'data': data}, indent=None)
+
+    async def _fetch_json(self, fetcher, url: str, params: Dict, subreddit_name: str, cache_key: str) -> Optional[Any]:
+        """GET a Reddit JSON endpoint through the cache"""
+        cached = self._cache_get(subreddit_name, cache_key)
+        if cached is not None or self.offline:
+            return cached
+
+        result = await fetcher.fetch(f"{url}?{urlencode(params)}")
+        if not result.ok:
+            print(f"   ⚠️  {url}: {result.error}")
+            return None
+
+        try:
+            data = json.loads(result.content)
+        except ValueError:
+            return None
+
+        self._cache_put(subreddit_name, cache_key, data)
+        return data
+
+    # ------------------------------------------------------------------
+    # Single-fetch mode
+    # ------------------------------------------------------------------
+
+    async def fetch_listing_async(self, fetcher, subreddit_name: str, listing: str = 'top',
+                                  t: Optional[str] = 'year', max_pages: int = 10) -> List[Dict]:
+        """
+        Page through a subreddit listing once (Reddit caps listings at ~1000 items)
+
+        Returns:
+            Raw post data dicts in listing order
+        """
+        url = f"https://www.reddit.com/r/{subreddit_name}/{listing}/.json"
+        posts = []
+        after = None
+
+        for page in range(max_pages):
+            params = {'limit': 100}
+            if t:
+                params['t'] = t
+            if after:
+                params['after'] = after
+
+            data = await self._fetch_json(fetcher, url, params, subreddit_name,
+                                          f"listing_{listing}_{t or 'all'}_p{page}")
+            if not data or 'data' not in data or 'children' not in data['data']:
+                break
+
+            posts.extend(child['data'] for child in data['data']['children'] if child.get('kind') == 't3')
+
+            after = data['data'].get('after')
+            if not after:
+                break
+
+        return posts
+
+    async def fetch_post_comments_async(self, fetcher, subreddit_name: str, post_id: str, limit: int = 3) -> List[Dict]:
+        """Fetch top comments for a post (cached, rate-limited by the fetcher)"""
+        url = f"https://www.reddit.com/r/{subreddit_name}/comments/{post_id}/.json"
+        data = await self._fetch_json(fetcher, url, {'limit': limit, 'sort': 'top'},
+                                      subreddit_name, f"comments_{post_id}")
+        try:
+            return self._parse_comments(data, limit)
+        except (KeyError, TypeError, IndexError):
+            return []
+
+    async def collect_posts_by_week_async(self, fetcher, subreddit_name: str, weeks: int,
+                                          limit_per_week: int = 100,
+                                          week_indexes: Optional[List[int]] = None) -> Dict[int, List[Dict]]:
+        """
+        Fetch the listings once and bucket posts into week windows
+
+        Candidates per week keep the old priority: "top" (year) order first,
+        then "hot", deduplicated by post id and capped at limit_per_week.
+
+        Args:
+            week_indexes: Only build these weeks (0 = current week); default all
+
+        Returns:
+            {weeks_ago: [post, ...]} with comments attached
+        """
+        windows = self.get_week_windows(weeks)
+        wanted = set(range(weeks) if week_indexes is None else week_indexes)
+        current_start = windows[0][0]
+
+        top_posts = await self.fetch_listing_async(fetcher, subreddit_name, 'top', 'year')
+        hot_posts = await self.fetch_listing_async(fetcher, subreddit_name, 'hot', None, max_pages=1)
+
+        def week_of(post_data):
+            delta = (current_start - datetime.fromtimestamp(int(post_data['created_utc']))).total_seconds()
+            return 0 if delta <= 0 else math.ceil(delta / (7 * 24 * 3600))
+
+        buckets = defaultdict(list)
+        seen_ids = set()
+        for post_data in top_posts:
+            week_index = week_of(post_data)
+            if post_data['id'] in seen_ids or week_index not in wanted:
+                continue
+            if len(buckets[week_index]) < limit_per_week:
+                buckets[week_index].append(post_data)
+                seen_ids.add(post_data['id'])
+
+        # As in fetch_week_posts, "hot" only tops up weeks where "top" came up short
+        short_weeks = {w for w in wanted if len(buckets[w]) < limit_per_week // 2}
+        for post_data in hot_posts:
+            week_index = week_of(post_data)
+            if post_data['id'] in seen_ids or week_index not in short_weeks:
+                continue
+            if len(buckets[week_index]) < limit_per_week:
+                buckets[week_index].append(post_data)
+                seen_ids.add(post_data['id'])
+
+        buckets = {w: posts for w, posts in buckets.items() if posts}
+
+        selected = [post_data for week_index in sorted(buckets) for post_data in buckets[week_index]]
+        print(f"   📥 {len(top_posts) + len(hot_posts)} listing posts → {len(selected)} in {len(buckets)} weeks")
+        print(f"   💬 Fetching comments for {len(selected)} posts")
+
+        comments = await asyncio.gather(*(
+            self.fetch_post_comments_async(fetcher, subreddit_name, post_data['id'], limit=3)
+            for post_data in selected
+        ))
+        comments_by_id = {post_data['id']: c for post_data, c in zip(selected, comments)}
+
+        return {
+            week_index: [self._build_post(p, comments_by_id[p['id']]) for p in posts]
+            for week_index, posts in buckets.items()
+        }
+
+    def collect_posts_by_week(self, subreddit_name: str, weeks: int, limit_per_week: int = 100,
+                              week_indexes: Optional[List[int]] = None) -> Dict[int, List[Dict]]:
+        """Synchronous wrapper for collect_posts_by_week_async"""
+        async def _collect(fetcher):
+            buckets = await self.collect_posts_by_week_async(
+                fetcher, subreddit_name, weeks, limit_per_week, week_indexes
+            )
+            print(f"   🌐 Requests: {fetcher.stats['requests']} | 💾 Cache hits: {self.cache_hits}")
+            return buckets
+
+        return run_with_fetcher(_collect, fetcher_kwargs=self.fetcher_kwargs)
+
     def fetch_week_posts(self, subreddit_name: str, week_start: datetime, week_end: datetime, limit: int = 100) -> List[Dict]:
         """Fetch top posts from a specific week using Reddit JSON API"""
         print(f"   📅 Week: {week_start.strftime('%Y-%m-%d')} to {week_end.strftime('%Y-%m-%d')}")
 
         try:
             posts = []
+            seen_ids = set()
 
             # Convert to timestamps
             start_timestamp = int(week_start.timestamp())
@@ -134,23 +394,9 @@ class RedditHistoricalAnalyzer:
                     # Fetch top comments
                     comments = self.fetch_post_comments(subreddit_name, post_data['id'], limit=3)
 
-                    post = {
-                        'id': post_data['id'],
-                        'title': post_data['title'],
-                        'selftext': post_data.get('selftext', ''),
-                        'score': post_data['score'],
-                        'upvote_ratio': post_data['upvote_ratio'],
-                        'num_comments': post_data['num_comments'],
-                        'created_utc': post_data['created_utc'],
-                        'author': post_data['author'],
-                        'url': post_data['url'],
-                        'permalink': f"https://reddit.com{post_data['permalink']}",
-                        'link_flair_text': post_data.get('link_flair_text', ''),
-                        'is_self': post_data['is_self'],
-                        'gilded': post_data['gilded'],
-                        'comments': comments
-                    }
+                    post = self._build_post(post_data, comments)
                     posts.append(post)
+                    seen_ids.add(post['id'])
 
                     if len(posts) >= limit:
                         break
@@ -168,25 +414,10 @@ class RedditHistoricalAnalyzer:
                     post_time = int(post_data['created_utc'])
 
                     if start_timestamp <= post_time <= end_timestamp:
-                        if post_data['id'] not in [p['id'] for p in posts]:  # Avoid duplicates
+                        if post_data['id'] not in seen_ids:  # Avoid duplicates
                             comments = self.fetch_post_comments(subreddit_name, post_data['id'], limit=3)
 
-                            post = {
-                                'id': post_data['id'],
-                                'title': post_data['title'],
-                                'selftext': post_data.get('selftext', ''),
-                                'score': post_data['score'],
-                                'upvote_ratio': post_data['upvote_ratio'],
-                                'num_comments': post_data['num_comments'],
-                                'created_utc': post_data['created_utc'],
-                                'author': post_data['author'],
-                                'url': post_data['url'],
-                                'permalink': f"https://reddit.com{post_data['permalink']}",
-                                'link_flair_text': post_data.get('link_flair_text', ''),
-                                'is_self': post_data['is_self'],
-                                'gilded': post_data['gilded'],
-                                'comments': comments
-                            }
+                            post = self._build_post(post_data, comments)
                             posts.append(post)
 
                             if len(posts) >= limit:
@@ -209,20 +440,7 @@ class RedditHistoricalAnalyzer:
             response.raise_for_status()
             data = response.json()
 
-            if len(data) < 2:
-                return []
-
-            comments = []
-            comment_listing = data[1]['data']['children']
-
-            for item in comment_listing[:limit]:
-                if item['kind'] == 't1':  # Comment
-                    comment_data = item['data']
-                    comments.append({
-                        'body': comment_data.get('body', ''),
-                        'score': comment_data.get('score', 0),
-                        'author': comment_data.get('author', '[deleted]')
-                    })
+            comments = self._parse_comments(data, limit)
 
             time.sleep(0.5)  # Rate limiting
             return comments
@@ -232,119 +450,49 @@ class RedditHistoricalAnalyzer:
 
     def analyze_sentiment(self, text: str) -> Dict:
         """Analyze sentiment of text"""
-        if not text or len(text.strip()) == 0:
-            return {'score': 0, 'label': 'neutral', 'confidence': 0}
-
-        scores = self.sentiment_analyzer.polarity_scores(text)
-        compound = scores['compound']
-
-        if compound >= 0.05:
-            label = 'positive'
-        elif compound <= -0.05:
-            label = 'negative'
-        else:
-            label = 'neutral'
-
+        sentiment = text_analytics.score_sentiment(text)
         return {
-            'score': compound,
-            'label': label,
-            'confidence': max(scores['pos'], scores['neg'], scores['neu'])
+            'score': sentiment['compound'],
+            'label': sentiment['label'],
+            'confidence': sentiment['confidence']
         }
 
-    def extract_topics(self, posts: List[Dict]) -> Dict:
+    def analyze_posts(self, posts: List[Dict]) -> List[Dict]:
+        """Single-pass text signals for each post (see scripts/text_analytics.py)"""
+        return text_analytics.analyze_posts(posts, workers=self.analysis_workers)
+
+    def extract_topics(self, posts: List[Dict], signals: Optional[List[Dict]] = None) -> Dict:
         """Extract trending topics from posts"""
-        word_freq = Counter()
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                     'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been',
-                     'i', 'you', 'we', 'they', 'my', 'your', 'our', 'their', 'this', 'that',
-                     'how', 'what', 'when', 'where', 'why', 'do', 'does', 'did', 'can', 'should'}
-
-        for post in posts:
-            title = post.get('title', '')
-            words = re.findall(r'\b[a-z]{3,}\b', title.lower())
-            word_freq.update([w for w in words if w not in stop_words])
-
-        top_words = word_freq.most_common(20)
-
-        topics = []
-        for word, count in top_words[:10]:
-            topics.append({
-                'topic': word,
-                'mentions': count,
-                'growth': None
-            })
-
-        return {'top_topics': topics}
-
-    def extract_pain_points(self, posts: List[Dict]) -> List[Dict]:
-        """Extract pain points and challenges from posts"""
-        pain_keywords = ['problem', 'issue', 'struggle', 'difficult', 'challenge', 'frustrat',
-                        'stuck', 'fail', 'help', 'advice', 'how to', 'can\'t', 'unable']
-
-        pain_points = []
-        for post in posts:
-            title = post.get('title', '').lower()
-            text = post.get('selftext', '').lower()
-            combined = title + ' ' + text
-
-            if any(keyword in combined for keyword in pain_keywords):
-                sentiment = self.analyze_sentiment(combined)
-
-                pain_points.append({
-                    'text': post.get('title', ''),
-                    'score': post.get('score', 0),
-                    'severity': abs(sentiment['score']) if sentiment['label'] == 'negative' else 0.5,
-                    'url': post.get('permalink', '')
-                })
+        return text_analytics.top_topics(signals or self.analyze_posts(posts))
 
-        pain_points.sort(key=lambda x: x['score'] * x['severity'], reverse=True)
-        return pain_points[:10]
+    def extract_pain_points(self, posts: List[Dict], signals: Optional[List[Dict]] = None) -> List[Dict]:
+        """Extract pain points and challenges from posts"""
+        return text_analytics.top_pain_points(posts, signals or self.analyze_posts(posts))
 
-    def extract_solutions(self, posts: List[Dict]) -> Dict:
+    def extract_solutions(self, posts: List[Dict], signals: Optional[List[Dict]] = None) -> Dict:
         """Extract tools, solutions, and recommendations"""
-        tool_pattern = r'\b(?:using|use|used|try|recommend|love|hate|prefer|switch|migrate)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b'
-
-        tools_mentioned = Counter()
-        for post in posts:
-            text = post.get('title', '') + ' ' + post.get('selftext', '')
-            for comment in post.get('comments', []):
-                text += ' ' + comment.get('body', '')
-
-            matches = re.findall(tool_pattern, text)
-            tools_mentioned.update(matches)
+        return text_analytics.top_tools(signals or self.analyze_posts(posts))
 
-        return {
-            'top_tools_mentioned': [
-                {'tool': tool, 'mentions': count}
-                for tool, count in tools_mentioned.most_common(10)
-            ]
-        }
-
-    def extract_questions(self, posts: List[Dict]) -> List[Dict]:
+    def extract_questions(self, posts: List[Dict], signals: Optional[List[Dict]] = None) -> List[Dict]:
         """Extract top questions from posts"""
-        questions = []
-
-        for post in posts:
-            title = post.get('title', '')
-            if '?' in title:
-                questions.append({
-                    'question': title,
-                    'upvotes': post.get('score', 0),
-                    'answers': post.get('num_comments', 0),
-                    'url': post.get('permalink', '')
-                })
+        return text_analytics.top_questions(posts, signals or self.analyze_posts(posts))
 
-        questions.sort(key=lambda x: x['upvotes'], reverse=True)
-        return questions[:10]
+    def analyze_week(self, subreddit_name: str, week_start: datetime, week_end: datetime,
+                     posts: Optional[List[Dict]] = None, signals: Optional[List[Dict]] = None) -> Dict:
+        """
+        Analyze a single week of data
 
-    def analyze_week(self, subreddit_name: str, week_start: datetime, week_end: datetime) -> Dict:
-        """Analyze a single week of data"""
+        Args:
+            posts: Pre-fetched posts (fetched for the week if None)
+            signals: Pre-computed text_analytics signals for posts (computed if None)
+        """
         week_id = self.get_week_identifier(week_start)
 
         print(f"\n📊 Analyzing {subreddit_name} - {week_id}")
 
         # Fetch posts
-        posts = self.fetch_week_posts(subreddit_name, week_start, week_end)
+        if posts is None:
+            posts = self.fetch_week_posts(subreddit_name, week_start, week_end)
 
         if len(posts) == 0:
             print(f"   ⚠️  No posts found for this week")
@@ -357,12 +505,16 @@ class RedditHistoricalAnalyzer:
         avg_comments = total_comments / len(posts) if posts else 0
         gilded_posts = sum(1 for p in posts if p.get('gilded', 0) > 0)
 
+        # One text pass per post feeds every qualifier below
+        if signals is None:
+            signals = self.analyze_posts(posts)
+
         # Sentiment analysis
-        sentiments = []
-        for post in posts:
-            text = post.get('title', '') + ' ' + post.get('selftext', '')
-            sentiment = self.analyze_sentiment(text)
-            sentiments.append(sentiment)
+        sentiments = [
+            {'score': s['sentiment']['compound'], 'label': s['sentiment']['label'],
+             'confidence': s['sentiment']['confidence']}
+            for s in signals
+        ]
 
         positive = sum(1 for s in sentiments if s['label'] == 'positive')
         negative = sum(1 for s in sentiments if s['label'] == 'negative')
@@ -371,10 +523,10 @@ class RedditHistoricalAnalyzer:
         avg_sentiment = sum(s['score'] for s in sentiments) / len(sentiments) if sentiments else 0
 
         # Extract insights
-        topics = self.extract_topics(posts)
-        pain_points = self.extract_pain_points(posts)
-        solutions = self.extract_solutions(posts)
-        questions = self.extract_questions(posts)
+        topics = self.extract_topics(posts, signals)
+        pain_points = self.extract_pain_points(posts, signals)
+        solutions = self.extract_solutions(posts, signals)
+        questions = self.extract_questions(posts, signals)
 
         # Most engaged posts
         top_posts = sorted(posts, key=lambda x: x.get('score', 0), reverse=True)[:5]
@@ -466,13 +618,32 @@ class RedditHistoricalAnalyzer:
 
         print(f"   💾 Saved: {filepath}")
 
-    def collect_historical_data(self, subreddit_name: str, weeks: int = 52, limit_per_week: int = 100):
-        """Collect historical data for a subreddit"""
+    def get_snapshot_path(self, subreddit_name: str, week_start: datetime) -> str:
+        """Path of the snapshot file for a subreddit week"""
+        week_id = self.get_week_identifier(week_start)
+        snapshot_id = f"{subreddit_name.lower()}_{week_id.replace('-', '_')}".replace(' ', '_')
+        return os.path.join(self.data_dir, subreddit_name.lower(), f"{snapshot_id}.json")
+
+    def collect_historical_data(self, subreddit_name: str, weeks: int = 52, limit_per_week: int = 100,
+                                single_fetch: bool = True):
+        """
+        Collect historical data for a subreddit
+
+        Args:
+            subreddit_name: Subreddit without the r/ prefix
+            weeks: Number of weeks back to cover
+            limit_per_week: Max posts per weekly snapshot
+            single_fetch: Fetch the listing once and bucket by week (False = legacy per-week fetch)
+        """
         print("\n" + "=" * 70)
         print(f"📡 COLLECTING: r/{subreddit_name}")
         print("=" * 70)
         print(f"   Weeks: {weeks}")
         print(f"   Posts per week: {limit_per_week}")
+        print(f"   Mode: {'single-fetch' if single_fetch else 'per-week'}{' (offline)' if self.offline else ''}")
+
+        if single_fetch:
+            return self._collect_historical_single_fetch(subreddit_name, weeks, limit_per_week)
 
         snapshots_created = 0
 
@@ -481,9 +652,7 @@ class RedditHistoricalAnalyzer:
 
             # Check if snapshot already exists
             week_id = self.get_week_identifier(week_start)
-            snapshot_id = f"{subreddit_name.lower()}_{week_id.replace('-', '_')}".replace(' ', '_')
-            subreddit_dir = os.path.join(self.data_dir, subreddit_name.lower())
-            filepath = os.path.join(subreddit_dir, f"{snapshot_id}.json")
+            filepath = self.get_snapshot_path(subreddit_name, week_start)
 
             if os.path.exists(filepath):
                 print(f"\n⏭️  Week {week_num + 1}/{weeks}: {week_id} - Already exists, skipping")
@@ -504,6 +673,42 @@ class RedditHistoricalAnalyzer:
         print(f"\n✅ Completed: {snapshots_created} snapshots created for r/{subreddit_name}")
         return snapshots_created
 
+    def _collect_historical_single_fetch(self, subreddit_name: str, weeks: int, limit_per_week: int) -> int:
+        """Build every missing weekly snapshot from one pass over the listings"""
+        windows = self.get_week_windows(weeks)
+
+        pending = []
+        for week_num, (week_start, _) in enumerate(windows):
+            if os.path.exists(self.get_snapshot_path(subreddit_name, week_start)):
+                print(f"⏭️  Week {week_num + 1}/{weeks}: {self.get_week_identifier(week_start)} - Already exists, skipping")
+            else:
+                pending.append(week_num)
+
+        if not pending:
+            print(f"\n✅ Completed: 0 snapshots created for r/{subreddit_name}")
+            return 0
+
+        posts_by_week = self.collect_posts_by_week(subreddit_name, weeks, limit_per_week, pending)
+
+        # Text analytics for the whole backfill in one (parallel) batch
+        all_posts = [post for week_num in pending for post in posts_by_week.get(week_num, [])]
+        all_signals = iter(self.analyze_posts(all_posts))
+
+        snapshots_created = 0
+        for week_num in pending:
+            week_start, week_end = windows[week_num]
+            print(f"\n📅 Week {week_num + 1}/{weeks}: {self.get_week_identifier(week_start)}")
+
+            week_posts = posts_by_week.get(week_num, [])
+            snapshot = self.analyze_week(subreddit_name, week_start, week_end, posts=week_posts,
+                                         signals=[next(all_signals) for _ in week_posts])
+            if snapshot:
+                self.save_snapshot(snapshot, subreddit_name)
+                snapshots_created += 1
+
+        print(f"\n✅ Completed: {snapshots_created} snapshots created for r/{subreddit_name}")
+        return snapshots_created
+
 
 def main():
     """Main execution"""
@@ -514,6 +719,14 @@ def main():
     parser.add_argument('--weeks', type=int, default=52, help='Number of weeks to analyze (default: 52)')
     parser.add_argument('--limit', type=int, default=100, help='Posts per week (default: 100)')
     parser.add_argument('--tier1', action='store_true', help='Analyze all Tier 1 subreddits')
+    parser.add_argument('--per-week', action='store_true',
+                        help='Legacy mode: re-fetch the listing for every week')
+    parser.add_argument('--offline', action='store_true',
+                        help='Re-analyze from the raw response cache only (no network)')
+    parser.add_argument('--cache-ttl', type=float, default=24,
+                        help='Hours before cached raw responses are refetched (default: 24)')
+    parser.add_argument('--workers', type=int,
+                        help='Processes for text analytics on large backfills (default: CPU count)')
 
     args = parser.parse_args()
 
@@ -523,7 +736,9 @@ def main():
     print("Using Reddit JSON API (no authentication required)")
     print()
 
-    analyzer = RedditHistoricalAnalyzer()
+    analyzer = RedditHistoricalAnalyzer(cache_ttl_hours=args.cache_ttl, offline=args.offline,
+                                        analysis_workers=args.workers)
+    single_fetch = not args.per_week
 
     if args.tier1:
         # Analyze all Tier 1 subreddits
@@ -533,7 +748,7 @@ def main():
 
         total_snapshots = 0
         for subreddit_name in TIER_1_SUBREDDITS.keys():
-            snapshots = analyzer.collect_historical_data(subreddit_name, args.weeks, args.limit)
+            snapshots = analyzer.collect_historical_data(subreddit_name, args.weeks, args.limit, single_fetch)
             total_snapshots += snapshots
 
         print("\n" + "=" * 70)
@@ -545,7 +760,7 @@ def main():
 
     elif args.subreddit:
         # Analyze specific subreddit
-        analyzer.collect_historical_data(args.subreddit, args.weeks, args.limit)
+        analyzer.collect_historical_data(args.subreddit, args.weeks, args.limit, single_fetch)
 
     else:
         parser.print_help()
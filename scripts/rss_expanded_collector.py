@@ -9,13 +9,14 @@ Usage:
     python3 rss_expanded_collector.py --tier 2
     python3 rss_expanded_collector.py --tier all
     python3 rss_expanded_collector.py --historical
+    python3 rss_expanded_collector.py --full        # ignore feed state (no 304 / seen-entry skipping)
 """
 
 import sys
 sys.path.append('/Users/yourox/AI-Workspace')
 
 # Import existing collector
-from scripts.rss_news_collector import RSSNewsCollector, TIER1_SOURCES
+from scripts.rss_news_collector import RSSNewsCollector, TIER1_SOURCES, FEED_USER_AGENT
 import argparse
 
 # Tier 2: Additional high-priority sources
@@ -229,6 +230,8 @@ def main():
                         help='Test mode (3 articles each)')
     parser.add_argument('--quiet', action='store_true',
                         help='Quiet mode')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore feed state: re-download and re-process every entry')
 
     args = parser.parse_args()
 
@@ -251,7 +254,7 @@ def main():
         limit = 3
 
     # Create custom collector with selected sources
-    collector = ExpandedRSSCollector(sources, store_db=True)
+    collector = ExpandedRSSCollector(sources, store_db=True, incremental=not args.full)
 
     print(f"Max age: {max_age} days")
     print(f"Limit: {limit or 'default'} articles/source")
@@ -263,14 +266,19 @@ def main():
 class ExpandedRSSCollector(RSSNewsCollector):
     """Extended collector with configurable sources"""
 
-    def __init__(self, sources_config, output_dir="/Users/yourox/AI-Workspace/data/rss_news", store_db=True):
+    collection_title = "ALL SOURCES"
+
+    def __init__(self, sources_config, output_dir="/Users/yourox/AI-Workspace/data/rss_news", store_db=True,
+                 incremental=True):
         self.sources_config = sources_config
+        self.fetcher_kwargs = {'user_agent': FEED_USER_AGENT, 'timeout': 30}
 
         # Initialize parent WITHOUT overriding
         from pathlib import Path
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.store_db = store_db
+        self.init_feed_state(incremental)
 
         if self.store_db:
             import os
@@ -280,48 +288,6 @@ class ExpandedRSSCollector(RSSNewsCollector):
         for source_id in sources_config.keys():
             (self.output_dir / source_id).mkdir(exist_ok=True)
 
-    def collect_all_sources(self, limit_per_source=None, max_age_days=30, verbose=True):
-        """Collect from ALL configured sources"""
-        if verbose:
-            print(f"\n{'='*70}")
-            print(f"🚀 COLLECTING FROM ALL SOURCES")
-            print(f"{'='*70}\n")
-
-        results = {}
-        total_articles = 0
-
-        # Iterate through OUR sources, not TIER1_SOURCES
-        for source_id in self.sources_config.keys():
-            articles = self.fetch_rss_feed_custom(source_id, limit=limit_per_source,
-                                                  max_age_days=max_age_days, verbose=verbose)
-
-            if articles:
-                output_file = self.save_articles(source_id, articles)
-                results[source_id] = {
-                    "article_count": len(articles),
-                    "output_file": output_file
-                }
-                total_articles += len(articles)
-            else:
-                results[source_id] = {
-                    "article_count": 0,
-                    "output_file": None
-                }
-
-        if verbose:
-            print(f"\n{'='*70}")
-            print(f"📊 COLLECTION SUMMARY")
-            print(f"{'='*70}\n")
-
-            for source_id, result in results.items():
-                source_name = self.sources_config[source_id]['name']
-                count = result['article_count']
-                print(f"   {source_name}: {count} articles")
-
-            print(f"\n   TOTAL: {total_articles} articles collected")
-
-        return results
-
     def save_articles(self, source_id, articles):
         """Override to use custom source config"""
         if not articles:
@@ -346,68 +312,23 @@ class ExpandedRSSCollector(RSSNewsCollector):
 
         print(f"\n💾 Saved {len(articles)} articles to: {output_file}")
 
-        # Save to database
+        # Save to database (on failure, keep the old feed state so these
+        # entries are fetched again instead of being marked as seen)
         if self.store_db:
             db_saved = self.save_to_database(source_id, articles)
+            if db_saved is None:
+                self.discard_feed_state(source_id)
+                return str(output_file)
             if db_saved:
                 print(f"✅ Stored {db_saved} articles in database")
 
+        self.commit_feed_state(source_id)
+
         return str(output_file)
 
     def fetch_rss_feed_custom(self, source_id, limit=None, max_age_days=30, verbose=True):
-        """Fetch RSS using custom source config"""
-        if source_id not in self.sources_config:
-            print(f"❌ Unknown source: {source_id}")
-            return []
-
-        source = self.sources_config[source_id]
-        limit = limit or source['rate_limit_per_day']
-
-        if verbose:
-            print(f"\n{'='*70}")
-            print(f"📰 Fetching: {source['name']}")
-            print(f"{'='*70}")
-            print(f"URL: {source['rss_url']}")
-            print(f"Limit: {limit} articles | Max age: {max_age_days} days")
-
-        try:
-            import requests
-            import feedparser
-            from datetime import datetime
-
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-            response = requests.get(source['rss_url'], headers=headers, timeout=30)
-            response.raise_for_status()
-
-            feed = feedparser.parse(response.content)
-
-            if feed.bozo and verbose:
-                print(f"⚠️  Feed parsing warning: {feed.get('bozo_exception', 'Unknown')}")
-
-            if verbose:
-                print(f"✅ Found {len(feed.entries)} entries in feed")
-
-            articles = []
-            for entry in feed.entries[:limit]:
-                article = self.process_entry(entry, source_id, source)
-
-                if article and self.passes_quality_filter(article, source, max_age_days=max_age_days):
-                    articles.append(article)
-                    if verbose:
-                        print(f"   ✓ {article['title'][:60]}...")
-                else:
-                    if verbose:
-                        print(f"   ✗ Filtered: {entry.get('title', 'No title')[:60]}...")
-
-            if verbose:
-                print(f"\n✅ Collected {len(articles)}/{len(feed.entries[:limit])} articles (after filtering)")
-            return articles
-
-        except Exception as e:
-            print(f"❌ Error fetching {source_id}: {e}")
-            return []
+        """Fetch RSS using custom source config (kept for older callers)"""
+        return self.fetch_rss_feed(source_id, limit=limit, max_age_days=max_age_days, verbose=verbose)
 
 if __name__ == "__main__":
     main()
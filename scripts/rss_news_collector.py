@@ -15,9 +15,14 @@ Tier 1 Sources (8 RSS feeds):
 - Moz Blog
 - Hacker News (via API, not RSS)
 
+Feeds are polled incrementally: ETag/Last-Modified validators and the ids of
+already-seen entries are kept per feed in feed_state.json, so unchanged feeds
+return 304 and only new entries are processed and stored (--full disables this).
+
 Usage:
     python3 rss_news_collector.py --source techcrunch
     python3 rss_news_collector.py --source all --limit 10
+    python3 rss_news_collector.py --source all --full
     python3 rss_news_collector.py --test
 """
 
@@ -26,7 +31,6 @@ import sys
 import json
 import hashlib
 import argparse
-import requests
 import feedparser
 import psycopg2
 from datetime import datetime, timedelta
@@ -36,6 +40,13 @@ from dotenv import load_dotenv
 sys.path.append('/Users/yourox/AI-Workspace')
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
+from scripts.polite_fetcher import run_with_fetcher
+from scripts.artifact_store import write_json_atomic
+from scripts.bulk_upsert import upsert_external_content
+from scripts.content_dedup import drop_near_duplicates
+
+FEED_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
 # Tier 1 RSS Sources Configuration
 TIER1_SOURCES = {
     "techcrunch": {
@@ -110,21 +121,133 @@ TIER1_SOURCES = {
     }
 }
 
+def entry_key(entry):
+    """Stable identity for a feed entry: id/guid/link, else a hash of its content"""
+    key = entry.get('id') or entry.get('guid') or entry.get('link')
+    if key:
+        return key.strip()
+    raw = f"{entry.get('title', '')}|{entry.get('summary', '')}"
+    return "sha1:" + hashlib.sha1(raw.encode('utf-8', errors='replace')).hexdigest()
+
+
+class FeedState:
+    """Persisted per-feed polling state: conditional-GET validators + seen entry keys"""
+
+    MAX_SEEN = 1000  # Per feed; comfortably above typical feed window sizes
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.feeds = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.feeds = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Could not load feed state ({self.path}): {e}")
+
+        self._seen = {
+            source_id: set(state.get('seen', []))
+            for source_id, state in self.feeds.items()
+        }
+
+    def validators(self, source_id, url):
+        """ETag/Last-Modified for a feed, ignored if the feed URL changed"""
+        state = self.feeds.get(source_id, {})
+        if state.get('url') != url:
+            return {}
+        return {
+            k: state[k] for k in ('etag', 'last_modified') if state.get(k)
+        }
+
+    def is_seen(self, source_id, key):
+        return key in self._seen.get(source_id, ())
+
+    def update(self, source_id, url, status, headers=None, seen_keys=()):
+        """
+        Record the outcome of one poll
+
+        Args:
+            source_id: Source identifier
+            url: Feed URL that was polled
+            status: HTTP status (304 = not modified)
+            headers: Response headers carrying new validators (200 only)
+            seen_keys: Entry keys examined on this poll
+        """
+        state = self.feeds.setdefault(source_id, {})
+        if state.get('url') != url:
+            state.clear()
+            state['url'] = url
+            self._seen[source_id] = set()
+
+        state['last_checked'] = datetime.now().isoformat()
+        state['last_status'] = status
+
+        if headers is not None:
+            state.pop('etag', None)
+            state.pop('last_modified', None)
+            if headers.get('etag'):
+                state['etag'] = headers['etag']
+            if headers.get('last-modified'):
+                state['last_modified'] = headers['last-modified']
+
+        new_keys = [k for k in seen_keys if k not in self._seen.setdefault(source_id, set())]
+        if new_keys:
+            seen = (state.get('seen', []) + new_keys)[-self.MAX_SEEN:]
+            state['seen'] = seen
+            self._seen[source_id] = set(seen)
+            state['last_new_entry_at'] = state['last_checked']
+
+    def save(self):
+        write_json_atomic(self.path, self.feeds, indent=None)
+
+
 class RSSNewsCollector:
-    def __init__(self, output_dir="/Users/yourox/AI-Workspace/data/rss_news", store_db=True):
+    collection_title = "ALL TIER 1 SOURCES"
+
+    def __init__(self, output_dir="/Users/yourox/AI-Workspace/data/rss_news", store_db=True,
+                 incremental=True):
         """Initialize RSS collector"""
+        self.sources_config = TIER1_SOURCES
+        self.fetcher_kwargs = {'user_agent': FEED_USER_AGENT, 'timeout': 30}
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.store_db = store_db
+        self.init_feed_state(incremental)
 
         # Database connection
         if self.store_db:
             self.conn_string = os.getenv('RAILWAY_DATABASE_URL')
 
         # Create subdirectories for each source
-        for source_id in TIER1_SOURCES.keys():
+        for source_id in self.sources_config.keys():
             (self.output_dir / source_id).mkdir(exist_ok=True)
 
+    def init_feed_state(self, incremental=True):
+        """
+        Set up incremental polling state
+
+        Args:
+            incremental: Use conditional GET and skip already-seen entries.
+                         False re-downloads and re-processes every feed in full
+                         (state is still updated for the next incremental run).
+        """
+        self.incremental = incremental
+        self.feed_state = FeedState(self.output_dir / "feed_state.json")
+        self._pending_state = {}
+
+    def commit_feed_state(self, source_id):
+        """Persist a feed's polling state once its new articles are safely stored"""
+        pending = self._pending_state.pop(source_id, None)
+        if pending is None:
+            return
+        self.feed_state.update(source_id, **pending)
+        self.feed_state.save()
+
+    def discard_feed_state(self, source_id):
+        """Drop a feed's pending polling state so the next poll fetches its entries again"""
+        self._pending_state.pop(source_id, None)
+
     def fetch_rss_feed(self, source_id, limit=None, max_age_days=30, verbose=True):
         """
         Fetch RSS feed for a source
@@ -138,11 +261,34 @@ class RSSNewsCollector:
         Returns:
             list: Parsed articles
         """
-        if source_id not in TIER1_SOURCES:
+        if source_id not in self.sources_config:
             print(f"❌ Unknown source: {source_id}")
             return []
 
-        source = TIER1_SOURCES[source_id]
+        result = self.fetch_all_feeds([source_id])[0]
+        return self.process_feed(source_id, result, limit=limit,
+                                 max_age_days=max_age_days, verbose=verbose)
+
+    def process_feed(self, source_id, result, limit=None, max_age_days=30, verbose=True):
+        """
+        Parse a fetched feed (FetchResult) into filtered articles
+
+        In incremental mode a 304 short-circuits to no articles, and entries
+        already recorded in the feed state are skipped before processing.
+        The new state is staged and committed by save_articles (or right away
+        when nothing new needs saving).
+
+        Args:
+            source_id: Source identifier
+            result: FetchResult for the source's rss_url
+            limit: Max articles to process (None = use rate_limit_per_day)
+            max_age_days: Maximum age of articles in days
+            verbose: Print detailed progress
+
+        Returns:
+            list: Parsed articles
+        """
+        source = self.sources_config[source_id]
         limit = limit or source['rate_limit_per_day']
 
         if verbose:
@@ -153,25 +299,36 @@ class RSSNewsCollector:
             print(f"Limit: {limit} articles | Max age: {max_age_days} days")
 
         try:
-            # Fetch RSS feed with requests first (handles SSL better)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-            response = requests.get(source['rss_url'], headers=headers, timeout=30)
-            response.raise_for_status()
+            if result.not_modified:
+                if verbose:
+                    print(f"⚡ Not modified since last poll (304) - skipped")
+                self._pending_state[source_id] = {"url": source['rss_url'], "status": 304}
+                self.commit_feed_state(source_id)
+                return []
+
+            if not result.ok:
+                raise Exception(result.error)
 
             # Parse RSS feed
-            feed = feedparser.parse(response.content)
+            feed = feedparser.parse(result.content)
 
             if feed.bozo and verbose:
                 print(f"⚠️  Feed parsing warning: {feed.get('bozo_exception', 'Unknown')}")
 
+            # Only unseen entries count against the limit
+            entries = feed.entries
+            if self.incremental:
+                entries = [e for e in entries if not self.feed_state.is_seen(source_id, entry_key(e))]
+            truncated = len(entries) > limit
+            entries = entries[:limit]
+
             if verbose:
-                print(f"✅ Found {len(feed.entries)} entries in feed")
+                seen_note = f" ({len(feed.entries) - len(entries)} already seen/over limit)" if self.incremental else ""
+                print(f"✅ Found {len(feed.entries)} entries in feed{seen_note}")
 
             # Process entries
             articles = []
-            for entry in feed.entries[:limit]:
+            for entry in entries:
                 article = self.process_entry(entry, source_id, source)
 
                 if article and self.passes_quality_filter(article, source, max_age_days=max_age_days):
@@ -183,13 +340,38 @@ class RSSNewsCollector:
                         print(f"   ✗ Filtered: {entry.get('title', 'No title')[:60]}...")
 
             if verbose:
-                print(f"\n✅ Collected {len(articles)}/{len(feed.entries[:limit])} articles (after filtering)")
+                print(f"\n✅ Collected {len(articles)}/{len(entries)} articles (after filtering)")
+
+            self._pending_state[source_id] = {
+                "url": source['rss_url'],
+                "status": result.status,
+                # Unseen entries were cut off by the limit: drop the validators
+                # so the next poll gets a full 200 instead of a 304
+                "headers": {} if truncated else result.headers,
+                "seen_keys": [entry_key(e) for e in entries],
+            }
+            if not articles:
+                self.commit_feed_state(source_id)
             return articles
 
         except Exception as e:
             print(f"❌ Error fetching {source_id}: {e}")
             return []
 
+    def fetch_all_feeds(self, source_ids):
+        """Fetch several feeds concurrently through one polite fetcher (conditional GET when incremental)"""
+        urls = [self.sources_config[source_id]['rss_url'] for source_id in source_ids]
+
+        async def _fetch_all(fetcher):
+            if self.incremental:
+                for source_id, url in zip(source_ids, urls):
+                    validators = self.feed_state.validators(source_id, url)
+                    if validators:
+                        fetcher.validators[url] = validators
+            return await fetcher.fetch_many(urls, conditional=self.incremental)
+
+        return run_with_fetcher(_fetch_all, fetcher_kwargs=self.fetcher_kwargs)
+
     def process_entry(self, entry, source_id, source):
         """
         Process a single RSS entry into structured article
@@ -354,6 +536,11 @@ class RSSNewsCollector:
             print("⚠️  No articles to save")
             return None
 
+        articles = drop_near_duplicates(articles)
+        if not articles:
+            self.commit_feed_state(source_id)
+            return None
+
         # Save to JSON
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = self.output_dir / source_id / f"{source_id}_{timestamp}.json"
@@ -361,7 +548,7 @@ class RSSNewsCollector:
         with open(output_file, 'w') as f:
             json.dump({
                 "source_id": source_id,
-                "source_name": TIER1_SOURCES[source_id]['name'],
+                "source_name": self.sources_config[source_id]['name'],
                 "collected_at": datetime.now().isoformat(),
                 "article_count": len(articles),
                 "articles": articles
@@ -369,12 +556,18 @@ class RSSNewsCollector:
 
         print(f"\n💾 Saved {len(articles)} articles to: {output_file}")
 
-        # Save to database
+        # Save to database (on failure, keep the old feed state so these
+        # entries are fetched again instead of being marked as seen)
         if self.store_db:
             db_saved = self.save_to_database(source_id, articles)
+            if db_saved is None:
+                self.discard_feed_state(source_id)
+                return str(output_file)
             if db_saved:
                 print(f"✅ Stored {db_saved} articles in database")
 
+        self.commit_feed_state(source_id)
+
         return str(output_file)
 
     def save_to_database(self, source_id, articles):
@@ -386,59 +579,24 @@ class RSSNewsCollector:
             articles: List of articles
 
         Returns:
-            int: Number of articles saved
+            int: Number of articles saved, or None if the write failed
         """
         if not articles:
             return 0
 
         try:
             conn = psycopg2.connect(self.conn_string)
-            cursor = conn.cursor()
 
-            saved_count = 0
-
-            for article in articles:
-                try:
-                    # Insert article
-                    cursor.execute("""
-                        INSERT INTO external_content (
-                            content_id, source_id, title, url, author,
-                            published_at, fetched_at, content_type,
-                            content_text, content_length, tags, categories,
-                            raw_score, final_score
-                        ) VALUES (
-                            %s, %s, %s, %s, %s,
-                            %s, %s, %s,
-                            %s, %s, %s, %s,
-                            %s, %s
-                        )
-                        ON CONFLICT (url) DO UPDATE SET
-                            fetched_at = EXCLUDED.fetched_at,
-                            raw_score = EXCLUDED.raw_score,
-                            final_score = EXCLUDED.final_score
-                    """, (
-                        article['content_id'],
-                        article['source_id'],
-                        article['title'],
-                        article['url'],
-                        article.get('author'),
-                        article['published_at'],
-                        article['fetched_at'],
-                        article['content_type'],
-                        article['content_text'],
-                        article['content_length'],
-                        json.dumps(article.get('tags', [])),
-                        json.dumps([article['category']]),
-                        article['raw_score'],
-                        article['raw_score']  # Use raw_score as final_score for now
-                    ))
-
-                    saved_count += 1
-
-                except psycopg2.errors.UniqueViolation:
-                    # Article already exists
-                    conn.rollback()
-                    continue
+            result = upsert_external_content(
+                conn, articles,
+                update_columns=['fetched_at', 'raw_score', 'final_score'],
+                commit=False
+            )
+            saved_count = result.saved
+            for url, error in result.errors:
+                print(f"   ⚠️  Skipped {url}: {error}")
+
+            cursor = conn.cursor()
 
             # Update source last_fetched_at
             cursor.execute("""
@@ -456,11 +614,13 @@ class RSSNewsCollector:
 
         except Exception as e:
             print(f"❌ Database error: {e}")
-            return 0
+            return None
 
     def collect_all_sources(self, limit_per_source=None, max_age_days=30, verbose=True):
         """
-        Collect from all Tier 1 sources
+        Collect from all configured sources
+
+        Feeds are downloaded concurrently, then parsed and saved in order.
 
         Args:
             limit_per_source: Max articles per source
@@ -472,15 +632,18 @@ class RSSNewsCollector:
         """
         if verbose:
             print(f"\n{'='*70}")
-            print(f"🚀 COLLECTING FROM ALL TIER 1 SOURCES")
+            print(f"🚀 COLLECTING FROM {self.collection_title}")
             print(f"{'='*70}\n")
 
         results = {}
         total_articles = 0
 
-        for source_id in TIER1_SOURCES.keys():
-            articles = self.fetch_rss_feed(source_id, limit=limit_per_source,
-                                          max_age_days=max_age_days, verbose=verbose)
+        source_ids = list(self.sources_config.keys())
+        feeds = self.fetch_all_feeds(source_ids)
+
+        for source_id, feed_result in zip(source_ids, feeds):
+            articles = self.process_feed(source_id, feed_result, limit=limit_per_source,
+                                         max_age_days=max_age_days, verbose=verbose)
 
             if articles:
                 output_file = self.save_articles(source_id, articles)
@@ -502,7 +665,7 @@ class RSSNewsCollector:
             print(f"{'='*70}\n")
 
             for source_id, result in results.items():
-                source_name = TIER1_SOURCES[source_id]['name']
+                source_name = self.sources_config[source_id]['name']
                 count = result['article_count']
                 print(f"   {source_name}: {count} articles")
 
@@ -525,10 +688,12 @@ def main():
                         help='Test collection (fetch 3 articles from each)')
     parser.add_argument('--quiet', action='store_true',
                         help='Quiet mode: minimal output')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore feed state: re-download and re-process every entry')
 
     args = parser.parse_args()
 
-    collector = RSSNewsCollector()
+    collector = RSSNewsCollector(incremental=not args.full)
 
     # Set max age
     max_age = 180 if args.historical else args.max_age_days
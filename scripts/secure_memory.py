@@ -2,8 +2,13 @@
 """
 Secure Memory System with Classification Levels
 Protects sensitive data from unauthorized access
+
+Each level keeps an inverted token index over its memories, built lazily on
+first search and kept in sync on save, so a search only touches the postings
+for the query terms in the levels it is allowed to read.
 """
 
+import re
 import json
 from datetime import datetime
 from pathlib import Path
@@ -27,6 +32,120 @@ SECRET_MEMORY = BASE_DIR / "memories_secret.json"
 # Ensure directories exist
 BASE_DIR.mkdir(parents=True, exist_ok=True)
 
+TOKEN_RE = re.compile(r'\w+')
+CONTAINING_CACHE_SIZE = 512
+
+
+class MemoryIndex:
+    """Inverted token index over the memories of one security level"""
+
+    def __init__(self, memories: list[dict[str, Any]], signature: tuple | None = None):
+        self.memories: list[dict[str, Any]] = []
+        self.postings: dict[str, list[int]] = {}
+        self.signature = signature
+        self._containing: dict[str, set[str]] = {}   # query word -> vocabulary tokens containing it
+        for memory in memories:
+            self.add(memory)
+
+    def add(self, memory: dict[str, Any]):
+        """Append a memory and index the tokens of its text"""
+        position = len(self.memories)
+        self.memories.append(memory)
+        for token in set(TOKEN_RE.findall(memory['text'].lower())):
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = []
+                for word, tokens in self._containing.items():
+                    if word in token:
+                        tokens.add(token)
+            postings.append(position)
+
+    def _tokens_containing(self, word: str) -> set[str]:
+        """Vocabulary tokens that contain word (cached, kept current on add)"""
+        tokens = self._containing.get(word)
+        if tokens is None:
+            tokens = {token for token in self.postings if word in token}
+            if len(self._containing) >= CONTAINING_CACHE_SIZE:
+                self._containing.clear()
+            self._containing[word] = tokens
+        return tokens
+
+    def search(self, query_lower: str) -> list[dict[str, Any]]:
+        """
+        Memories whose text contains query_lower, in stored order
+
+        Every word of the query must sit inside some token of a matching
+        memory, so the postings give a superset of the matches; candidates
+        are then verified with the same substring test as a full scan.
+        Words are intersected rarest first, and common words are skipped
+        once the candidate set is smaller than their postings.
+        """
+        words = set(TOKEN_RE.findall(query_lower))
+        if not words:
+            return [m for m in self.memories if query_lower in m['text'].lower()]
+
+        postings_per_word = []
+        for word in words:
+            lists = [self.postings[token] for token in self._tokens_containing(word)]
+            if not lists:
+                return []
+            postings_per_word.append((sum(map(len, lists)), lists))
+        postings_per_word.sort(key=lambda entry: entry[0])
+
+        candidates = None
+        for size, lists in postings_per_word:
+            if candidates is not None and size > len(candidates):
+                break
+            positions = set()
+            for postings in lists:
+                positions.update(postings)
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                return []
+
+        return [
+            self.memories[p] for p in sorted(candidates)
+            if query_lower in self.memories[p]['text'].lower()
+        ]
+
+
+def read_memory_file(path: Path) -> list[dict[str, Any]]:
+    """
+    Memories from UltimateMemorySystem storage
+
+    A .jsonl path is replayed like the memory log (add records, then field
+    updates); anything else is read as the legacy JSON list.
+    """
+    if path.suffix != '.jsonl':
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    memories: list[dict[str, Any]] = []
+    by_id: dict[Any, dict[str, Any]] = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # partial line still being written
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get('op') == 'add':
+                memory = record['memory']
+                memories.append(memory)
+                by_id[memory.get('id')] = memory
+            elif record.get('op') == 'update' and record.get('id') in by_id:
+                by_id[record['id']].update(record.get('fields', {}))
+    return memories
+
+
+def _file_signature(file: Path) -> tuple | None:
+    """Identity of a memory file's current contents (None if missing)"""
+    try:
+        st = file.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
 
 class SecureMemorySystem:
     """Memory system with security classification"""
@@ -38,6 +157,7 @@ class SecureMemorySystem:
             SecurityLevel.CONFIDENTIAL: CONFIDENTIAL_MEMORY,
             SecurityLevel.SECRET: SECRET_MEMORY
         }
+        self._indexes: dict[SecurityLevel, MemoryIndex] = {}
     
     def load_memories(self, level: SecurityLevel) -> list[dict[str, Any]]:
         """Load memories at specific security level"""
@@ -47,6 +167,15 @@ class SecureMemorySystem:
         with open(file, 'r') as f:
             return json.load(f)
     
+    def _index(self, level: SecurityLevel) -> MemoryIndex:
+        """Token index for one level, rebuilt if the file changed on disk"""
+        signature = _file_signature(self.files[level])
+        index = self._indexes.get(level)
+        if index is None or index.signature != signature:
+            memories = self.load_memories(level) if signature is not None else []
+            index = self._indexes[level] = MemoryIndex(memories, signature)
+        return index
+    
     def save_memory(
         self, 
         text: str, 
@@ -54,7 +183,8 @@ class SecureMemorySystem:
         memory_type: str = "conversation"
     ) -> dict[str, Any]:
         """Save memory at specific security level"""
-        memories = self.load_memories(level)
+        index = self._index(level)
+        memories = list(index.memories)
         
         new_memory = {
             "id": len(memories) + 1,
@@ -71,6 +201,9 @@ class SecureMemorySystem:
         with open(file, 'w') as f:
             json.dump(memories, f, indent=2)
         
+        index.add(new_memory)
+        index.signature = _file_signature(file)
+        
         return new_memory
     
     def load_safe_context(self, include_private: bool = False) -> str:
@@ -118,9 +251,7 @@ class SecureMemorySystem:
         levels_to_search = [level] if level else [SecurityLevel.PUBLIC, SecurityLevel.PRIVATE]
         
         for search_level in levels_to_search:
-            memories = self.load_memories(search_level)
-            matches = [m for m in memories if query_lower in m['text'].lower()]
-            results.extend(matches)
+            results.extend(self._index(search_level).search(query_lower))
         
         return results
     
@@ -138,12 +269,11 @@ class SecureMemorySystem:
         }
     
     def migrate_existing_memories(self, source_file: Path) -> dict[str, int]:
-        """Migrate existing memories to classified system"""
+        """Migrate existing memories (memories.jsonl log or legacy JSON list) to classified system"""
         if not source_file.exists():
             return {"migrated": 0, "skipped": 0}
         
-        with open(source_file, 'r') as f:
-            old_memories = json.load(f)
+        old_memories = read_memory_file(source_file)
         
         # Classify existing memories
         migrated = 0
@@ -186,7 +316,11 @@ Usage:
     command = sys.argv[1]
     
     if command == "migrate":
-        old_file = Path("/Users/yourox/AI-Workspace/data/claude_memory_json/memories.json")
+        # UltimateMemorySystem appends to memories.jsonl; memories.json is only
+        # the pre-log snapshot, so read it only when no log exists yet
+        old_file = BASE_DIR / "memories.jsonl"
+        if not old_file.exists():
+            old_file = BASE_DIR / "memories.json"
         result = system.migrate_existing_memories(old_file)
         print(f"✓ Migrated {result['migrated']} memories")
         print(f"\nNew structure:")
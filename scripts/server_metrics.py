@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Server Metrics - Per-tool and per-route latency histograms for the servers
+
+Records, per MCP tool and per HTTP route:
+- Latency histogram (Prometheus-style cumulative buckets)
+- Result size histogram (characters for text, items for lists/dicts,
+  Content-Length for HTTP responses)
+- Error count
+plus hit/miss counters for named caches. Recording a call is a bisect and
+a few integer updates under a lock, so overhead stays in the low microseconds.
+
+Exposed as Prometheus text (a /metrics route for FastAPI and Flask apps) and
+as a get_server_metrics tool for FastMCP servers.
+
+Usage:
+    from server_metrics import instrument_mcp
+    mcp = FastMCP("My Server")
+    instrument_mcp(mcp)            # Before any @mcp.tool() definitions
+
+    from server_metrics import instrument_fastapi, instrument_flask
+    instrument_fastapi(app)        # Adds middleware + GET /metrics
+    instrument_flask(app)
+
+    from server_metrics import METRICS
+    METRICS.cache("search_results", hit=True)
+"""
+
+import time
+import inspect
+import functools
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Seconds; the top bucket is +Inf
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# kind -> (metric prefix, label name)
+KINDS = {
+    "tool": ("mcp_tool", "tool"),
+    "route": ("http_request", "route"),
+    "load": ("resource_load", "resource"),
+}
+
+
+class Histogram:
+    """Fixed-bucket histogram (counts per bucket, plus sum and count)"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating inside its bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                if i == len(self.bounds):
+                    return lower
+                return lower + (self.bounds[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+
+class CallStats:
+    """Latency, result size and errors for one tool or route"""
+
+    __slots__ = ("latency", "size", "errors")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.errors = 0
+
+
+def result_size(result: Any) -> Optional[int]:
+    """Cheap size of a tool result (never serializes)"""
+    if isinstance(result, (str, bytes, list, dict, tuple)):
+        return len(result)
+    return None
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """Process-wide call and cache metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[Tuple[str, str], CallStats] = {}
+        self.caches: Dict[str, List[int]] = {}  # name -> [hits, misses]
+        self.started_at = time.time()
+
+    def observe(self, kind: str, name: str, seconds: float, size: Optional[int] = None, error: bool = False):
+        """
+        Record one call
+
+        Args:
+            kind: "tool" or "route"
+            name: Tool name or "METHOD /route/template"
+            seconds: Wall time of the call
+            size: Result size, if known
+            error: Whether the call failed
+        """
+        key = (kind, name)
+        with self._lock:
+            stats = self.calls.get(key)
+            if stats is None:
+                stats = self.calls[key] = CallStats()
+            stats.latency.observe(seconds)
+            if size is not None:
+                stats.size.observe(size)
+            if error:
+                stats.errors += 1
+
+    def cache(self, name: str, hit: bool):
+        """Record a hit or miss on a named cache"""
+        with self._lock:
+            counts = self.caches.get(name)
+            if counts is None:
+                counts = self.caches[name] = [0, 0]
+            counts[0 if hit else 1] += 1
+
+    def timed(self, kind: str, name: str) -> Callable:
+        """Decorator recording latency, result size and errors of a sync or async function"""
+        def decorator(fn: Callable) -> Callable:
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    start = time.perf_counter()
+                    try:
+                        result = await fn(*args, **kwargs)
+                    except BaseException:
+                        self.observe(kind, name, time.perf_counter() - start, error=True)
+                        raise
+                    self.observe(kind, name, time.perf_counter() - start, result_size(result))
+                    return result
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException:
+                    self.observe(kind, name, time.perf_counter() - start, error=True)
+                    raise
+                self.observe(kind, name, time.perf_counter() - start, result_size(result))
+                return result
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary per tool/route and cache (quantiles estimated from buckets)"""
+        with self._lock:
+            calls = {}
+            for (kind, name), stats in sorted(self.calls.items()):
+                latency = stats.latency
+                entry = {
+                    "calls": latency.count,
+                    "errors": stats.errors,
+                    "mean_ms": round(latency.sum / latency.count * 1000, 3) if latency.count else 0.0,
+                }
+                for label, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                    value = latency.quantile(q)
+                    entry[label] = round(value * 1000, 3) if value is not None else None
+                if stats.size.count:
+                    entry["mean_result_size"] = round(stats.size.sum / stats.size.count, 1)
+                calls.setdefault(f"{kind}s", {})[name] = entry
+
+            caches = {}
+            for name, (hits, misses) in sorted(self.caches.items()):
+                total = hits + misses
+                caches[name] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / total, 4) if total else None,
+                }
+
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            **calls,
+            "caches": caches,
+        }
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP process_start_time_seconds Start time of the process since unix epoch",
+            "# TYPE process_start_time_seconds gauge",
+            f"process_start_time_seconds {self.started_at:.3f}",
+        ]
+
+        with self._lock:
+            by_kind: Dict[str, List[Tuple[str, CallStats]]] = {}
+            for (kind, name), stats in sorted(self.calls.items()):
+                by_kind.setdefault(kind, []).append((name, stats))
+
+            for kind, entries in by_kind.items():
+                prefix, label = KINDS.get(kind, (kind, "name"))
+                for metric, attr, unit_help in (
+                    (f"{prefix}_duration_seconds", "latency", "Latency"),
+                    (f"{prefix}_result_size", "size", "Result size"),
+                ):
+                    lines.append(f"# HELP {metric} {unit_help} per {label}")
+                    lines.append(f"# TYPE {metric} histogram")
+                    for name, stats in entries:
+                        histogram = getattr(stats, attr)
+                        if not histogram.count:
+                            continue
+                        labels = f'{label}="{_escape(name)}"'
+                        cumulative = 0
+                        for bound, n in zip(histogram.bounds, histogram.counts):
+                            cumulative += n
+                            lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                        lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                        lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                        lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+                metric = f"{prefix}_errors_total"
+                lines.append(f"# HELP {metric} Failed calls per {label}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, stats in entries:
+                    lines.append(f'{metric}{{{label}="{_escape(name)}"}} {stats.errors}')
+
+            if self.caches:
+                lines.append("# HELP cache_requests_total Cache lookups by result")
+                lines.append("# TYPE cache_requests_total counter")
+                for name, (hits, misses) in sorted(self.caches.items()):
+                    lines.append(f'cache_requests_total{{cache="{_escape(name)}",result="hit"}} {hits}')
+                    lines.append(f'cache_requests_total{{cache="{_escape(name)}",result="miss"}} {misses}')
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry for the process
+METRICS = MetricsRegistry()
+
+
+def instrument_mcp(mcp: Any, registry: MetricsRegistry = METRICS, metrics_tool: bool = True):
+    """
+    Time every tool registered on a FastMCP server from now on
+
+    Wraps mcp.tool so each @mcp.tool() function is recorded under its tool
+    name, and registers a get_server_metrics tool.
+
+    Args:
+        mcp: FastMCP instance (call before defining tools)
+        registry: Registry to record into
+        metrics_tool: Register the get_server_metrics tool
+    """
+    register_tool = mcp.tool
+
+    @functools.wraps(register_tool)
+    def tool(*args, **kwargs):
+        decorator = register_tool(*args, **kwargs)
+
+        def register(fn: Callable) -> Callable:
+            name = kwargs.get("name") or (args[0] if args and isinstance(args[0], str) else fn.__name__)
+            return decorator(registry.timed("tool", name)(fn))
+        return register
+
+    mcp.tool = tool
+
+    if metrics_tool:
+        @register_tool()
+        def get_server_metrics() -> Dict[str, Any]:
+            """
+            Get latency, result size and error metrics for this server's tools
+
+            Returns:
+                Per-tool call counts, errors, mean/p50/p95/p99 latency (ms),
+                mean result size, and cache hit rates. Quantiles are bucket
+                estimates: they interpolate linearly inside the histogram
+                bucket holding the rank (10 µs resolution at the low end,
+                coarser above), so use the mean for sub-bucket precision.
+            """
+            return registry.snapshot()
+
+
+def instrument_fastapi(app: Any, registry: MetricsRegistry = METRICS, path: str = "/metrics"):
+    """
+    Record per-route latency for a FastAPI app and serve GET /metrics
+
+    Latency is measured to the start of the response, so streaming routes
+    report time to first byte.
+    """
+    from fastapi.responses import PlainTextResponse
+
+    @app.middleware("http")
+    async def record_route_metrics(request, call_next):
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        except BaseException:
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            registry.observe("route", f"{request.method} {route}", time.perf_counter() - start, error=True)
+            raise
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        length = response.headers.get("content-length")
+        registry.observe(
+            "route", f"{request.method} {route}", time.perf_counter() - start,
+            int(length) if length else None, error=response.status_code >= 500
+        )
+        return response
+
+    async def metrics():
+        return PlainTextResponse(registry.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    app.add_api_route(path, metrics, methods=["GET"], include_in_schema=False)
+
+
+def instrument_flask(app: Any, registry: MetricsRegistry = METRICS, path: str = "/metrics"):
+    """Record per-route latency for a Flask app and serve GET /metrics"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def start_route_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_route_metrics(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            registry.observe(
+                "route", f"{request.method} {route}", time.perf_counter() - start,
+                response.content_length, error=response.status_code >= 500
+            )
+        return response
+
+    def metrics():
+        return Response(registry.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    app.add_url_rule(path, "metrics", metrics)
@@ -14,6 +14,8 @@ from qdrant_client.models import Distance, VectorParams, PointStruct
 from openai import OpenAI
 import hashlib
 
+from transcript_store import TranscriptLibrary
+
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 
@@ -25,6 +27,7 @@ class SimpleVectorStore:
         self.transcripts_dir = self.workspace_dir / "data" / "transcripts"
         self.videos_json = self.workspace_dir / "data" / "greg_isenberg_videos.json"
         self.qdrant_dir = self.workspace_dir / "data" / "youtube_qdrant_direct"
+        self.transcripts = TranscriptLibrary(self.transcripts_dir)
 
         # Create directory
         self.qdrant_dir.mkdir(parents=True, exist_ok=True)
@@ -79,22 +82,17 @@ class SimpleVectorStore:
 
     def ingest_transcript(self, video_id: str, video_metadata: Dict) -> Dict:
         """Ingest a single transcript"""
-        transcript_file = self.transcripts_dir / f"{video_id}_full.json"
+        transcript = self.transcripts.get(video_id)
 
-        if not transcript_file.exists():
+        if transcript is None:
             return {"status": "skipped", "reason": "file not found"}
 
         try:
-            # Load transcript
-            with open(transcript_file, 'r') as f:
-                data = json.load(f)
-
-            # Extract text
-            if not data.get('transcript'):
+            # Header check avoids parsing segments of empty transcripts
+            if not transcript.header['format']:
                 return {"status": "skipped", "reason": "no transcript"}
 
-            segments = data['transcript'].get('segments', [])
-            full_text = " ".join([seg.get('text', '') for seg in segments])
+            full_text = transcript.text
 
             if not full_text:
                 return {"status": "skipped", "reason": "empty text"}
@@ -104,7 +102,7 @@ class SimpleVectorStore:
 
             # Prepare points
             points = []
-            title = data.get('title', video_metadata.get('title', 'Unknown'))
+            title = transcript.title or video_metadata.get('title', 'Unknown')
 
             print(f"  📝 {video_id}: {title[:50]}... ({len(chunks)} chunks)", end="", flush=True)
 
@@ -123,7 +121,7 @@ class SimpleVectorStore:
                         "chunk_index": i,
                         "total_chunks": len(chunks),
                         "text": chunk,
-                        "method": data.get('method', 'unknown'),
+                        "method": transcript.header['method'] or 'unknown',
                         "url": f"https://youtube.com/watch?v={video_id}",
                         "channel": video_metadata.get('channel', 'Greg Isenberg'),
                         "duration": video_metadata.get('duration', 0),
@@ -183,6 +181,8 @@ class SimpleVectorStore:
             else:
                 stats["error"] += 1
 
+        self.transcripts.save_index()
+
         print(f"\n{'='*70}")
         print(f"✅ INGESTION COMPLETE")
         print(f"{'='*70}")
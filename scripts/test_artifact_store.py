@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Artifact Store Tests
+Round-trips through the SQLite store and checks that readers merge store rows
+with the legacy per-file JSON layout, taking the newer copy of each id
+
+Usage:
+    python3 -m pytest scripts/test_artifact_store.py -q
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from artifact_store import (
+    ArtifactStore, artifact_ids, iter_artifacts, load_artifact, open_existing_store
+)
+
+
+def write_legacy(directory: Path, artifact_id: str, data: dict):
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / f"{artifact_id}_enriched.json", 'w') as f:
+        json.dump(data, f)
+
+
+def test_round_trip_and_latest_version(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts.db")
+    store.put("enriched", "vid1", {"score": 1})
+    store.put("enriched", "vid1", {"score": 2})
+    store.put_many("enriched", [("vid2", {"score": 3}), ("vid3", {"score": 4})])
+
+    assert store.get("enriched", "vid1") == {"score": 2}
+    assert store.count("enriched") == 3
+    assert store.ids("enriched") == {"vid1", "vid2", "vid3"}
+    assert [i for i, _ in store.iter_kind("enriched")] == ["vid1", "vid2", "vid3"]
+
+    store.update("enriched", "vid2", lambda d: {**d, "extra": True})
+    assert store.get("enriched", "vid2") == {"score": 3, "extra": True}
+    store.close()
+
+
+def test_readers_merge_store_with_legacy_files(tmp_path):
+    legacy = tmp_path / "enriched_insights"
+    write_legacy(legacy, "old1", {"source": "file"})
+    write_legacy(legacy, "both", {"source": "file"})
+
+    store = ArtifactStore(tmp_path / "artifacts.db")
+    store.put("enriched", "both", {"source": "store"})
+    store.put("enriched", "new1", {"source": "store"})
+
+    merged = {i: d["source"] for i, d, _ in iter_artifacts("enriched", legacy, "_enriched.json", store)}
+    assert merged == {"old1": "file", "both": "store", "new1": "store"}
+
+    assert artifact_ids("enriched", legacy, "_enriched.json", store) == {"old1", "both", "new1"}
+    assert load_artifact("enriched", "old1", legacy, "_enriched.json", store) == {"source": "file"}
+    assert load_artifact("enriched", "both", legacy, "_enriched.json", store) == {"source": "store"}
+    assert load_artifact("enriched", "missing", legacy, "_enriched.json", store) is None
+    store.close()
+
+
+def test_file_rewritten_after_import_wins(tmp_path):
+    legacy = tmp_path / "enriched_insights"
+    write_legacy(legacy, "vid1", {"version": "old"})
+    write_legacy(legacy, "vid2", {"version": "old"})
+
+    store = ArtifactStore(tmp_path / "artifacts.db")
+    assert store.import_directory("enriched", legacy, "_enriched.json") == 2
+
+    # A producer that only writes JSON re-extracts vid1 after the import
+    write_legacy(legacy, "vid1", {"version": "new"})
+    later = time.time() + 5
+    os.utime(legacy / "vid1_enriched.json", (later, later))
+
+    merged = {i: d["version"] for i, d, _ in iter_artifacts("enriched", legacy, "_enriched.json", store)}
+    assert merged == {"vid1": "new", "vid2": "old"}
+    assert load_artifact("enriched", "vid1", legacy, "_enriched.json", store) == {"version": "new"}
+    assert load_artifact("enriched", "vid2", legacy, "_enriched.json", store) == {"version": "old"}
+
+    # A later store write takes precedence again
+    store.put("enriched", "vid1", {"version": "store"})
+    store.conn.execute("UPDATE artifacts SET updated_at = ? WHERE id = 'vid1'", (later + 1,))
+    store.conn.commit()
+    assert load_artifact("enriched", "vid1", legacy, "_enriched.json", store) == {"version": "store"}
+    store.close()
+
+
+def test_readers_fall_back_to_files_without_store(tmp_path):
+    legacy = tmp_path / "enriched_insights"
+    write_legacy(legacy, "old1", {"source": "file"})
+
+    assert open_existing_store(tmp_path / "artifacts.db") is None
+    assert not (tmp_path / "artifacts.db").exists()
+
+    merged = [(i, d) for i, d, _ in iter_artifacts("enriched", legacy, "_enriched.json")]
+    assert merged == [("old1", {"source": "file"})]
+
+
+def test_unreadable_legacy_file_is_skipped(tmp_path):
+    legacy = tmp_path / "enriched_insights"
+    write_legacy(legacy, "good", {"ok": True})
+    (legacy / "bad_enriched.json").write_text("{not json")
+
+    merged = [i for i, _, _ in iter_artifacts("enriched", legacy, "_enriched.json")]
+    assert merged == ["good"]
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Claude Memory Ultimate Tests
+The memories.jsonl log must be replayed the same way by every process: new
+records are picked up incrementally, and a compacted (replaced) log is reloaded
+
+Usage:
+    python3 -m pytest scripts/test_claude_memory_ultimate.py -q
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+import claude_memory_ultimate
+from claude_memory_ultimate import UltimateMemorySystem
+from secure_memory import SecureMemorySystem, SecurityLevel, read_memory_file
+
+
+@pytest.fixture(autouse=True)
+def json_only(monkeypatch):
+    monkeypatch.setattr(claude_memory_ultimate, "MEM0_AVAILABLE", False)
+
+
+def make_system(tmp_path) -> UltimateMemorySystem:
+    return UltimateMemorySystem(json_dir=tmp_path / "json", mem0_dir=tmp_path / "qdrant")
+
+
+def append_record(system: UltimateMemorySystem, record: dict, newline: bool = True):
+    """Write a log record the way another process would"""
+    with open(system.json_log, 'a') as f:
+        f.write(json.dumps(record) + ("\n" if newline else ""))
+
+
+def test_legacy_snapshot_is_migrated(tmp_path):
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    legacy = [{"id": 1, "text": "legacy deploy note", "type": "conversation"}]
+    (json_dir / "memories.json").write_text(json.dumps(legacy))
+
+    system = make_system(tmp_path)
+    assert system._load_json() == legacy
+    assert read_memory_file(system.json_log) == legacy
+
+
+def test_second_process_catches_up(tmp_path):
+    writer, reader = make_system(tmp_path), make_system(tmp_path)
+    writer.save_memory("first deploy note")
+    writer.save_memory("second deploy note", "decision")
+
+    context = reader.load_context("deploy")
+    assert "first deploy note" in context and "second deploy note" in context
+    assert [m['text'] for m in reader._search("deploy")] == ["first deploy note", "second deploy note"]
+    assert [m['text'] for m in reader.get_memories_by_type("decision")] == ["second deploy note"]
+
+    reader.save_memory("third note")  # Ids continue from the caught-up state
+    assert [m['id'] for m in writer._load_json()] == [1, 2, 3]
+
+
+def test_updates_and_partial_lines_on_replay(tmp_path):
+    writer, reader = make_system(tmp_path), make_system(tmp_path)
+    writer.save_memory("note")
+    append_record(writer, {"op": "update", "id": 1, "fields": {"synced_to_mem0": True}})
+    partial = {"op": "add", "memory": {"id": 2, "text": "half written"}}
+    append_record(writer, partial, newline=False)
+
+    assert [m['synced_to_mem0'] for m in reader._load_json()] == [True]
+
+    with open(writer.json_log, 'a') as f:
+        f.write("\n")
+    assert [m['text'] for m in reader._load_json()] == ["note", "half written"]
+    assert read_memory_file(writer.json_log) == reader._load_json()
+
+
+def test_compaction_is_reloaded_by_other_process(tmp_path):
+    writer, reader = make_system(tmp_path), make_system(tmp_path)
+    for i in range(3):
+        writer.save_memory(f"note {i}")
+        append_record(writer, {"op": "update", "id": i + 1, "fields": {"synced_to_mem0": True}})
+    before = reader._load_json()
+    inode = reader._log_inode
+
+    assert writer.compact() == 3
+    assert len(writer.json_log.read_text().splitlines()) == 3
+
+    writer.save_memory("after compaction")
+    memories = reader._load_json()
+    assert reader._log_inode != inode
+    assert memories[:3] == before
+    assert [m['text'] for m in memories] == ["note 0", "note 1", "note 2", "after compaction"]
+    assert reader._log_records == 4
+
+
+def test_secure_memory_migrates_from_log(tmp_path):
+    system = make_system(tmp_path)
+    (system.json_dir / "memories.json").write_text("[]")  # Stale pre-log snapshot
+    system.save_memory("public deploy note")
+    system.save_memory("api key for stripe")
+
+    secure = SecureMemorySystem()
+    secure.files = {level: tmp_path / f"memories_{level.value}.json" for level in SecurityLevel}
+    assert secure.migrate_existing_memories(system.json_log) == {"migrated": 2, "skipped": 0}
+    assert [m['text'] for m in secure.search_memories("note", SecurityLevel.PUBLIC)] == ["public deploy note"]
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Coding History Search Tests
+The FTS sidecar must match anywhere in a chunk (as the old LIKE scan did) and
+must not index a large backlog inline on a search request
+
+Usage:
+    python3 -m pytest scripts/test_coding_history_search.py -q
+"""
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import coding_history_search
+from coding_history_search import ChunkReader, HistorySearchIndex
+
+
+class FakeHistoryDB:
+    """The parts of CodingHistoryDB the index reads: conn, lock and two tables"""
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("CREATE TABLE sessions (session_id TEXT, project_path TEXT, tool_name TEXT)")
+        self.conn.execute("""
+            CREATE TABLE output_chunks (
+                session_id TEXT, output_type TEXT, timestamp TEXT, compressed_path TEXT
+            )
+        """)
+        self.conn.execute("INSERT INTO sessions VALUES ('s1', '/tmp/project', 'terminal')")
+
+    def add_chunk(self, chunk_dir: Path, text: str) -> Path:
+        with self.lock:
+            rowid = self.conn.execute("SELECT COUNT(*) FROM output_chunks").fetchone()[0] + 1
+            path = chunk_dir / f"chunk_{rowid}.txt"
+            path.write_text(text)
+            self.conn.execute(
+                "INSERT INTO output_chunks VALUES ('s1', 'stdout', ?, ?)",
+                (f"2026-01-01T00:{rowid // 60:02d}:{rowid % 60:02d}", str(path))
+            )
+            self.conn.commit()
+        return path
+
+
+def make_index(tmp_path) -> HistorySearchIndex:
+    reader = ChunkReader(dict_dir=tmp_path / "dicts", fallback=lambda path: Path(path).read_text())
+    return HistorySearchIndex(tmp_path / "index.db", reader=reader)
+
+
+def test_matches_text_past_the_preview(tmp_path):
+    db = FakeHistoryDB(tmp_path / "history.db")
+    db.add_chunk(tmp_path, "x" * 20000 + " late-needle")
+    db.add_chunk(tmp_path, "early-needle " + "y" * 100)
+    index = make_index(tmp_path)
+
+    assert index.sync_or_defer(db) is True
+    late = index.search("late-needle")
+    assert len(late) == 1
+    assert late[0]['text_length'] == 20000 + len(" late-needle")
+    assert len(index.search("late-needle", preview_chars=1000)[0]['content']) == 1000
+    assert len(index.search("early-needle")) == 1
+
+
+def test_large_backlog_is_synced_in_background(tmp_path, monkeypatch):
+    monkeypatch.setattr(coding_history_search, 'SYNC_BATCH', 5)
+    db = FakeHistoryDB(tmp_path / "history.db")
+    for i in range(30):
+        db.add_chunk(tmp_path, f"chunk {i} needle")
+    index = make_index(tmp_path)
+
+    assert index.backlog(db) == 30
+    assert index.sync_or_defer(db, max_rows=10) is False
+    index.sync_in_background(db, session_log=False).join(timeout=10)
+
+    assert index.count() == 30
+    assert index.backlog(db) == 0
+    assert index.sync_or_defer(db, max_rows=10) is True
+    assert len(index.search("needle", limit=100)) == 30
+
+
+def test_bounded_sync_stops_early(tmp_path, monkeypatch):
+    monkeypatch.setattr(coding_history_search, 'SYNC_BATCH', 5)
+    db = FakeHistoryDB(tmp_path / "history.db")
+    for i in range(12):
+        db.add_chunk(tmp_path, f"chunk {i}")
+    index = make_index(tmp_path)
+
+    assert index.sync(db, max_rows=5) == 5
+    assert index.backlog(db) == 7
+    assert index.sync(db) == 7
+
+
+def test_old_truncated_index_is_rebuilt(tmp_path):
+    db = FakeHistoryDB(tmp_path / "history.db")
+    db.add_chunk(tmp_path, "some text")
+    index = make_index(tmp_path)
+    index.sync(db)
+    with index.lock:
+        index.conn.execute("UPDATE meta SET value = '1' WHERE key = 'index_version'")
+        index.conn.commit()
+    index.close()
+
+    reopened = make_index(tmp_path)
+    assert reopened.count() == 0
+    assert reopened.backlog(db) == 1
+    assert reopened.sync(db) == 1
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Job Queue Tests
+Leasing, lease expiry, stale-owner protection, retries and run_workers scoping
+
+Usage:
+    python3 -m pytest scripts/test_job_queue.py -q
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import job_queue
+from job_queue import JobQueue, run_workers
+
+
+def make_queue(tmp_path) -> JobQueue:
+    return JobQueue(tmp_path / "queue.db")
+
+
+def test_enqueue_is_idempotent(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.enqueue('transcript', ['a', 'b', 'a']) == 2
+    assert queue.enqueue('transcript', ['a', 'b', 'c']) == 1
+    assert queue.outstanding(['transcript']) == 3
+
+
+def test_lease_is_exclusive_until_expiry(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue('transcript', ['a'])
+
+    first = queue.lease('transcript', 'w1', lease_seconds=0.2)
+    assert [job.item_id for job in first] == ['a']
+    assert queue.lease('transcript', 'w2') == []
+
+    time.sleep(0.3)
+    second = queue.lease('transcript', 'w2')
+    assert [job.item_id for job in second] == ['a']
+    assert second[0].attempts == 2
+
+
+def test_expired_final_attempt_is_dead_lettered(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue('transcript', ['a'], max_attempts=1)
+
+    queue.lease('transcript', 'crashed', lease_seconds=0.1)
+    time.sleep(0.2)
+
+    assert queue.lease('transcript', 'w2') == []
+    assert queue.status_of('transcript', ['a']) == {'a': 'dead'}
+    assert queue.outstanding(['transcript']) == 0
+
+
+def test_stale_owner_cannot_overwrite_result(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue('transcript', ['a'])
+
+    stale = queue.lease('transcript', 'w1', lease_seconds=0.1)[0]
+    time.sleep(0.2)
+    current = queue.lease('transcript', 'w2')[0]
+
+    assert queue.heartbeat(stale) is False
+    assert queue.complete(stale) is False
+    assert queue.fail(stale, 'boom') is None
+    assert queue.status_of('transcript', ['a']) == {'a': 'leased'}
+    assert queue.outstanding(['comments']) == 0
+
+    assert queue.complete(current) is True
+    assert queue.status_of('transcript', ['a']) == {'a': 'done'}
+    assert queue.status_of('comments', ['a']) == {'a': 'pending'}
+
+
+def test_fail_retries_then_dead_letters(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, 'BACKOFF_BASE', 0.0)
+    queue = make_queue(tmp_path)
+    queue.enqueue('insights', ['a'], max_attempts=2)
+
+    assert queue.fail(queue.lease('insights', 'w')[0], 'first') == 'pending'
+    assert queue.fail(queue.lease('insights', 'w')[0], 'second') == 'dead'
+    assert [job['error'] for job in queue.dead('insights')] == ['second']
+
+    assert queue.retry_dead('insights') == 1
+    assert queue.status_of('insights', ['a']) == {'a': 'pending'}
+
+
+def test_lease_filters_by_item_ids(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue('insights', ['mine1', 'other', 'mine2'])
+
+    leased = queue.lease('insights', 'w', limit=10, item_ids=['mine1', 'mine2'])
+    assert sorted(job.item_id for job in leased) == ['mine1', 'mine2']
+    assert queue.outstanding(['insights'], ['mine1', 'mine2']) == 2
+    assert queue.lease('insights', 'w', limit=10, item_ids=['mine1', 'mine2']) == []
+
+
+def test_run_workers_only_processes_requested_items(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue('insights', ['other'])
+    queue.enqueue('insights', ['a', 'b'])
+
+    seen = []
+    totals = run_workers(
+        queue,
+        {'insights': lambda job: seen.append(job.item_id) or {'status': 'success', 'next_stage': None}},
+        max_workers=2,
+        poll_interval=0.05,
+        item_ids=['a', 'b'],
+    )
+
+    assert sorted(seen) == ['a', 'b']
+    assert totals['done'] == 2
+    assert queue.status_of('insights', ['other']) == {'other': 'pending'}
+
+
+def test_run_workers_heartbeats_long_jobs(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue('insights', ['slow'])
+    calls = []
+    lock = threading.Lock()
+
+    def handler(job):
+        with lock:
+            calls.append(job.item_id)
+        time.sleep(0.8)  # Several times the lease length
+        return {'status': 'success', 'next_stage': None}
+
+    totals = run_workers(queue, {'insights': handler}, max_workers=3,
+                         poll_interval=0.05, lease_seconds=0.3)
+
+    assert calls == ['slow']
+    assert totals == {'done': 1, 'retried': 0, 'dead': 0, 'lost': 0}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Query Engine Tests
+Indexed Collection queries must return exactly what the servers' linear
+json.dumps(item).lower() scans returned, in the same order
+
+Usage:
+    python3 -m pytest scripts/test_query_engine.py -q
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from query_engine import Collection, Text, Match, Equals, AtLeast
+
+WORDS = ["enduro", "trail", "fork", "shock", "carbon", "alloy", "e-bike", "29er",
+         "Santa Cruz", "SRAM", "Shimano", "pricing", "ai", "agents", "saas", "workflow"]
+
+
+def make_items(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        item = {
+            "name": " ".join(rng.sample(WORDS, 3)),
+            "category": rng.choice(["bike", "component", "gear"]),
+            "likes": rng.choice([0, 5, 10, 10, 500, 10000, 25000]),
+            "meta": {"score": rng.randint(0, 100)},
+        }
+        if rng.random() < 0.3:
+            item["sentiment"] = rng.choice(["positive", "negative"])
+        if rng.random() < 0.2:
+            del item["likes"]
+        items.append(item)
+    return items
+
+
+def scan(items, query=None, filters=None, min_likes=None, order_by=None, limit=None):
+    """The linear scan the servers used before the query engine"""
+    found = []
+    for item in items:
+        if query and query.lower() not in json.dumps(item).lower():
+            continue
+        if filters and any(k in item and item[k] != v for k, v in filters.items()):
+            continue
+        if min_likes is not None and item.get("likes", 0) < min_likes:
+            continue
+        found.append(item)
+    if order_by:
+        found = sorted(found, key=lambda item: item.get(order_by, 0), reverse=True)
+    return found[:limit] if limit is not None else found
+
+
+ITEMS = make_items(2000)
+COLLECTION = Collection(ITEMS, fields=["category", "sentiment"], ranges=["likes"])
+
+QUERIES = ["enduro", "Santa Cruz", "cruz", "e-bike", "bike", "ai", "a", "29er fork",
+           "\"category\": \"gear\"", "nothing-matches-this", "", None]
+
+
+def test_text_matches_substring_scan():
+    for query in QUERIES:
+        for limit in (None, 1, 20):
+            assert COLLECTION.find(Text(query), limit=limit) == scan(ITEMS, query, limit=limit), query
+
+
+def test_filters_match_scan():
+    for query in ("enduro", None):
+        for filters in ({"category": "bike"}, {"sentiment": "positive"},
+                        {"category": "gear", "sentiment": "negative"}):
+            assert COLLECTION.find(Text(query), Match(filters)) == scan(ITEMS, query, filters)
+
+
+def test_threshold_and_ordering_match_scan():
+    for threshold in (0, 10, 10000, 10**9):
+        for limit in (None, 5, 50):
+            expected = scan(ITEMS, min_likes=threshold, order_by="likes", limit=limit)
+            actual = COLLECTION.find(AtLeast("likes", threshold), order_by="likes", limit=limit)
+            assert actual == expected
+
+
+def test_nested_paths_and_equality():
+    expected = [item for item in ITEMS if item["meta"]["score"] >= 90]
+    assert COLLECTION.find(AtLeast(("meta", "score"), 90)) == expected
+
+    expected = [item for item in ITEMS if item.get("sentiment") is None]
+    assert COLLECTION.find(Equals("sentiment", None)) == expected
+
+
+def test_lazy_text_index_matches_eager():
+    lazy = Collection(ITEMS, text=False)
+    for query in QUERIES:
+        assert lazy.find(Text(query), limit=10) == COLLECTION.find(Text(query), limit=10)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Secure Memory Tests
+MemoryIndex searches must return exactly what the linear substring scan
+returned, and SecureMemorySystem must keep each level's index current
+
+Usage:
+    python3 -m pytest scripts/test_secure_memory.py -q
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from secure_memory import MemoryIndex, SecureMemorySystem, SecurityLevel
+from benchmark_secure_memory import generate_memories, scan
+
+MEMORIES = generate_memories(3000, seed=11) + [
+    {"id": 9001, "text": "API key: sk-test_ABC123 for Stripe (prod)"},
+    {"id": 9002, "text": "Meeting at 10:30 — café with Zoë re: pricing"},
+    {"id": 9003, "text": "   "},
+    {"id": 9004, "text": "deploy-deploy deployment deployed"},
+]
+
+QUERIES = [
+    "deploy", "DEPLOY", "migration schema", "schema migration", "pipe", "ploy",
+    "ticket-42", "ticket-4", "sk-test_abc", "10:30", "café", "zoë re", " (prod)",
+    "re: pricing", "-", " ", "", "nonexistent phrase", "deploy deploy",
+]
+
+
+def test_index_matches_scan():
+    index = MemoryIndex(MEMORIES)
+    for query in QUERIES:
+        assert index.search(query.lower()) == scan(MEMORIES, query), query
+
+
+def test_incremental_add_matches_scan():
+    index = MemoryIndex([])
+    for query in QUERIES:
+        index.search(query.lower())  # Warm the per-word token cache before adding
+    for memory in MEMORIES:
+        index.add(memory)
+    for query in QUERIES:
+        assert index.search(query.lower()) == scan(MEMORIES, query), query
+
+
+def make_system(tmp_path) -> SecureMemorySystem:
+    system = SecureMemorySystem()
+    system.files = {level: tmp_path / f"memories_{level.value}.json" for level in SecurityLevel}
+    return system
+
+
+def test_search_respects_levels(tmp_path):
+    system = make_system(tmp_path)
+    system.save_memory("public deploy note")
+    system.save_memory("private deploy note", SecurityLevel.PRIVATE)
+    system.save_memory("secret deploy key", SecurityLevel.SECRET)
+
+    assert [m['text'] for m in system.search_memories("deploy")] == [
+        "public deploy note", "private deploy note"
+    ]
+    assert [m['text'] for m in system.search_memories("deploy", SecurityLevel.SECRET)] == [
+        "secret deploy key"
+    ]
+
+
+def test_index_rebuilds_when_file_changes(tmp_path):
+    system = make_system(tmp_path)
+    system.save_memory("first entry")
+    assert len(system.search_memories("entry")) == 1
+
+    path = system.files[SecurityLevel.PUBLIC]
+    memories = json.loads(path.read_text())
+    memories.append({**memories[0], "id": 2, "text": "second entry written elsewhere"})
+    path.write_text(json.dumps(memories))
+
+    assert [m['id'] for m in system.search_memories("entry")] == [1, 2]
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Text Analytics - Single-pass post signals for Reddit/social collectors
+
+Each post is normalized once and scanned once to emit every signal the
+weekly snapshots need:
+- VADER sentiment (one polarity_scores call per post)
+- Topic tokens (title words, stop words removed)
+- Pain keyword hit
+- Tool/solution mentions (post + comments)
+- Question flag
+
+Patterns and stop words are compiled once at import time, and the VADER
+analyzer is created once per process. `analyze_posts` fans large batches
+out over a process pool for year-scale backfills.
+
+Usage:
+    signals = analyze_posts(posts, workers=8)
+    topics = top_topics(signals)
+    pains = top_pain_points(posts, signals)
+"""
+
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+except ImportError:
+    SentimentIntensityAnalyzer = None
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been',
+    'i', 'you', 'we', 'they', 'my', 'your', 'our', 'their', 'this', 'that',
+    'how', 'what', 'when', 'where', 'why', 'do', 'does', 'did', 'can', 'should'
+})
+
+PAIN_KEYWORDS = ('problem', 'issue', 'struggle', 'difficult', 'challenge', 'frustrat',
+                 'stuck', 'fail', 'help', 'advice', 'how to', 'can\'t', 'unable')
+
+WORD_RE = re.compile(r'\b[a-z]{3,}\b')
+PAIN_RE = re.compile('|'.join(re.escape(keyword) for keyword in PAIN_KEYWORDS))
+TOOL_RE = re.compile(
+    r'\b(?:using|use|used|try|recommend|love|hate|prefer|switch|migrate)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b'
+)
+
+# Batches smaller than this are analyzed in-process (pool startup dominates)
+MIN_PARALLEL_POSTS = 500
+
+_analyzer = None
+
+
+def get_sentiment_analyzer():
+    """Per-process VADER analyzer"""
+    global _analyzer
+    if _analyzer is None:
+        if SentimentIntensityAnalyzer is None:
+            raise ImportError("vaderSentiment is required: pip install vaderSentiment")
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def sentiment_label(compound: float) -> str:
+    """Map a VADER compound score to positive/negative/neutral"""
+    if compound >= 0.05:
+        return 'positive'
+    if compound <= -0.05:
+        return 'negative'
+    return 'neutral'
+
+
+def score_sentiment(text: str) -> Dict:
+    """
+    VADER scores plus label for a piece of text
+
+    Returns:
+        {'compound', 'pos', 'neg', 'neu', 'label', 'confidence'}; empty text is neutral/0
+    """
+    if not text or not text.strip():
+        return {'compound': 0, 'pos': 0, 'neg': 0, 'neu': 0, 'label': 'neutral', 'confidence': 0}
+
+    scores = get_sentiment_analyzer().polarity_scores(text)
+    return {
+        'compound': scores['compound'],
+        'pos': scores['pos'],
+        'neg': scores['neg'],
+        'neu': scores['neu'],
+        'label': sentiment_label(scores['compound']),
+        'confidence': max(scores['pos'], scores['neg'], scores['neu'])
+    }
+
+
+def analyze_post(post: Dict) -> Dict:
+    """
+    Emit all text signals for one post in a single pass
+
+    Args:
+        post: Dict with 'title' and 'selftext' (or 'text'), optional 'comments'
+
+    Returns:
+        {'sentiment', 'topic_tokens', 'is_pain', 'tools', 'is_question'}
+    """
+    title = post.get('title', '') or ''
+    body = post.get('selftext', post.get('text', '')) or ''
+    text = title + ' ' + body
+
+    comment_text = ' '.join(c.get('body', '') for c in post.get('comments', []) or [])
+
+    return {
+        'sentiment': score_sentiment(text),
+        'topic_tokens': [w for w in WORD_RE.findall(title.lower()) if w not in STOP_WORDS],
+        'is_pain': PAIN_RE.search(text.lower()) is not None,
+        'tools': TOOL_RE.findall(f"{text} {comment_text}" if comment_text else text),
+        'is_question': '?' in title
+    }
+
+
+def _analyze_chunk(posts: List[Dict]) -> List[Dict]:
+    return [analyze_post(post) for post in posts]
+
+
+def analyze_posts(posts: List[Dict], workers: Optional[int] = None,
+                  min_parallel: int = MIN_PARALLEL_POSTS) -> List[Dict]:
+    """
+    Analyze many posts, in a process pool when the batch is large enough
+
+    Args:
+        posts: Post dicts
+        workers: Worker processes (None = CPU count, 1 = in-process)
+        min_parallel: Smallest batch worth a pool
+
+    Returns:
+        Signals in the same order as posts
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(posts) < min_parallel:
+        return _analyze_chunk(posts)
+
+    chunk_size = max(50, len(posts) // (workers * 4))
+    chunks = [posts[i:i + chunk_size] for i in range(0, len(posts), chunk_size)]
+
+    signals = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_signals in executor.map(_analyze_chunk, chunks):
+            signals.extend(chunk_signals)
+    return signals
+
+
+# ----------------------------------------------------------------------
+# Aggregation (output shapes match the weekly snapshot qualifiers)
+# ----------------------------------------------------------------------
+
+def top_topics(signals: List[Dict], limit: int = 10) -> Dict:
+    """Most frequent title words"""
+    word_freq = Counter()
+    for signal in signals:
+        word_freq.update(signal['topic_tokens'])
+
+    return {
+        'top_topics': [
+            {'topic': word, 'mentions': count, 'growth': None}
+            for word, count in word_freq.most_common(limit)
+        ]
+    }
+
+
+def top_pain_points(posts: List[Dict], signals: List[Dict], limit: int = 10) -> List[Dict]:
+    """Posts hitting a pain keyword, ranked by score x severity"""
+    pain_points = []
+    for post, signal in zip(posts, signals):
+        if not signal['is_pain']:
+            continue
+
+        sentiment = signal['sentiment']
+        pain_points.append({
+            'text': post.get('title', ''),
+            'score': post.get('score', 0),
+            'severity': abs(sentiment['compound']) if sentiment['label'] == 'negative' else 0.5,
+            'url': post.get('permalink', '')
+        })
+
+    pain_points.sort(key=lambda x: x['score'] * x['severity'], reverse=True)
+    return pain_points[:limit]
+
+
+def top_tools(signals: List[Dict], limit: int = 10) -> Dict:
+    """Most mentioned tools/solutions"""
+    tools_mentioned = Counter()
+    for signal in signals:
+        tools_mentioned.update(signal['tools'])
+
+    return {
+        'top_tools_mentioned': [
+            {'tool': tool, 'mentions': count}
+            for tool, count in tools_mentioned.most_common(limit)
+        ]
+    }
+
+
+def top_questions(posts: List[Dict], signals: List[Dict], limit: int = 10) -> List[Dict]:
+    """Question titles ranked by upvotes"""
+    questions = [
+        {
+            'question': post.get('title', ''),
+            'upvotes': post.get('score', 0),
+            'answers': post.get('num_comments', 0),
+            'url': post.get('permalink', '')
+        }
+        for post, signal in zip(posts, signals)
+        if signal['is_question']
+    ]
+
+    questions.sort(key=lambda x: x['upvotes'], reverse=True)
+    return questions[:limit]
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Transcript Store - Streaming access to data/transcripts/*_full.json
+
+Transcript files carry every segment plus comments and API metadata, so
+json.load-ing one just to read its title or join its text is the dominant
+cost for both the API server and the bulk reports. This module splits a
+transcript into:
+- Header: title, channel, method, language, segment count, duration,
+  text length, comment count and short metadata fields. Headers are
+  scanned once per file version and cached in data/transcript_headers.json
+  (validated by mtime + size), so bulk scans never parse segments.
+- Segments: iterated lazily (streamed with ijson when installed, so
+  early-exit consumers stop reading the file) and materialized only on
+  request.
+- Text: the joined segment text, computed once per Transcript object.
+
+Usage:
+    library = TranscriptLibrary()
+    for header in library.headers():
+        print(header['title'], header['duration'])
+
+    transcript = library.get(video_id)
+    transcript.text                    # cached joined text
+    transcript.head_text(3000)         # stops after 3000 chars
+    for seg in transcript.iter_segments(): ...
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from artifact_store import write_json_atomic
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSCRIPTS_DIR = Path('/Users/yourox/AI-Workspace/data/transcripts')
+INDEX_FILENAME = 'transcript_headers.json'
+INDEX_VERSION = 1
+
+TOP_LEVEL_FIELDS = ('video_id', 'title', 'channel', 'method', 'agent_id',
+                    'extraction_method', 'extracted_at', 'url')
+# Longer strings (descriptions, raw text) stay out of the header
+MAX_HEADER_STRING = 300
+
+# Parsed transcripts kept per library (API detail pages re-open the same videos)
+TRANSCRIPT_CACHE_SIZE = 32
+
+
+def join_segments(segments: Iterable[Dict], limit: Optional[int] = None) -> str:
+    """
+    Join segment texts with spaces
+
+    Args:
+        segments: Segment dicts (any iterable, consumed lazily)
+        limit: Stop once this many characters are collected (result is truncated to it)
+
+    Returns:
+        Joined text
+    """
+    if limit is None:
+        return ' '.join(seg.get('text', '') for seg in segments)
+
+    parts = []
+    length = 0
+    for seg in segments:
+        text = seg.get('text', '')
+        parts.append(text)
+        length += len(text) + 1
+        if length >= limit:
+            break
+    return ' '.join(parts)[:limit]
+
+
+def _header_value(value):
+    if isinstance(value, str) and len(value) > MAX_HEADER_STRING:
+        return None
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return None
+
+
+class _HeaderBuilder:
+    """Accumulates header fields from either a parsed document or a parse event stream"""
+
+    def __init__(self):
+        self.header = {field: None for field in TOP_LEVEL_FIELDS}
+        self.header.update({
+            'format': None,
+            'language': None,
+            'segment_count': 0,
+            'duration': 0.0,
+            'text_chars': 0,
+            'comment_count': 0,
+            'metadata': {}
+        })
+        self._last_start = 0.0
+        self._last_duration = 0.0
+        self._comment_items = 0
+        self._comment_total = None
+
+    def segment(self, seg: Dict):
+        self.begin_segment()
+        self.segment_text(seg.get('text', ''))
+        self._last_start = seg.get('start', 0) or 0
+        self._last_duration = seg.get('duration', 0) or 0
+
+    def begin_segment(self):
+        self.header['segment_count'] += 1
+        self._last_start = 0.0
+        self._last_duration = 0.0
+
+    def segment_text(self, text: str):
+        self.header['text_chars'] += len(text or '')
+
+    def build(self) -> Dict:
+        header = self.header
+        count = header['segment_count']
+        if count:
+            # Joined with single spaces
+            header['text_chars'] += count - 1
+            header['duration'] = float(self._last_start) + float(self._last_duration)
+        if header['format'] == 'segments' and header['language'] is None:
+            header['language'] = 'en'
+        header['comment_count'] = (self._comment_total if self._comment_total is not None
+                                   else self._comment_items)
+        if isinstance(header['channel'], dict):
+            header['channel'] = header['channel'].get('name')
+        return header
+
+    # ------------------------------------------------------------------
+    # Parsed document
+    # ------------------------------------------------------------------
+
+    def from_document(self, data: Dict) -> Dict:
+        for field in TOP_LEVEL_FIELDS:
+            if field in data:
+                self.header[field] = _header_value(data[field])
+        if isinstance(data.get('channel'), dict):
+            self.header['channel'] = _header_value(data['channel'].get('name'))
+
+        metadata = data.get('metadata')
+        if isinstance(metadata, dict):
+            self.header['metadata'] = {
+                key: value for key, value in metadata.items()
+                if _header_value(value) is not None
+            }
+
+        transcript = data.get('transcript')
+        if isinstance(transcript, dict):
+            self.header['format'] = 'segments'
+            self.header['language'] = _header_value(transcript.get('language'))
+            for seg in transcript.get('segments', []) or []:
+                self.segment(seg)
+        elif isinstance(transcript, list):
+            self.header['format'] = 'list'
+            for seg in transcript:
+                self.segment(seg)
+        elif isinstance(transcript, str):
+            self.header['format'] = 'text'
+            self.header['text_chars'] = len(transcript)
+
+        comments = data.get('comments')
+        if isinstance(comments, list):
+            self._comment_items = len(comments)
+        elif isinstance(comments, dict):
+            self._comment_items = len(comments.get('top_comments', []) or [])
+            if isinstance(comments.get('count'), (int, float)):
+                self._comment_total = int(comments['count'])
+
+        return self.build()
+
+    # ------------------------------------------------------------------
+    # ijson event stream (segments are counted, never materialized)
+    # ------------------------------------------------------------------
+
+    def from_events(self, events) -> Dict:
+        segment_prefix = None
+
+        for prefix, event, value in events:
+            if prefix in TOP_LEVEL_FIELDS:
+                if event in ('string', 'number', 'boolean', 'null'):
+                    self.header[prefix] = _header_value(value)
+            elif prefix == 'channel.name' and event == 'string':
+                self.header['channel'] = _header_value(value)
+            elif prefix.startswith('metadata.') and prefix.count('.') == 1:
+                if event in ('string', 'number', 'boolean'):
+                    value = _header_value(value)
+                    if value is not None:
+                        self.header['metadata'][prefix[len('metadata.'):]] = value
+            elif prefix == 'transcript':
+                if event == 'start_map':
+                    self.header['format'] = 'segments'
+                    segment_prefix = 'transcript.segments.item'
+                elif event == 'start_array':
+                    self.header['format'] = 'list'
+                    segment_prefix = 'transcript.item'
+                elif event == 'string':
+                    self.header['format'] = 'text'
+                    self.header['text_chars'] = len(value)
+            elif prefix == 'transcript.language' and event == 'string':
+                self.header['language'] = _header_value(value)
+            elif segment_prefix and prefix.startswith(segment_prefix):
+                field = prefix[len(segment_prefix):]
+                if field == '' and event == 'start_map':
+                    self.begin_segment()
+                elif field == '.text' and event == 'string':
+                    self.segment_text(value)
+                elif field == '.start' and event == 'number':
+                    self._last_start = value
+                elif field == '.duration' and event == 'number':
+                    self._last_duration = value
+            elif prefix in ('comments.item', 'comments.top_comments.item') and event == 'start_map':
+                self._comment_items += 1
+            elif prefix == 'comments.count' and event == 'number':
+                self._comment_total = int(value)
+
+        return self.build()
+
+
+def scan_header(path: Path) -> Dict:
+    """
+    Read a transcript's header fields
+
+    Streams the file with ijson when available (no segment dicts are
+    built); otherwise falls back to a full json.load.
+    """
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            return _HeaderBuilder().from_events(ijson.parse(f, use_float=True))
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return _HeaderBuilder().from_document(json.load(f))
+
+
+class Transcript:
+    """One transcript file with lazy segments and cached joined text"""
+
+    def __init__(self, path: Path, header: Optional[Dict] = None):
+        self.path = Path(path)
+        self.video_id = self.path.name.replace('_full.json', '')
+        self._header = header
+        self._document = None
+        self._segments = None
+
+    @property
+    def header(self) -> Dict:
+        """Header fields (see TranscriptLibrary.header)"""
+        if self._header is None:
+            self._header = scan_header(self.path)
+        return self._header
+
+    @property
+    def title(self) -> str:
+        return self.header.get('title') or ''
+
+    @property
+    def language(self) -> str:
+        return self.header.get('language') or 'en'
+
+    @property
+    def duration(self) -> float:
+        return self.header.get('duration') or 0
+
+    def load(self) -> Dict:
+        """Full parsed document (cached on this object)"""
+        if self._document is None:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._document = json.load(f)
+        return self._document
+
+    def iter_segments(self) -> Iterator[Dict]:
+        """
+        Yield segments in order without materializing the list
+
+        With ijson, stopping early stops reading the file.
+        """
+        if self._segments is not None:
+            yield from self._segments
+            return
+
+        if self._document is None and ijson is not None:
+            fmt = self.header.get('format')
+            if fmt not in ('segments', 'list'):
+                return
+            item_prefix = 'transcript.segments.item' if fmt == 'segments' else 'transcript.item'
+            with open(self.path, 'rb') as f:
+                yield from ijson.items(f, item_prefix, use_float=True)
+            return
+
+        yield from self.segments
+
+    @cached_property
+    def segments(self) -> List[Dict]:
+        """All segments as a list (parsed once per object)"""
+        if self._segments is None:
+            if self._document is None and ijson is not None:
+                self._segments = list(self.iter_segments())
+            else:
+                transcript = self.load().get('transcript')
+                if isinstance(transcript, dict):
+                    self._segments = transcript.get('segments', []) or []
+                elif isinstance(transcript, list):
+                    self._segments = transcript
+                else:
+                    self._segments = []
+        return self._segments
+
+    @cached_property
+    def text(self) -> str:
+        """Joined segment text (computed once)"""
+        if self.header.get('format') == 'text':
+            return self.load().get('transcript', '')
+        return join_segments(self.iter_segments())
+
+    def head_text(self, limit: int) -> str:
+        """First `limit` characters of the text, reading only as many segments as needed"""
+        if 'text' in self.__dict__ or self.header.get('format') == 'text':
+            return self.text[:limit]
+        return join_segments(self.iter_segments(), limit=limit)
+
+    def comments(self):
+        """
+        Comments block as stored ({'count', 'top_comments'} or a list)
+
+        With ijson only the comments subtree is built; segments are skipped.
+        """
+        if self._document is None and ijson is not None:
+            if not self.header.get('comment_count'):
+                return {}
+            with open(self.path, 'rb') as f:
+                return next(ijson.items(f, 'comments', use_float=True), {})
+        return self.load().get('comments', {})
+
+
+class TranscriptLibrary:
+    """Directory of transcripts with a persisted header index"""
+
+    def __init__(self, transcripts_dir: Path = DEFAULT_TRANSCRIPTS_DIR, index_path: Optional[Path] = None,
+                 cache_size: int = TRANSCRIPT_CACHE_SIZE):
+        self.transcripts_dir = Path(transcripts_dir)
+        self.index_path = Path(index_path) if index_path else self.transcripts_dir.parent / INDEX_FILENAME
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._dirty = False
+        self._transcripts = OrderedDict()
+
+        if ijson is None:
+            logger.warning("ijson is not installed - transcripts are fully parsed with json.load "
+                           "(pip install ijson for streaming headers and segments)")
+
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get('version') != INDEX_VERSION:
+            return {}
+        return index.get('files', {})
+
+    def save_index(self):
+        """Persist the header index if any entry changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            files = dict(self._index)
+            self._dirty = False
+        try:
+            write_json_atomic(self.index_path, {'version': INDEX_VERSION, 'files': files}, indent=None)
+        except OSError as e:
+            print(f"⚠️  Could not save transcript header index: {e}")
+
+    def path_for(self, video_id: str) -> Path:
+        return self.transcripts_dir / f"{video_id}_full.json"
+
+    def exists(self, video_id: str) -> bool:
+        return self.path_for(video_id).exists()
+
+    def _header_for_path(self, path: Path, stat: Optional[os.stat_result] = None) -> Dict:
+        stat = stat or path.stat()
+        with self._lock:
+            entry = self._index.get(path.name)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['header']
+
+        header = scan_header(path)
+        with self._lock:
+            self._index[path.name] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'header': header}
+            self._dirty = True
+        return header
+
+    def header(self, video_id: str) -> Optional[Dict]:
+        """
+        Header fields for one video, without parsing segments
+
+        Returns:
+            {'video_id', 'title', 'channel', 'method', 'agent_id', 'language',
+             'segment_count', 'duration', 'text_chars', 'comment_count', 'metadata', ...}
+            or None if the transcript file is missing
+        """
+        path = self.path_for(video_id)
+        try:
+            return self._header_for_path(path)
+        except FileNotFoundError:
+            return None
+
+    def headers(self, pattern: str = '*_full.json', save: bool = True) -> Iterator[Dict]:
+        """
+        Yield the header of every transcript file (cached headers are free)
+
+        Each header gets a 'file' entry with name, size and mtime. Unreadable
+        files are reported and skipped.
+        """
+        try:
+            for path in sorted(self.transcripts_dir.glob(pattern)):
+                try:
+                    stat = path.stat()
+                    header = self._header_for_path(path, stat)
+                except (OSError, ValueError) as e:
+                    print(f"Error processing {path.name}: {e}")
+                    continue
+                yield {**header, 'file': {'name': path.name, 'size': stat.st_size, 'mtime': stat.st_mtime}}
+        finally:
+            if save:
+                self.save_index()
+
+    def get(self, video_id: str) -> Optional[Transcript]:
+        """
+        Transcript object for a video (recently used ones are reused while the file is unchanged)
+
+        Returns:
+            Transcript, or None if the file is missing
+        """
+        path = self.path_for(video_id)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._transcripts.get(video_id)
+            if cached and cached[0] == key:
+                self._transcripts.move_to_end(video_id)
+                return cached[1]
+
+        transcript = Transcript(path, header=self._header_for_path(path, stat))
+        with self._lock:
+            self._transcripts[video_id] = (key, transcript)
+            self._transcripts.move_to_end(video_id)
+            while len(self._transcripts) > self.cache_size:
+                self._transcripts.popitem(last=False)
+        return transcript
+
+    def open(self, path: Path) -> Transcript:
+        """Transcript object for an arbitrary file path (header from the index when inside this library)"""
+        path = Path(path)
+        if path.parent.resolve() == self.transcripts_dir.resolve():
+            transcript = self.get(path.name.replace('_full.json', ''))
+            if transcript is not None:
+                return transcript
+        return Transcript(path)
+
+
+_default_library = None
+
+
+def get_library(transcripts_dir: Path = DEFAULT_TRANSCRIPTS_DIR) -> TranscriptLibrary:
+    """Shared library for the default transcripts directory"""
+    global _default_library
+    if transcripts_dir != DEFAULT_TRANSCRIPTS_DIR:
+        return TranscriptLibrary(transcripts_dir)
+    if _default_library is None:
+        _default_library = TranscriptLibrary()
+    return _default_library
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TRANSCRIPTS_DIR
+    library = TranscriptLibrary(directory)
+
+    start = time.time()
+    count = segments = 0
+    duration = 0.0
+    for header in library.headers():
+        count += 1
+        segments += header['segment_count']
+        duration += header['duration']
+
+    print(f"📝 {count} transcripts, {segments:,} segments, {duration / 3600:.1f} hours")
+    print(f"⏱️  Header scan: {time.time() - start:.2f}s (index: {library.index_path})")
+    print(f"   Streaming parser: {'ijson' if ijson else 'json (pip install ijson for streaming)'}")
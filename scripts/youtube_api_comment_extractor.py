@@ -2,16 +2,17 @@
 """
 YouTube Data API v3 Comment & Metadata Extractor
 Free tier: 10,000 quota units/day
-- Video metadata: 1 unit
+- Video metadata: 1 unit per 50 videos (batched videos.list)
 - Comments: 1 unit per request (100 comments per request)
+Requests, caching and quota accounting go through youtube_metadata_service.
 """
 
 import os
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Iterable, Optional
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+
+from youtube_metadata_service import YouTubeMetadataService, YouTubeAPIError, video_metadata
 
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
@@ -19,150 +20,98 @@ load_dotenv('/Users/yourox/AI-Workspace/.env')
 class YouTubeAPIExtractor:
     """Extract comments and metadata using YouTube Data API v3"""
 
-    def __init__(self):
+    def __init__(self, service: Optional[YouTubeMetadataService] = None, use_cache: bool = True):
         self.api_key = os.getenv('GOOGLE_API_KEY')
-        if not self.api_key:
+        if not self.api_key and service is None:
             raise ValueError("GOOGLE_API_KEY not found in .env")
 
-        self.youtube = build('youtube', 'v3', developerKey=self.api_key)
-        self.quota_used = 0
+        self.service = service or YouTubeMetadataService(api_key=self.api_key, use_cache=use_cache)
+
+    @property
+    def quota_used(self) -> int:
+        """Quota units spent by this process"""
+        return self.service.quota.session_used
 
     def get_video_metadata(self, video_id: str) -> Optional[Dict]:
         """
-        Get video metadata (1 quota unit)
+        Get video metadata (1 quota unit, 0 if cached)
         Returns: title, channel, views, likes, duration, description, tags
         """
-        try:
-            request = self.youtube.videos().list(
-                part='snippet,statistics,contentDetails',
-                id=video_id
-            )
-            response = request.execute()
-            self.quota_used += 1
-
-            if not response.get('items'):
-                return None
-
-            video = response['items'][0]
-            snippet = video['snippet']
-            statistics = video['statistics']
-            content_details = video['contentDetails']
-
-            metadata = {
-                'video_id': video_id,
-                'title': snippet.get('title', ''),
-                'channel': snippet.get('channelTitle', ''),
-                'channel_id': snippet.get('channelId', ''),
-                'description': snippet.get('description', ''),
-                'published_at': snippet.get('publishedAt', ''),
-                'tags': snippet.get('tags', []),
-                'category_id': snippet.get('categoryId', ''),
-                'duration': content_details.get('duration', ''),
-                'views': int(statistics.get('viewCount', 0)),
-                'likes': int(statistics.get('likeCount', 0)),
-                'comment_count': int(statistics.get('commentCount', 0)),
-                'thumbnail': snippet.get('thumbnails', {}).get('high', {}).get('url', '')
-            }
-
-            return metadata
+        return self.get_videos_metadata([video_id]).get(video_id)
 
-        except HttpError as e:
+    def get_videos_metadata(self, video_ids: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Get metadata for many videos (1 quota unit per 50 uncached videos)
+        Returns: {video_id: metadata}; private/deleted videos are absent
+        """
+        try:
+            items = self.service.get_videos(video_ids)
+        except YouTubeAPIError as e:
             print(f"❌ API Error getting metadata: {e}")
-            return None
+            return {}
+
+        return {video_id: video_metadata(item) for video_id, item in items.items()}
 
     def get_comments(self, video_id: str, max_results: int = 100) -> List[Dict]:
         """
         Get top comments (1 quota unit per 100 comments)
         Returns: list of {author, text, likes, published_at, reply_count}
         """
-        comments = []
-
         try:
-            # Get top-level comments (sorted by relevance)
-            request = self.youtube.commentThreads().list(
-                part='snippet',
-                videoId=video_id,
-                maxResults=min(max_results, 100),
-                order='relevance',  # Get most relevant comments
-                textFormat='plainText'
-            )
-
-            response = request.execute()
-            self.quota_used += 1
-
-            for item in response.get('items', []):
-                top_comment = item['snippet']['topLevelComment']['snippet']
-
-                comments.append({
-                    'author': top_comment.get('authorDisplayName', ''),
-                    'author_channel_id': top_comment.get('authorChannelId', {}).get('value', ''),
-                    'text': top_comment.get('textDisplay', ''),
-                    'likes': int(top_comment.get('likeCount', 0)),
-                    'published_at': top_comment.get('publishedAt', ''),
-                    'reply_count': int(item['snippet'].get('totalReplyCount', 0))
-                })
-
-            # Get next page if we want more than 100 comments
-            while 'nextPageToken' in response and len(comments) < max_results:
-                request = self.youtube.commentThreads().list(
-                    part='snippet',
-                    videoId=video_id,
-                    maxResults=min(max_results - len(comments), 100),
-                    pageToken=response['nextPageToken'],
-                    order='relevance',
-                    textFormat='plainText'
-                )
-                response = request.execute()
-                self.quota_used += 1
-
-                for item in response.get('items', []):
-                    top_comment = item['snippet']['topLevelComment']['snippet']
-                    comments.append({
-                        'author': top_comment.get('authorDisplayName', ''),
-                        'author_channel_id': top_comment.get('authorChannelId', {}).get('value', ''),
-                        'text': top_comment.get('textDisplay', ''),
-                        'likes': int(top_comment.get('likeCount', 0)),
-                        'published_at': top_comment.get('publishedAt', ''),
-                        'reply_count': int(item['snippet'].get('totalReplyCount', 0))
-                    })
-
-            print(f"✅ Extracted {len(comments)} comments via API")
-            return comments
-
-        except HttpError as e:
-            if 'commentsDisabled' in str(e):
-                print(f"⚠️  Comments disabled for video {video_id}")
-            else:
-                print(f"❌ API Error getting comments: {e}")
+            comments = self.service.get_comments(video_id, max_results)
+        except YouTubeAPIError as e:
+            print(f"❌ API Error getting comments: {e}")
             return []
 
+        print(f"✅ Extracted {len(comments)} comments via API")
+        return comments
+
+    def get_videos_full_data(self, video_ids: Iterable[str], max_comments: int = 100) -> Dict[str, Dict]:
+        """
+        Get metadata + comments for many videos in one concurrent batch
+        Returns: {video_id: result} in the get_video_full_data format
+        """
+        video_ids = list(video_ids)
+        try:
+            full_data = self.service.get_full_data(video_ids, max_comments)
+        except YouTubeAPIError as e:
+            print(f"❌ API Error: {e}")
+            full_data = {}
+
+        results = {}
+        for video_id in video_ids:
+            if video_id not in full_data:
+                results[video_id] = {
+                    'video_id': video_id,
+                    'error': 'Video not found or private',
+                    'status': 'error'
+                }
+                continue
+
+            comments = full_data[video_id]['comments']
+            results[video_id] = {
+                **video_metadata(full_data[video_id]['video']),
+                'comments': comments,
+                'comments_extracted': len(comments),
+                'quota_used': self.quota_used,
+                'status': 'success'
+            }
+
+        return results
+
     def get_video_full_data(self, video_id: str, max_comments: int = 100) -> Dict:
         """
         Get complete video data: metadata + comments
-        Total cost: 2-3 quota units
+        Total cost: 2-3 quota units (0 if cached)
         """
         print(f"🔍 Fetching video data for {video_id}...")
 
-        metadata = self.get_video_metadata(video_id)
-        if not metadata:
-            return {
-                'video_id': video_id,
-                'error': 'Video not found or private',
-                'status': 'error'
-            }
-
-        comments = self.get_comments(video_id, max_comments)
-
-        result = {
-            **metadata,
-            'comments': comments,
-            'comments_extracted': len(comments),
-            'quota_used': self.quota_used,
-            'status': 'success'
-        }
+        result = self.get_videos_full_data([video_id], max_comments)[video_id]
+        if result.get('status') == 'error':
+            return result
 
-        print(f"📊 Metadata: {metadata['title'][:50]}...")
-        print(f"💬 Comments: {len(comments)} (from {metadata['comment_count']} total)")
+        print(f"📊 Metadata: {result['title'][:50]}...")
+        print(f"💬 Comments: {result['comments_extracted']} (from {result['comment_count']} total)")
         print(f"📈 Quota used: {self.quota_used} units")
 
         return result
@@ -5,6 +5,8 @@ Enhanced YouTube Channel Extractor
 - Filters out YouTube Shorts automatically
 - Integrates with CrewAI pipeline
 - Quality validation
+- Video metadata batched through the YouTube Data API (50 ids per unit) when
+  an API key is configured; per-video yt-dlp extraction is the fallback
 """
 
 import os
@@ -18,6 +20,8 @@ from dotenv import load_dotenv
 import yt_dlp
 from urllib.parse import urlparse, parse_qs
 
+from youtube_metadata_service import YouTubeMetadataService, YouTubeAPIError, parse_duration
+
 load_dotenv('/Users/yourox/AI-Workspace/.env')
 
 
@@ -26,7 +30,8 @@ class YouTubeChannelExtractor:
 
     def __init__(
         self,
-        cache_dir: str = "/Users/yourox/AI-Workspace/data/youtube_channels"
+        cache_dir: str = "/Users/yourox/AI-Workspace/data/youtube_channels",
+        metadata_service: Optional[YouTubeMetadataService] = None
     ):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -34,6 +39,14 @@ class YouTubeChannelExtractor:
         # YouTube Shorts are typically < 60 seconds
         self.shorts_max_duration = 60
 
+        # Batched Data API metadata (None = yt-dlp per video)
+        self.metadata_service = metadata_service
+        if self.metadata_service is None:
+            try:
+                self.metadata_service = YouTubeMetadataService()
+            except ValueError:
+                print("⚠️  No YouTube API key: falling back to per-video yt-dlp metadata")
+
     def extract_channel_handle(self, url: str) -> Optional[str]:
         """Extract channel handle/ID from various YouTube URL formats"""
 
@@ -125,6 +138,11 @@ class YouTubeChannelExtractor:
                 print(f"Found {len(entries)} videos")
                 print(f"\nProcessing videos...")
 
+                # Metadata for all listed entries in 50-id API batches
+                api_videos = self._get_videos_metadata_batch(
+                    [entry.get('id') for entry in entries if entry and entry.get('id')]
+                )
+
                 # Calculate cutoff date if specified
                 cutoff_date = None
                 if days_back:
@@ -141,12 +159,16 @@ class YouTubeChannelExtractor:
 
                     video_url = f"https://www.youtube.com/watch?v={video_id}"
 
-                    # Fetch full metadata to get duration
-                    try:
-                        video_info = self._get_video_metadata(video_id)
-                    except Exception as e:
-                        print(f"  ⚠️  Skipping {video_id}: {e}")
-                        continue
+                    # Full metadata: batched API result, else one yt-dlp extraction
+                    used_ytdlp = video_id not in api_videos
+                    if used_ytdlp:
+                        try:
+                            video_info = self._get_video_metadata(video_id)
+                        except Exception as e:
+                            print(f"  ⚠️  Skipping {video_id}: {e}")
+                            continue
+                    else:
+                        video_info = api_videos[video_id]
 
                     duration = video_info.get('duration', 0)
                     title = video_info.get('title', entry.get('title', 'Unknown'))
@@ -193,8 +215,9 @@ class YouTubeChannelExtractor:
                     if len(videos) >= max_videos:
                         break
 
-                    # Rate limiting
-                    time.sleep(0.5)
+                    # Rate limiting (yt-dlp fallback only)
+                    if used_ytdlp:
+                        time.sleep(0.5)
 
         except Exception as e:
             print(f"Error extracting channel: {e}")
@@ -206,6 +229,42 @@ class YouTubeChannelExtractor:
 
         return videos
 
+    def _get_videos_metadata_batch(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get metadata for many videos via the Data API (1 quota unit per 50)
+
+        Returns:
+            {video_id: yt-dlp style info dict}; empty if the API is unavailable
+        """
+        if not self.metadata_service or not video_ids:
+            return {}
+
+        try:
+            items = self.metadata_service.get_videos(video_ids)
+        except YouTubeAPIError as e:
+            print(f"  ⚠️  API metadata unavailable ({e}), using yt-dlp")
+            return {}
+
+        videos = {}
+        for video_id, item in items.items():
+            snippet = item.get('snippet', {})
+            statistics = item.get('statistics', {})
+            thumbnails = snippet.get('thumbnails', {})
+            videos[video_id] = {
+                'duration': parse_duration(item.get('contentDetails', {}).get('duration', '')),
+                'title': snippet.get('title', ''),
+                'upload_date': snippet.get('publishedAt', '')[:10].replace('-', ''),
+                'view_count': int(statistics.get('viewCount', 0)),
+                'like_count': int(statistics.get('likeCount', 0)),
+                'description': snippet.get('description', ''),
+                'tags': snippet.get('tags', []),
+                'thumbnail': (thumbnails.get('maxres') or thumbnails.get('high') or {}).get('url', ''),
+            }
+
+        print(f"Fetched metadata for {len(videos)}/{len(video_ids)} videos via API "
+              f"({self.metadata_service.quota.session_used} quota units this run)")
+        return videos
+
     def _get_video_metadata(self, video_id: str) -> Dict:
         """Get detailed metadata for a single video"""
 
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+YouTube Metadata Service - Batched YouTube Data API v3 client with quota accounting
+
+Shared by the API comment extractor, the channel extractor and the domain
+collectors so every caller gets the same quota-saving behaviour:
+- videos.list batches up to 50 ids per request (1 unit per batch, not per video)
+- Channel discovery via channels.list + the uploads playlist (1 unit per 50
+  videos) instead of search.list (100 units per call)
+- Responses cached on disk with per-kind TTLs (SQLite artifact store)
+- Quota units tracked per method and persisted per Pacific-time day
+- commentThreads pagination fanned out concurrently across videos
+  (pages of one video stay sequential, they are linked by pageToken)
+
+Requests go through the shared PoliteFetcher (pooled httpx client, retries
+with backoff on 429/5xx).
+
+Usage:
+    service = YouTubeMetadataService()
+    videos = service.get_videos(video_ids)             # {video_id: API resource}
+    comments = service.get_comments_many(video_ids)    # {video_id: [comment, ...]}
+    channel, uploads = service.get_channel_uploads('@GregIsenberg', max_videos=100)
+
+    python3 youtube_metadata_service.py quota
+    python3 youtube_metadata_service.py videos dQw4w9WgXcQ jNQXAC9IVRw
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+from zoneinfo import ZoneInfo
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_store import ArtifactStore, write_json_atomic
+from polite_fetcher import run_with_fetcher
+
+load_dotenv('/Users/yourox/AI-Workspace/.env')
+
+logger = logging.getLogger(__name__)
+
+API_BASE = "https://www.googleapis.com/youtube/v3"
+DATA_DIR = Path("/Users/yourox/AI-Workspace/data/youtube_api")
+DEFAULT_CACHE_DB = DATA_DIR / "api_cache.db"
+DEFAULT_QUOTA_PATH = DATA_DIR / "quota.json"
+
+DAILY_QUOTA = 10000
+MAX_IDS_PER_CALL = 50
+MAX_COMMENTS_PER_CALL = 100
+
+# Quota cost per API method (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    'videos.list': 1,
+    'channels.list': 1,
+    'playlistItems.list': 1,
+    'commentThreads.list': 1,
+    'search.list': 100,
+}
+
+# Cache TTL per artifact kind, in seconds
+CACHE_TTLS = {
+    'yt_video': 24 * 3600,
+    'yt_comments': 7 * 24 * 3600,
+    'yt_channel': 30 * 24 * 3600,
+    'yt_uploads': 6 * 3600,
+}
+
+VIDEO_PARTS = 'snippet,statistics,contentDetails'
+
+FETCHER_KWARGS = {
+    'per_host_concurrency': 8,
+    'per_host_rate': 10.0,
+    'per_host_burst': 10,
+    'respect_robots': False,
+    'headers': {'Accept': 'application/json'},
+}
+
+# Quota resets at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+
+DURATION_RE = re.compile(
+    r'^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$'
+)
+
+
+class YouTubeAPIError(Exception):
+    """Error response from the YouTube Data API"""
+
+    def __init__(self, status: Optional[int], reason: str, message: str = ''):
+        super().__init__(f"HTTP {status} {reason}: {message}" if message else f"HTTP {status} {reason}")
+        self.status = status
+        self.reason = reason
+
+
+class QuotaExceededError(YouTubeAPIError):
+    """Local daily quota budget (or the API's own quota) is exhausted"""
+
+    def __init__(self, message: str):
+        super().__init__(403, 'quotaExceeded', message)
+
+
+class QuotaTracker:
+    """Thread-safe per-method quota accounting, persisted per Pacific-time day"""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_QUOTA_PATH, daily_limit: int = DAILY_QUOTA):
+        self.path = Path(path) if path else None
+        self.daily_limit = daily_limit
+        self._lock = threading.Lock()
+
+        self.day = self._today()
+        self.by_method: Dict[str, int] = defaultdict(int)
+        self.session: Dict[str, int] = defaultdict(int)
+        self._load()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+    def _load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load quota state from {self.path}: {e}")
+            return
+        if data.get('day') == self.day:
+            self.by_method.update(data.get('by_method', {}))
+
+    def _roll_day(self):
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.by_method.clear()
+
+    @property
+    def used(self) -> int:
+        """Units used today (all sessions)"""
+        return sum(self.by_method.values())
+
+    @property
+    def remaining(self) -> int:
+        return max(self.daily_limit - self.used, 0)
+
+    @property
+    def session_used(self) -> int:
+        """Units used by this process"""
+        return sum(self.session.values())
+
+    def reserve(self, method: str) -> int:
+        """
+        Charge one call of `method` against today's budget
+
+        Returns:
+            Units charged
+
+        Raises:
+            QuotaExceededError if the call would exceed the daily limit
+        """
+        cost = QUOTA_COSTS.get(method, 1)
+        with self._lock:
+            self._roll_day()
+            if self.used + cost > self.daily_limit:
+                raise QuotaExceededError(
+                    f"{method} needs {cost} units, {self.remaining} of {self.daily_limit} left today"
+                )
+            self.by_method[method] += cost
+            self.session[method] += cost
+        return cost
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {'day': self.day, 'by_method': dict(self.by_method), 'used': self.used,
+                    'daily_limit': self.daily_limit}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.path, data)
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                'day': self.day,
+                'used': self.used,
+                'remaining': self.remaining,
+                'daily_limit': self.daily_limit,
+                'by_method': dict(self.by_method),
+                'session_used': self.session_used,
+                'session_by_method': dict(self.session),
+            }
+
+
+# ----------------------------------------------------------------------
+# Response parsing
+# ----------------------------------------------------------------------
+
+def parse_duration(iso_duration: str) -> int:
+    """ISO 8601 duration (e.g. PT1H2M3S) to seconds; 0 if missing or unparseable"""
+    match = DURATION_RE.match(iso_duration or '')
+    if not match:
+        return 0
+    parts = {k: int(v) for k, v in match.groupdict().items() if v}
+    return (parts.get('days', 0) * 86400 + parts.get('hours', 0) * 3600
+            + parts.get('minutes', 0) * 60 + parts.get('seconds', 0))
+
+
+def video_metadata(item: Dict) -> Dict:
+    """Flatten a videos.list resource into the extractor metadata format"""
+    snippet = item.get('snippet', {})
+    statistics = item.get('statistics', {})
+    content_details = item.get('contentDetails', {})
+
+    return {
+        'video_id': item['id'],
+        'title': snippet.get('title', ''),
+        'channel': snippet.get('channelTitle', ''),
+        'channel_id': snippet.get('channelId', ''),
+        'description': snippet.get('description', ''),
+        'published_at': snippet.get('publishedAt', ''),
+        'tags': snippet.get('tags', []),
+        'category_id': snippet.get('categoryId', ''),
+        'duration': content_details.get('duration', ''),
+        'views': int(statistics.get('viewCount', 0)),
+        'likes': int(statistics.get('likeCount', 0)),
+        'comment_count': int(statistics.get('commentCount', 0)),
+        'thumbnail': snippet.get('thumbnails', {}).get('high', {}).get('url', '')
+    }
+
+
+def comment_from_thread(item: Dict) -> Dict:
+    """Flatten a commentThreads.list item into {author, text, likes, ...}"""
+    top_comment = item['snippet']['topLevelComment']['snippet']
+    return {
+        'author': top_comment.get('authorDisplayName', ''),
+        'author_channel_id': top_comment.get('authorChannelId', {}).get('value', ''),
+        'text': top_comment.get('textDisplay', ''),
+        'likes': int(top_comment.get('likeCount', 0)),
+        'published_at': top_comment.get('publishedAt', ''),
+        'reply_count': int(item['snippet'].get('totalReplyCount', 0))
+    }
+
+
+def _batches(items: List[str], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class YouTubeMetadataService:
+    """Batched, cached, quota-accounted YouTube Data API v3 client"""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_db: Path = DEFAULT_CACHE_DB,
+        quota: Optional[QuotaTracker] = None,
+        use_cache: bool = True,
+        fetcher_kwargs: Optional[Dict] = None,
+    ):
+        """
+        Args:
+            api_key: API key (defaults to GOOGLE_API_KEY, then YOUTUBE_API_KEY)
+            cache_db: SQLite response cache
+            quota: Shared QuotaTracker (defaults to the persisted daily tracker)
+            use_cache: Read cached responses (fresh responses are always written)
+            fetcher_kwargs: PoliteFetcher overrides
+        """
+        self.api_key = api_key or os.getenv('GOOGLE_API_KEY') or os.getenv('YOUTUBE_API_KEY')
+        if not self.api_key:
+            raise ValueError("GOOGLE_API_KEY (or YOUTUBE_API_KEY) not found in .env")
+
+        self.store = ArtifactStore(cache_db)
+        self.quota = quota or QuotaTracker()
+        self.use_cache = use_cache
+        self.fetcher_kwargs = {**FETCHER_KWARGS, **(fetcher_kwargs or {})}
+
+        # Sync wrappers may be called from worker threads (one event loop each)
+        self._store_lock = threading.Lock()
+        self.cache_hits = 0
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    async def _call(self, fetcher, method: str, params: Dict) -> Dict:
+        """One API request, charged to the quota tracker before it is sent"""
+        self.quota.reserve(method)
+
+        endpoint = method.split('.')[0]
+        url = f"{API_BASE}/{endpoint}?{urlencode({**params, 'key': self.api_key})}"
+        result = await fetcher.fetch(url)
+
+        try:
+            payload = json.loads(result.content) if result.content else {}
+        except ValueError:
+            payload = {}
+
+        if not result.ok:
+            error = payload.get('error', {})
+            reason = (error.get('errors') or [{}])[0].get('reason', result.error or 'unknown')
+            if reason in ('quotaExceeded', 'dailyLimitExceeded'):
+                raise QuotaExceededError(error.get('message', reason))
+            raise YouTubeAPIError(result.status, reason, error.get('message', ''))
+
+        return payload
+
+    def _cached(self, kind: str, ids: List[str], version: str) -> Dict[str, Dict]:
+        if not self.use_cache or not ids:
+            return {}
+        with self._store_lock:
+            found = self.store.get_many(kind, ids, version=version, max_age=CACHE_TTLS[kind])
+        self.cache_hits += len(found)
+        return found
+
+    def _remember(self, kind: str, items: Iterable[Tuple[str, Dict]], version: str):
+        items = list(items)
+        if items:
+            with self._store_lock:
+                self.store.put_many(kind, items, version=version)
+
+    # ------------------------------------------------------------------
+    # Async API (share one fetcher across calls)
+    # ------------------------------------------------------------------
+
+    async def get_videos_async(self, fetcher, video_ids: Iterable[str],
+                               parts: str = VIDEO_PARTS) -> Dict[str, Dict]:
+        """videos.list resources by id, 50 ids per request, cache first"""
+        ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+        found = self._cached('yt_video', ids, parts)
+        missing = [video_id for video_id in ids if video_id not in found]
+
+        responses = await asyncio.gather(
+            *(
+                self._call(fetcher, 'videos.list', {
+                    'part': parts, 'id': ','.join(batch), 'maxResults': MAX_IDS_PER_CALL
+                })
+                for batch in _batches(missing, MAX_IDS_PER_CALL)
+            ),
+            return_exceptions=True
+        )
+
+        fetched = {}
+        for batch, response in zip(_batches(missing, MAX_IDS_PER_CALL), responses):
+            if isinstance(response, QuotaExceededError):
+                raise response
+            if isinstance(response, Exception):
+                logger.warning(f"videos.list batch failed: {response}")
+                continue
+            # Private/deleted ids are cached as {} so they are not re-requested
+            fetched.update({video_id: {} for video_id in batch})
+            for item in response.get('items', []):
+                fetched[item['id']] = item
+
+        self._remember('yt_video', fetched.items(), parts)
+        found.update(fetched)
+        return {video_id: found[video_id] for video_id in ids if found.get(video_id)}
+
+    async def _comment_pages(self, fetcher, video_id: str, max_results: int,
+                             order: str) -> List[Dict]:
+        comments = []
+        page_token = None
+
+        while len(comments) < max_results:
+            params = {
+                'part': 'snippet',
+                'videoId': video_id,
+                'maxResults': min(max_results - len(comments), MAX_COMMENTS_PER_CALL),
+                'order': order,
+                'textFormat': 'plainText',
+            }
+            if page_token:
+                params['pageToken'] = page_token
+
+            try:
+                response = await self._call(fetcher, 'commentThreads.list', params)
+            except YouTubeAPIError as e:
+                if e.reason == 'commentsDisabled':
+                    logger.info(f"Comments disabled for video {video_id}")
+                    return []
+                raise
+
+            comments.extend(comment_from_thread(item) for item in response.get('items', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+
+        return comments[:max_results]
+
+    async def get_comments_many_async(self, fetcher, video_ids: Iterable[str],
+                                      max_results: int = 100,
+                                      order: str = 'relevance') -> Dict[str, List[Dict]]:
+        """Top-level comments per video; videos are paginated concurrently"""
+        ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+        version = f"{order}:{max_results}"
+        found = {
+            video_id: data['comments']
+            for video_id, data in self._cached('yt_comments', ids, version).items()
+        }
+        missing = [video_id for video_id in ids if video_id not in found]
+
+        results = await asyncio.gather(
+            *(self._comment_pages(fetcher, video_id, max_results, order) for video_id in missing),
+            return_exceptions=True
+        )
+
+        fetched = {}
+        quota_error = None
+        for video_id, result in zip(missing, results):
+            if isinstance(result, QuotaExceededError):
+                quota_error = result
+            elif isinstance(result, Exception):
+                logger.warning(f"commentThreads.list failed for {video_id}: {result}")
+            else:
+                fetched[video_id] = result
+
+        self._remember('yt_comments', ((vid, {'comments': c}) for vid, c in fetched.items()), version)
+        if quota_error and not fetched:
+            raise quota_error
+
+        found.update(fetched)
+        return {video_id: found[video_id] for video_id in ids if video_id in found}
+
+    async def resolve_channel_async(self, fetcher, channel: str) -> Optional[Dict]:
+        """
+        Resolve a channel id, @handle or legacy username (1 unit, cached)
+
+        Returns:
+            {'channel_id', 'title', 'uploads_playlist_id'} or None
+        """
+        channel = channel.strip()
+        cached = self._cached('yt_channel', [channel], '')
+        if channel in cached:
+            return cached[channel]
+
+        if channel.startswith('UC') and len(channel) == 24:
+            params = {'id': channel}
+        elif channel.startswith('@'):
+            params = {'forHandle': channel}
+        else:
+            params = {'forUsername': channel}
+
+        response = await self._call(fetcher, 'channels.list', {'part': 'snippet,contentDetails', **params})
+        if not response.get('items') and 'forUsername' in params:
+            # Bare handles are written without the @ in older configs
+            response = await self._call(fetcher, 'channels.list', {
+                'part': 'snippet,contentDetails', 'forHandle': f"@{channel}"
+            })
+
+        if not response.get('items'):
+            return None
+
+        item = response['items'][0]
+        info = {
+            'channel_id': item['id'],
+            'title': item.get('snippet', {}).get('title', ''),
+            'uploads_playlist_id': item.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads', ''),
+        }
+        self._remember('yt_channel', [(channel, info)], '')
+        return info
+
+    async def get_upload_ids_async(self, fetcher, uploads_playlist_id: str,
+                                   max_videos: int = 50) -> List[str]:
+        """Newest-first video ids from an uploads playlist (1 unit per 50 ids)"""
+        version = str(max_videos)
+        cached = self._cached('yt_uploads', [uploads_playlist_id], version)
+        if uploads_playlist_id in cached:
+            return cached[uploads_playlist_id]['video_ids']
+
+        video_ids = []
+        page_token = None
+        while len(video_ids) < max_videos:
+            params = {
+                'part': 'contentDetails',
+                'playlistId': uploads_playlist_id,
+                'maxResults': MAX_IDS_PER_CALL,
+            }
+            if page_token:
+                params['pageToken'] = page_token
+
+            response = await self._call(fetcher, 'playlistItems.list', params)
+            video_ids.extend(item['contentDetails']['videoId'] for item in response.get('items', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+
+        video_ids = video_ids[:max_videos]
+        self._remember('yt_uploads', [(uploads_playlist_id, {'video_ids': video_ids})], version)
+        return video_ids
+
+    async def get_channel_uploads_async(self, fetcher, channel: str,
+                                        max_videos: int = 50) -> Tuple[Optional[Dict], List[Dict]]:
+        """Channel info plus newest-first video resources of its uploads"""
+        info = await self.resolve_channel_async(fetcher, channel)
+        if not info or not info['uploads_playlist_id']:
+            return info, []
+
+        video_ids = await self.get_upload_ids_async(fetcher, info['uploads_playlist_id'], max_videos)
+        videos = await self.get_videos_async(fetcher, video_ids)
+        return info, [videos[video_id] for video_id in video_ids if video_id in videos]
+
+    async def get_full_data_async(self, fetcher, video_ids: Iterable[str],
+                                  max_comments: int = 100) -> Dict[str, Dict]:
+        """Video resources and comments for many videos, fetched concurrently"""
+        ids = list(video_ids)
+        videos, comments = await asyncio.gather(
+            self.get_videos_async(fetcher, ids),
+            self.get_comments_many_async(fetcher, ids, max_comments) if max_comments > 0 else _no_comments(),
+        )
+        return {
+            video_id: {'video': videos[video_id], 'comments': comments.get(video_id, [])}
+            for video_id in ids if video_id in videos
+        }
+
+    # ------------------------------------------------------------------
+    # Sync API (one pooled fetcher per call)
+    # ------------------------------------------------------------------
+
+    def _run(self, fn, *args, **kwargs):
+        try:
+            return run_with_fetcher(fn, *args, fetcher_kwargs=self.fetcher_kwargs, **kwargs)
+        finally:
+            self.quota.save()
+
+    def get_videos(self, video_ids: Iterable[str], parts: str = VIDEO_PARTS) -> Dict[str, Dict]:
+        """videos.list resources by id (1 unit per 50 uncached ids)"""
+        return self._run(self.get_videos_async, list(video_ids), parts=parts)
+
+    def get_comments(self, video_id: str, max_results: int = 100) -> List[Dict]:
+        """Top-level comments of one video (1 unit per 100 comments)"""
+        return self.get_comments_many([video_id], max_results).get(video_id, [])
+
+    def get_comments_many(self, video_ids: Iterable[str], max_results: int = 100) -> Dict[str, List[Dict]]:
+        """Top-level comments for many videos, paginated concurrently"""
+        return self._run(self.get_comments_many_async, list(video_ids), max_results=max_results)
+
+    def resolve_channel(self, channel: str) -> Optional[Dict]:
+        """{'channel_id', 'title', 'uploads_playlist_id'} for an id/@handle (1 unit, cached)"""
+        return self._run(self.resolve_channel_async, channel)
+
+    def get_channel_uploads(self, channel: str, max_videos: int = 50) -> Tuple[Optional[Dict], List[Dict]]:
+        """Channel info plus its newest uploads (about 1 + 2 units per 50 videos)"""
+        return self._run(self.get_channel_uploads_async, channel, max_videos=max_videos)
+
+    def get_full_data(self, video_ids: Iterable[str], max_comments: int = 100) -> Dict[str, Dict]:
+        """{video_id: {'video': resource, 'comments': [...]}} for many videos"""
+        return self._run(self.get_full_data_async, list(video_ids), max_comments=max_comments)
+
+    def close(self):
+        self.quota.save()
+        self.store.close()
+
+
+async def _no_comments() -> Dict:
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='YouTube Metadata Service')
+    parser.add_argument('command', choices=['quota', 'videos', 'channel'])
+    parser.add_argument('targets', nargs='*', help='Video ids (videos) or a channel id/@handle (channel)')
+    parser.add_argument('--max-videos', type=int, default=50, help='Uploads to list (channel)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached responses')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'quota':
+        print(json.dumps(QuotaTracker().summary(), indent=2))
+        return
+
+    service = YouTubeMetadataService(use_cache=not args.no_cache)
+    start = time.time()
+
+    if args.command == 'videos':
+        videos = service.get_videos(args.targets)
+        for video_id, item in videos.items():
+            meta = video_metadata(item)
+            print(f"  {video_id}  {parse_duration(meta['duration']):>6}s  {meta['views']:>12,} views  {meta['title'][:60]}")
+    else:
+        if not args.targets:
+            parser.error("channel requires a channel id or @handle")
+        info, videos = service.get_channel_uploads(args.targets[0], max_videos=args.max_videos)
+        if not info:
+            print(f"✗ Channel not found: {args.targets[0]}")
+        else:
+            print(f"📺 {info['title']} ({info['channel_id']}): {len(videos)} videos")
+            for item in videos:
+                meta = video_metadata(item)
+                print(f"  {item['id']}  {meta['published_at'][:10]}  {parse_duration(meta['duration']):>6}s  {meta['title'][:60]}")
+
+    quota = service.quota.summary()
+    print(f"\n📈 Quota: {quota['session_used']} units this run, {quota['remaining']:,} left today "
+          f"({service.cache_hits} cache hits, {time.time() - start:.1f}s)")
+    service.close()
+
+
+if __name__ == "__main__":
+    main()
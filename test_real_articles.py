@@ -23,10 +23,11 @@ print(f"{'='*70}\n")
 
 results = []
 
-for i, url in enumerate(test_articles, 1):
-    print(f"\n[{i}/{len(test_articles)}] Testing: {url.split('/')[-1][:50]}...")
+# Both articles are extracted concurrently over one pooled session
+extracted = collector.extract_articles(test_articles)
 
-    article_data = collector.extract_article_content(url)
+for i, (url, article_data) in enumerate(zip(test_articles, extracted), 1):
+    print(f"\n[{i}/{len(test_articles)}] Result: {url.split('/')[-1][:50]}...")
 
     if article_data and article_data.get('status') == 'success':
         collector.save_article(article_data)
@@ -43,7 +44,7 @@ for i, url in enumerate(test_articles, 1):
         print(f"  Videos: {article_data.get('media', {}).get('video_count', 0)}")
         print(f"  Rating: {article_data.get('rating', 'N/A')}")
     else:
-        print(f"❌ Failed: {article_data.get('error', 'Unknown error')}")
+        print(f"❌ Failed: {(article_data or {}).get('error', 'Unknown error')}")
 
 print(f"\n{'='*70}")
 print(f"✅ TEST COMPLETE - {len(results)}/{len(test_articles)} articles extracted")
@@ -6,10 +6,14 @@ Provides comprehensive statistics on all transcripts
 
 import json
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from transcript_store import TranscriptLibrary
+
 # Paths
 TRANSCRIPTS_DIR = Path('/Users/yourox/AI-Workspace/data/transcripts')
 INSIGHTS_DIR = Path('/Users/yourox/AI-Workspace/data/insights')
@@ -36,56 +40,38 @@ def analyze_youtube_database():
     }
 
     # Analyze individual transcript files
-    full_json_files = list(TRANSCRIPTS_DIR.glob('*_full.json'))
-    stats['individual_files'] = len(full_json_files)
+    library = TranscriptLibrary(TRANSCRIPTS_DIR)
+    stats['individual_files'] = len(list(TRANSCRIPTS_DIR.glob('*_full.json')))
 
-    for file_path in full_json_files:
-        try:
-            # Get file size
-            file_size_mb = file_path.stat().st_size / (1024 * 1024)
-            stats['file_sizes_mb'].append(file_size_mb)
+    # Headers come from the cached index; segments are never parsed here
+    for header in library.headers():
+        # Get file size
+        file_size_mb = header['file']['size'] / (1024 * 1024)
+        stats['file_sizes_mb'].append(file_size_mb)
 
-            # Read and parse file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        # Extract video ID
+        video_id = header['video_id'] or header['file']['name'].replace('_full.json', '')
+        stats['unique_videos'].add(video_id)
 
-            # Extract video ID
-            video_id = data.get('video_id', file_path.stem.replace('_full', ''))
-            stats['unique_videos'].add(video_id)
-
-            # Extract metadata
-            title = data.get('title', 'Unknown')
-            stats['titles'].append(title)
-
-            # Method used
-            method = data.get('method', 'unknown')
-            stats['methods'][method] += 1
-
-            # Agent ID
-            agent_id = data.get('agent_id', 0)
-            stats['agent_ids'][agent_id] += 1
-
-            # Transcript data
-            transcript = data.get('transcript', {})
-            if isinstance(transcript, dict):
-                segments = transcript.get('segments', [])
-                language = transcript.get('language', 'en')
-                stats['languages'][language] += 1
-            else:
-                segments = transcript if isinstance(transcript, list) else []
-
-            num_segments = len(segments)
-            stats['segments_per_video'].append(num_segments)
-            stats['total_segments'] += num_segments
-
-            # Calculate duration from segments
-            if segments and len(segments) > 0:
-                last_segment = segments[-1]
-                total_duration = last_segment.get('start', 0) + last_segment.get('duration', 0)
-                stats['total_duration'] += total_duration
+        # Extract metadata
+        stats['titles'].append(header['title'] or 'Unknown')
 
-        except Exception as e:
-            print(f"Error processing {file_path.name}: {e}")
+        # Method used
+        stats['methods'][header['method'] or 'unknown'] += 1
+
+        # Agent ID
+        stats['agent_ids'][header['agent_id'] or 0] += 1
+
+        # Transcript data
+        if header['format'] == 'segments':
+            stats['languages'][header['language']] += 1
+
+        num_segments = header['segment_count']
+        stats['segments_per_video'].append(num_segments)
+        stats['total_segments'] += num_segments
+
+        # Duration = end of last segment
+        stats['total_duration'] += header['duration']
 
     # Analyze batch files
     batch_files = list(TRANSCRIPTS_DIR.glob('batch_*.json'))